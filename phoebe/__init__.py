@@ -6,12 +6,16 @@ Available environment variables:
 * PHOEBE_ENABLE_SYMPY=TRUE/FALSE (whether to attempt to import sympy for constraint algebra: defaults to True if sympy installed, otherwise False)
 * PHOEBE_ENABLE_ONLINE_PASSBANDS=TRUE/FALSE (whether to query for online passbands and download on-the-fly: defaults to True)
 * PHOEBE_PBDIR (directory to search for passbands, in addition to phoebe.list_passband_directories())
+* PHOEBE_PBCACHEDIR (directory in which to store uncompressed, memory-mappable copies of the passband tables as they are first needed, which can take up to several GB for all installed passbands.  Set to an empty string or 'none' to disable the cache and read the tables into memory instead.  Defaults to ~/.phoebe/atmospheres/tables/cache.)
 * PHOEBE_DOWNLOAD_PASSBAND_DEFAULTS_GZIPPED=TRUE/FALSE (whether to download gzipped version of passbands by default.  Defaults to False.  Note that gzipped files take longer to load and will increase time for import, but take significantly less disk-space.)
 * PHOEBE_DOWNLOAD_PASSBAND_DEFAULTS_CONTENT (default content, comma separated for list.  Defaults to 'all')
 * PHOEBE_UPDATE_PASSBAND_IGNORE_VERSION=TRUE/FALSE (update passbands that need new content even if the online version is newer than the installed version.  Defaults to False.)
 * PHOEBE_ENABLE_MPI=TRUE/FALSE (whether to use internal parallelization: defaults to True if within mpirun, otherwise False, can override in python with phoebe.mpi.on() and phoebe.mpi.off())
 * PHOEBE_MPI_NPROCS=INT (number of procs to spawn in mpi is enabled but not running within mpirun: defaults to 4, only applicable if not within mpirun and PHOEBE_ENABLE_MPI=TRUE or phoebe.mpi.on() called, can override in python by passing nprocs to phoebe.mpi.on() or by setting phoebe.mpi.nprocs)
 * PHOEBE_MULTIPROC_NPROCS=INT (number of proces to use within multiprocessing.  Multiprocessing is used for solver that support it and when sampling over a distribution in run_compute if MPI is not in use.  Set to 0 to disable multiprocessing and force serial.  Defaults to number of CPUs available.)
+* PHOEBE_MULTIPROC_TIMES=TRUE/FALSE (whether to also use multiprocessing to split the times of a single run_compute call with the phoebe backend across local processes when MPI is not in use.  Defaults to False.)
+* PHOEBE_SOLVER_COMPUTE_SESSION=TRUE/FALSE (whether solvers re-use anything unaffected by the changed parameters (pblums, meshes, dynamics, etc) between forward models, see phoebe.solver_compute_session_on().  Defaults to True.)
+* PHOEBE_THREADING_TIMES=TRUE/FALSE (whether to split the times of a single run_compute call with the phoebe backend across a pool of threads (see PHOEBE_NTHREADS) when neither MPI nor PHOEBE_MULTIPROC_TIMES are in use.  Defaults to False.)
 * PHOEBE_PBDIR (directory to search for passbands, in addition to phoebe.list_passband_directories())
 * PHOEBE_DEVEL=TRUE/FALSE enable developer mode by default
 
@@ -23,6 +27,7 @@ import os as _os
 import sys as _sys
 import inspect as _inspect
 import multiprocessing as _multiprocessing
+import threading as _threading
 import atexit
 import re
 
@@ -249,6 +254,15 @@ class Settings(object):
         self._update_passband_ignore_version = _env_variable_bool('PHOEBE_UPDATE_PASSBAND_IGNORE_VERSION', False)
 
         self._multiprocessing_nprocs = _env_variable_int_or_none('PHOEBE_MULTIPROC_NPROCS', None)
+        self._multiprocessing_times = _env_variable_bool('PHOEBE_MULTIPROC_TIMES', False)
+        self._threading_nthreads = _env_variable_int('PHOEBE_NTHREADS', 1)
+        self._threading_times = _env_variable_bool('PHOEBE_THREADING_TIMES', False)
+        self._solver_compute_session = _env_variable_bool('PHOEBE_SOLVER_COMPUTE_SESSION', True)
+        # per-thread override of threading_nthreads, set within the threads
+        # that already split the times of a forward model
+        self._threading_local = _threading.local()
+        # maximum size (in MB) of the cached view-factor matrices for irradiation
+        self._view_factors_cache_maxsize = _env_variable_int('PHOEBE_VIEW_FACTORS_CACHE_MAXSIZE', 128)
         self._progressbars = True
 
         # And we'll require explicitly setting developer mode on
@@ -352,6 +366,57 @@ class Settings(object):
             return _multiprocessing.cpu_count()
         return self._multiprocessing_nprocs
 
+    def multiprocessing_times_on(self):
+        self._multiprocessing_times = True
+
+    def multiprocessing_times_off(self):
+        self._multiprocessing_times = False
+
+    @property
+    def multiprocessing_times(self):
+        return self._multiprocessing_times
+
+    def threading_set_nthreads(self, value):
+        if not isinstance(value, int):
+            raise TypeError("must be integer")
+        self._threading_nthreads = value
+
+    @property
+    def threading_nthreads(self):
+        nthreads = getattr(self._threading_local, 'nthreads', self._threading_nthreads)
+        if nthreads <= 0:
+            return _multiprocessing.cpu_count()
+        return nthreads
+
+    def threading_times_on(self):
+        self._threading_times = True
+
+    def threading_times_off(self):
+        self._threading_times = False
+
+    @property
+    def threading_times(self):
+        return self._threading_times
+
+    def solver_compute_session_on(self):
+        self._solver_compute_session = True
+
+    def solver_compute_session_off(self):
+        self._solver_compute_session = False
+
+    @property
+    def solver_compute_session(self):
+        return self._solver_compute_session
+
+    def view_factors_cache_set_maxsize(self, value):
+        if not isinstance(value, int):
+            raise TypeError("must be integer")
+        self._view_factors_cache_maxsize = value
+
+    @property
+    def view_factors_cache_maxsize(self):
+        return self._view_factors_cache_maxsize
+
     def progressbars_on(self):
         self._progressbars = True
 
@@ -378,6 +443,7 @@ from .atmospheres.passbands import install_passband, uninstall_passband, uninsta
 from .parameters import hierarchy, component, compute, constraint, dataset, feature, figure, solver, server
 from .frontend.bundle import Bundle
 from .backend import backends as _backends
+from .backend import universe as _universe
 from .solverbackends import solverbackends as _solverbackends
 from . import utils as _utils
 
@@ -820,6 +886,177 @@ def multiprocessing_set_nprocs(nprocs):
     """
     conf.multiprocessing_set_nprocs(nprocs)
 
+def multiprocessing_times_on():
+    """
+    Enable splitting the times of a single forward model across local processes
+    (using <phoebe.multiprocessing_get_nprocs> processes) whenever
+    <phoebe.frontend.bundle.Bundle.run_compute> is called with the phoebe
+    backend.  This is disabled by default.
+
+    MPI will always take preference over multiprocessing.  See <phoebe.mpi_on>
+    and <phoebe.mpi_off>.  Per-time multiprocessing is also skipped within
+    solvers and when sampling with `sample_from`, as those already parallelize
+    over forward models.
+
+    See also:
+    * <phoebe.multiprocessing_times_off>
+    * <phoebe.multiprocessing_set_nprocs>
+    """
+    conf.multiprocessing_times_on()
+
+def multiprocessing_times_off():
+    """
+    Disable splitting the times of a single forward model across local processes
+    (this is the state by default).
+
+    See also:
+    * <phoebe.multiprocessing_times_on>
+    """
+    conf.multiprocessing_times_off()
+
+def threading_get_nthreads():
+    """
+    Get the number of threads used within a single forward model by the
+    compiled routines of PHOEBE (for example, when computing the view-factors
+    for irradiation, the visibilities of triangles in eclipses, or when
+    interpolating the atmosphere tables).
+
+    See also:
+    * <phoebe.threading_set_nthreads>
+    """
+    return conf.threading_nthreads
+
+def threading_set_nthreads(nthreads):
+    """
+    Set the number of threads used within a single forward model by the
+    compiled routines of PHOEBE (for example, when computing the view-factors
+    for irradiation, the visibilities of triangles in eclipses, or when
+    interpolating the atmosphere tables).  The results do not depend on the
+    number of threads, except that with more than one thread the triangles
+    are clipped independently in eclipses, so the visibilities of partially
+    eclipsed triangles agree with the serial ones to the precision of the
+    polygon clipping (~1e-9).
+    This defaults to 1 (or the value of the environment variable
+    `PHOEBE_NTHREADS`) as parallelizing over forward models with MPI or
+    multiprocessing is usually more efficient.  Pass `nthreads<=0` to use all
+    available CPUs.
+
+    See also:
+    * <phoebe.threading_get_nthreads>
+    * <phoebe.threading_times_on>
+    * <phoebe.multiprocessing_set_nprocs>
+    """
+    conf.threading_set_nthreads(nthreads)
+
+def threading_times_on():
+    """
+    Enable splitting the times of a single forward model across a pool of
+    <phoebe.threading_get_nthreads> threads whenever
+    <phoebe.frontend.bundle.Bundle.run_compute> is called with the phoebe
+    backend.  This is disabled by default.
+
+    Unlike <phoebe.multiprocessing_times_on>, the bundle, the passband tables
+    and the dynamics are shared by the threads instead of being copied to
+    each process, only the meshes of the system are copied per-thread.  The
+    compiled routines release the GIL while computing the meshes, eclipses,
+    irradiation and intensities, but the remaining (python) work at each time
+    is still serialized, so the speedup depends on the size of the meshes.
+    Within each of these threads the compiled routines themselves run
+    serially.
+
+    MPI and <phoebe.multiprocessing_times_on> will always take preference.
+    Per-time threading is also skipped within solvers and when sampling with
+    `sample_from`, as those already parallelize over forward models.
+
+    See also:
+    * <phoebe.threading_times_off>
+    * <phoebe.threading_set_nthreads>
+    """
+    conf.threading_times_on()
+
+def threading_times_off():
+    """
+    Disable splitting the times of a single forward model across threads
+    (this is the state by default).
+
+    See also:
+    * <phoebe.threading_times_on>
+    """
+    conf.threading_times_off()
+
+def solver_compute_session_on():
+    """
+    Enable re-using the passband luminosities, third lights, meshes, dynamics
+    and infolists between the forward models computed by a solver whenever
+    they are unaffected by the sampled parameters (see
+    <phoebe.frontend.bundle.Bundle.compute_session>).  This is enabled by
+    default.
+
+    The meshes pick up round-off in the spin axis through the inclination,
+    so meshes re-used after a change in `incl` only agree with those of a
+    fresh call to <phoebe.frontend.bundle.Bundle.run_compute> to within mesh
+    discretization (~1e-4 in flux).  The lnprobability of a sample can
+    therefore depend (at that level) on which of the previous samples
+    computed the meshes.
+
+    See also:
+    * <phoebe.solver_compute_session_off>
+    """
+    conf.solver_compute_session_on()
+
+def solver_compute_session_off():
+    """
+    Disable re-using the passband luminosities, third lights, meshes, dynamics
+    and infolists between the forward models computed by a solver, so that
+    each lnprobability is computed from a fresh call to
+    <phoebe.frontend.bundle.Bundle.run_compute>.
+
+    See also:
+    * <phoebe.solver_compute_session_on>
+    """
+    conf.solver_compute_session_off()
+
+def view_factors_cache_get_maxsize():
+    """
+    Get the maximum size (in MB) of the cache of view-factor matrices for
+    irradiation.
+
+    See also:
+    * <phoebe.view_factors_cache_set_maxsize>
+    * <phoebe.view_factors_cache_clear>
+    """
+    return conf.view_factors_cache_maxsize
+
+def view_factors_cache_set_maxsize(maxsize):
+    """
+    Set the maximum size (in MB) of the cache of view-factor matrices for
+    irradiation.  The view-factors only depend on the relative geometry of
+    the meshes, so they are reused whenever the same configuration occurs
+    again (for example, at the same phase of an eccentric orbit or in repeated
+    calls to <phoebe.frontend.bundle.Bundle.run_compute> while only changing
+    parameters that do not affect the meshes).  The least recently used
+    matrices are discarded once the cache exceeds `maxsize`.  This defaults
+    to 128 (or the value of the environment variable
+    `PHOEBE_VIEW_FACTORS_CACHE_MAXSIZE`).  Pass `maxsize<=0` to disable (and
+    clear) the cache.
+
+    See also:
+    * <phoebe.view_factors_cache_get_maxsize>
+    * <phoebe.view_factors_cache_clear>
+    """
+    conf.view_factors_cache_set_maxsize(maxsize)
+    if maxsize <= 0:
+        view_factors_cache_clear()
+
+def view_factors_cache_clear():
+    """
+    Clear the cache of view-factor matrices for irradiation.
+
+    See also:
+    * <phoebe.view_factors_cache_set_maxsize>
+    """
+    _universe._view_factors_cache.clear()
+
 def progressbars_on():
     """
     Enable progressbars. Progressbars require `tqdm` to be installed
@@ -26,6 +26,8 @@ import glob
 import shutil
 import json
 import time
+import threading
+import hashlib
 
 # NOTE: python3 only
 from urllib.request import urlopen, urlretrieve
@@ -76,9 +78,289 @@ _pbdir_env = os.getenv('PHOEBE_PBDIR', None)
 
 _pbdir_env = os.getenv('PHOEBE_PBDIR', None)
 
+# uncompressed (native byte-order) copies of the passband tables, which are
+# memory-mapped when loading (see _load_table) so that the pages are shared
+# between processes.  The directory can be moved by setting PHOEBE_PBCACHEDIR
+# or the cache disabled (reading the tables into memory instead) by setting
+# PHOEBE_PBCACHEDIR to an empty string or 'none'.
+if hasattr(sys, 'real_prefix'):
+    _pbcachedir_default = os.path.join(sys.prefix, '.phoebe/atmospheres/tables/cache/')
+else:
+    _pbcachedir_default = os.path.abspath(os.path.expanduser('~/.phoebe/atmospheres/tables/cache'))+'/'
+
+_pbcachedir = os.getenv('PHOEBE_PBCACHEDIR', _pbcachedir_default)
+if _pbcachedir.strip().lower() in ['', 'none']:
+    _pbcachedir = None
+
+# tables stored in the passband files per content, as attribute name:
+# extension name (for grids) or tuple of (extension name, column) pairs (for
+# axes).  These are only read when first accessed, see Passband.__getattr__.
+_content_tables = {
+    'blackbody:ext': {'_bb_extinct_axes': (('bb_teffs', 'teff'), ('bb_ebvs', 'ebv'), ('bb_rvs', 'rv')),
+                      '_bb_extinct_energy_grid': 'bbegrid',
+                      '_bb_extinct_photon_grid': 'bbpgrid'},
+    'ck2004:Inorm': {'_ck2004_axes': (('ck_teffs', 'teff'), ('ck_loggs', 'logg'), ('ck_abuns', 'abun')),
+                     '_ck2004_energy_grid': 'cknegrid',
+                     '_ck2004_photon_grid': 'cknpgrid'},
+    'ck2004:Imu': {'_ck2004_intensity_axes': (('ck_teffs', 'teff'), ('ck_loggs', 'logg'), ('ck_abuns', 'abun'), ('ck_mus', 'mu')),
+                   '_ck2004_Imu_energy_grid': 'ckfegrid',
+                   '_ck2004_Imu_photon_grid': 'ckfpgrid'},
+    'ck2004:ld': {'_ck2004_ld_energy_grid': 'cklegrid',
+                  '_ck2004_ld_photon_grid': 'cklpgrid'},
+    'ck2004:ldint': {'_ck2004_ldint_energy_grid': 'ckiegrid',
+                     '_ck2004_ldint_photon_grid': 'ckipgrid'},
+    'ck2004:ext': {'_ck2004_extinct_axes': (('ck_teffs', 'teff'), ('ck_loggs', 'logg'), ('ck_abuns', 'abun'), ('ck_ebvs', 'ebv'), ('ck_rvs', 'rv')),
+                   '_ck2004_extinct_energy_grid': 'ckxegrid',
+                   '_ck2004_extinct_photon_grid': 'ckxpgrid'},
+    'phoenix:Inorm': {'_phoenix_axes': (('ph_teffs', 'teff'), ('ph_loggs', 'logg'), ('ph_abuns', 'abun')),
+                      '_phoenix_energy_grid': 'phnegrid',
+                      '_phoenix_photon_grid': 'phnpgrid'},
+    'phoenix:Imu': {'_phoenix_intensity_axes': (('ph_teffs', 'teff'), ('ph_loggs', 'logg'), ('ph_abuns', 'abun'), ('ph_mus', 'mu')),
+                    '_phoenix_Imu_energy_grid': 'phfegrid',
+                    '_phoenix_Imu_photon_grid': 'phfpgrid'},
+    'phoenix:ld': {'_phoenix_ld_energy_grid': 'phlegrid',
+                   '_phoenix_ld_photon_grid': 'phlpgrid'},
+    'phoenix:ldint': {'_phoenix_ldint_energy_grid': 'phiegrid',
+                      '_phoenix_ldint_photon_grid': 'phipgrid'},
+    'phoenix:ext': {'_phoenix_extinct_axes': (('ph_teffs', 'teff'), ('ph_loggs', 'logg'), ('ph_abuns', 'abun'), ('ph_ebvs', 'ebv'), ('ph_rvs', 'rv')),
+                    '_phoenix_extinct_energy_grid': 'phxegrid',
+                    '_phoenix_extinct_photon_grid': 'phxpgrid'},
+}
+
+def _table_cachedir(archive):
+    """
+    Directory in which the tables of the passband file `archive` are cached,
+    and the glob pattern of all directories cached for (previous versions of)
+    the same file.  Passband files with the same name in different
+    directories are cached separately.
+    """
+    archive = os.path.abspath(archive)
+    stat = os.stat(archive)
+    path_key = hashlib.sha1(archive.encode('utf-8')).hexdigest()[:16]
+    prefix = '{}.{}'.format(os.path.basename(archive), path_key)
+    return os.path.join(_pbcachedir, '{}.{}.{}'.format(prefix, stat.st_size, stat.st_mtime_ns)), os.path.join(_pbcachedir, '{}.*'.format(prefix))
+
+def _load_table(archive, extname, column=None):
+    """
+    Load a single table (or column of a table) from a passband file.  If
+    `extname` is a tuple of extension names, the tables (which must share the
+    same shape) are stacked along their last axis into a single table.
+
+    The first time a table is needed, it is copied (in native byte-order) to
+    an uncompressed file in the cache directory (see PHOEBE_PBCACHEDIR).  The
+    cached file is then memory-mapped (read-only), so that multiple processes
+    share the same pages.  If the cache is disabled or cannot be written, the
+    table is read into memory instead.
+    """
+    if _pbcachedir is None:
+        return _read_table(archive, extname, column)
+
+    cachedir, cachedir_pattern = _table_cachedir(archive)
+    cachefile = os.path.join(cachedir, '{}.npy'.format(_table_name(extname, column, sep='.')))
+
+    if os.path.exists(cachefile):
+        try:
+            return np.load(cachefile, mmap_mode='r')
+        except (OSError, ValueError) as err:
+            logger.warning("failed to load cached passband table from {}, reading from {} instead: {}".format(cachefile, archive, err))
+
+    table = _read_table(archive, extname, column)
+
+    try:
+        if not os.path.exists(cachedir):
+            # remove any tables cached for previous versions of this file
+            # (another process may have created cachedir in the meantime)
+            for olddir in glob.glob(cachedir_pattern):
+                if olddir == cachedir:
+                    continue
+                shutil.rmtree(olddir, ignore_errors=True)
+            logger.info("caching uncompressed tables of {} in {} (see PHOEBE_PBCACHEDIR)".format(archive, cachedir))
+            os.makedirs(cachedir, exist_ok=True)
+
+        # write to a temporary file first so that other processes never
+        # see a partially written table
+        tmpfile = '{}.{}.tmp'.format(cachefile, os.getpid())
+        with open(tmpfile, 'wb') as f:
+            np.save(f, table)
+        os.replace(tmpfile, cachefile)
+        return np.load(cachefile, mmap_mode='r')
+    except (OSError, ValueError) as err:
+        logger.warning("could not cache passband table in {}: {}".format(cachedir, err))
+        return table
+
+def _table_name(extname, column=None, sep='.'):
+    if isinstance(extname, tuple):
+        extname = '+'.join(extname)
+    return extname if column is None else '{}{}{}'.format(extname, sep, column)
+
+def _read_table(archive, extname, column=None):
+    logger.debug("reading {} from {}".format(_table_name(extname, column, sep=':'), archive))
+    with fits.open(archive) as hdul:
+        if isinstance(extname, tuple):
+            data = np.concatenate([hdul[e].data for e in extname], axis=-1)
+        else:
+            data = hdul[extname].data if column is None else hdul[extname].data[column]
+        # FITS is big-endian, but libphoebe would convert the entire table
+        # to native byte-order at every call
+        return np.ascontiguousarray(data, dtype=data.dtype.newbyteorder('='))
+
 def _dict_without_keys(d, skip_keys=[]):
     return {k:v for k,v in d.items() if k not in skip_keys}
 
+def _mask_elements(value, mask, ndim=1):
+    # per-element arrays (of at least ndim dimensions, with the elements along
+    # the last axis) are masked, anything else (scalars, a list of manual ld
+    # coefficients, etc) applies to all elements and is passed on as-is
+    if np.ndim(value) >= ndim:
+        return np.asarray(value)[..., mask]
+    return value
+
+def _nmasked(mask):
+    mask = np.asarray(mask)
+    return np.count_nonzero(mask) if mask.dtype == bool else mask.size
+
+class AtmosphereInterpolator(object):
+    """
+    Reusable interpolator of the model atmosphere tables of a passband for a
+    given atmosphere and weighting.  Use
+    <phoebe.atmospheres.passbands.Passband.get_interpolator> to retrieve the
+    (cached) instance rather than creating one directly.
+
+    Normal intensities and ldint are tabulated on the same axes and are
+    interpolated together, so the bracketing along the axes is only done
+    once for both.  The request and result buffers passed to libphoebe are
+    reused between calls (per thread).
+    """
+    def __init__(self, pb, atm='ck2004', photon_weighted=False):
+        """
+        Arguments
+        ----------
+        * `pb` (<phoebe.atmospheres.passbands.Passband>): the passband.
+        * `atm` (string, optional, default='ck2004'): model atmosphere, one
+            of 'ck2004' or 'phoenix'.
+        * `photon_weighted` (bool, optional, default=False): photon/energy switch
+
+        Raises
+        ----------
+        * NotImplementedError: if `atm` is not a supported model atmosphere.
+        """
+        if atm not in ['ck2004', 'phoenix']:
+            raise NotImplementedError("atm={} not supported by AtmosphereInterpolator".format(atm))
+
+        self.atm = atm
+        self.photon_weighted = photon_weighted
+        self._local = threading.local()
+
+        weighting = 'photon' if photon_weighted else 'energy'
+        normal_grids = {}
+        if '{}:Inorm'.format(atm) in pb.content:
+            normal_grids['Inorm'] = '_{}_{}_grid'.format(atm, weighting)
+        if '{}:ldint'.format(atm) in pb.content:
+            normal_grids['ldint'] = '_{}_ldint_{}_grid'.format(atm, weighting)
+
+        # list of (names, axes, grid) to interpolate for mu-independent
+        # quantities.  For passbands loaded from a file, the Inorm and ldint
+        # grids are stacked into a single one whenever they share the same
+        # shape.  The stacked grid is cached (and memory-mapped) by
+        # _load_table just like the individual grids, so that it is still
+        # shared between processes.
+        lazy_tables = pb.__dict__.get('_lazy_tables', {})
+        stack = len(normal_grids) == 2 and all(isinstance(lazy_tables.get(attr, None), str) for attr in normal_grids.values())
+        normal_grids = {name: getattr(pb, attr) for name, attr in normal_grids.items()}
+        self._normal_sweeps = []
+        if stack and normal_grids['Inorm'].shape == normal_grids['ldint'].shape:
+            self._normal_sweeps.append((('Inorm', 'ldint'),
+                                        getattr(pb, '_{}_axes'.format(atm)),
+                                        _load_table(pb._archive, (lazy_tables['_{}_{}_grid'.format(atm, weighting)],
+                                                                  lazy_tables['_{}_ldint_{}_grid'.format(atm, weighting)]))))
+        else:
+            for name, grid in normal_grids.items():
+                self._normal_sweeps.append(((name,),
+                                            getattr(pb, '_{}_axes'.format(atm)),
+                                            grid))
+
+        if '{}:Imu'.format(atm) in pb.content:
+            self._intensity_axes = getattr(pb, '_{}_intensity_axes'.format(atm))
+            self._Imu_grid = getattr(pb, '_{}_Imu_{}_grid'.format(atm, weighting))
+        else:
+            self._Imu_grid = None
+
+    def _buffer(self, key, nrows, ncols):
+        # buffers only ever grow, callers use the first nrows rows (which are
+        # still C-contiguous as required by libphoebe.interp)
+        buffers = self._local.__dict__.setdefault('buffers', {})
+        buf = buffers.get(key, None)
+        if buf is None or buf.shape[0] < nrows or buf.shape[1] != ncols:
+            buf = np.empty((nrows, ncols))
+            buffers[key] = buf
+        return buf[:nrows]
+
+    def evaluate(self, teff, logg, abun, mu=None, normal=True, out=None):
+        """
+        Interpolate the normal intensities, ldint, and (if `mu` is provided)
+        projected intensities for an array of elements.
+
+        Elements outside the bounds of the tables are returned as nan (it is
+        up to the caller to check and raise an appropriate error).
+
+        Arguments
+        ----------
+        * `teff` (array): effective temperatures.
+        * `logg` (array or float): surface gravities in cgs.
+        * `abun` (array or float): log-abundances in solar log-abundances.
+        * `mu` (array, optional, default=None): cosines of the angle between
+            the normal and the line of sight.  If None, the projected
+            intensities are not computed.
+        * `normal` (bool, optional, default=True): whether to compute the
+            normal intensities and ldint.
+        * `out` (tuple, optional, default=None): tuple of three arrays (any of
+            which may be None) in which to store Inorm, ldint and Imu,
+            respectively.
+
+        Returns
+        ----------
+        * (tuple) Inorm, ldint, Imu arrays.  Each is None if not requested or
+            not available in the passband.
+        """
+        out = list(out) if out is not None else [None, None, None]
+        retval = [None, None, None]
+        indices = {'Inorm': 0, 'ldint': 1, 'Imu': 2}
+        N = len(teff)
+
+        if normal and len(self._normal_sweeps):
+            req = self._buffer('req3', N, 3)
+            req[:,0] = teff
+            req[:,1] = logg
+            req[:,2] = abun
+
+            for names, axes, grid in self._normal_sweeps:
+                res = libphoebe.interp(req, axes, grid, out=self._buffer(names, N, len(names)), nthreads=conf.threading_nthreads)
+                for i, name in enumerate(names):
+                    ind = indices[name]
+                    if out[ind] is None:
+                        out[ind] = np.empty(N)
+                    if name == 'Inorm':
+                        # the tables store log10 of the intensities
+                        np.power(10, res[:,i], out=out[ind])
+                    else:
+                        out[ind][:] = res[:,i]
+                    retval[ind] = out[ind]
+
+        if mu is not None and self._Imu_grid is not None:
+            req = self._buffer('req4', N, 4)
+            req[:,0] = teff
+            req[:,1] = logg
+            req[:,2] = abun
+            req[:,3] = mu
+
+            res = libphoebe.interp(req, self._intensity_axes, self._Imu_grid, out=self._buffer('Imu', N, 1), nthreads=conf.threading_nthreads)
+            if out[2] is None:
+                out[2] = np.empty(N)
+            np.power(10, res[:,0], out=out[2])
+            retval[2] = out[2]
+
+        return tuple(retval)
+
 class Passband:
     def __init__(self, ptf=None, pbset='Johnson', pbname='V', effwl=5500.0,
                  wlunits=u.AA, calibrated=False, reference='', version=1.0,
@@ -180,6 +462,9 @@ class Passband:
         self.c = c.value
         self.k = k_B.value
 
+        # see get_interpolator
+        self._interpolators = {}
+
         if from_file:
             return
 
@@ -473,59 +758,63 @@ class Passband:
                     self._log10_Inorm_bb_energy = lambda Teff: interpolate.splev(Teff, self._bb_func_energy)
                     self._log10_Inorm_bb_photon = lambda Teff: interpolate.splev(Teff, self._bb_func_photon)
 
-                if 'blackbody:ext' in self.content:
-                    self._bb_extinct_axes = (np.array(list(hdul['bb_teffs'].data['teff'])), np.array(list(hdul['bb_ebvs'].data['ebv'])), np.array(list(hdul['bb_rvs'].data['rv'])))
-                    self._bb_extinct_energy_grid = hdul['bbegrid'].data
-                    self._bb_extinct_photon_grid = hdul['bbpgrid'].data
-
-                if 'ck2004:Inorm' in self.content:
-                    self._ck2004_axes = (np.array(list(hdul['ck_teffs'].data['teff'])), np.array(list(hdul['ck_loggs'].data['logg'])), np.array(list(hdul['ck_abuns'].data['abun'])))
-                    self._ck2004_energy_grid = hdul['cknegrid'].data
-                    self._ck2004_photon_grid = hdul['cknpgrid'].data
-
-                if 'ck2004:Imu' in self.content:
-                    self._ck2004_intensity_axes = (np.array(list(hdul['ck_teffs'].data['teff'])), np.array(list(hdul['ck_loggs'].data['logg'])), np.array(list(hdul['ck_abuns'].data['abun'])), np.array(list(hdul['ck_mus'].data['mu'])))
-                    self._ck2004_Imu_energy_grid = hdul['ckfegrid'].data
-                    self._ck2004_Imu_photon_grid = hdul['ckfpgrid'].data
-
-                if 'ck2004:ld' in self.content:
-                    self._ck2004_ld_energy_grid = hdul['cklegrid'].data
-                    self._ck2004_ld_photon_grid = hdul['cklpgrid'].data
-
-                if 'ck2004:ldint' in self.content:
-                    self._ck2004_ldint_energy_grid = hdul['ckiegrid'].data
-                    self._ck2004_ldint_photon_grid = hdul['ckipgrid'].data
-
-                if 'ck2004:ext' in self.content:
-                    self._ck2004_extinct_axes = (np.array(list(hdul['ck_teffs'].data['teff'])), np.array(list(hdul['ck_loggs'].data['logg'])), np.array(list(hdul['ck_abuns'].data['abun'])), np.array(list(hdul['ck_ebvs'].data['ebv'])), np.array(list(hdul['ck_rvs'].data['rv'])))
-                    self._ck2004_extinct_energy_grid = hdul['ckxegrid'].data
-                    self._ck2004_extinct_photon_grid = hdul['ckxpgrid'].data
-
-                if 'phoenix:Inorm' in self.content:
-                    self._phoenix_axes = (np.array(list(hdul['ph_teffs'].data['teff'])), np.array(list(hdul['ph_loggs'].data['logg'])), np.array(list(hdul['ph_abuns'].data['abun'])))
-                    self._phoenix_energy_grid = hdul['phnegrid'].data
-                    self._phoenix_photon_grid = hdul['phnpgrid'].data
-
-                if 'phoenix:Imu' in self.content:
-                    self._phoenix_intensity_axes = (np.array(list(hdul['ph_teffs'].data['teff'])), np.array(list(hdul['ph_loggs'].data['logg'])), np.array(list(hdul['ph_abuns'].data['abun'])), np.array(list(hdul['ph_mus'].data['mu'])))
-                    self._phoenix_Imu_energy_grid = hdul['phfegrid'].data
-                    self._phoenix_Imu_photon_grid = hdul['phfpgrid'].data
-
-                if 'phoenix:ld' in self.content:
-                    self._phoenix_ld_energy_grid = hdul['phlegrid'].data
-                    self._phoenix_ld_photon_grid = hdul['phlpgrid'].data
-
-                if 'phoenix:ldint' in self.content:
-                    self._phoenix_ldint_energy_grid = hdul['phiegrid'].data
-                    self._phoenix_ldint_photon_grid = hdul['phipgrid'].data
-
-                if 'phoenix:ext' in self.content:
-                    self._phoenix_extinct_axes = (np.array(list(hdul['ph_teffs'].data['teff'])),np.array(list(hdul['ph_loggs'].data['logg'])), np.array(list(hdul['ph_abuns'].data['abun'])), np.array(list(hdul['ph_ebvs'].data['ebv'])), np.array(list(hdul['ph_rvs'].data['rv'])))
-                    self._phoenix_extinct_energy_grid = hdul['phxegrid'].data
-                    self._phoenix_extinct_photon_grid = hdul['phxpgrid'].data
+                # all other tables are only read once they're first accessed
+                # (see __getattr__)
+                self._archive = archive
+                self._lazy_tables = {}
+                for content, tables in _content_tables.items():
+                    if content in self.content:
+                        self._lazy_tables.update(tables)
 
         return self
 
+    def __getattr__(self, name):
+        # only called if the attribute does not (yet) exist, so this is where
+        # tables registered by load are read on first access.
+        lazy_tables = self.__dict__.get('_lazy_tables', {})
+        if name not in lazy_tables:
+            raise AttributeError("'{}' object has no attribute '{}'".format(self.__class__.__name__, name))
+
+        table = lazy_tables[name]
+        if isinstance(table, str):
+            value = _load_table(self._archive, table)
+        else:
+            value = tuple(_load_table(self._archive, extname, column) for extname, column in table)
+
+        setattr(self, name, value)
+        return value
+
+    def get_interpolator(self, atm='ck2004', photon_weighted=False):
+        """
+        Retrieve the (cached) interpolator of the model atmosphere tables for
+        a given atmosphere and weighting.
+
+        Arguments
+        ----------
+        * `atm` (string, optional, default='ck2004'): model atmosphere, one
+            of 'ck2004' or 'phoenix'.
+        * `photon_weighted` (bool, optional, default=False): photon/energy switch
+
+        Returns
+        ----------
+        * <phoebe.atmospheres.passbands.AtmosphereInterpolator>
+        """
+        # the interpolator holds on to (copies of) the tables, so if any are
+        # recomputed (see compute_*) we need a new one
+        weighting = 'photon' if photon_weighted else 'energy'
+        attrs = ['_{}_{}_grid'.format(atm, weighting),
+                 '_{}_ldint_{}_grid'.format(atm, weighting),
+                 '_{}_Imu_{}_grid'.format(atm, weighting)]
+
+        interpolator, grids = self._interpolators.get((atm, photon_weighted), (None, None))
+        if interpolator is None or not np.all([grid is self.__dict__.get(attr, None) for grid, attr in zip(grids, attrs)]):
+            interpolator = AtmosphereInterpolator(self, atm, photon_weighted)
+            # the tables have now been loaded (see __getattr__)
+            grids = [self.__dict__.get(attr, None) for attr in attrs]
+            self._interpolators[(atm, photon_weighted)] = (interpolator, grids)
+
+        return interpolator
+
     def _planck(self, lam, Teff):
         """
         Computes monochromatic blackbody intensity in W/m^3 using the
@@ -2051,16 +2340,10 @@ class Passband:
         return log10_Inorm
 
     def _Inorm_ck2004(self, Teff, logg, abun, photon_weighted=False):
-        req = np.vstack((Teff, logg, abun)).T
-        Inorm = libphoebe.interp(req, self._ck2004_axes, self._ck2004_photon_grid if photon_weighted else self._ck2004_energy_grid).T[0]
-
-        return 10**Inorm
+        return self.get_interpolator('ck2004', photon_weighted).evaluate(Teff, logg, abun)[0]
 
     def _Inorm_phoenix(self, Teff, logg, abun, photon_weighted=False):
-        req = np.vstack((Teff, logg, abun)).T
-        Inorm = libphoebe.interp(req, self._phoenix_axes, self._phoenix_photon_grid if photon_weighted else self._phoenix_energy_grid).T[0]
-
-        return 10**Inorm
+        return self.get_interpolator('phoenix', photon_weighted).evaluate(Teff, logg, abun)[0]
 
     def _log10_Imu_ck2004(self, Teff, logg, abun, mu, photon_weighted=False):
         if not hasattr(Teff, '__iter__'):
@@ -2076,21 +2359,17 @@ class Passband:
         if not hasattr(Teff, '__iter__'):
             req = np.array(((Teff, logg, abun, mu),))
             Imu = libphoebe.interp(req, self._ck2004_intensity_axes, self._ck2004_Imu_photon_grid if photon_weighted else self._ck2004_Imu_energy_grid)[0][0]
-        else:
-            req = np.vstack((Teff, logg, abun, mu)).T
-            Imu = libphoebe.interp(req, self._ck2004_intensity_axes, self._ck2004_Imu_photon_grid if photon_weighted else self._ck2004_Imu_energy_grid).T[0]
+            return 10**Imu
 
-        return 10**Imu
+        return self.get_interpolator('ck2004', photon_weighted).evaluate(Teff, logg, abun, mu, normal=False)[2]
 
     def _Imu_phoenix(self, Teff, logg, abun, mu, photon_weighted=False):
         if not hasattr(Teff, '__iter__'):
             req = np.array(((Teff, logg, abun, mu),))
             Imu = libphoebe.interp(req, self._phoenix_intensity_axes, self._phoenix_Imu_photon_grid if photon_weighted else self._phoenix_Imu_energy_grid)[0][0]
-        else:
-            req = np.vstack((Teff, logg, abun, mu)).T
-            Imu = libphoebe.interp(req, self._phoenix_intensity_axes, self._phoenix_Imu_photon_grid if photon_weighted else self._phoenix_Imu_energy_grid).T[0]
+            return 10**Imu
 
-        return 10**Imu
+        return self.get_interpolator('phoenix', photon_weighted).evaluate(Teff, logg, abun, mu, normal=False)[2]
 
     def Inorm(self, Teff=5772., logg=4.43, abun=0.0, atm='ck2004', ldatm='ck2004', ldint=None, ld_func='interp', ld_coeffs=None, photon_weighted=False):
         r"""
@@ -2172,7 +2451,7 @@ class Passband:
             raise ValueError('Atmosphere parameters out of bounds: atm=%s, ldatm=%s, Teff=%s, logg=%s, abun=%s' % (atm, ldatm, Teff[nanmask], logg[nanmask], abun[nanmask]))
         return retval
 
-    def Imu(self, Teff=5772., logg=4.43, abun=0.0, mu=1.0, atm='ck2004', ldatm='ck2004', ldint=None, ld_func='interp', ld_coeffs=None, photon_weighted=False):
+    def Imu(self, Teff=5772., logg=4.43, abun=0.0, mu=1.0, atm='ck2004', ldatm='ck2004', ldint=None, ld_func='interp', ld_coeffs=None, photon_weighted=False, mask=None):
         r"""
         Arguments
         ----------
@@ -2196,6 +2475,11 @@ class Passband:
         * `ld_coeffs` (list, optional, default=None): limb darkening coefficients
             for the corresponding limb darkening function, `ld_func`.
         * `photon_weighted` (bool, optional, default=False): photon/energy switch
+        * `mask` (array, optional, default=None): boolean mask or array of
+            indices of the elements (of the arrays passed as `Teff`, `logg`,
+            `abun`, `mu` and, if per-element, `ldint` and `ld_coeffs`) for
+            which to compute intensities.  All other elements are left at
+            zero and are not checked against the bounds of the tables.
 
         Returns
         ----------
@@ -2210,6 +2494,20 @@ class Passband:
         """
         # TODO: improve docstring
 
+        if mask is not None:
+            retval = np.zeros(len(Teff))
+            if _nmasked(mask):
+                retval[mask] = self.Imu(Teff=_mask_elements(Teff, mask),
+                                        logg=_mask_elements(logg, mask),
+                                        abun=_mask_elements(abun, mask),
+                                        mu=_mask_elements(mu, mask),
+                                        atm=atm, ldatm=ldatm,
+                                        ldint=_mask_elements(ldint, mask),
+                                        ld_func=ld_func,
+                                        ld_coeffs=_mask_elements(ld_coeffs, mask, ndim=2),
+                                        photon_weighted=photon_weighted)
+            return retval
+
         # make sure we're not suffering from rounding issues in mu:
         mu[np.isclose(mu, 1)] = 1-1e-12
         mu[np.isclose(mu, 0)] = 1e-12
@@ -2259,8 +2557,7 @@ class Passband:
             req = np.array(((Teff, logg, abun),))
             ldint = libphoebe.interp(req, self._ck2004_axes, self._ck2004_ldint_photon_grid if photon_weighted else self._ck2004_ldint_energy_grid)[0][0]
         else:
-            req = np.vstack((Teff, logg, abun)).T
-            ldint = libphoebe.interp(req, self._ck2004_axes, self._ck2004_ldint_photon_grid if photon_weighted else self._ck2004_ldint_energy_grid).T[0]
+            ldint = self.get_interpolator('ck2004', photon_weighted).evaluate(Teff, logg, abun)[1]
 
         return ldint
 
@@ -2269,8 +2566,7 @@ class Passband:
             req = np.array(((Teff, logg, abun),))
             ldint = libphoebe.interp(req, self._phoenix_axes, self._phoenix_ldint_photon_grid if photon_weighted else self._phoenix_ldint_energy_grid)[0][0]
         else:
-            req = np.vstack((Teff, logg, abun)).T
-            ldint = libphoebe.interp(req, self._phoenix_axes, self._phoenix_ldint_photon_grid if photon_weighted else self._phoenix_ldint_energy_grid).T[0]
+            ldint = self.get_interpolator('phoenix', photon_weighted).evaluate(Teff, logg, abun)[1]
 
         return ldint
 
@@ -2345,7 +2641,7 @@ class Passband:
 
         return bindex
 
-    def bindex(self, Teff=5772., logg=4.43, abun=0.0, mu=1.0, atm='ck2004', photon_weighted=False):
+    def bindex(self, Teff=5772., logg=4.43, abun=0.0, mu=1.0, atm='ck2004', photon_weighted=False, mask=None):
         """
         Arguments
         ----------
@@ -2355,6 +2651,10 @@ class Passband:
         * `mu`
         * `atm`
         * `photon_weighted` (bool, optional, default=False): photon/energy switch
+        * `mask` (array, optional, default=None): boolean mask or array of
+            indices of the elements for which to compute the boosting index.
+            All other elements are left at zero.  See also
+            <phoebe.atmospheres.passbands.Passband.Imu>.
 
         Returns
         ----------
@@ -2368,6 +2668,17 @@ class Passband:
         """
         # TODO: implement phoenix boosting.
 
+        if mask is not None:
+            retval = np.zeros(len(Teff))
+            if _nmasked(mask):
+                retval[mask] = self.bindex(Teff=_mask_elements(Teff, mask),
+                                           logg=_mask_elements(logg, mask),
+                                           abun=_mask_elements(abun, mask),
+                                           mu=_mask_elements(mu, mask),
+                                           atm=atm,
+                                           photon_weighted=photon_weighted)
+            return retval
+
         if atm == 'ck2004':
             retval = self._bindex_ck2004(Teff, logg, abun, mu, atm, photon_weighted)
         elif atm == 'blackbody':
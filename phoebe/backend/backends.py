@@ -9,15 +9,20 @@ except:
 import tempfile
 from copy import deepcopy
 import itertools
+import multiprocessing as _multiprocessing
+import threading as _threading
+import queue as _queue
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
 
 from phoebe.parameters import dataset as _dataset
-from phoebe.parameters import StringParameter, DictParameter, ArrayParameter, ParameterSet
-from phoebe.parameters.parameters import _extract_index_from_string
+from phoebe.parameters import StringParameter, DictParameter, ArrayParameter, FloatArrayParameter, ParameterSet
+from phoebe.parameters import archive as _archive
 from phoebe import dynamics
 from phoebe.backend import universe, etvs, horizon_analytic
 from phoebe.atmospheres import passbands
 from phoebe.distortions  import roche
 from phoebe.frontend import io
+from phoebe.frontend import session as _session
 import phoebe.frontend.bundle
 from phoebe.dependencies.nparray.nparray import Array as _nparrayArray
 from phoebe import u, c
@@ -175,6 +180,11 @@ def _extract_from_bundle(b, compute, dataset=None, times=None,
     Setting of other meta-data should be handled by the bundle once
     the backend returns the filled synthetics.
 
+    If `compute_session` is passed (see
+    <phoebe.frontend.session.ComputeSession>), the times and infolists are
+    re-used from its previous evaluation when unaffected, only the
+    synthetics are created each time.
+
     :parameter b: the :class:`phoebe.frontend.bundle.Bundle`
     :return: times (list of floats or dictionary of lists of floats),
         infos (list of lists of dictionaries),
@@ -183,6 +193,26 @@ def _extract_from_bundle(b, compute, dataset=None, times=None,
         a unique match to a dataset (shouldn't ever happen unless
         the user overrides a label)
     """
+    def _extract():
+        return _extract_infos_from_bundle(b, compute, dataset=dataset, times=times,
+                                          by_time=by_time, include_mesh=include_mesh,
+                                          **kwargs)
+
+    compute_session = kwargs.get('compute_session', None)
+    if compute_session is None:
+        infos = _extract()
+    else:
+        key = (dataset, times, by_time, include_mesh, kwargs.get('fti_method', None))
+        infos = compute_session._get_cached(compute, 'infos', key, _extract)
+
+    return infos[:-1] + (_create_syns(b, infos[-1]),)
+
+def _extract_infos_from_bundle(b, compute, dataset=None, times=None,
+                               by_time=True, include_mesh=True, **kwargs):
+    """
+    See _extract_from_bundle, but returns the information needed to create
+    the synthetics (needed_syns) instead of the synthetics themselves.
+    """
     provided_times = times
     times = []
     infolists = []
@@ -327,10 +357,10 @@ def _extract_from_bundle(b, compute, dataset=None, times=None,
 
     if by_time:
         # print "*** _extract_from_bundle return(times, infolists, syns)", times, infolists, needed_syns
-        return np.asarray(times), infolists, _create_syns(b, needed_syns)
+        return np.asarray(times), infolists, needed_syns
     else:
         # print "*** _extract_from_bundle return(infolists, syns)", infolists, needed_syns
-        return infolists, _create_syns(b, needed_syns)
+        return infolists, needed_syns
 
 def _create_syns(b, needed_syns):
     """
@@ -398,6 +428,91 @@ def _make_packet(qualifier, value, time, info, **kwargs):
 
     return packet
 
+def _packet_time_tag(time):
+    # same formatting as Parameter.time so that packets can be matched to
+    # the time-tagged synthetic parameters without filtering
+    return '{:09f}'.format(float(time)) if time is not None else None
+
+def _stream_packetlist(stream, packetlist):
+    """
+    write the array values of the packets in packetlist to stream (an
+    <phoebe.parameters.archive.ArchiveWriter>, see `stream_fname` in
+    <phoebe.frontend.bundle.Bundle.run_compute>) and replace them in-place by
+    their placeholders, so that they do not need to be kept in memory until
+    <BaseBackend._fill_syns>.  The columns collected by <_SynColumns> are
+    left as is.
+    """
+    if stream is None:
+        return packetlist
+
+    for packet in packetlist:
+        if 'times' in packet.keys():
+            continue
+        value = packet['value']
+        unit = None
+        if isinstance(value, u.Quantity):
+            unit, value = value.unit, value.value
+        placeholder = stream.extract_array(value)
+        if placeholder is not None:
+            packet['value'] = placeholder
+            packet['stream_unit'] = unit
+
+    return packetlist
+
+class _SynColumns(object):
+    """
+    Preallocated columns (one entry per time) for the synthetics that are a
+    single value at a single time (fluxes, rvs, orbits, etc).  A worker stores
+    these here instead of returning a packet per-value, and then returns a
+    single packet per column (with a `times` array instead of `time`) to be
+    filled in bulk by <BaseBackend._fill_syns>.
+    """
+    def __init__(self, times):
+        self.times = np.asarray(times)
+        self._columns = {}
+
+    def add(self, i, packet):
+        """
+        store the value of packet at index i of its column.  Returns False
+        (and does not store anything) if the packet is not a single value at
+        a single time, in which case it should be sent as is.
+        """
+        value = packet['value']
+        if packet.get('time', None) is None or np.ndim(value) != 0:
+            return False
+
+        key = (packet['qualifier'], packet['dataset'], packet['component'], packet['kind'])
+        column = self._columns.get(key, None)
+        if column is None:
+            column = {'unit': getattr(value, 'unit', None),
+                      'values': np.full(len(self.times), np.nan),
+                      'filled': np.zeros(len(self.times), dtype=bool)}
+            self._columns[key] = column
+
+        if column['unit'] is not None:
+            value = value.to_value(column['unit'])
+
+        column['values'][i] = value
+        column['filled'][i] = True
+        return True
+
+    def to_packetlist(self):
+        packetlist = []
+        for (qualifier, dataset, component, kind), column in self._columns.items():
+            filled = column['filled']
+            value = column['values'][filled]
+            if column['unit'] is not None:
+                value = value * column['unit']
+
+            packetlist.append({'dataset': dataset,
+                               'component': component,
+                               'kind': kind,
+                               'qualifier': qualifier,
+                               'value': value,
+                               'times': self.times[filled]})
+
+        return packetlist
+
 class BaseBackend(object):
     def __init__(self):
         return
@@ -441,9 +556,9 @@ class BaseBackend(object):
         """
         packet, new_syns = self._get_packet_and_syns(b, compute, dataset, times, **kwargs)
         for k,v in kwargs.items():
-            if k=='system':
-                # force the workers to rebuild the system instead of attempting to
-                # send via MPI
+            if k in ['system', 'compute_session'] and mpi.enabled:
+                # force the workers to rebuild the system (without the
+                # session) instead of attempting to send via MPI
                 continue
             packet[k] = v
 
@@ -465,23 +580,97 @@ class BaseBackend(object):
         # np.array_split(any_input_array, nprocs)[myrank]
         raise NotImplementedError("_run_chunk is not implemented by the {} backend".format(self.__class__.__name__))
 
-    def _fill_syns(self, new_syns, rpacketlists_per_worker):
+    def _fill_syns(self, new_syns, rpacketlists_per_worker, stream=None):
         """
         rpacket_per_worker is a list of packetlists as returned by _run_chunk
+
+        stream is the <phoebe.parameters.archive.Archive> of any packets that
+        were streamed to disk (see _stream_packetlist).  Their values are set
+        to views of the memory-mapped arrays.
         """
         # TODO: move to BaseBackendByDataset or BaseBackend?
         logger.debug("rank:{}/{} {}._fill_syns".format(mpi.myrank, mpi.nprocs, self.__class__.__name__))
 
+        # index the synthetic parameters once so that we don't need to filter
+        # new_syns for every packet.  Anything that can't be matched exactly
+        # falls back on new_syns.set_value.
+        syn_params = {(param.qualifier, param.dataset, param.component, param.kind, param.time): param for param in new_syns.to_list()}
+
+        def _set_packet(packet):
+            param = syn_params.get((packet['qualifier'], packet['dataset'], packet['component'], packet['kind'], _packet_time_tag(packet.get('time', None))), None)
+            if 'stream_unit' in packet.keys():
+                packet = packet.copy()
+                unit = packet.pop('stream_unit')
+                index = _archive.placeholder_index(packet['value'])
+                if index is not None:
+                    value = stream.get_array(index)
+                    if unit is None and param is not None:
+                        unit = param.default_unit
+                    packet['value'] = u.Quantity(value, unit, copy=False) if unit is not None else value
+            try:
+                if param is not None:
+                    param.set_value(packet['value'], ignore_readonly=True)
+                else:
+                    new_syns.set_value(check_visible=False, check_default=False, ignore_readonly=True, **packet)
+            except Exception as err:
+                raise ValueError("failed to set value from packet: {}.  Original error: {}".format(packet, str(err)))
+
+        column_packets = {}
         for packetlists in rpacketlists_per_worker:
             # single worker
             for packetlist in packetlists:
                 # single time/dataset
                 for packet in packetlist:
                     # single parameter
-                    try:
-                        new_syns.set_value(check_visible=False, check_default=False, ignore_readonly=True, **packet)
-                    except Exception as err:
-                        raise ValueError("failed to set value from packet: {}.  Original error: {}".format(packet, str(err)))
+                    if 'times' in packet.keys():
+                        # see _SynColumns, these may be split across workers
+                        key = (packet['qualifier'], packet['dataset'], packet['component'], packet['kind'])
+                        column_packets.setdefault(key, []).append(packet)
+                    else:
+                        _set_packet(packet)
+
+        for (qualifier, dataset, component, kind), packets in column_packets.items():
+            times = np.concatenate([packet['times'] for packet in packets])
+            values = [packet['value'] for packet in packets]
+            unit = getattr(values[0], 'unit', None)
+            if unit is not None:
+                values = np.concatenate([value.to_value(unit) for value in values])
+            else:
+                values = np.concatenate(values)
+
+            param = syn_params.get((qualifier, dataset, component, kind, None), None)
+            times_param = syn_params.get(('times', dataset, component, kind, None), None)
+            if param is not None and times_param is not None and isinstance(param, FloatArrayParameter):
+                # a single array for all times (ie. fluxes@lc): gather the
+                # computed values into the (sorted) synthetic times and set
+                # the entire array at once
+                syn_times = times_param.get_value()
+                sort = np.argsort(times)
+                times, values = times[sort], values[sort]
+                inds = np.clip(np.searchsorted(times, syn_times), 0, len(times)-1)
+                computed = times[inds] == syn_times
+
+                if unit is not None:
+                    syn_values = param.get_quantity().to_value(unit)
+                else:
+                    syn_values = param.get_value()
+                syn_values = np.array(syn_values, dtype=float)
+                if len(syn_values) != len(syn_times):
+                    syn_values = np.full(len(syn_times), np.nan)
+                syn_values[computed] = values[inds[computed]]
+
+                try:
+                    param.set_value(syn_values * unit if unit is not None else syn_values, ignore_readonly=True)
+                except Exception as err:
+                    raise ValueError("failed to set value for {}@{}@{}.  Original error: {}".format(qualifier, dataset, component, str(err)))
+
+            else:
+                # time-tagged parameters (ie. mesh columns)
+                for time, value in zip(times, values):
+                    _set_packet({'dataset': dataset, 'component': component,
+                                 'kind': kind, 'qualifier': qualifier,
+                                 'value': value * unit if unit is not None else value,
+                                 'time': time})
 
         return new_syns
 
@@ -500,9 +689,25 @@ class BaseBackend(object):
         """
         self.run_checks(b, compute, times, **kwargs)
 
+        stream_fname = kwargs.pop('stream_fname', None)
+        if stream_fname is not None:
+            if mpi.enabled:
+                raise NotImplementedError("stream_fname is not supported within MPI")
+            logger.info("streaming model arrays to {}".format(stream_fname))
+            kwargs['stream'] = _archive.ArchiveWriter(stream_fname)
+
         logger.debug("rank:{}/{} calling get_packet_and_syns".format(mpi.myrank, mpi.nprocs))
         packet, new_syns = self.get_packet_and_syns(b, compute, dataset, times, **kwargs)
 
+        if stream_fname is not None:
+            try:
+                rpacketlists_per_worker = [self._run_chunk(**packet)]
+            except:
+                kwargs['stream'].abort()
+                raise
+            kwargs['stream'].close()
+            return self._fill_syns(new_syns, rpacketlists_per_worker, stream=_archive.Archive(stream_fname))
+
         if mpi.enabled:
             # broadcast the packet to ALL workers
             logger.debug("rank:{}/{} broadcasting to all workers".format(mpi.myrank, mpi.nprocs))
@@ -532,6 +737,11 @@ class BaseBackendByTime(BaseBackend):
         raise NotImplementedError("worker_setup not implemented by the {} backend".format(self.__class__.__name__))
         return dict()
 
+    def _worker_setup_thread(self, worker_setup_kwargs):
+        """
+        """
+        raise NotImplementedError("_worker_setup_thread not implemented by the {} backend".format(self.__class__.__name__))
+
     def _run_single_time(self, b, i, time, infolist, **kwargs):
         """
         """
@@ -559,8 +769,17 @@ class BaseBackendByTime(BaseBackend):
     def _run_chunk(self, b, compute, times, infolists, **kwargs):
         logger.debug("rank:{}/{} _run_chunk".format(mpi.myrank, mpi.nprocs))
 
+        nprocs = _multiprocessing_times_nprocs(b, times)
+        if nprocs > 1:
+            return self._run_chunk_multiprocessing(nprocs, b, compute, times, infolists, **kwargs)
+
+        nthreads = _threading_times_nthreads(b, times)
+        if nthreads > 1:
+            return self._run_chunk_threading(nthreads, b, compute, times, infolists, **kwargs)
+
         worker_setup_kwargs = self._worker_setup(b, compute, times, infolists, **kwargs)
 
+        columns = _SynColumns(times)
         inds = range(len(times))
 
         if mpi.enabled:
@@ -576,11 +795,195 @@ class BaseBackendByTime(BaseBackend):
                 break
 
             packetlist = self._run_single_time(b, i, time, infolist, **worker_setup_kwargs)
-            packetlists.append(packetlist)
+            packetlists.append(_stream_packetlist(kwargs.get('stream', None), [packet for packet in packetlist if not columns.add(i, packet)]))
+
+        packetlists.append(columns.to_packetlist())
 
         logger.debug("rank:{}/{} _run_chunk returning packetlist".format(mpi.myrank, mpi.nprocs))
         return packetlists
 
+    def _run_chunk_multiprocessing(self, nprocs, b, compute, times, infolists, **kwargs):
+        """
+        split the times across nprocs local processes.  Each process builds its
+        own system (via _worker_setup) once when the pool starts and then
+        computes the chunks of times it is handed.  The returned packetlists
+        are in the same order as times, just as in _run_chunk.
+        """
+        logger.info("{}: using multiprocessing pool with {} procs to split {} times".format(self.__class__.__name__, nprocs, len(times)))
+
+        # use a few chunks per process so that more expensive times (ie. in
+        # eclipse) are still balanced between the workers
+        inds_per_chunk = [inds for inds in np.array_split(np.arange(len(times)), min(len(times), nprocs*4)) if len(inds)]
+        args_per_chunk = [(inds, [times[i] for i in inds], [infolists[i] for i in inds]) for inds in inds_per_chunk]
+
+        show_progressbar = not b._within_solver and kwargs.get('progressbar', False)
+        pbar = _tqdm(total=len(times)) if show_progressbar else None
+
+        # each process builds its own system (and computes its own dynamics)
+        # rather than receiving a copy
+        kwargs.pop('system', None)
+        kwargs.pop('compute_session', None)
+        # the results are streamed by this process as each chunk is received
+        stream = kwargs.pop('stream', None)
+
+        def _chunk_progress(packetlists):
+            for packetlist in packetlists:
+                _stream_packetlist(stream, packetlist)
+            if pbar is not None:
+                # the last packetlist of each chunk holds the columns
+                pbar.update(len(packetlists) - 1)
+
+        pool = _pool.MultiPool(processes=nprocs,
+                               initializer=_init_times_worker,
+                               initargs=(self.__class__.__name__, b, compute, times, infolists, kwargs))
+        try:
+            packetlists_per_chunk = pool.map(_run_times_worker, args_per_chunk, callback=_chunk_progress)
+        except:
+            pool.terminate()
+            raise
+        else:
+            pool.close()
+        finally:
+            pool.join()
+            if pbar is not None:
+                pbar.close()
+
+        logger.debug("rank:{}/{} _run_chunk_multiprocessing returning packetlist".format(mpi.myrank, mpi.nprocs))
+        return list(itertools.chain.from_iterable(packetlists_per_chunk))
+
+    def _run_chunk_threading(self, nthreads, b, compute, times, infolists, **kwargs):
+        """
+        split the times across a pool of nthreads threads.  Unlike
+        _run_chunk_multiprocessing, the bundle, passbands and everything
+        computed by _worker_setup are shared between the threads rather than
+        pickled, only the state that changes per-time is copied for each
+        thread (see _worker_setup_thread).  The threads only run concurrently
+        while libphoebe releases the GIL.  The returned packetlists are in the
+        same order as times, just as in _run_chunk.
+        """
+        logger.info("{}: using pool of {} threads to split {} times".format(self.__class__.__name__, nthreads, len(times)))
+
+        worker_setup_kwargs = self._worker_setup(b, compute, times, infolists, **kwargs)
+
+        # each thread takes its own setup when it starts
+        worker_setups = _queue.Queue()
+        worker_setups.put(worker_setup_kwargs)
+        for _ in range(nthreads-1):
+            worker_setups.put(self._worker_setup_thread(worker_setup_kwargs))
+
+        thread_state = _threading.local()
+
+        def _init_thread():
+            # the times are already split between the threads, so the compiled
+            # routines do not need to use threads of their own
+            conf._threading_local.nthreads = 1
+            thread_state.worker_setup_kwargs = worker_setups.get_nowait()
+
+        def _run_thread(args):
+            inds, times_chunk, infolists_chunk = args
+            return _run_times(self, b, times, thread_state.worker_setup_kwargs, kwargs.get('out_fname', False),
+                              inds, times_chunk, infolists_chunk)
+
+        inds_per_chunk = [inds for inds in np.array_split(np.arange(len(times)), min(len(times), nthreads*4)) if len(inds)]
+        args_per_chunk = [(inds, [times[i] for i in inds], [infolists[i] for i in inds]) for inds in inds_per_chunk]
+
+        show_progressbar = not b._within_solver and kwargs.get('progressbar', False)
+        pbar = _tqdm(total=len(times)) if show_progressbar else None
+
+        packetlists = []
+        try:
+            with _ThreadPoolExecutor(max_workers=nthreads, initializer=_init_thread) as executor:
+                for (inds, _, _), packetlists_chunk in zip(args_per_chunk, executor.map(_run_thread, args_per_chunk)):
+                    for packetlist in packetlists_chunk:
+                        _stream_packetlist(kwargs.get('stream', None), packetlist)
+                    packetlists += packetlists_chunk
+                    if pbar is not None:
+                        pbar.update(len(inds))
+        finally:
+            if pbar is not None:
+                pbar.close()
+
+        logger.debug("rank:{}/{} _run_chunk_threading returning packetlist".format(mpi.myrank, mpi.nprocs))
+        return packetlists
+
+
+def _split_times_enabled(b):
+    """
+    determine whether the times of a single forward model may be split
+    across local processes or threads.
+    """
+    if mpi.enabled:
+        return False
+    if b._within_solver:
+        # solvers already parallelize over forward models
+        return False
+    if _multiprocessing.current_process().daemon:
+        # workers of another pool (ie. sample_from) already parallelize over
+        # forward models and cannot create their own pool
+        return False
+    return True
+
+def _multiprocessing_times_nprocs(b, times):
+    """
+    determine the number of local processes to use when splitting the times
+    of a single forward model, or 0 if the times should be computed serially.
+    """
+    if not conf.multiprocessing_times or not _split_times_enabled(b):
+        return 0
+
+    return min(conf.multiprocessing_nprocs, len(times))
+
+def _threading_times_nthreads(b, times):
+    """
+    determine the number of threads to use when splitting the times of a
+    single forward model, or 0 if the times should be computed serially.
+    """
+    if not conf.threading_times or not _split_times_enabled(b):
+        return 0
+
+    return min(conf.threading_nthreads, len(times))
+
+# per-process state for the workers created by _run_chunk_multiprocessing
+_times_worker_state = {}
+
+def _init_times_worker(backend, b, compute, times, infolists, kwargs):
+    backend = globals()[backend]()
+    worker_setup_kwargs = backend._worker_setup(b, compute, times, infolists, **kwargs)
+
+    _times_worker_state['backend'] = backend
+    _times_worker_state['b'] = b
+    _times_worker_state['times'] = times
+    _times_worker_state['worker_setup_kwargs'] = worker_setup_kwargs
+    _times_worker_state['out_fname'] = kwargs.get('out_fname', False)
+
+def _run_times_worker(args):
+    inds, times, infolists = args
+    return _run_times(_times_worker_state['backend'],
+                      _times_worker_state['b'],
+                      _times_worker_state['times'],
+                      _times_worker_state['worker_setup_kwargs'],
+                      _times_worker_state['out_fname'],
+                      inds, times, infolists)
+
+def _run_times(backend, b, all_times, worker_setup_kwargs, out_fname, inds, times, infolists):
+    """
+    compute the chunk of `times` (at indices `inds` of `all_times`) for the
+    workers of _run_chunk_multiprocessing and _run_chunk_threading.
+    """
+    columns = _SynColumns(all_times)
+    packetlists = []
+    for i, time, infolist in zip(inds, times, infolists):
+        if out_fname and os.path.isfile(out_fname+'.kill'):
+            logger.warning("received kill signal, exiting sampler loop")
+            break
+
+        packetlist = backend._run_single_time(b, i, time, infolist, **worker_setup_kwargs)
+        packetlists.append([packet for packet in packetlist if not columns.add(i, packet)])
+
+    packetlists.append(columns.to_packetlist())
+
+    return packetlists
+
 
 class BaseBackendByDataset(BaseBackend):
     def _worker_setup(self, b, compute, infolist, **kwargs):
@@ -620,12 +1023,12 @@ class BaseBackendByDataset(BaseBackend):
                 logger.warning("received kill signal, exiting sampler loop")
                 break
             packetlist = self._run_single_dataset(b, info, **worker_setup_kwargs)
-            packetlists.append(packetlist)
+            packetlists.append(_stream_packetlist(kwargs.get('stream', None), packetlist))
 
         return packetlists
 
 def _call_run_single_model(args):
-    # NOTE: b should be a deepcopy here to prevent conflicts
+    # NOTE: b should be a copy (see Bundle._copy_lightweight) here to prevent conflicts
     b, samples, sample_kwargs, compute, dataset, times, compute_kwargs, expose_samples, expose_failed, i, allow_retries = args
     # override sample_from
     compute_kwargs['sample_from'] = []
@@ -636,28 +1039,17 @@ def _call_run_single_model(args):
 
     while True:
         # print("trying with samples={}".format(samples))
-        for uniqueid, value in samples.items():
-            uniqueid, index = _extract_index_from_string(uniqueid)
-
-            # TODO: for some reason when redrawing we're getting arrays with length
-            # one as if we had passed N=1 to sample_distribution_collection.  For now, we'll
-            # just work around the issue.
-            if isinstance(value, np.ndarray):
-                value = value[0]
-            # print("setting uniqueid={}, value={}".format(uniqueid, value))
-            ref_param = b.get_parameter(uniqueid=uniqueid, **_skip_filter_checks)
-            try:
-                if index is None:
-                    ref_param.set_value(value)
-                else:
-                    ref_param.set_index_value(index, value)
-            except Exception as err:
-                if expose_samples:
-                    msg = _simplify_error_message(err)
-                    failed_samples[msg] = failed_samples.get(msg, []) + [list(samples.values())]
+        # TODO: for some reason when redrawing we're getting arrays with length
+        # one as if we had passed N=1 to sample_distribution_collection.  For now, we'll
+        # just work around the issue.
+        try:
+            b.set_values({uniqueid: value[0] if isinstance(value, np.ndarray) else value for uniqueid, value in samples.items()})
+        except Exception as err:
+            if expose_samples:
+                msg = _simplify_error_message(err)
+                failed_samples[msg] = failed_samples.get(msg, []) + [list(samples.values())]
 
-                samples = b.sample_distribution_collection(N=None, keys='uniqueid', **sample_kwargs)
-                break
+            samples = b.sample_distribution_collection(N=None, keys='uniqueid', **sample_kwargs)
 
         try:
             model_ps = b.run_compute(compute=compute, dataset=dataset, times=times, do_create_fig_params=False, model='sample_{}'.format(i), **compute_kwargs)
@@ -689,22 +1081,12 @@ def _test_single_sample(args):
     success = False
 
     while not success:
-        for uniqueid, sample_value in zip(uniqueids, sample_per_param):
-
-            uniqueid, index = _extract_index_from_string(uniqueid)
-            ref_param = b_copy.get_parameter(uniqueid=uniqueid, **_skip_filter_checks)
-
-            try:
-                if index is None:
-                    ref_param.set_value(sample_value)
-                else:
-                    ref_param.set_index_value(index, sample_value)
-
-
-            except:
-                success = False
-            else:
-                success = True
+        try:
+            b_copy.set_values(dict(zip(uniqueids, sample_per_param)))
+        except:
+            success = False
+        else:
+            success = True
 
         compute_for_checks = None
         if require_compute not in [True, False]:
@@ -842,7 +1224,7 @@ class SampleOverModel(object):
             bexcl = b.copy()
             bexcl.remove_parameters_all(context=['model', 'solver', 'solutoin', 'figure'], **_skip_filter_checks)
             bexcl.remove_parameters_all(kind=['orb', 'mesh'], context='dataset', **_skip_filter_checks)
-            args_per_sample = [(bexcl.copy(), {k:v[i] for k,v in sample_dict.items()}, sample_kwargs, compute, dataset, times, compute_kwargs, expose_samples, expose_failed, i, allow_retries) for i in range(sample_num)]
+            args_per_sample = [(bexcl._copy_lightweight(uniqueids=list(sample_dict.keys())), {k:v[i] for k,v in sample_dict.items()}, sample_kwargs, compute, dataset, times, compute_kwargs, expose_samples, expose_failed, i, allow_retries) for i in range(sample_num)]
             models_success_failed = list(pool.map(_call_run_single_model, args_per_sample, callback=_sample_progress))
         else:
             pool.wait()
@@ -935,10 +1317,15 @@ class PhoebeBackend(BaseBackendByTime):
                                           datasets=None,
                                           reset=True,
                                           lc_only=True,
+                                          standard_meshes=None,
                                           **kwargs):
 
         logger.debug("rank:{}/{} PhoebeBackend._create_system_and_compute_pblums: calling universe.System.from_bundle".format(mpi.myrank, mpi.nprocs))
         system = universe.System.from_bundle(b, compute, datasets=b.datasets, **kwargs)
+        if standard_meshes is not None:
+            # re-use the meshes from a previous system (see
+            # session.ComputeSession) instead of remeshing at t0
+            _session._transplant_standard_meshes(system, standard_meshes)
 
         if dynamics_method is None:
             if compute is None:
@@ -1002,6 +1389,168 @@ class PhoebeBackend(BaseBackendByTime):
 
         return system
 
+    def _ooe_meshes_time_independent(self, b, system, hier, ooe_method):
+        """
+        Whether the meshes (and local quantities) of the (detached, two-star)
+        system are the same at all times, and can therefore be placed once and
+        re-used for ooe_method.
+
+        This is decided from the parameters themselves (aligned, circular,
+        keplerian and no features that require remeshing) rather than from
+        <phoebe.backend.universe.Star.needs_remesh>, which compares the polar
+        direction exactly and so is True for some aligned systems depending
+        on round-off in the inclination.
+        """
+        for star in hier.get_stars():
+            if b.get_value(qualifier='pitch', component=star, context='component', **_skip_filter_checks) != 0 or \
+                    b.get_value(qualifier='yaw', component=star, context='component', **_skip_filter_checks) != 0:
+                logger.info("ooe_method='{}' not supported for misaligned systems, falling back on ooe_method='mesh'".format(ooe_method))
+                return False
+        for body in system.bodies:
+            if body.ecc != 0:
+                logger.info("ooe_method='{}' only supported for circular systems, falling back on ooe_method='mesh'".format(ooe_method))
+                return False
+            if body.dynamics_method != 'keplerian':
+                logger.info("ooe_method='{}' only supported with dynamics_method='keplerian', falling back on ooe_method='mesh'".format(ooe_method))
+                return False
+            if np.any([feature._remeshing_required for feature in body.features]):
+                logger.info("ooe_method='{}' not supported with features that require remeshing, falling back on ooe_method='mesh'".format(ooe_method))
+                return False
+        return True
+
+    def _classify_ooe_times(self, b, compute, system, hier, times, infolists, ooe_method,
+                            xs, ys, zs, vxs, vys, vzs, ethetas, elongans, eincls):
+        """
+        Classify the times into those in which eclipses are possible and those
+        in which they are not (using the same instantaneous_maxr test as
+        <phoebe.backend.universe.System.handle_eclipses>) for the given
+        ooe_method.  This places the system at the first time.
+
+        Returns None if the system is not supported by ooe_method, otherwise an
+        array (per-time) of whether the out-of-eclipse observables can be used
+        at that time (no eclipses possible and only supported kinds require the
+        mesh).
+        """
+        bodies = system.bodies
+        if len(bodies) != 2 or len(hier.get_stars()) != 2:
+            logger.info("ooe_method='{}' only supported for binaries, falling back on ooe_method='mesh'".format(ooe_method))
+            return None
+        if system.eclipse_method not in ['native', 'only_horizon'] or system.horizon_method != 'boolean':
+            logger.info("ooe_method='{}' not supported with eclipse_method='{}', falling back on ooe_method='mesh'".format(ooe_method, system.eclipse_method))
+            return None
+        for body in bodies:
+            if not isinstance(body, universe.Star) or len(body.features):
+                logger.info("ooe_method='{}' only supported for detached systems without features, falling back on ooe_method='mesh'".format(ooe_method))
+                return None
+
+        if ooe_method == 'interp':
+            # the fluxes need to be a function of phase only
+            supported_kinds = ['lc']
+            if not self._ooe_meshes_time_independent(b, system, hier, ooe_method):
+                return None
+            orbit = hier.get_parent_of(hier.get_stars()[0])
+            if b.get_value(qualifier='deccdt', component=orbit, context='component', default=0.0, **_skip_filter_checks) != 0:
+                logger.info("ooe_method='interp' not supported with deccdt, falling back on ooe_method='mesh'")
+                return None
+        elif ooe_method == 'batch':
+            # the meshes and local quantities need to be the same at all times
+            supported_kinds = ['lc', 'rv']
+            if not self._ooe_meshes_time_independent(b, system, hier, ooe_method):
+                return None
+        else:
+            raise NotImplementedError("ooe_method='{}' not implemented".format(ooe_method))
+
+        # the meshes (and therefore max_rs) are the same at all times, so we
+        # only need to place the system once to classify all the times using the
+        # same (conservative) test as in System.handle_eclipses
+        x0, y0, z0, vx0, vy0, vz0, etheta0, elongan0, eincl0 = dynamics.dynamics_at_i(xs, ys, zs, vxs, vys, vzs, ethetas, elongans, eincls, i=0)
+        system.update_positions(times[0], x0, y0, z0, vx0, vy0, vz0, etheta0, elongan0, eincl0)
+        max_sep_ecl = sum([body.instantaneous_maxr for body in bodies])
+        proj_sep_sq = (np.asarray(xs[0]) - np.asarray(xs[1]))**2 + (np.asarray(ys[0]) - np.asarray(ys[1]))**2
+
+        # only times at which nothing but supported kinds require the mesh can
+        # make use of the out-of-eclipse observables
+        supported = np.array([np.all([info['kind'] in supported_kinds or not info['needs_mesh'] for info in infolist]) for infolist in infolists])
+        return supported & (proj_sep_sq >= (1.05*max_sep_ecl)**2)
+
+    def _compute_ooe_interp(self, b, compute, system, hier, times, infolists, ethetas, nphases):
+        """
+        For circular, aligned, feature-free binaries, the out-of-eclipse lc
+        fluxes are only a function of orbital phase, so we integrate the
+        horizon-only mesh at nphases phases once and interpolate in phase for
+        all times.
+
+        Returns a dictionary (per (dataset, component)) of the interpolated
+        fluxes at all times.
+        """
+        lc_datasets = []
+        for infolist in infolists:
+            for info in infolist:
+                if info['kind'] == 'lc' and info['dataset'] not in lc_datasets:
+                    lc_datasets.append(info['dataset'])
+
+        # sample one full orbit starting at the first time
+        orbit = hier.get_parent_of(hier.get_stars()[0])
+        t0 = b.get_value(qualifier='t0', context='system', unit=u.d, **_skip_filter_checks)
+        period = b.get_value(qualifier='period', component=orbit, context='component', unit=u.d, **_skip_filter_checks)
+        dpdt = b.get_value(qualifier='dpdt', component=orbit, context='component', unit=u.d/u.d, **_skip_filter_checks)
+        period += dpdt * (times[0] - t0)
+        grid_times = times[0] + period * np.arange(nphases) / nphases
+
+        logger.debug("rank:{}/{} PhoebeBackend._compute_ooe_interp: computing dynamics at {} phases".format(mpi.myrank, mpi.nprocs, nphases))
+        _, gxs, gys, gzs, gvxs, gvys, gvzs, gethetas, gelongans, geincls = dynamics.keplerian.dynamics_from_bundle(b, grid_times, compute, return_euler=True)
+
+        grid_fluxes = {dataset: np.zeros(nphases) for dataset in lc_datasets}
+        for k in range(nphases):
+            xk, yk, zk, vxk, vyk, vzk, ethetak, elongank, einclk = dynamics.dynamics_at_i(gxs, gys, gzs, gvxs, gvys, gvzs, gethetas, gelongans, geincls, i=k)
+            system.update_positions(grid_times[k], xk, yk, zk, vxk, vyk, vzk, ethetak, elongank, einclk)
+            system.handle_eclipses(eclipse_method='only_horizon')
+            system.populate_observables(grid_times[k], ['lc' for dataset in lc_datasets], lc_datasets)
+            for dataset in lc_datasets:
+                grid_fluxes[dataset][k] = system.observe(dataset, kind='lc')['flux']
+
+        # the orientation of the meshes (and therefore the flux) is set by the
+        # euler theta, so interpolate in that rather than in time
+        grid_phases = np.mod(gethetas[0], 2*np.pi)
+        phases = np.mod(np.asarray(ethetas[0]), 2*np.pi)
+        return {(dataset, None): np.interp(phases, grid_phases, fluxes, period=2*np.pi) for dataset, fluxes in grid_fluxes.items()}
+
+    def _compute_ooe_batch(self, system, times, infolists, ooe_mask,
+                           vxs, vys, vzs, ethetas, elongans, eincls, max_memory):
+        """
+        Integrate the horizon-only meshes at all out-of-eclipse times at once
+        (see <phoebe.backend.universe.System.observe_horizon_only_batch>).
+
+        Returns a dictionary (per (dataset, component)) of the fluxes or rvs at
+        all times (nan where ooe_mask is False).
+        """
+        observables = []
+        for infolist in infolists:
+            for info in infolist:
+                if info['kind'] in ['lc', 'rv'] and info['needs_mesh']:
+                    observable = (info['kind'], info['dataset'], info['component'])
+                    if observable not in observables:
+                        observables.append(observable)
+
+        # the system is already placed (see _classify_ooe_times), but we need
+        # the local quantities to include reflection
+        system.populate_observables(times[0], [], [])
+
+        def _masked(arrays):
+            return [np.asarray(array)[ooe_mask] for array in arrays]
+
+        logger.debug("rank:{}/{} PhoebeBackend._compute_ooe_batch: integrating {} times".format(mpi.myrank, mpi.nprocs, ooe_mask.sum()))
+        results = system.observe_horizon_only_batch(observables,
+                                                    _masked(vxs), _masked(vys), _masked(vzs),
+                                                    _masked(ethetas), _masked(elongans), _masked(eincls),
+                                                    max_memory=max_memory)
+
+        ooe_obs = {}
+        for (kind, dataset, component), result in zip(observables, results):
+            ooe_obs[(dataset, component)] = np.full(len(times), np.nan)
+            ooe_obs[(dataset, component)][ooe_mask] = result
+
+        return ooe_obs
 
     def _worker_setup(self, b, compute, times, infolists, **kwargs):
         logger.debug("rank:{}/{} PhoebeBackend._worker_setup: extracting parameters".format(mpi.myrank, mpi.nprocs))
@@ -1015,7 +1564,9 @@ class PhoebeBackend(BaseBackendByTime):
 
         # b.compute_ld_coeffs(set_value=True) # TODO: only need if irradiation is enabled and only for bolometric
 
-        system = kwargs.get('system', universe.System.from_bundle(b, compute, datasets=b.datasets, **kwargs))
+        system = kwargs.get('system', None)
+        if system is None:
+            system = universe.System.from_bundle(b, compute, datasets=b.datasets, **kwargs)
         # pblums_scale computed within run_compute and then passed as kwarg to run (so should be in kwargs sent to each worker)
         pblums_scale = kwargs.get('pblums_scale')
         for dataset in list(pblums_scale.keys()):
@@ -1023,25 +1574,36 @@ class PhoebeBackend(BaseBackendByTime):
                 system.get_body(comp).set_pblum_scale(dataset, component=comp, pblum_scale=pblum_scale)
 
         if len(meshablerefs) > 1 or hier.get_kind_of(meshablerefs[0])=='envelope':
-            logger.debug("rank:{}/{} PhoebeBackend._worker_setup: computing dynamics at all times".format(mpi.myrank, mpi.nprocs))
-            if dynamics_method in ['nbody', 'rebound']:
-                ts, xs, ys, zs, vxs, vys, vzs, inst_ds, inst_Fs, ethetas, elongans, eincls = dynamics.nbody.dynamics_from_bundle(b, times, compute, return_roche_euler=True, **kwargs)
+            def _dynamics():
+                logger.debug("rank:{}/{} PhoebeBackend._worker_setup: computing dynamics at all times".format(mpi.myrank, mpi.nprocs))
+                if dynamics_method in ['nbody', 'rebound']:
+                    ts, xs, ys, zs, vxs, vys, vzs, inst_ds, inst_Fs, ethetas, elongans, eincls = dynamics.nbody.dynamics_from_bundle(b, times, compute, return_roche_euler=True, **kwargs)
 
-            elif dynamics_method == 'bs':
-                # if distortion_method == 'roche':
-                    # raise ValueError("distortion_method '{}' not compatible with dynamics_method '{}'".format(distortion_method, dynamics_method))
+                elif dynamics_method == 'bs':
+                    # if distortion_method == 'roche':
+                        # raise ValueError("distortion_method '{}' not compatible with dynamics_method '{}'".format(distortion_method, dynamics_method))
 
-                # TODO: pass stepsize
-                # TODO: pass orbiterror
-                # TODO: make sure that this takes systemic velocity and corrects positions and velocities (including ltte effects if enabled)
-                ts, xs, ys, zs, vxs, vys, vzs, inst_ds, inst_Fs, ethetas, elongans, eincls = dynamics.nbody.dynamics_from_bundle_bs(b, times, compute, return_roche_euler=True, **kwargs)
+                    # TODO: pass stepsize
+                    # TODO: pass orbiterror
+                    # TODO: make sure that this takes systemic velocity and corrects positions and velocities (including ltte effects if enabled)
+                    ts, xs, ys, zs, vxs, vys, vzs, inst_ds, inst_Fs, ethetas, elongans, eincls = dynamics.nbody.dynamics_from_bundle_bs(b, times, compute, return_roche_euler=True, **kwargs)
 
-            elif dynamics_method=='keplerian':
-                # TODO: make sure that this takes systemic velocity and corrects positions and velocities (including ltte effects if enabled)
-                ts, xs, ys, zs, vxs, vys, vzs, ethetas, elongans, eincls = dynamics.keplerian.dynamics_from_bundle(b, times, compute, return_euler=True, **kwargs)
+                elif dynamics_method=='keplerian':
+                    # TODO: make sure that this takes systemic velocity and corrects positions and velocities (including ltte effects if enabled)
+                    ts, xs, ys, zs, vxs, vys, vzs, ethetas, elongans, eincls = dynamics.keplerian.dynamics_from_bundle(b, times, compute, return_euler=True, **kwargs)
+
+                else:
+                    raise NotImplementedError
+
+                return ts, xs, ys, zs, vxs, vys, vzs, ethetas, elongans, eincls
 
+            compute_session = kwargs.get('compute_session', None)
+            if compute_session is None:
+                ts, xs, ys, zs, vxs, vys, vzs, ethetas, elongans, eincls = _dynamics()
             else:
-                raise NotImplementedError
+                # re-use the dynamics from the previous evaluation of the
+                # session if unaffected (see session.ComputeSession)
+                ts, xs, ys, zs, vxs, vys, vzs, ethetas, elongans, eincls = compute_session._get_cached(compute, 'dynamics', (np.asarray(times), dynamics_method, ltte), _dynamics)
 
         else:
             # singlestar case
@@ -1058,6 +1620,52 @@ class PhoebeBackend(BaseBackendByTime):
             for i,t in enumerate(times):
                 zs[0][i] = vgamma*(t-t0)
 
+        ooe_mask, ooe_obs = None, None
+        ooe_method = b.get_value(qualifier='ooe_method', compute=compute, context='compute', ooe_method=kwargs.get('ooe_method', None), default='mesh', **_skip_filter_checks)
+        if ooe_method == 'interp' and dynamics_method != 'keplerian':
+            logger.info("ooe_method='interp' only supported with dynamics_method='keplerian', falling back on ooe_method='mesh'")
+        elif ooe_method in ['interp', 'batch']:
+            ooe_mask = self._classify_ooe_times(b, compute, system, hier, times, infolists, ooe_method,
+                                                xs, ys, zs, vxs, vys, vzs, ethetas, elongans, eincls)
+
+            if ooe_mask is None:
+                pass
+            elif ooe_method == 'interp':
+                ooe_nphases = b.get_value(qualifier='ooe_nphases', compute=compute, context='compute', ooe_nphases=kwargs.get('ooe_nphases', None), **_skip_filter_checks)
+                if ooe_mask.sum() <= ooe_nphases:
+                    logger.info("ooe_method='interp': only {} out-of-eclipse times (ooe_nphases={}), falling back on ooe_method='mesh'".format(ooe_mask.sum(), ooe_nphases))
+                    ooe_mask = None
+                else:
+                    logger.info("ooe_method='interp': using cached fluxes at {}/{} times".format(ooe_mask.sum(), len(times)))
+                    ooe_obs = self._compute_ooe_interp(b, compute, system, hier, times, infolists, ethetas, ooe_nphases)
+            elif not np.any(ooe_mask):
+                logger.info("ooe_method='batch': no out-of-eclipse times, falling back on ooe_method='mesh'")
+                ooe_mask = None
+            else:
+                logger.info("ooe_method='batch': integrating {}/{} times in batches".format(ooe_mask.sum(), len(times)))
+                ooe_batch_memory = b.get_value(qualifier='ooe_batch_memory', compute=compute, context='compute', ooe_batch_memory=kwargs.get('ooe_batch_memory', None), default=256, **_skip_filter_checks)
+                ooe_obs = self._compute_ooe_batch(system, times, infolists, ooe_mask,
+                                                  vxs, vys, vzs, ethetas, elongans, eincls,
+                                                  ooe_batch_memory)
+
+            # the remaining times are computed from scratch
+            system.reset(force_recompute_instantaneous=True)
+
+        # solve for all eclipse times of each etv dataset at once
+        etv_ecls = {}
+        for i, infolist in enumerate(infolists):
+            for info in infolist:
+                if info['kind'] == 'etv':
+                    etv_ecls.setdefault((info['dataset'], info['component']), []).append(i)
+
+        for (dataset, component), inds in etv_ecls.items():
+            logger.debug("rank:{}/{} PhoebeBackend._worker_setup: computing {} eclipse times for {}@{}".format(mpi.myrank, mpi.nprocs, len(inds), dataset, component))
+            # TODO: add support for other etv kinds (barycentric, robust, others?)
+            etv_tol = computeparams.get_value(qualifier='etv_tol', unit=u.d, dataset=dataset, component=component, **_skip_filter_checks)
+            time_ecls = np.full(len(times), np.nan)
+            time_ecls[inds] = etvs.crossings(b, component, np.asarray(times)[inds], dynamics_method, ltte, tol=etv_tol)
+            etv_ecls[(dataset, component)] = time_ecls
+
         return dict(system=system,
                     hier=hier,
                     meshablerefs=meshablerefs,
@@ -1065,7 +1673,14 @@ class PhoebeBackend(BaseBackendByTime):
                     dynamics_method=dynamics_method,
                     ts=ts, xs=xs, ys=ys, zs=zs,
                     vxs=vxs, vys=vys, vzs=vzs,
-                    ethetas=ethetas, elongans=elongans, eincls=eincls)
+                    ethetas=ethetas, elongans=elongans, eincls=eincls,
+                    ooe_mask=ooe_mask, ooe_obs=ooe_obs,
+                    etv_ecls=etv_ecls)
+
+    def _worker_setup_thread(self, worker_setup_kwargs):
+        # the system (meshes) is updated in place at each time, everything
+        # else (ie. the dynamics) is only read by _run_single_time
+        return dict(worker_setup_kwargs, system=worker_setup_kwargs['system'].copy())
 
     def _run_single_time(self, b, i, time, infolist, **kwargs):
         logger.debug("rank:{}/{} PhoebeBackend._run_single_time(i={}, time={}, infolist={}, **kwargs.keys={})".format(mpi.myrank, mpi.nprocs, i, time, infolist, kwargs.keys()))
@@ -1085,6 +1700,13 @@ class PhoebeBackend(BaseBackendByTime):
         ethetas = kwargs.get('ethetas')
         elongans = kwargs.get('elongans')
         eincls = kwargs.get('eincls')
+        ooe_mask = kwargs.get('ooe_mask')
+        ooe_obs = kwargs.get('ooe_obs')
+        etv_ecls = kwargs.get('etv_ecls')
+
+        # if out-of-eclipse observables are available at this time, then none
+        # of the requested observables need the mesh
+        use_ooe_obs = ooe_mask is not None and ooe_mask[i]
 
         # Check to see what we might need to do that requires a mesh
         # TODO: make sure to use the requested distortion_method
@@ -1093,7 +1715,7 @@ class PhoebeBackend(BaseBackendByTime):
         logger.debug("rank:{}/{} PhoebeBackend._run_single_time: extracting dynamics at time={}".format(mpi.myrank, mpi.nprocs, time))
         xi, yi, zi, vxi, vyi, vzi, ethetai, elongani, eincli = dynamics.dynamics_at_i(xs, ys, zs, vxs, vys, vzs, ethetas, elongans, eincls, i=i)
 
-        if True in [info['needs_mesh'] for info in infolist]:
+        if True in [info['needs_mesh'] for info in infolist] and not use_ooe_obs:
 
             if dynamics_method in ['nbody', 'rebound']:
                 di = dynamics.at_i(inst_ds, i)
@@ -1211,9 +1833,12 @@ class PhoebeBackend(BaseBackendByTime):
             elif kind=='rv':
                 ### this_syn['times'].append(time) # time array was set when initializing the syns
                 if info['needs_mesh']:
-                    obs = system.observe(info['dataset'],
-                                         kind=kind,
-                                         components=info['component'])
+                    if use_ooe_obs:
+                        obs = {'rv': ooe_obs[(info['dataset'], info['component'])][i]}
+                    else:
+                        obs = system.observe(info['dataset'],
+                                             kind=kind,
+                                             components=info['component'])
 
                     rv = obs['rv'] + b.get_value(qualifier='rv_offset',
                                                  component=info['component'],
@@ -1230,18 +1855,21 @@ class PhoebeBackend(BaseBackendByTime):
                                               time, info))
 
             elif kind=='lc':
-                obs = system.observe(info['dataset'],
-                                     kind=kind,
-                                     components=info['component'])
+                if use_ooe_obs:
+                    flux = ooe_obs[(info['dataset'], info['component'])][i]
+                else:
+                    obs = system.observe(info['dataset'],
+                                         kind=kind,
+                                         components=info['component'])
+                    flux = obs['flux']
 
                 packetlist.append(_make_packet('fluxes',
-                                              obs['flux']*u.W/u.m**2,
+                                              flux*u.W/u.m**2,
                                               time, info))
 
             elif kind=='etv':
-
-                # TODO: add support for other etv kinds (barycentric, robust, others?)
-                time_ecl = etvs.crossing(b, info['component'], time, dynamics_method, ltte, tol=computeparams.get_value(qualifier='etv_tol', unit=u.d, dataset=info['dataset'], component=info['component']))
+                # eclipse times for all times were solved in _worker_setup
+                time_ecl = etv_ecls[(info['dataset'], info['component'])][i]
 
                 this_obs = b.filter(dataset=info['dataset'], component=info['component'], context='dataset')
 
@@ -1299,12 +1927,15 @@ class PhoebeBackend(BaseBackendByTime):
                 if body.mesh is None:
                     continue
 
+                # NOTE: the placed coordinates/normals of the mesh are work
+                # buffers that are overwritten at the next time, so anything
+                # referencing them must be copied here.
                 if 'uvw' in info['mesh_coordinates']:
                     packetlist.append(_make_packet('uvw_elements',
                                                   body.mesh.vertices_per_triangle,
                                                   time, info))
                     packetlist.append(_make_packet('uvw_normals',
-                                                  body.mesh.tnormals,
+                                                  body.mesh.tnormals.copy(),
                                                   time, info))
 
                 if 'xyz' in info['mesh_coordinates']:
@@ -1331,17 +1962,17 @@ class PhoebeBackend(BaseBackendByTime):
                 if 'us' in info['mesh_columns']:
                     # UNIT: u.solRad
                     packetlist.append(_make_packet('us',
-                                                  body.mesh.centers[:,0],
+                                                  body.mesh.centers[:,0].copy(),
                                                   time, info))
                 if 'vs' in info['mesh_columns']:
                     # UNIT: u.solRad
                     packetlist.append(_make_packet('vs',
-                                                  body.mesh.centers[:,1],
+                                                  body.mesh.centers[:,1].copy(),
                                                   time, info))
                 if 'ws' in info['mesh_columns']:
                     # UNIT: u.solRad
                     packetlist.append(_make_packet('ws',
-                                                  body.mesh.centers[:,2],
+                                                  body.mesh.centers[:,2].copy(),
                                                   time, info))
 
                 if 'vus' in info['mesh_columns']:
@@ -1364,15 +1995,15 @@ class PhoebeBackend(BaseBackendByTime):
 
                 if 'nus' in info['mesh_columns']:
                     packetlist.append(_make_packet('nus',
-                                                  body.mesh.tnormals[:,0],
+                                                  body.mesh.tnormals[:,0].copy(),
                                                   time, info))
                 if 'nvs' in info['mesh_columns']:
                     packetlist.append(_make_packet('nvs',
-                                                  body.mesh.tnormals[:,1],
+                                                  body.mesh.tnormals[:,1].copy(),
                                                   time, info))
                 if 'nws' in info['mesh_columns']:
                     packetlist.append(_make_packet('nws',
-                                                  body.mesh.tnormals[:,2],
+                                                  body.mesh.tnormals[:,2].copy(),
                                                   time, info))
 
 
@@ -1460,7 +2091,7 @@ class PhoebeBackend(BaseBackendByTime):
                                                   time, info))
                 if 'mus' in info['mesh_columns']:
                     packetlist.append(_make_packet('mus',
-                                                  body.mesh.mus,
+                                                  body.mesh.mus.copy(),
                                                   time, info))
                 if 'visibilities' in info['mesh_columns']:
                     packetlist.append(_make_packet('visibilities',
@@ -1478,7 +2109,13 @@ class PhoebeBackend(BaseBackendByTime):
 
 
                 # Dataset-dependent quantities
-                for mesh_dataset in info['mesh_datasets']:
+                for mesh_kind, mesh_dataset in zip(info['mesh_kinds'], info['mesh_datasets']):
+                    if np.any(["{}@{}".format(indep, mesh_dataset) in info['mesh_columns'] for indep in ['intensities', 'abs_intensities', 'boost_factors']]):
+                        # intensities are only computed for visible elements
+                        # when populating observables, so we'll fill the rest
+                        # now that they're actually requested.
+                        body.fill_hidden_intensities(mesh_kind, mesh_dataset)
+
                     if 'pblum_ext@{}'.format(mesh_dataset) in info['mesh_columns']:
                         packetlist.append(_make_packet('pblum_ext',
                                                       body.compute_luminosity(mesh_dataset),
@@ -3,6 +3,7 @@ import numpy as np
 
 from phoebe.algorithms import ceclipse
 from phoebe.utils import _bytes
+from phoebe import conf
 import libphoebe
 
 import logging
@@ -169,7 +170,8 @@ def native(meshes, xs, ys, zs, expose_horizon=False, horizon_method='boolean'):
                                      tvisibilities=True,
                                      taweights=True,
                                      method=_bytes(horizon_method),
-                                     horizon=expose_horizon)
+                                     horizon=expose_horizon,
+                                     nthreads=conf.threading_nthreads)
 
     visibilities = meshes.unpack_column_flat(info['tvisibilities'], computed_type='triangles')
     weights = meshes.unpack_column_flat(info['taweights'], computed_type='triangles')
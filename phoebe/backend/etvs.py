@@ -1,11 +1,14 @@
 import logging
 import numpy as np
 from phoebe import dynamics
+from phoebe import u
 
-from scipy.optimize import newton
+from scipy.interpolate import CubicSpline
 
 logger = logging.getLogger("ETVS")
 
+_skip_filter_checks = {'check_default': False, 'check_visible': False}
+
 def barycentric():
     """
     """
@@ -15,39 +18,156 @@ def barycentric():
 def crossing(b, component, time, dynamics_method='keplerian', ltte=True, tol=1e-4, maxiter=1000):
     """
     tol in days
+
+    See :func:`crossings` (which this calls for a single time).
     """
+    return crossings(b, component, [time], dynamics_method=dynamics_method,
+                     ltte=ltte, tol=tol, maxiter=maxiter)[0]
 
 
-    def projected_separation_sq(time, b, dynamics_method, cind1, cind2, ltte=True):
-        """
-        """
-        #print "*** projected_separation_sq", time, dynamics_method, cind1, cind2, ltte
+def crossings(b, component, times, dynamics_method='keplerian', ltte=True,
+              tol=1e-4, maxiter=1000, ngrid=200):
+    """
+    Find the times of minimum projected separation between `component` and
+    its sibling closest to each of the requested `times`.
+
+    All times are solved simultaneously.  For dynamics_method='keplerian',
+    the orbital elements are read from the bundle once and a vectorized
+    Newton iteration (with bounded steps towards decreasing separation
+    whenever the curvature is not positive) is run on the projected
+    separation.  For the n-body methods, the system is integrated once on
+    a grid of `ngrid` points per orbit covering one orbit around each
+    requested time and the minima are found from a cubic spline through
+    the projected separation.
+
+    Arguments
+    -----------
+    * `b` (Bundle): the bundle with a set hierarchy
+    * `component` (string): the star whose eclipse times are requested
+    * `times` (array): approximate (ephemeris) times of the eclipses [days]
+    * `dynamics_method` (string, optional, default='keplerian')
+    * `ltte` (bool, optional, default=True)
+    * `tol` (float, optional, default=1e-4): tolerance on the eclipse times
+        [days].  Only applies to dynamics_method='keplerian'.
+    * `maxiter` (int, optional, default=1000): maximum number of iterations.
+        Only applies to dynamics_method='keplerian'.
+    * `ngrid` (int, optional, default=200): number of samples per orbit.
+        Only applies to the n-body dynamics methods.
+
+    Returns
+    ---------
+    * (array) eclipse times [days] with the same length as `times`
+
+    Raises
+    --------
+    * NotImplementedError: if `dynamics_method` is not supported
+    * RuntimeError: if an eclipse time could not be found
+    """
+    times = np.atleast_1d(np.asarray(times, dtype=float))
 
+    hier = b.hierarchy
+    starrefs = hier.get_stars()
+    cind1 = starrefs.index(component)
+    cind2 = starrefs.index(hier.get_sibling_of(component))
 
-        times = np.array([time])
+    period = b.get_value(qualifier='period', component=hier.get_parent_of(component), context='component', unit=u.d, **_skip_filter_checks)
 
-        if dynamics_method in ['nbody', 'rebound']:
-            # TODO: make sure that this takes systemic velocity and corrects positions and velocities (including ltte effects if enabled)
-            ts, xs, ys, zs, vxs, vys, vzs = dynamics.nbody.dynamics_from_bundle(b, times, compute=None, ltte=ltte)
+    if not len(times):
+        return times
 
-        elif dynamics_method=='bs':
-            ts, xs, ys, zs, vxs, vys, vzs = dynamics.nbody.dynamics_from_bundle_bs(b, times, compute, ltte=ltte)
+    if dynamics_method == 'keplerian':
+        # TODO: make sure that this takes systemic velocity and corrects positions and velocities (including ltte effects if enabled)
+        elements = dynamics.keplerian.elements_from_bundle(b, compute=None)
+        elements['ltte'] = ltte
 
-        elif dynamics_method=='keplerian':
-            # TODO: make sure that this takes systemic velocity and corrects positions and velocities (including ltte effects if enabled)
-            ts, xs, ys, zs, vxs, vys, vzs = dynamics.keplerian.dynamics_from_bundle(b, times, compute=None, ltte=ltte, return_euler=False)
+        def projected_separation_sq(ts):
+            ts, xs, ys, zs, vxs, vys, vzs = dynamics.keplerian.dynamics(ts, **elements)
+            return (xs[cind2]-xs[cind1])**2 + (ys[cind2]-ys[cind1])**2
+
+        return _minimize_newton(projected_separation_sq, times, tol=tol, maxiter=maxiter, h=period*1e-5, max_step=period/8.)
 
+    elif dynamics_method in ['nbody', 'rebound', 'bs']:
+        if dynamics_method == 'bs':
+            dynamics_func = dynamics.nbody.dynamics_from_bundle_bs
         else:
-            raise NotImplementedError
+            dynamics_func = dynamics.nbody.dynamics_from_bundle
 
+        def projected_separation_sq(ts):
+            # TODO: make sure that this takes systemic velocity and corrects positions and velocities (including ltte effects if enabled)
+            ts, xs, ys, zs, vxs, vys, vzs = dynamics_func(b, ts, compute=None, ltte=ltte)[:7]
+            return (np.asarray(xs[cind2])-np.asarray(xs[cind1]))**2 + (np.asarray(ys[cind2])-np.asarray(ys[cind1]))**2
 
-        return (xs[cind2][0]-xs[cind1][0])**2 + (ys[cind2][0]-ys[cind1][0])**2
+        try:
+            return _minimize_spline(projected_separation_sq, times, step=period/ngrid, nsteps=ngrid)
+        except RuntimeError as err:
+            raise RuntimeError("could not find eclipse of {} ({})".format(component, err))
 
+    else:
+        raise NotImplementedError
 
-    # TODO: optimize this by allowing to pass cind1 and cind2 directly (and fallback to this if they aren't)
-    starrefs = b.hierarchy.get_stars()
-    cind1 = starrefs.index(component)
-    cind2 = starrefs.index(b.hierarchy.get_sibling_of(component))
 
-    # TODO: provide options for tol and maxiter (in the frontend computeoptionsp)?
-    return newton(projected_separation_sq, x0=time, args=(b, dynamics_method, cind1, cind2, ltte), tol=tol, maxiter=maxiter)
+def _minimize_newton(func, x0, h, tol=1e-4, maxiter=1000, max_step=np.inf):
+    """
+    Vectorized Newton iteration for the local minima of `func` closest to
+    each entry in `x0`, using central differences (with stepsize `h`)
+    for the first and second derivatives.
+
+    Only the entries which have not yet converged are passed to `func`
+    in each iteration.  Whenever the second derivative is not positive or
+    the Newton step exceeds `max_step`, a step of `max_step` is taken in the
+    direction of decreasing `func` instead.
+    """
+    x = np.array(x0, dtype=float)
+    active = np.arange(len(x))
+
+    for iteration in range(maxiter):
+        xa = x[active]
+        f = func(np.concatenate((xa-h, xa, xa+h)))
+        fm, f0, fp = f[:len(xa)], f[len(xa):2*len(xa)], f[2*len(xa):]
+
+        d1 = (fp - fm) / (2*h)
+        d2 = (fp - 2*f0 + fm) / h**2
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dx = -d1 / d2
+        bounded = ~(d2 > 0) | ~(abs(dx) <= max_step)
+        dx[bounded] = -np.sign(d1[bounded]) * max_step
+
+        x[active] = xa + dx
+
+        active = active[abs(dx) >= tol]
+        if not len(active):
+            return x
+
+    raise RuntimeError("Failed to converge after {} iterations for {} of {} times".format(maxiter, len(active), len(x)))
+
+
+def _minimize_spline(func, x0, step, nsteps):
+    """
+    Local minima of `func` closest to each entry in `x0`, from a cubic spline
+    through `func` sampled every `step` over (at least) `nsteps` steps
+    centered on each entry.
+
+    `func` is called only once, on the (sorted) union of the samples of all
+    entries, so that expensive functions (ie. an n-body integration) only
+    need to be evaluated once.
+    """
+    x0 = np.asarray(x0, dtype=float)
+    x_start = x0.min() - nsteps * step
+    inds_centers = np.round((x0 - x_start) / step).astype(int)
+    inds_window = np.arange(-nsteps//2-2, nsteps//2+3)
+    inds = np.unique((inds_centers[:,None] + inds_window[None,:]).ravel())
+    grid = x_start + inds * step
+    f = func(grid)
+
+    x = np.empty_like(x0)
+    for i, (xi, ind_center) in enumerate(zip(x0, inds_centers)):
+        window = np.searchsorted(inds, ind_center + inds_window[[0, -1]])
+        spline = CubicSpline(grid[window[0]:window[1]+1], f[window[0]:window[1]+1])
+        extrema = spline.derivative().roots(extrapolate=False)
+        minima = extrema[spline(extrema, 2) > 0]
+        if not len(minima):
+            raise RuntimeError("no minimum found near {}".format(xi))
+        x[i] = minima[np.argmin(abs(minima - xi))]
+
+    return x
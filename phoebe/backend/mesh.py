@@ -84,6 +84,35 @@ def euler_trans_matrix(etheta, elongan, eincl):
                         [s1*s3, s1*c3, c1]
                     ])
 
+def euler_trans_matrices(etheta, elongan, eincl):
+    """
+    Vectorized version of :func:`euler_trans_matrix` for arrays of euler
+    angles (ie. at many times).
+
+    :parameter array etheta: euler theta angles
+    :parameter array elongan: euler long of asc node angles
+    :parameter array eincl: euler inclination angles
+    :return: array with shape Tx3x3
+    """
+    etheta, elongan, eincl = np.broadcast_arrays(np.asarray(etheta, dtype=float),
+                                                 np.asarray(elongan, dtype=float),
+                                                 np.asarray(eincl, dtype=float))
+
+    s1 = np.sin(eincl)
+    c1 = np.cos(eincl)
+    s2 = np.sin(elongan)
+    c2 = np.cos(elongan)
+    s3 = np.sin(etheta)
+    c3 = np.cos(etheta)
+    c1s3 = c1*s3
+    c1c3 = c1*c3
+
+    return np.moveaxis(np.array([
+                                    [-c2*c3+s2*c1s3, c2*s3+s2*c1c3, -s2*s1],
+                                    [-s2*c3-c2*c1s3, s2*s3-c2*c1c3, c2*s1],
+                                    [s1*s3, s1*c3, c1]
+                                ]), -1, 0)
+
 def Rx(x):
   c = cos(x)
   s = sin(x)
@@ -162,7 +191,7 @@ def general_rotation_matrix(theta, phi, alpha):
                   ])
 
 
-def transform_position_array(array, pos, euler, is_normal, reverse=False):
+def transform_position_array(array, pos, euler, is_normal, reverse=False, out=None):
     """
     Transform any Nx3 position array by translating to a center-of-mass 'pos'
     and applying an euler transformation
@@ -175,6 +204,8 @@ def transform_position_array(array, pos, euler, is_normal, reverse=False):
     :parameter bool is_normal: whether each entry is a normal vector rather
         than position vector.  If true, the quantities won't be offset by
         'pos'
+    :parameter array out: (optional) Nx3 float array to write the results
+        into instead of allocating a new array.
     :return: new positions array with same shape as 'array'.
     """
     trans_matrix = euler_trans_matrix(*euler)
@@ -185,13 +216,19 @@ def transform_position_array(array, pos, euler, is_normal, reverse=False):
     if isinstance(array, ComputedColumn):
         array = array.for_computations
 
+    if out is not None:
+        np.dot(np.asarray(array), trans_matrix, out=out)
+        if not is_normal:
+            out += np.asarray(pos)
+        return out
+
     if is_normal:
         # then we don't do an offset by the position
         return np.dot(np.asarray(array), trans_matrix)
     else:
         return np.dot(np.asarray(array), trans_matrix) + np.asarray(pos)
 
-def transform_velocity_array(array, pos_array, vel, euler, rotation_vel=(0,0,0)):
+def transform_velocity_array(array, pos_array, vel, euler, rotation_vel=(0,0,0), out=None):
     """
     Transform any Nx3 velocity vector array by adding the center-of-mass 'vel',
     accounting for solid-body rotation, and applying an euler transformation.
@@ -205,6 +242,8 @@ def transform_velocity_array(array, pos_array, vel, euler, rotation_vel=(0,0,0))
     :parameter array euler: euler angles (etheta, elongan, eincl) in radians
     :parameter array rotation_vel: vector of the rotation velocity of the star
         in the original (star) coordinate frame
+    :parameter array out: (optional) Nx3 float array to write the results
+        into instead of allocating a new array.
     :return: new velocity array with same shape as 'array'
     """
 
@@ -217,7 +256,10 @@ def transform_velocity_array(array, pos_array, vel, euler, rotation_vel=(0,0,0))
     if isinstance(array, ComputedColumn):
         array = array.for_computations
 
-    new_vel = np.dot(np.asarray(array)+rotation_component, trans_matrix.T) + orbital_component
+    # NOTE: rotation_component is a new array, so we can safely add in-place
+    rotation_component += np.asarray(array)
+    new_vel = np.dot(rotation_component, trans_matrix.T, out=out)
+    new_vel += orbital_component
 
     return new_vel
 
@@ -281,6 +323,68 @@ def wd_grid_to_mesh_dict(the_grid, q, F, d):
     return new_mesh
 
 
+def transform_position_arrays(array, pos, euler, is_normal):
+    """
+    Vectorized version of :func:`transform_position_array` to transform the
+    same Nx3 position array to T different positions and orientations at
+    once.
+
+    :parameter array array: numpy array of Nx3 positions in the original (star)
+        coordinate frame
+    :parameter array pos: numpy array with shape Tx3 giving the cartesian
+        coordinates to offset all positions at each time (ignored if
+        `is_normal`)
+    :parameter tuple euler: arrays (each with length T) of the euler angles
+        (etheta, elongan, eincl) in radians
+    :parameter bool is_normal: whether each entry is a normal vector rather
+        than position vector.  If true, the quantities won't be offset by
+        'pos'
+    :return: new positions array with shape TxNx3
+    """
+    trans_matrices = euler_trans_matrices(*euler)
+
+    if isinstance(array, ComputedColumn):
+        array = array.for_computations
+
+    new_array = np.matmul(np.asarray(array)[np.newaxis, :, :], trans_matrices.transpose(0, 2, 1))
+
+    if not is_normal:
+        new_array += np.asarray(pos)[:, np.newaxis, :]
+
+    return new_array
+
+def transform_velocity_arrays(array, pos_array, vel, euler, rotation_vel=(0,0,0)):
+    """
+    Vectorized version of :func:`transform_velocity_array` to transform the
+    same Nx3 velocity array to T different velocities and orientations at
+    once.
+
+    :parameter array array: numpy array of Nx3 velocity vectors in the original
+        (star) coordinate frame
+    :parameter array pos_array: positions of the elements with respect to the
+        original (star) coordinate frame.  Must be the same shape as 'array'.
+    :parameter array vel: numpy array with shape Tx3 giving cartesian velocity
+        offsets in the new (system) coordinate frame at each time
+    :parameter tuple euler: arrays (each with length T) of the euler angles
+        (etheta, elongan, eincl) in radians
+    :parameter array rotation_vel: vector of the rotation velocity of the star
+        in the original (star) coordinate frame
+    :return: new velocity array with shape TxNx3
+    """
+    trans_matrices = euler_trans_matrices(*euler)
+
+    # v_{rot,i} = omega x r_i    with  omega = rotation_vel
+    rotation_component = np.cross(rotation_vel, pos_array, axisb=1)
+
+    if isinstance(array, ComputedColumn):
+        array = array.for_computations
+
+    rotation_component += np.asarray(array)
+    new_vel = np.matmul(rotation_component[np.newaxis, :, :], trans_matrices.transpose(0, 2, 1))
+    new_vel += np.asarray(vel)[:, np.newaxis, :]
+
+    return new_vel
+
 class ComputedColumn(object):
     """
     Any non-geometric column in a Mesh should be a ComputedColumn.  Depending
@@ -1240,6 +1344,9 @@ class Mesh(ScaledProtoMesh):
 
         self._observables       = {}    # ComputedColumn (each)
 
+        # persistent arrays for the orbit-placed columns, see update_from_scaledproto
+        self._work_buffers      = {}
+
         keys = ['mus', 'visibilities', 'weights', 'observables']
         keys = keys + kwargs.pop('keys', [])
 
@@ -1288,7 +1395,76 @@ class Mesh(ScaledProtoMesh):
 
         return mesh
 
-    def _place_in_orbit(self, pos, vel, euler, euler_vel, rotation_vel=(0,0,0), component_com_x=None):
+    def update_from_scaledproto(self, scaledproto_mesh,
+                                pos, vel, euler, euler_vel,
+                                rotation_vel=(0,0,0),
+                                component_com_x=None):
+        """
+        Re-place this (existing) Mesh in orbit from a ScaledProtoMesh without
+        copying the ScaledProtoMesh.
+
+        This is equivalent to
+        `Mesh.from_scaledproto(scaledproto_mesh.copy(), ...)` but treats the
+        arrays of `scaledproto_mesh` as immutable and only references them.
+        The orbit-transformed columns (vertices, pvertices, centers, vnormals,
+        tnormals, velocities) are written into work buffers owned by this
+        mesh which are re-used between calls.  Any arrays of this mesh
+        exposed from a previous call should therefore be copied if they need
+        to outlive the next call.
+
+        All observables, visibilities, and weights are cleared.
+
+        :parameter scaledproto_mesh: :class:`ScaledProtoMesh` in the star's
+            coordinate frame.  This is not modified.
+        :parameter list pos: current position (x, y, z)
+        :parameter list vel: current velocity (vx, vy, vz)
+        :parameter list euler: current euler angles (etheta, elongan, eincl)
+        :parameter list rotation_vel: rotation velocity vector (polar_dir*freq_rot)
+        """
+        self._compute_at_vertices = scaledproto_mesh._compute_at_vertices
+
+        for k in scaledproto_mesh.keys():
+            hkey = '_{}'.format(k)
+            if not hasattr(scaledproto_mesh, hkey):
+                # then a property computed on-the-fly
+                continue
+
+            value = getattr(scaledproto_mesh, hkey)
+            if isinstance(value, ComputedColumn):
+                # the columns themselves cannot be shared (they're updated
+                # via set_for_computations), but their arrays can be
+                col = getattr(self, hkey, None)
+                if not isinstance(col, ComputedColumn) or col._mesh is not self:
+                    col = ComputedColumn(mesh=self)
+                    setattr(self, hkey, col)
+                col._compute_at_vertices = value._compute_at_vertices
+                col._vertices = value._vertices
+                col._centers = value._centers
+            else:
+                setattr(self, hkey, value)
+
+        self._visibilities = None
+        self._weights = None
+        self._observables = {}
+
+        self._place_in_orbit(pos, vel, euler, euler_vel, rotation_vel, component_com_x,
+                             use_work_buffers=True)
+
+        return self
+
+    def _get_work_buffer(self, key, like):
+        """
+        Access the persistent work buffer for a given column, (re)allocating
+        it if it does not yet exist or does not match the shape of `like`.
+        """
+        buf = self._work_buffers.get(key, None)
+        if buf is None or buf.shape != like.shape:
+            buf = np.empty(like.shape, dtype=float)
+            self._work_buffers[key] = buf
+
+        return buf
+
+    def _place_in_orbit(self, pos, vel, euler, euler_vel, rotation_vel=(0,0,0), component_com_x=None, use_work_buffers=False):
         """
         TODO: add documentation
         """
@@ -1309,13 +1485,23 @@ class Mesh(ScaledProtoMesh):
         if component_com_x is not None and component_com_x != 0.0:
             # then we're the secondary component and need to do 1-x and then flip the rotation component vxs
             pos_array = np.array([component_com_x, 0.0, 0.0]) - pos_array
-        self.update_columns_dict({k: transform_velocity_array(self[k], pos_array, vel, euler_vel, rotation_vel) for k in vel_ks if self[k] is not None})
+        if use_work_buffers:
+            def _out(k):
+                array = self[k]
+                if isinstance(array, ComputedColumn):
+                    array = array.for_computations
+                return self._get_work_buffer(k, array)
+        else:
+            def _out(k):
+                return None
+
+        self.update_columns_dict({k: transform_velocity_array(self[k], pos_array, vel, euler_vel, rotation_vel, out=_out(k)) for k in vel_ks if self[k] is not None})
         # TODO: handle velocity from mesh reprojection during volume conservation
 
         # handle rotation/displacement
         # NOTE: mus will automatically be updated on-the-fly
-        self.update_columns_dict({k: transform_position_array(self[k], pos, euler, False) for k in pos_ks if self[k] is not None})
-        self.update_columns_dict({k: transform_position_array(self[k], pos, euler, True) for k in norm_ks if self[k] is not None})
+        self.update_columns_dict({k: transform_position_array(self[k], pos, euler, False, out=_out(k)) for k in pos_ks if self[k] is not None})
+        self.update_columns_dict({k: transform_position_array(self[k], pos, euler, True, out=_out(k)) for k in norm_ks if self[k] is not None})
 
         # let's store the position.  This is both useful for "undoing" the
         # orbit-offset, and also eventually to allow incremental changes.
@@ -1366,6 +1552,27 @@ class Mesh(ScaledProtoMesh):
         else:
             return np.ones(self.Ntriangles)
 
+    @property
+    def visible_for_computations(self):
+        """
+        Return a boolean mask of the elements used for computations (vertices
+        or triangles, see compute_at_vertices) that belong to at least one
+        (partially) visible triangle, or None if visibilities have not yet
+        been computed.
+
+        (Nx1 or Vx1)
+        """
+        if self._visibilities is None:
+            return None
+
+        visible = self._visibilities > 0
+        if self._compute_at_vertices:
+            mask = np.zeros(len(self.mus_for_computations), dtype=bool)
+            mask[self.triangles[visible].ravel()] = True
+            return mask
+        else:
+            return visible
+
     @property
     def weights(self):
         """
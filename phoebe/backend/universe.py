@@ -4,6 +4,9 @@ from scipy.special import sph_harm as Y
 from math import sqrt, sin, cos, acos, atan2, trunc, pi
 import sys, os
 import copy
+import hashlib
+import threading
+from collections import OrderedDict
 
 from phoebe.atmospheres import passbands
 from phoebe.distortions import roche, rotstar
@@ -95,6 +98,72 @@ def _estimate_delta(ntriangles, area):
     return np.sqrt(4./np.sqrt(3) * float(area) / float(ntriangles))
 
 
+# relative tolerance (with respect to the size of the system) to which two
+# configurations of the meshes are considered the same when looking up cached
+# view-factor matrices for irradiation
+_view_factors_rtol = 1e-9
+
+
+class ViewFactorsCache(object):
+    """
+    Least-recently-used cache of the view-factor matrices of irradiation (as
+    packed by libphoebe.mesh_radiosity_matrix*) for the configurations of the
+    meshes seen so far, limited to <phoebe.view_factors_cache_get_maxsize> MB.
+
+    The cache is shared between all Systems within a process, so that the
+    matrices are reused at repeated phases (ie. eccentric orbits) and by
+    repeated calls to run_compute (ie. within a solver) as long as the
+    geometry of the meshes does not change.  The cache may be accessed from
+    several threads (see <phoebe.threading_times_on>).
+    """
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        return self._nbytes
+
+    def get(self, key):
+        """
+        Return the cached matrix for `key` (or None).
+        """
+        with self._lock:
+            Fmat = self._entries.get(key, None)
+            if Fmat is not None:
+                self._entries.move_to_end(key)
+            return Fmat
+
+    def set(self, key, Fmat, maxsize):
+        """
+        Store `Fmat` for `key`, dropping the least-recently-used matrices to
+        stay within `maxsize` bytes.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._nbytes -= self._entries.pop(key).nbytes
+
+            if Fmat.nbytes > maxsize:
+                return
+
+            while self._nbytes + Fmat.nbytes > maxsize:
+                self._nbytes -= self._entries.popitem(last=False)[1].nbytes
+
+            self._entries[key] = Fmat
+            self._nbytes += Fmat.nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+_view_factors_cache = ViewFactorsCache()
+
+
 class System(object):
     def __init__(self, bodies_dict, eclipse_method='graham',
                  horizon_method='boolean',
@@ -318,6 +387,50 @@ class System(object):
             for starref, body in self.items():
                 body.populate_observable(time, kind, dataset, ignore_effects=ignore_effects)
 
+    def _view_factors_key(self, meshes, kind, vertices_per_body, normals_per_body, triangles_per_body, ld_func_and_coeffs, ld_inds=None):
+        """
+        Key of the view-factor matrix for the current configuration of the
+        meshes in <phoebe.backend.universe.ViewFactorsCache>.
+
+        The view-factors only depend on the relative geometry of the meshes,
+        so the vertices and normals are expressed in the frame of the first
+        mesh (removing its position and euler angles) and rounded to
+        `_view_factors_rtol` of the size of the system.
+
+        Returns None if the cache is disabled.
+        """
+        if conf.view_factors_cache_maxsize <= 0:
+            if len(_view_factors_cache):
+                _view_factors_cache.clear()
+            return None
+
+        ref_mesh = meshes.values()[0]
+        while isinstance(ref_mesh, mesh.Meshes):
+            # halves of a contact envelope share the same frame
+            ref_mesh = ref_mesh.values()[0]
+        pos, euler = getattr(ref_mesh, '_pos', None), getattr(ref_mesh, '_euler', None)
+        if pos is None or euler is None:
+            return None
+
+        trans_matrix = mesh.euler_trans_matrix(*euler)
+        vertices_per_body = [np.dot(np.asarray(vertices) - np.asarray(pos), trans_matrix) for vertices in vertices_per_body]
+        normals_per_body = [np.dot(np.asarray(normals), trans_matrix) for normals in normals_per_body]
+
+        scale = max([np.abs(vertices).max() for vertices in vertices_per_body])
+        tol = _view_factors_rtol * 2**np.ceil(np.log2(scale))
+
+        h = hashlib.blake2b(kind.encode(), digest_size=16)
+        for vertices, normals, triangles in zip(vertices_per_body, normals_per_body, triangles_per_body):
+            h.update(np.array(vertices.shape + triangles.shape).tobytes())
+            h.update(np.round(vertices / tol).astype(np.int64).tobytes())
+            h.update(np.round(normals / _view_factors_rtol).astype(np.int64).tobytes())
+            h.update(np.ascontiguousarray(triangles).tobytes())
+        h.update(repr([(ld_func, list(ld_coeffs)) for ld_func, ld_coeffs in ld_func_and_coeffs]).encode())
+        if ld_inds is not None:
+            h.update(np.ascontiguousarray(ld_inds).tobytes())
+
+        return h.digest()
+
     def handle_reflection(self,  **kwargs):
         """
         """
@@ -365,16 +478,26 @@ class System(object):
 
             ld_func_and_coeffs = [tuple([_bytes(body.ld_func['bol'])] + [np.asarray(body.ld_coeffs['bol'])]) for body in self.bodies]
             logger.debug("irradiation ld_func_and_coeffs: {}".format(ld_func_and_coeffs))
-            fluxes_intrins_and_refl_per_body = libphoebe.mesh_radiosity_problem_nbody_convex(vertices_per_body,
-                                                                                       triangles_per_body,
-                                                                                       normals_per_body,
-                                                                                       areas_per_body,
-                                                                                       irrad_frac_refl_per_body,
-                                                                                       fluxes_intrins_per_body,
-                                                                                       ld_func_and_coeffs,
-                                                                                       _bytes(self.irrad_method.title()),
-                                                                                       support=_bytes('vertices')
-                                                                                       )
+
+            key = self._view_factors_key(meshes, 'nbody_convex', vertices_per_body, normals_per_body, triangles_per_body, ld_func_and_coeffs)
+            Fmat = _view_factors_cache.get(key) if key is not None else None
+            if Fmat is None:
+                Fmat = libphoebe.mesh_radiosity_matrix_nbody_convex(vertices_per_body,
+                                                                    triangles_per_body,
+                                                                    normals_per_body,
+                                                                    areas_per_body,
+                                                                    ld_func_and_coeffs,
+                                                                    _bytes('vertices'),
+                                                                    nthreads=conf.threading_nthreads)
+                if key is not None:
+                    _view_factors_cache.set(key, Fmat, conf.view_factors_cache_maxsize*1024**2)
+            else:
+                logger.debug("reflection: using cached view-factors")
+
+            fluxes_intrins_and_refl_per_body = libphoebe.mesh_radiosity_solve_nbody(Fmat,
+                                                                                   irrad_frac_refl_per_body,
+                                                                                   fluxes_intrins_per_body,
+                                                                                   _bytes(self.irrad_method.title()))
 
             fluxes_intrins_and_refl_flat = meshes.pack_column_flat(fluxes_intrins_and_refl_per_body)
 
@@ -390,17 +513,26 @@ class System(object):
             ld_func_and_coeffs = [tuple([_bytes(body.ld_func['bol'])] + [np.asarray(body.ld_coeffs['bol'])]) for body in self.mesh_bodies] # list
             ld_inds_flat = meshes.pack_column_flat({body.comp_no: np.full(fluxes.shape, body.comp_no-1) for body, fluxes in zip(self.mesh_bodies, fluxes_intrins_per_body)}) # np.ndarray
 
-            fluxes_intrins_and_refl_flat = libphoebe.mesh_radiosity_problem(vertices_flat,
-                                                                            triangles_flat,
-                                                                            normals_flat,
-                                                                            areas_flat,
-                                                                            irrad_frac_refl_flat,
-                                                                            fluxes_intrins_flat,
-                                                                            ld_func_and_coeffs,
-                                                                            ld_inds_flat,
-                                                                            _bytes(self.irrad_method.title()),
-                                                                            support=_bytes('vertices')
-                                                                            )
+            key = self._view_factors_key(meshes, 'general', [vertices_flat], [normals_flat], [triangles_flat], ld_func_and_coeffs, ld_inds_flat)
+            Fmat = _view_factors_cache.get(key) if key is not None else None
+            if Fmat is None:
+                Fmat = libphoebe.mesh_radiosity_matrix(vertices_flat,
+                                                       triangles_flat,
+                                                       normals_flat,
+                                                       areas_flat,
+                                                       ld_func_and_coeffs,
+                                                       ld_inds_flat,
+                                                       _bytes('vertices'),
+                                                       nthreads=conf.threading_nthreads)
+                if key is not None:
+                    _view_factors_cache.set(key, Fmat, conf.view_factors_cache_maxsize*1024**2)
+            else:
+                logger.debug("reflection: using cached view-factors")
+
+            fluxes_intrins_and_refl_flat = libphoebe.mesh_radiosity_solve(Fmat,
+                                                                          irrad_frac_refl_flat,
+                                                                          fluxes_intrins_flat,
+                                                                          _bytes(self.irrad_method.title()))
 
 
 
@@ -631,6 +763,150 @@ class System(object):
         else:
             raise NotImplementedError("observe for dataset with kind '{}' not implemented".format(kind))
 
+    def observe_horizon_only_batch(self, observables,
+                                   vxs, vys, vzs,
+                                   ethetas, elongans, eincls,
+                                   max_memory=256):
+        """
+        Vectorized equivalent of calling :meth:`update_positions`,
+        :meth:`handle_eclipses` (with eclipse_method='only_horizon'),
+        :meth:`populate_observables` and :meth:`observe` at many times at once.
+
+        This is only valid if no eclipses are possible at any of the times and
+        neither the meshes nor the local quantities change in time (ie. no
+        body needs_remesh or needs_recompute_instantaneous and there are no
+        features).  All bodies must have been placed in orbit (and reflection
+        handled, if applicable) at least once before calling this method.
+
+        The meshes are rotated for all times in a chunk at once, where the
+        number of times per chunk is set so that the per-element arrays
+        require roughly max_memory MB.
+
+        :parameter list observables: list of (kind, dataset, components) tuples
+            where kind is either 'lc' or 'rv' (see :meth:`observe`)
+        :parameter list vxs: a list (per component) of arrays (per time) of x-velocities
+        :parameter list vys: a list (per component) of arrays (per time) of y-velocities
+        :parameter list vzs: a list (per component) of arrays (per time) of z-velocities
+        :parameter list ethetas: a list (per component) of arrays (per time) of euler-thetas
+        :parameter list elongans: a list (per component) of arrays (per time) of euler-longans
+        :parameter list eincls: a list (per component) of arrays (per time) of euler-incls
+        :parameter float max_memory: approximate memory (in MB) to use per chunk
+        :return: list (per observable) of arrays (per time) of fluxes or rvs
+        """
+        bodies = self.bodies
+        ntimes = len(ethetas[0])
+
+        # time-independent (star-frame) quantities for each body
+        body_data = []
+        for body in bodies:
+            scaledprotomesh = body._get_scaled_standard_mesh_cached()
+            compute_at_vertices = body.mesh._compute_at_vertices
+            body_data.append({'compute_at_vertices': compute_at_vertices,
+                              'normals': scaledprotomesh.vnormals if compute_at_vertices else scaledprotomesh.tnormals,
+                              'tnormals': scaledprotomesh.tnormals,
+                              'velocities': scaledprotomesh.velocities,
+                              'pos_array': scaledprotomesh.roche_vertices if compute_at_vertices else scaledprotomesh.roche_centers,
+                              'rotation_vel': body.polar_direction_xyz*body.freq_rot*body._scale,
+                              'teffs': body.mesh.teffs.for_computations,
+                              'loggs': body.mesh.loggs.for_computations,
+                              'abuns': body.mesh.abuns.for_computations,
+                              'areas': body.mesh.areas_si,
+                              'triangles': body.mesh.triangles,
+                              })
+
+        # NOTE: the factor of 40 is a rough count of the float arrays (per
+        # element per time) needed while computing intensities
+        nelements = sum([len(bd['teffs']) + len(bd['areas']) for bd in body_data])
+        chunk_size = max(1, int(max_memory * 1e6 / (40 * 8 * nelements)))
+        logger.debug("system.observe_horizon_only_batch: {} times in chunks of {}".format(ntimes, chunk_size))
+
+        results = [np.empty(ntimes) for observable in observables]
+        for start in range(0, ntimes, chunk_size):
+            sl = slice(start, min(start+chunk_size, ntimes))
+            n = sl.stop - sl.start
+
+            chunk_meshes = {}
+            chunk_cols = {}
+            def _get_cols(body, bd, kind, dataset):
+                if (body.component, kind, dataset) in chunk_cols.keys():
+                    return chunk_cols[(body.component, kind, dataset)]
+
+                if body.component not in chunk_meshes.keys():
+                    euler = (ethetas[body.ind_self][sl], elongans[body.ind_self][sl], eincls[body.ind_self][sl])
+                    euler_vel = (ethetas[body.ind_self_vel][sl], elongans[body.ind_self_vel][sl], eincls[body.ind_self_vel][sl])
+                    vel = np.array([vxs[body.ind_self_vel][sl], vys[body.ind_self_vel][sl], vzs[body.ind_self_vel][sl]]).T
+
+                    normals = mesh.transform_position_arrays(bd['normals'], None, euler, True)
+                    velocities = mesh.transform_velocity_arrays(bd['velocities'], bd['pos_array'], vel, euler_vel, bd['rotation_vel'])
+                    mus = mesh.transform_position_arrays(bd['tnormals'], None, euler, True)[:, :, 2]
+
+                    # stack all times into a single (flat) mesh so that each
+                    # element at each time is treated as a separate element
+                    if bd['compute_at_vertices']:
+                        # triangles (offset per time) are needed to determine
+                        # which vertices are visible
+                        mesh_kwargs = {'vnormals': normals.reshape(-1, 3),
+                                       'triangles': (bd['triangles'][None, :, :] + len(bd['teffs'])*np.arange(n)[:, None, None]).reshape(-1, 3)}
+                    else:
+                        mesh_kwargs = {'tnormals': normals.reshape(-1, 3)}
+                    chunk_mesh = mesh.Mesh(compute_at_vertices=bd['compute_at_vertices'],
+                                           velocities=velocities.reshape(-1, 3),
+                                           teffs=np.tile(bd['teffs'], n),
+                                           loggs=np.tile(bd['loggs'], n),
+                                           abuns=np.tile(bd['abuns'], n),
+                                           visibilities=(mus > 0).astype(float).ravel(),
+                                           **mesh_kwargs)
+                    chunk_meshes[body.component] = (chunk_mesh, mus)
+
+                cols = getattr(body, '_populate_{}'.format(kind))(dataset, mesh=chunk_meshes[body.component][0])
+                chunk_cols[(body.component, kind, dataset)] = cols
+                return cols
+
+            def _for_observations(bd, values):
+                # per element-per time values to per-triangle per time (see
+                # ComputedColumn.for_observations with the default weights)
+                values = values.reshape(n, -1)
+                if bd['compute_at_vertices']:
+                    return np.sum(values[:, bd['triangles']]*(1./3), axis=2)
+                return values
+
+            for observable, result in zip(observables, results):
+                kind, dataset, components = observable
+                if isinstance(components, str):
+                    components = [components]
+
+                obs_bodies = [(body, bd) for body, bd in zip(bodies, body_data) if (kind=='lc' and not components) or body.component in components]
+
+                weights = []
+                rvs = []
+                visible = []
+                for body, bd in obs_bodies:
+                    cols = _get_cols(body, bd, kind, dataset)
+                    mus = chunk_meshes[body.component][1]
+                    visibilities = (mus > 0).astype(int)
+                    visible.append(np.any(visibilities, axis=1))
+                    if kind == 'lc':
+                        weights.append(_for_observations(bd, cols['intensities'])*bd['areas']*mus*visibilities)
+                    elif kind == 'rv':
+                        weights.append(_for_observations(bd, cols['abs_intensities'])*bd['areas']*mus*visibilities)
+                        rvs.append(_for_observations(bd, cols['rvs']))
+                    else:
+                        raise NotImplementedError("observe_horizon_only_batch for kind '{}' not implemented".format(kind))
+
+                weights = np.hstack(weights)
+                if kind == 'lc':
+                    ptfarea = obs_bodies[0][0].get_ptfarea(dataset)
+                    result[sl] = np.sum(weights, axis=1)*ptfarea
+                else:
+                    rvs = np.hstack(rvs)
+                    with np.errstate(invalid='ignore', divide='ignore'):
+                        result[sl] = np.sum(rvs*weights, axis=1) / np.sum(weights, axis=1)
+
+                # no triangles are visible, see observe
+                result[sl][~np.any(visible, axis=0)] = np.nan
+
+        return results
+
 
 
 
@@ -692,6 +968,8 @@ class Body(object):
         # for reprojection for volume conservation in eccentric orbits.
         # Storing meshes should only be done through self.save_as_standard_mesh(theta)
         self._standard_meshes = {}
+        # (protomesh, scale, scaledprotomesh) see _get_scaled_standard_mesh_cached
+        self._scaled_standard_mesh = None
 
         self.mesh_init_phi = mesh_init_phi
         self.do_mesh_offset = do_mesh_offset
@@ -869,6 +1147,22 @@ class Body(object):
 
         # return mesh
 
+    def _get_scaled_standard_mesh_cached(self):
+        """
+        Access the scaled standard mesh, only rescaling the standard mesh if
+        it or self._scale has changed since the last call.  The returned
+        ScaledProtoMesh must not be edited (use
+        :meth:`get_standard_mesh` instead if edits are necessary).
+        """
+        protomesh = self._standard_meshes[0.0]
+        cached = self._scaled_standard_mesh
+        if cached is None or cached[0] is not protomesh or cached[1] != self._scale:
+            scaledprotomesh = mesh.ScaledProtoMesh.from_proto(protomesh, self._scale)
+            self._scaled_standard_mesh = (protomesh, self._scale, scaledprotomesh)
+            return scaledprotomesh
+
+        return cached[2]
+
     def reset(self, force_remesh=False, force_recompute_instantaneous=False):
         if force_remesh:
             logger.debug("{}.reset: forcing remesh and recompute_instantaneous for next iteration".format(self.component))
@@ -991,8 +1285,11 @@ class Body(object):
             # coordinates before placing in orbit
 
             # TODO: eventually pass etheta to get_standard_mesh
-            scaledprotomesh = self.get_standard_mesh(scaled=True)
-            # TODO: can we avoid an extra copy here?
+            if not ignore_effects and len(self.features):
+                # features will edit the scaledprotomesh, so we need our own
+                scaledprotomesh = self.get_standard_mesh(scaled=True)
+            else:
+                scaledprotomesh = self._get_scaled_standard_mesh_cached()
 
 
         if not ignore_effects and len(self.features):
@@ -1024,7 +1321,8 @@ class Body(object):
                     updated_props = libphoebe.mesh_properties(scaledprotomesh.vertices,
                                                               scaledprotomesh.triangles,
                                                               tnormals=True,
-                                                              areas=True)
+                                                              areas=True,
+                                                              nthreads=conf.threading_nthreads)
 
                     scaledprotomesh.update_columns(**updated_props)
 
@@ -1033,14 +1331,17 @@ class Body(object):
                     raise NotImplementedError("areas are not updated for changed mesh")
 
 
-        # TODO NOW [OPTIMIZE]: get rid of the deepcopy here - but without it the
-        # mesh velocities build-up and do terrible things.  It may be possible
-        # to just clear the velocities in get_standard_mesh()?
-        logger.debug("{}.update_position: placing in orbit, Mesh.from_scaledproto at t={}".format(self.component, self.time))
-        self._mesh = mesh.Mesh.from_scaledproto(scaledprotomesh.copy(),
-                                                pos, vel, euler, euler_vel,
-                                                self.polar_direction_xyz*self.freq_rot*self._scale,
-                                                component_com_x)
+        # NOTE: rather than deepcopying scaledprotomesh and building a new Mesh
+        # at each time, we re-use the same Mesh instance which only references
+        # the (untouched) arrays of scaledprotomesh and writes the placed
+        # coordinates, normals, and velocities into its own work buffers.
+        logger.debug("{}.update_position: placing in orbit, Mesh.update_from_scaledproto at t={}".format(self.component, self.time))
+        if self._mesh is None:
+            self._mesh = mesh.Mesh()
+        self._mesh.update_from_scaledproto(scaledprotomesh,
+                                           pos, vel, euler, euler_vel,
+                                           self.polar_direction_xyz*self.freq_rot*self._scale,
+                                           component_com_x)
 
 
         # Lastly, we'll recompute physical quantities (not observables) if
@@ -1083,6 +1384,22 @@ class Body(object):
 
         self.populated_at_time.append(dataset)
 
+    def fill_hidden_intensities(self, kind, dataset, **kwargs):
+        """
+        Populate the columns of a dataset (already populated by
+        :meth:`populate_observable`) including the intensities of the elements
+        that are hidden at the current time.  These are otherwise skipped
+        and are only needed when exposing them in a mesh dataset.
+        """
+        if kind in ['mesh', 'orb']:
+            return
+
+        new_mesh_cols = getattr(self, '_populate_{}'.format(kind.lower()))(dataset, visible_only=False, **kwargs)
+
+        for key, col in new_mesh_cols.items():
+
+            self.mesh.update_columns_dict({'{}:{}'.format(key, dataset): col})
+
 class Star(Body):
     def __init__(self, component, comp_no, ind_self, ind_sibling, masses, ecc, incl,
                  long_an, t0, do_mesh_offset, mesh_init_phi,
@@ -1143,6 +1460,9 @@ class Star(Body):
         self._pblum_scale = {}
         self._ptfarea = {}
 
+        # mu-independent intensities per-dataset, see _populate_lc
+        self._atm_cache = {}
+
         self.do_rv_grav = do_rv_grav
         self.features = features
 
@@ -1715,7 +2035,7 @@ class Star(Body):
 
         return cols
 
-    def _populate_rv(self, dataset, **kwargs):
+    def _populate_rv(self, dataset, mesh=None, **kwargs):
         """
         Populate columns necessary for an RV dataset
 
@@ -1724,15 +2044,18 @@ class Star(Body):
         """
         logger.debug("{}._populate_rv(dataset={})".format(self.component, dataset))
 
+        if mesh is None:
+            mesh = self.mesh
+
         # We need to fill all the flux-related columns so that we can weigh each
         # triangle's rv by its flux in the requested passband.
-        lc_cols = self._populate_lc(dataset, **kwargs)
+        lc_cols = self._populate_lc(dataset, mesh=mesh, **kwargs)
 
         # rv per element is just the z-component of the velocity vectory.  Note
         # the change in sign from our right-handed system to rv conventions.
         # These will be weighted by the fluxes when integrating
 
-        rvs = -1*self.mesh.velocities.for_computations[:,2]
+        rvs = -1*mesh.velocities.for_computations[:,2]
 
         # Gravitational redshift
         if self.do_rv_grav:
@@ -1751,7 +2074,7 @@ class Star(Body):
         return cols
 
 
-    def _populate_lc(self, dataset, ignore_effects=False, **kwargs):
+    def _populate_lc(self, dataset, ignore_effects=False, mesh=None, **kwargs):
         """
         Populate columns necessary for an LC dataset
 
@@ -1762,6 +2085,9 @@ class Star(Body):
         """
         logger.debug("{}._populate_lc(dataset={}, ignore_effects={})".format(self.component, dataset, ignore_effects))
 
+        if mesh is None:
+            mesh = self.mesh
+
         lc_method = kwargs.get('lc_method', 'numerical')  # TODO: make sure this is actually passed
 
         passband = kwargs.get('passband', self.passband.get(dataset, None))
@@ -1819,77 +2145,146 @@ class Star(Body):
 
             self.set_ptfarea(dataset, ptfarea)
 
-            try:
-                ldint = pb.ldint(Teff=self.mesh.teffs.for_computations,
-                                 logg=self.mesh.loggs.for_computations,
-                                 abun=self.mesh.abuns.for_computations,
-                                 ldatm=ldatm,
-                                 ld_func=ld_func if ld_mode != 'interp' else ld_mode,
-                                 ld_coeffs=ld_coeffs,
-                                 photon_weighted=intens_weighting=='photon')
-            except ValueError as err:
-                if str(err).split(":")[0] == 'Atmosphere parameters out of bounds':
-                    # let's override with a more helpful error message
-                    logger.warning(str(err))
-                    if atm=='blackbody':
-                        raise ValueError("Could not compute ldint with ldatm='{}'.  Try changing ld_coeffs_source to a table that covers a sufficient range of values or set ld_mode to 'manual' and manually provide coefficients via ld_coeffs. Enable 'warning' logger to see out-of-bound arrays.".format(ldatm))
-                    else:
-                        if ld_mode=='interp':
-                            raise ValueError("Could not compute ldint with ldatm='{}'.  Try changing atm to a table that covers a sufficient range of values.  If necessary, set atm to 'blackbody' and/or ld_mode to 'manual' (in which case coefficients will need to be explicitly provided via ld_coeffs). Enable 'warning' logger to see out-of-bound arrays.".format(ldatm))
-                        elif ld_mode == 'lookup':
-                            raise ValueError("Could not compute ldint with ldatm='{}'.  Try changing atm to a table that covers a sufficient range of values.  If necessary, set atm to 'blackbody' and/or ld_mode to 'manual' (in which case coefficients will need to be explicitly provided via ld_coeffs). Enable 'warning' logger to see out-of-bound arrays.".format(ldatm))
+            teffs = mesh.teffs.for_computations
+            loggs = mesh.loggs.for_computations
+            abuns = mesh.abuns.for_computations
+
+            # ldint, the normal intensities and the extinction factors do not
+            # depend on mu, so we can reuse them for this dataset until the
+            # local quantities are recomputed (which always results in new
+            # arrays) or any of the atmosphere options change.
+            atm_key = (passband, intens_weighting, atm, ldatm, ld_mode, ld_func,
+                       None if ld_coeffs is None else tuple(np.atleast_1d(ld_coeffs)),
+                       extinct, Rv)
+            atm_cache = self._atm_cache.get(dataset, None) if mesh is self.mesh else None
+            if atm_cache is not None and atm_cache['key'] == atm_key and \
+                    atm_cache['teffs'] is teffs and \
+                    atm_cache['loggs'] is loggs and \
+                    atm_cache['abuns'] is abuns:
+                logger.debug("{}._populate_lc(dataset={}): using cached mu-independent intensities".format(self.component, dataset))
+                ld_coeffs = atm_cache['ld_coeffs']
+                ldint = atm_cache['ldint']
+                abs_normal_intensities = atm_cache['abs_normal_intensities']
+                extinct_factors = atm_cache['extinct_factors']
+            else:
+                abs_normal_intensities = None
+                if ld_mode == 'interp' and atm in ['ck2004', 'phoenix']:
+                    # interpolate the normal intensities and ldint in a single
+                    # sweep through the tables
+                    abs_normal_intensities, ldint, _ = pb.get_interpolator(atm, photon_weighted=intens_weighting=='photon').evaluate(teffs, loggs, abuns)
+                    if abs_normal_intensities is None or ldint is None or np.any(np.isnan(abs_normal_intensities)) or np.any(np.isnan(ldint)):
+                        # missing tables or out of bounds, let the calls below
+                        # raise the appropriate error
+                        abs_normal_intensities = None
+
+                if abs_normal_intensities is None:
+                    try:
+                        if ld_mode == 'lookup':
+                            # interpolate the coefficients once, instead of within
+                            # both pb.ldint and pb.Imu
+                            ld_coeffs = pb.interpolate_ldcoeffs(Teff=teffs,
+                                                                logg=loggs,
+                                                                abun=abuns,
+                                                                ldatm=ldatm,
+                                                                ld_func=ld_func,
+                                                                photon_weighted=intens_weighting=='photon')
+                        ldint = pb.ldint(Teff=teffs,
+                                         logg=loggs,
+                                         abun=abuns,
+                                         ldatm=ldatm,
+                                         ld_func=ld_func if ld_mode != 'interp' else ld_mode,
+                                         ld_coeffs=ld_coeffs,
+                                         photon_weighted=intens_weighting=='photon')
+                    except ValueError as err:
+                        if str(err).split(":")[0] == 'Atmosphere parameters out of bounds':
+                            # let's override with a more helpful error message
+                            logger.warning(str(err))
+                            if atm=='blackbody':
+                                raise ValueError("Could not compute ldint with ldatm='{}'.  Try changing ld_coeffs_source to a table that covers a sufficient range of values or set ld_mode to 'manual' and manually provide coefficients via ld_coeffs. Enable 'warning' logger to see out-of-bound arrays.".format(ldatm))
+                            else:
+                                if ld_mode=='interp':
+                                    raise ValueError("Could not compute ldint with ldatm='{}'.  Try changing atm to a table that covers a sufficient range of values.  If necessary, set atm to 'blackbody' and/or ld_mode to 'manual' (in which case coefficients will need to be explicitly provided via ld_coeffs). Enable 'warning' logger to see out-of-bound arrays.".format(ldatm))
+                                elif ld_mode == 'lookup':
+                                    raise ValueError("Could not compute ldint with ldatm='{}'.  Try changing atm to a table that covers a sufficient range of values.  If necessary, set atm to 'blackbody' and/or ld_mode to 'manual' (in which case coefficients will need to be explicitly provided via ld_coeffs). Enable 'warning' logger to see out-of-bound arrays.".format(ldatm))
+                                else:
+                                    # manual... this means that the atm itself is out of bounds, so the only option is atm=blackbody
+                                    raise ValueError("Could not compute ldint with ldatm='{}'.  Try changing atm to a table that covers a sufficient range of values.  If necessary, set atm to 'blackbody', ld_mode to 'manual', and provide coefficients via ld_coeffs. Enable 'warning' logger to see out-of-bound arrays.".format(ldatm))
                         else:
-                            # manual... this means that the atm itself is out of bounds, so the only option is atm=blackbody
-                            raise ValueError("Could not compute ldint with ldatm='{}'.  Try changing atm to a table that covers a sufficient range of values.  If necessary, set atm to 'blackbody', ld_mode to 'manual', and provide coefficients via ld_coeffs. Enable 'warning' logger to see out-of-bound arrays.".format(ldatm))
-                else:
-                    raise err
+                            raise err
+
+                    try:
+                        # abs_normal_intensities are the normal emergent passband intensities:
+                        abs_normal_intensities = pb.Inorm(Teff=teffs,
+                                                          logg=loggs,
+                                                          abun=abuns,
+                                                          atm=atm,
+                                                          ldatm=ldatm,
+                                                          ldint=ldint,
+                                                          photon_weighted=intens_weighting=='photon')
+                    except ValueError as err:
+                        if str(err).split(":")[0] == 'Atmosphere parameters out of bounds':
+                            # let's override with a more helpful error message
+                            logger.warning(str(err))
+                            raise ValueError("Could not compute intensities with atm='{}'.  Try changing atm to a table that covers a sufficient range of values (or to 'blackbody' in which case ld_mode will need to be set to 'manual' and coefficients provided via ld_coeffs).  Enable 'warning' logger to see out-of-bounds arrays.".format(atm))
+                        else:
+                            raise err
 
-            try:
-                # abs_normal_intensities are the normal emergent passband intensities:
-                abs_normal_intensities = pb.Inorm(Teff=self.mesh.teffs.for_computations,
-                                                  logg=self.mesh.loggs.for_computations,
-                                                  abun=self.mesh.abuns.for_computations,
-                                                  atm=atm,
-                                                  ldatm=ldatm,
-                                                  ldint=ldint,
-                                                  photon_weighted=intens_weighting=='photon')
-            except ValueError as err:
-                if str(err).split(":")[0] == 'Atmosphere parameters out of bounds':
-                    # let's override with a more helpful error message
-                    logger.warning(str(err))
-                    raise ValueError("Could not compute intensities with atm='{}'.  Try changing atm to a table that covers a sufficient range of values (or to 'blackbody' in which case ld_mode will need to be set to 'manual' and coefficients provided via ld_coeffs).  Enable 'warning' logger to see out-of-bounds arrays.".format(atm))
+                if extinct == 0.0:
+                    extinct_factors = 1.0
                 else:
-                    raise err
+                    extinct_factors = pb.interpolate_extinct(Teff=teffs,
+                                                             logg=loggs,
+                                                             abun=abuns,
+                                                             extinct=extinct,
+                                                             Rv=Rv,
+                                                             atm=atm,
+                                                             photon_weighted=intens_weighting=='photon')
+
+                if mesh is self.mesh:
+                    self._atm_cache[dataset] = {'key': atm_key,
+                                                'teffs': teffs,
+                                                'loggs': loggs,
+                                                'abuns': abuns,
+                                                'ld_coeffs': ld_coeffs,
+                                                'ldint': ldint,
+                                                'abs_normal_intensities': abs_normal_intensities,
+                                                'extinct_factors': extinct_factors}
+
+            # the projected intensities are only needed for elements that are
+            # (at least partially) visible, so if visibilities are available
+            # we'll only interpolate those and leave the rest at zero (unless
+            # visible_only=False, see fill_hidden_intensities).
+            visible = mesh.visible_for_computations if kwargs.get('visible_only', True) else None
 
             # abs_intensities are the projected (limb-darkened) passband intensities
-            # TODO: why do we need to use abs(mus) here?
-            # ! Because the interpolation within Imu will otherwise fail.
-            # ! It would be best to pass only [visibilities > 0] elements to Imu.
-            abs_intensities = pb.Imu(Teff=self.mesh.teffs.for_computations,
-                                     logg=self.mesh.loggs.for_computations,
-                                     abun=self.mesh.abuns.for_computations,
-                                     mu=abs(self.mesh.mus_for_computations),
+            # NOTE: abs(mus) is still needed for partially visible triangles
+            # whose vertices (when computing at vertices) may be facing away.
+            abs_intensities = pb.Imu(Teff=teffs,
+                                     logg=loggs,
+                                     abun=abuns,
+                                     mu=abs(mesh.mus_for_computations),
                                      atm=atm,
                                      ldatm=ldatm,
                                      ldint=ldint,
                                      ld_func=ld_func if ld_mode != 'interp' else ld_mode,
                                      ld_coeffs=ld_coeffs,
-                                     photon_weighted=intens_weighting=='photon')
-
+                                     photon_weighted=intens_weighting=='photon',
+                                     mask=visible)
 
             # Beaming/boosting
             if boosting_method == 'none' or ignore_effects:
                 boost_factors = 1.0
             elif boosting_method == 'linear':
                 logger.debug("calling pb.bindex for boosting_method='linear'")
-                bindex = pb.bindex(Teff=self.mesh.teffs.for_computations,
-                                   logg=self.mesh.loggs.for_computations,
-                                   abun=self.mesh.abuns.for_computations,
-                                   mu=abs(self.mesh.mus_for_computations),
+                bindex = pb.bindex(Teff=teffs,
+                                   logg=loggs,
+                                   abun=abuns,
+                                   mu=abs(mesh.mus_for_computations),
                                    atm=atm,
-                                   photon_weighted=intens_weighting=='photon')
+                                   photon_weighted=intens_weighting=='photon',
+                                   mask=visible)
 
-                boost_factors = 1.0 + bindex * self.mesh.velocities.for_computations[:,2]/37241.94167601236
+                boost_factors = 1.0 + bindex * mesh.velocities.for_computations[:,2]/37241.94167601236
             else:
                 raise NotImplementedError("boosting_method='{}' not supported".format(self.boosting_method))
 
@@ -1897,21 +2292,11 @@ class Star(Body):
             # normal intensities
             abs_intensities *= boost_factors
 
-            if extinct == 0.0:
-                extinct_factors = 1.0
-            else:
-                extinct_factors = pb.interpolate_extinct(Teff=self.mesh.teffs.for_computations,
-                                                         logg=self.mesh.loggs.for_computations,
-                                                         abun=self.mesh.abuns.for_computations,
-                                                         extinct=extinct,
-                                                         Rv=Rv,
-                                                         atm=atm,
-                                                         photon_weighted=intens_weighting=='photon')
-
-                # extinction is NOT aspect dependent, so we'll correct both
-                # normal and directional intensities
-                abs_intensities *= extinct_factors
-                abs_normal_intensities *= extinct_factors
+            # extinction is NOT aspect dependent, so we'll correct both
+            # normal and directional intensities (without touching the
+            # cached arrays)
+            abs_intensities *= extinct_factors
+            abs_normal_intensities = abs_normal_intensities * extinct_factors
 
             # Handle pblum - distance and l3 scaling happens when integrating (in observe)
             # we need to scale each triangle so that the summed normal_intensities over the
@@ -100,11 +100,15 @@ class ConstraintVar(object):
         """
         if self.is_param:
             # TODO: CAREFUL, this may cause infinite loops if we try to run constraints through get_value
-            try:
-                return self._bundle.get_quantity(uniqueid=self.unique_label, units=units, t=t, check_visible=False, check_default=False)
-            except AttributeError:
+            # NOTE: this uses the cached parameter object rather than filtering
+            # the bundle as this is called for every variable whenever a
+            # constraint is run
+            param = self.get_parameter()
+            if hasattr(param, 'get_quantity'):
+                return param.get_quantity(unit=units, t=t)
+            else:
                 # then not a FloatParameter
-                return self._bundle.get_value(uniqueid=self.unique_label, check_visible=False, check_default=False)
+                return param.get_value()
 
         else:
             # TODO: constants and methods
@@ -118,7 +122,11 @@ class ConstraintVar(object):
         """
         if self.is_param:
             # TODO: CAREFUL, this may cause infinite loops if we try to run constraints through get_value
-            return self._bundle.get_value(uniqueid=self.unique_label, units=units, t=t, check_visible=False, check_default=False)
+            param = self.get_parameter()
+            if hasattr(param, 'get_quantity'):
+                return param.get_value(unit=units, t=t)
+            else:
+                return param.get_value()
 
         else:
             # TODO: constants and methods
@@ -38,6 +38,29 @@ def dynamics_from_bundle(b, times, compute=None, return_euler=False, **kwargs):
         set to True.
 
     """
+    # make sure times is an array and not a list
+    times = np.array(times)
+
+    return dynamics(times, return_euler=return_euler,
+                    **elements_from_bundle(b, compute=compute, **kwargs))
+
+def elements_from_bundle(b, compute=None, **kwargs):
+    """
+    Parse parameters in the bundle into the arguments of :func:`dynamics`.
+
+    This allows calling :func:`dynamics` repeatedly (ie. from an iterative
+    solver) without looking up parameters in the bundle each time.
+
+    NOTE: you must either provide compute (the label) OR all relevant options
+    as kwargs (ltte)
+
+    Args:
+        b: (Bundle) the bundle with a set hierarchy
+
+    Returns:
+        dictionary of all arguments (except times and return_euler) to be
+        passed to :func:`dynamics`.
+    """
 
     b.run_delayed_constraints()
 
@@ -47,9 +70,6 @@ def dynamics_from_bundle(b, times, compute=None, return_euler=False, **kwargs):
     else:
         ltte = False
 
-    # make sure times is an array and not a list
-    times = np.array(times)
-
     vgamma = b.get_value(qualifier='vgamma', context='system', unit=u.solRad/u.d, **_skip_filter_checks)
     t0 = b.get_value(qualifier='t0', context='system', unit=u.d, **_skip_filter_checks)
 
@@ -120,10 +140,11 @@ def dynamics_from_bundle(b, times, compute=None, return_euler=False, **kwargs):
         components.append([hier.get_primary_or_secondary(component=comp) for comp in [component]+ancestororbits[:-1]])
 
 
-    return  dynamics(times, periods, eccs, smas, t0_perpasses, per0s, \
-                    long_ans, incls, dpdts, deccdts, dperdts, \
-                    components, t0, vgamma, \
-                    mass_conservation=True, ltte=ltte, return_euler=return_euler)
+    return dict(periods=periods, eccs=eccs, smas=smas,
+                t0_perpasses=t0_perpasses, per0s=per0s, long_ans=long_ans,
+                incls=incls, dpdts=dpdts, deccdts=deccdts, dperdts=dperdts,
+                components=components, t0=t0, vgamma=vgamma,
+                mass_conservation=True, ltte=ltte)
 
 
 
@@ -35,12 +35,15 @@ from phoebe.parameters import constraint as _constraint
 from phoebe.parameters import feature as _feature
 from phoebe.parameters import figure as _figure
 from phoebe.parameters import server as _server
-from phoebe.parameters.parameters import _uniqueid, _clientid, _return_ps, _extract_index_from_string, _corner_twig, _corner_label, _cached_crimpl_servers
+from phoebe.parameters.parameters import _uniqueid, _clientid, _return_ps, _extract_index_from_string, _corner_twig, _corner_label, _cached_crimpl_servers, _lazy_context
+from phoebe.parameters import archive as _archive
 from phoebe.backend import backends, mesh
 from phoebe.backend import universe as _universe
 from phoebe.solverbackends import solverbackends as _solverbackends
 from phoebe.distortions import roche
 from phoebe.frontend import io
+from phoebe.frontend import session as _session
+from phoebe.frontend import residuals as _residuals
 from phoebe.atmospheres.passbands import list_installed_passbands, list_online_passbands, get_passband, update_passband, _timestamp_to_dt
 from phoebe import pool as _pool
 from phoebe.dependencies import distl as _distl
@@ -63,6 +66,10 @@ _bundle_cache_dir = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath
 
 _skip_filter_checks = {'check_default': False, 'check_visible': False}
 
+# maximum number of passes through circular constraints, see
+# Bundle._run_constraints_downstream
+_max_constraint_passes = 100
+
 # Attempt imports for client requirements
 try:
     """
@@ -137,6 +144,18 @@ def _is_equiv_array_or_float(value1, value2):
     else:
         return value1 == value2
 
+def _constraint_value_changed(value1, value2):
+    # same tolerance as used by FloatParameter.set_quantity to decide whether
+    # to trigger any constraints
+    if value1 is value2:
+        return False
+    try:
+        if isinstance(value1, u.Quantity) and isinstance(value2, u.Quantity) and value1.isscalar and value2.isscalar:
+            return not abs(value1 - value2).value < 1e-12
+        return not _is_equiv_array_or_float(value1, value2)
+    except Exception:
+        return True
+
 
 class RunChecksItem(object):
     def __init__(self, b, message, param_uniqueids=[], fail=True, affects_methods=[]):
@@ -540,7 +559,8 @@ class Bundle(ParameterSet):
         self._mpllinestylecyclers = {k: _figure.MPLPropCycler('linestyle', _figure._mpllinestyles) for k in ['default', 'component', 'dataset', 'model']}
 
     @classmethod
-    def open(cls, filename, import_from_older=True, import_from_newer=False):
+    def open(cls, filename, import_from_older=True, import_from_newer=False,
+             lazy_contexts=['model']):
         """
         For convenience, this function is available at the top-level as
         <phoebe.open> or <phoebe.load> as well as
@@ -548,7 +568,8 @@ class Bundle(ParameterSet):
 
         Open a new bundle.
 
-        Open a bundle from a JSON-formatted PHOEBE 2 file.
+        Open a bundle from a JSON-formatted or binary PHOEBE 2 file (see
+        <phoebe.frontend.bundle.Bundle.save>).
         This is a constructor so should be called as:
 
         ```py
@@ -581,6 +602,12 @@ class Bundle(ParameterSet):
             logger (at warning level or higher) to see messages.  If False, an
             error will be raised.  This is off by default as we cannot guarantee
             support with future changes to the code.
+        * `lazy_contexts` (list, optional, default=['model']): contexts whose
+            parameters are only created once they are accessed (ie. by filtering
+            for a model).  Only applies to binary files, in which case the arrays
+            are also memory-mapped from the file, so the file should not be
+            changed while the bundle is in use.  Only the 'model' and 'solution'
+            contexts can be loaded lazily.
 
         Returns
         ---------
@@ -590,16 +617,31 @@ class Bundle(ParameterSet):
         ---------
         * RuntimeError: if the version of the imported file fails to load according
             to `import_from_older` or `import_from_newer`.
+        * ValueError: if `lazy_contexts` includes contexts other than 'model'
+            or 'solution'.
         """
         def _ps_dict(ps, include_constrained=True):
             return {p.qualifier: p.get_quantity() if hasattr(p, 'get_quantity') else p.get_value() for p in ps.to_list() if (include_constrained or not p.is_constraint)}
 
+        for context in lazy_contexts:
+            if context not in ['model', 'solution']:
+                raise ValueError("lazy_contexts can only include 'model' and 'solution'")
+
+        archive = None
         if io._is_file(filename):
-            f = filename
+            if _archive.is_archive(filename):
+                filename.seek(0)
+                archive = _archive.Archive(filename)
+            else:
+                filename.seek(0)
+                f = filename
         elif isinstance(filename, str):
             filename = os.path.expanduser(filename)
             logger.debug("importing from {}".format(filename))
-            f = open(filename, 'r')
+            if _archive.is_archive(filename):
+                archive = _archive.Archive(filename)
+            else:
+                f = open(filename, 'r')
         elif isinstance(filename, list):
             # we'll handle later
             pass
@@ -608,12 +650,19 @@ class Bundle(ParameterSet):
 
         if isinstance(filename, list):
             data = filename
+        elif archive is not None:
+            data = [archive.resolve(param_dict) for context in archive.contexts if context not in lazy_contexts for param_dict in archive.get_params(context)]
         else:
             data = json.load(f, object_pairs_hook=parse_json)
             f.close()
 
         b = cls(data)
 
+        if archive is not None:
+            for context in archive.contexts:
+                if context in lazy_contexts:
+                    b._lazy_contexts[context] = _lazy_context(archive, context)
+
         version = b.get_value(qualifier='phoebe_version', check_default=False, check_visible=False)
         phoebe_version_import = parse(version.split('.dev')[0])
         phoebe_version_this = parse(__version__.split('.dev')[0])
@@ -635,6 +684,9 @@ class Bundle(ParameterSet):
         elif not import_from_older:
             raise RuntimeError("The file/bundle is from an older version of PHOEBE ({}) than installed ({}). Attempt importing by passing import_from_older=True.".format(phoebe_version_import, phoebe_version_this))
 
+        # migrations may need to access any parameter
+        b._load_lazy_contexts()
+
         # temporarily disable interactive_checks, check_default, and check_visible
         conf_interactive_checks = conf.interactive_checks
         if conf_interactive_checks:
@@ -1343,10 +1395,95 @@ class Bundle(ParameterSet):
 
         return b
 
-    def save(self, filename, compact=False, incl_uniqueid=True):
+    def _copy_lightweight(self, uniqueids=[]):
+        """
+        Copy the Bundle for a single forward-model, ie. a single likelihood
+        evaluation within a solver or a single sample from `sample_from` in
+        <phoebe.frontend.bundle.Bundle.run_compute>.
+
+        Unlike <phoebe.parameters.ParameterSet.copy>, the values and other
+        attributes of the parameters are not deepcopied.  Each parameter is
+        copied shallowly so that it can be changed, removed, or constrained in
+        the copy without affecting this Bundle, but the copy shares all values
+        (observations, meshes, distributions, etc) that are not changed.  This
+        relies on values being replaced (ie. by
+        <phoebe.parameters.Parameter.set_value>) rather than changed in-place,
+        so the values of the parameters in `uniqueids` are deepcopied to be
+        safe.
+
+        Arguments
+        ----------
+        * `uniqueids` (list, optional, default=[]): uniqueids (with optional
+            index) of the parameters which will be changed in the copy.
+
+        Returns
+        ---------
+        * (<phoebe.frontend.bundle.Bundle>)
+        """
+        deepcopy_uniqueids = set(_extract_index_from_string(uniqueid)[0] for uniqueid in uniqueids)
+
+        b = self.__class__.__new__(self.__class__)
+        b.__dict__.update(self.__dict__)
+        b._bundle = b
+        b._filter = self._filter.copy()
+        b._filter_index = None
+        b._delayed_constraints = list(self._delayed_constraints)
+        b._failed_constraints = list(self._failed_constraints)
+        b._lazy_contexts = dict(self._lazy_contexts)
+        b._server_clients = []
+        b._af_figure = None
+
+        b._params = []
+        newparams = {}
+        copied_vars = []
+        for param in self._params:
+            newparam = param.__class__.__new__(param.__class__)
+            newparam.__dict__.update(param.__dict__)
+            newparam._bundle = b
+            if hasattr(param, '_in_constraints'):
+                newparam._in_constraints = list(param._in_constraints)
+            if param.uniqueid in deepcopy_uniqueids:
+                newparam._value = _deepcopy(param._value)
+
+            if param.__class__.__name__ == 'ConstraintParameter':
+                # the variables cache the parameter objects (from this bundle)
+                newvars = {}
+                for var in param._vars + param._addl_vars:
+                    if id(var) not in newvars:
+                        newvar = var.__class__.__new__(var.__class__)
+                        newvar.__dict__.update(var.__dict__)
+                        newvar._bundle = b
+                        newvars[id(var)] = newvar
+                        copied_vars.append(newvar)
+                newparam._vars = [newvars[id(var)] for var in param._vars]
+                newparam._addl_vars = [newvars[id(var)] for var in param._addl_vars]
+                newparam._var_params = None
+                newparam._addl_var_params = None
+                newparam._constraint_kwargs = param._constraint_kwargs.copy()
+
+            if param is self._hierarchy_param:
+                b._hierarchy_param = newparam
+
+            b._params.append(newparam)
+            newparams[id(param)] = newparam
+
+        # point the cached parameter objects of the variables to the copies
+        for var in copied_vars:
+            if var._parameter is not None:
+                var._parameter = newparams.get(id(var._parameter), None)
+
+        return b
+
+    def save(self, filename, compact=False, incl_uniqueid=True, binary=False):
         """
-        Save the bundle to a JSON-formatted ASCII file.  This will run failed
-        and delayed constraints and raise an error if they fail.
+        Save the bundle to a JSON-formatted ASCII file (or a binary file if
+        `binary=True`).  This will run failed and delayed constraints and raise
+        an error if they fail.
+
+        The binary format stores numeric arrays (ie. times, fluxes, and mesh
+        columns) as separate blocks instead of converting them to JSON, making
+        it much faster to save and load bundles with large models.  Both
+        formats are read by <phoebe.frontend.bundle.Bundle.open>.
 
         See also:
         * <phoebe.parameters.ParameterSet.save>
@@ -1357,6 +1494,8 @@ class Bundle(ParameterSet):
         * `filename` (string): relative or full path to the file
         * `compact` (bool, optional, default=False): whether to use compact
             file-formatting (may be quicker to save/load, but not as easily readable)
+        * `binary` (bool, optional, default=False): whether to save in the
+            binary format.  See <phoebe.parameters.ParameterSet.save>.
 
         Returns
         -------------
@@ -1369,7 +1508,7 @@ class Bundle(ParameterSet):
         self.run_delayed_constraints()
         self.run_failed_constraints()
         return super(Bundle, self).save(filename, incl_uniqueid=incl_uniqueid,
-                                        compact=compact)
+                                        compact=compact, binary=binary)
 
     def export_legacy(self, filename, compute=None, skip_checks=False):
         """
@@ -1640,6 +1779,9 @@ class Bundle(ParameterSet):
                 server_changes += self._attach_param_from_server(paramdict)
                 added_new_params = True
 
+        # tags may have been changed in-place above
+        self._invalidate_filter_index()
+
         if added_new_params:
             # we skipped processing copy_for to avoid copying before all parameters
             # were loaded, so we should do that now.
@@ -1896,6 +2038,7 @@ class Bundle(ParameterSet):
         for param in self.filter(check_visible=False, check_default=False, **{tag: old_value}).to_list():
             setattr(param, '_{}'.format(tag), new_value)
             affected_params.append(param)
+        self._invalidate_filter_index()
         for param in self.filter(context='constraint', check_visible=False, check_default=False).to_list():
             for k, v in param.constraint_kwargs.items():
                 if v == old_value:
@@ -7722,8 +7865,21 @@ class Bundle(ParameterSet):
         kwargs['check_default'] = False
         # print "***", kwargs
         expression_param = self.get_parameter(**kwargs)
-        logger.debug("bundle.run_constraint {}".format(expression_param.twig))
+        constrained_param = self._get_constrained_parameter(expression_param)
 
+        result = self._run_constraint(expression_param, constrained_param, suppress_error=suppress_error)
+
+        if return_parameter:
+            return constrained_param
+        else:
+            return result
+
+    def _get_constrained_parameter(self, expression_param):
+        # the constrained parameter is one of the variables in the expression,
+        # whose parameters are cached, so avoid filtering the bundle if possible
+        matches = [param for param in [var.get_parameter() for var in expression_param._vars] if param.context in ['system', 'component', 'dataset', 'feature'] and param.qualifier == expression_param.qualifier and param.component == expression_param.component and param.dataset == expression_param.dataset and param.feature == expression_param.feature]
+        if len(matches) == 1:
+            return matches[0]
 
         kwargs = {}
         kwargs['twig'] = None
@@ -7742,7 +7898,10 @@ class Bundle(ParameterSet):
 
         kwargs['check_visible'] = False
         kwargs['check_default'] = False
-        constrained_param = self.get_parameter(**kwargs)
+        return self.get_parameter(**kwargs)
+
+    def _run_constraint(self, expression_param, constrained_param, suppress_error=True, run_constraints=None):
+        logger.debug("bundle.run_constraint {}".format(expression_param.twig))
 
         try:
             result = expression_param.get_result(suppress_error=False)
@@ -7767,9 +7926,9 @@ class Bundle(ParameterSet):
         # we won't bother checking for arrays (we'd have to do np.all),
         # but for floats, let's only set the value if the value has changed.
         if not isinstance(result, float) or result != constrained_param.get_value():
-            logger.debug("setting '{}'={} from '{}' constraint".format(constrained_param.uniquetwig, result, expression_param.uniquetwig))
+            logger.debug("setting '{}'={} from '{}' constraint".format(constrained_param.twig, result, expression_param.twig))
             try:
-                constrained_param.set_value(result, from_constraint=True, force=True)
+                constrained_param.set_value(result, from_constraint=True, force=True, run_constraints=run_constraints)
             except Exception as e:
                 if expression_param.uniqueid not in self._failed_constraints:
                     self._failed_constraints.append(expression_param.uniqueid)
@@ -7787,11 +7946,111 @@ class Bundle(ParameterSet):
                         e.args = (message_prefix + str(e),) + e.args[1:]
                     raise
 
+        return result
 
-        if return_parameter:
-            return constrained_param
-        else:
-            return result
+    def _run_constraints_downstream(self, constraint_ids, suppress_error=True):
+        """
+        Run the constraints in `constraint_ids` as well as any constraints
+        which (directly or indirectly) depend on their constrained parameters.
+
+        The dependency graph is built from the `_in_constraints` of the
+        constrained parameters and the constraints are then run in topological
+        order so that each constraint is run once (instead of recursively each
+        time one of its variables changes).  Downstream constraints are skipped
+        if none of the constraints they depend on changed the value of their
+        constrained parameter.  Any circular dependencies are repeated until
+        the values no longer change.
+
+        Returns
+        ---------
+        * (list): list of the constrained <phoebe.parameters.Parameter> objects
+            of all constraints that were run.
+        """
+        # resolve the constraints by uniqueid from a single pass through all
+        # parameters instead of filtering for each
+        params_by_uniqueid = {param.uniqueid: param for param in self._params}
+        def _get_expression_param(constraint_id):
+            expression_param = params_by_uniqueid.get(constraint_id, None)
+            if expression_param is None or expression_param.context != 'constraint':
+                # raise the same error as filtering would
+                expression_param = self.get_parameter(uniqueid=constraint_id, context='constraint', **_skip_filter_checks)
+            return expression_param
+
+        def _depends_on(expression_param, param):
+            # _in_constraints also includes the constraints in which param is
+            # only an additional variable (available for flipping), so only
+            # consider those in which it actually appears in the expression
+            for var in expression_param._vars + expression_param._addl_vars:
+                if var.unique_label == param.uniqueid and var.safe_label in expression_param._value:
+                    return True
+            return False
+
+        # build the graph of all downstream constraints (in order of discovery)
+        order = []
+        nodes = {}
+        queue = list(constraint_ids)
+        while len(queue):
+            constraint_id = queue.pop(0)
+            if constraint_id in nodes:
+                continue
+            expression_param = _get_expression_param(constraint_id)
+            constrained_param = self._get_constrained_parameter(expression_param)
+            children = [child for child in getattr(constrained_param, '_in_constraints', []) if _depends_on(_get_expression_param(child), constrained_param)]
+            nodes[constraint_id] = (expression_param, constrained_param, children)
+            order.append(constraint_id)
+            queue += children
+
+        # topological sort (Kahn's algorithm, retaining the order of discovery
+        # where possible)
+        nparents = {constraint_id: 0 for constraint_id in order}
+        for constraint_id in order:
+            for child in nodes[constraint_id][2]:
+                nparents[child] += 1
+        sorted_ids = []
+        ready = [constraint_id for constraint_id in order if nparents[constraint_id] == 0]
+        while len(ready):
+            constraint_id = ready.pop(0)
+            sorted_ids.append(constraint_id)
+            for child in nodes[constraint_id][2]:
+                nparents[child] -= 1
+                if nparents[child] == 0:
+                    ready.append(child)
+        if len(sorted_ids) < len(order):
+            # circular dependencies (ie. when flipping mass to solve for q),
+            # these are run in the order of discovery and repeated below until
+            # the values converge
+            sorted_ids += [constraint_id for constraint_id in order if constraint_id not in sorted_ids]
+
+        # setting the constrained parameters with run_constraints=False will
+        # append their constraints to the delayed constraints, but these are
+        # all handled by this pass
+        delayed_constraints = self._delayed_constraints
+        self._delayed_constraints = []
+
+        changes = []
+        needs_run = set(constraint_ids)
+        try:
+            for i in range(_max_constraint_passes):
+                if not len(needs_run):
+                    break
+                for constraint_id in sorted_ids:
+                    if constraint_id not in needs_run:
+                        continue
+                    needs_run.remove(constraint_id)
+                    expression_param, constrained_param, children = nodes[constraint_id]
+                    orig_value = constrained_param._value
+                    self._run_constraint(expression_param, constrained_param, suppress_error=suppress_error, run_constraints=False)
+                    if constrained_param not in changes:
+                        changes.append(constrained_param)
+                    if _constraint_value_changed(orig_value, constrained_param._value):
+                        needs_run.update(children)
+            else:
+                if len(needs_run):
+                    logger.error("circular constraints did not converge after {} passes".format(_max_constraint_passes))
+        finally:
+            self._delayed_constraints = delayed_constraints + [constraint_id for constraint_id in self._delayed_constraints if constraint_id not in nodes and constraint_id not in delayed_constraints]
+
+        return changes
 
     def run_delayed_constraints(self):
         """
@@ -7818,16 +8077,12 @@ class Bundle(ParameterSet):
 
         """
         changes = []
-        delayed_constraints = self._delayed_constraints
-        self._delayed_constraints = []
-        for constraint_id in delayed_constraints:
-            param = self.run_constraint(uniqueid=constraint_id, return_parameter=True, skip_kwargs_checks=True)
-            if param not in changes:
-                changes.append(param)
-        if len(self._delayed_constraints):
-            # some of the calls above may have delayed even more constraints,
-            # we must keep calling recursively until they're all cleared
-            changes += self.run_delayed_constraints()
+        while len(self._delayed_constraints):
+            delayed_constraints = self._delayed_constraints
+            self._delayed_constraints = []
+            for param in self._run_constraints_downstream(delayed_constraints):
+                if param not in changes:
+                    changes.append(param)
 
         return changes
 
@@ -7859,6 +8114,96 @@ class Bundle(ParameterSet):
                 changes.append(param)
         return changes
 
+    def set_values(self, values, run_checks=None, run_constraints=None, **kwargs):
+        """
+        Set the values of several parameters at once, referenced by their
+        uniqueids.
+
+        All values are set before running any constraints (in a single pass,
+        see <phoebe.frontend.bundle.Bundle.run_delayed_constraints>) or checks,
+        which makes this much cheaper than calling
+        <phoebe.parameters.ParameterSet.set_value> for each parameter
+        individually (as is done when sampling or optimizing).
+
+        See also:
+        * <phoebe.parameters.ParameterSet.set_value>
+        * <phoebe.frontend.bundle.Bundle.run_delayed_constraints>
+
+        Arguments
+        ----------
+        * `values` (dict): values (float, quantity, or array) per uniqueid.
+            The uniqueid can include an index (ie. 'uniqueid[0]') to set a
+            single entry of a <phoebe.parameters.FloatArrayParameter>.
+        * `run_checks` (bool, optional): whether to call
+            <phoebe.frontend.bundle.Bundle.run_checks> after setting the values.
+            If `None`, the value in `phoebe.conf.interactive_checks` will be used.
+        * `run_constraints` (bool, optional): whether to run any necessary
+            constraints after setting the values.  If `None`, the value in
+            `phoebe.conf.interactive_constraints` will be used.  If False, the
+            constraints will be delayed (see
+            <phoebe.frontend.bundle.Bundle.run_delayed_constraints>).
+        * `**kwargs`: additional keyword arguments are passed along to
+            `set_value` for every parameter (ie. `unit` or `force`).
+
+        Returns
+        ----------
+        * <phoebe.parameters.ParameterSet> of all changed parameters (including
+            those changed by constraints).
+
+        Raises
+        ----------
+        * ValueError: if any of the uniqueids could not be found, any of the
+            values could not be set (ie. outside the limits), or any of the
+            constraints failed.  All failures are included in the error message,
+            after all other values have been set.
+        """
+        uniqueids_indices = [(_extract_index_from_string(uniqueid_orig), value) for uniqueid_orig, value in values.items()]
+        # NOTE: a single pass through the parameters is much cheaper than
+        # filtering (which needs to build the filter index of a new copy)
+        uniqueids = set(uniqueid for (uniqueid, index), value in uniqueids_indices)
+        params = {param.uniqueid: param for param in self._params if param.uniqueid in uniqueids}
+
+        if run_constraints is None:
+            run_constraints = conf.interactive_constraints
+        if run_checks is None:
+            run_checks = conf.interactive_checks
+
+        errors = []
+        changed_params = []
+        for (uniqueid, index), value in uniqueids_indices:
+            param = params.get(uniqueid, None)
+            if param is None:
+                errors.append("no parameter found with uniqueid='{}'".format(uniqueid))
+                continue
+
+            try:
+                if index is None:
+                    param.set_value(value, run_checks=False, run_constraints=False, **kwargs)
+                else:
+                    param.set_index_value(index, value, run_checks=False, run_constraints=False, **kwargs)
+            except ValueError as err:
+                errors.append("{}: {}".format(param.twig, err))
+            else:
+                if param not in changed_params:
+                    changed_params.append(param)
+
+        if run_constraints:
+            failed_constraints = list(self._failed_constraints)
+            for param in self.run_delayed_constraints():
+                if param not in changed_params:
+                    changed_params.append(param)
+            for constraint_id in self._failed_constraints:
+                if constraint_id not in failed_constraints:
+                    errors.append("constraint '{}' failed".format(self.get_parameter(uniqueid=constraint_id, context='constraint', **_skip_filter_checks).twig))
+
+        if len(errors):
+            raise ValueError("could not set values: {}".format("; ".join(errors)))
+
+        if run_checks:
+            report = self.run_checks(allow_skip_constraints=True, raise_logger_warning=True)
+
+        return _return_ps(self, ParameterSet(changed_params))
+
 
     def _add_single_distribution(self, twig=None, value=None, return_changes=False, **kwargs):
         """
@@ -10747,7 +11092,9 @@ class Bundle(ParameterSet):
             if not kwargs.get('skip_compute_ld_coeffs', False):
                 self.compute_ld_coeffs(compute=compute, set_value=True, skip_checks=True, **{k:v for k,v in kwargs.items() if k not in ['ret_structured_dicts', 'pblum_mode', 'pblum_method', 'skip_checks']})
             # TODO: make sure this accepts all compute parameter overrides (distortion_method, etc)
-            system = kwargs.get('system', self._compute_intrinsic_system_at_t0(compute=compute, datasets=pblum_datasets, atms=atms, **kwargs))
+            system = kwargs.get('system', None)
+            if system is None:
+                system = self._compute_intrinsic_system_at_t0(compute=compute, datasets=pblum_datasets, atms=atms, **kwargs)
             logger.debug("computing observables with ignore_effects=True for {}".format(pblum_datasets))
             system.populate_observables(t0, ['lc'], pblum_datasets, ignore_effects=True)
         elif pblum_method == 'stefan-boltzmann':
@@ -11316,7 +11663,7 @@ class Bundle(ParameterSet):
 
         # we'll wait to here to run kwargs and system checks so that
         # add_compute is already called if necessary
-        allowed_kwargs = ['skip_checks', 'jobid', 'overwrite', 'max_computations', 'in_export_script', 'out_fname', 'solution', 'progressbar']
+        allowed_kwargs = ['skip_checks', 'jobid', 'overwrite', 'max_computations', 'in_export_script', 'out_fname', 'solution', 'progressbar', 'stream_fname']
         if conf.devel:
             allowed_kwargs += ['mesh_init_phi']
         self._kwargs_checks(kwargs, allowed_kwargs, ps=computes_ps)
@@ -11611,6 +11958,100 @@ class Bundle(ParameterSet):
         ret_changes += self._handle_figure_time_source_params(return_changes=return_changes)
         return ret_changes
 
+    def compute_session(self, compute=None):
+        """
+        Create a persistent forward-model session for repeated calls to
+        <phoebe.frontend.bundle.Bundle.run_compute> with the same compute
+        options (while changing parameter values between calls).
+
+        The session tracks which parameters changed since its previous
+        evaluation and re-uses the passband luminosities, third lights,
+        meshes, dynamics and infolists whenever each is unaffected.  In
+        particular, changing only `incl` (or `long_an`) will not remesh or
+        recompute pblums, and changing only `teff` will not remesh or
+        recompute the dynamics.  Note that meshes re-used after a change in
+        `incl` only agree with those of a fresh computation to within mesh
+        discretization (~1e-4 in flux).  Solvers use a session unless disabled
+        with <phoebe.solver_compute_session_off>.
+
+        ```py
+        session = b.compute_session(compute='phoebe01')
+        for incl in [80, 85, 90]:
+            b.set_value(qualifier='incl', component='binary', value=incl)
+            session.run_compute(model='incl{}'.format(incl))
+        ```
+
+        Arguments
+        ----------
+        * `compute` (string, optional, default=None): label of the compute
+            options.  Required if more than one set of compute options are
+            attached to the bundle.
+
+        Returns
+        ----------
+        * a <phoebe.frontend.session.ComputeSession> object
+
+        Raises
+        --------
+        * ValueError: if `compute` is not provided but more than one set of
+            compute options are attached.
+        """
+        if compute is None:
+            if len(self.computes) != 1:
+                raise ValueError("must provide compute")
+            compute = self.computes[0]
+        elif compute not in self.computes:
+            raise ValueError("compute='{}' not found".format(compute))
+
+        return _session.ComputeSession(self, compute)
+
+    def residual_plan(self, model=None, dataset=None, component=None,
+                      consider_gaussian_process=True, mask_enabled=None,
+                      mask_phases=None):
+        """
+        Create a plan for repeated calls to
+        <phoebe.parameters.ParameterSet.calculate_lnlikelihood> (or
+        <phoebe.parameters.ParameterSet.calculate_chi2>) for a model that is
+        recomputed (with the same label) while changing parameter values
+        between calls.
+
+        The observations, sigmas, and masks are only read once and the weights
+        to interpolate the model to the observed times are only computed once
+        (as long as the times of the model do not change).  The observations
+        should therefore not be changed while using the plan.
+
+        ```py
+        plan = b.residual_plan(model='latest')
+        for incl in [80, 85, 90]:
+            b.set_value(qualifier='incl', component='binary', value=incl)
+            b.run_compute(model='latest', overwrite=True)
+            print(plan.calculate_lnlikelihood())
+        ```
+
+        Arguments
+        ----------
+        * `model` (string, optional, default=None): label of the model.
+        * `dataset` (string or list, optional, default=None): datasets to
+            include.  If not provided, will include all datasets in the model.
+        * `component` (string or list, optional, default=None): components to
+            include.  If not provided, will include all components in the model.
+        * `consider_gaussian_process` (bool, optional, default=True): whether
+            to consider a system with gaussian process(es) as time-dependent.
+        * `mask_enabled` (bool, optional, default=None): whether to enable
+            masking on the dataset(s).  If None or not provided, will default
+            to the values set in the dataset(s).
+        * `mask_phases` (list of tuples, optional, default=None): phase masks
+            to apply if `mask_enabled = True`.  If None or not provided, will
+            default to the values set in the dataset(s).
+
+        Returns
+        ----------
+        * a <phoebe.frontend.residuals.ResidualPlan> object
+        """
+        return _residuals.ResidualPlan(self, model=model, dataset=dataset, component=component,
+                                       consider_gaussian_process=consider_gaussian_process,
+                                       mask_enabled=mask_enabled, mask_phases=mask_phases)
+
     @send_if_client
     def run_compute(self, compute=None, model=None, solver=None,
                     detach=False,
@@ -11692,6 +12133,14 @@ class Bundle(ParameterSet):
             provided or none, will default to <phoebe.progressbars_on> or
             <phoebe.progressbars_off>.  Progressbars require `tqdm` to be installed
             (will silently ignore if not installed).
+        * `stream_fname` (string, optional, default=None): if provided, the
+            arrays of the model (ie. mesh columns) are written to this file as
+            soon as each time is computed instead of being kept in memory
+            until the end of the run.  The values of the resulting parameters
+            are then memory-mapped from this file (which is replaced if it
+            already exists), so the file must not be removed while the model is
+            in use.  Only supported for a single set of compute options without
+            `sample_from` and not within MPI.
         * `**kwargs`:: any values in the compute options to temporarily
             override for this single compute run (parameter values will revert
             after run_compute is finished)
@@ -11709,6 +12158,8 @@ class Bundle(ParameterSet):
             <phoebe.frontend.bundle.Bundle.run_checks_compute>
         * ValueError: if any given dataset is enabled in more than one set of
             compute options sent to run_compute.
+        * ValueError: if passing `stream_fname` with more than one set of
+            compute options or with `sample_from`.
         """
 
         # NOTE: if we're already in client mode, we'll never get here in the client
@@ -11724,6 +12175,9 @@ class Bundle(ParameterSet):
         if solver is not None and compute is not None:
             raise ValueError("cannot provide both solver and compute")
 
+        # see compute_session and session.ComputeSession.run_compute
+        compute_session = kwargs.pop('compute_session', None)
+
         if solver is not None:
             if not kwargs.get('skip_checks', False):
                 report = self.run_checks_solver(solver=solver,
@@ -11761,6 +12215,9 @@ class Bundle(ParameterSet):
 
         _ = kwargs.pop('do_create_fig_params', None)
 
+        if kwargs.get('stream_fname', None) is not None and len(computes) > 1:
+            raise ValueError("stream_fname is only supported when computing a single set of compute options")
+
         if use_server is None:
             for compute in computes:
                 use_server_this = self.get_value(qualifier='use_server', compute=compute, context='compute', **_skip_filter_checks)
@@ -11940,6 +12397,8 @@ class Bundle(ParameterSet):
                 # and per-sample calls to run_compute.
                 sample_from = computeparams.get_value(qualifier='sample_from', expand=True, sample_from=kwargs.pop('sample_from', None), **_skip_filter_checks)
                 if len(sample_from):
+                    if kwargs.get('stream_fname', None) is not None:
+                        raise ValueError("stream_fname is not supported with sample_from")
                     params = backends.SampleOverModel().run(self, computeparams.compute,
                                                             dataset=dataset_this_compute,
                                                             times=times,
@@ -11958,15 +12417,39 @@ class Bundle(ParameterSet):
                 # TODO: have this return a dictionary like pblums/l3s that we can pass on to the backend?
 
                 # we need to check both for enabled but also passed via dataset kwarg
-                if len(self._datasets_where(compute=compute, mesh_needed=True)) > 0:
+                mesh_needed = len(self._datasets_where(compute=compute, mesh_needed=True)) > 0
+                compute_kwargs = {k:v for k,v in kwargs.items() if k in computeparams.qualifiers}
+                if mesh_needed:
                     logger.info("run_compute: computing necessary ld_coeffs, pblums, l3s")
-                    self.compute_ld_coeffs(compute=compute, skip_checks=True, set_value=True, **{k:v for k,v in kwargs.items() if k in computeparams.qualifiers})
-                    # NOTE that if pblum_method != 'phoebe', then system will be None
-                    # otherwise the system will be create which we can pass on to the backend
-                    # the phoebe backend can then skip initializing the system at least on the master proc
-                    # (workers will need to recreate the mesh)
-                    system, pblums_abs, pblums_scale, pblums_rel, pbfluxes = self.compute_pblums(compute=compute, ret_structured_dicts=True, skip_checks=True, **{k:v for k,v in kwargs.items() if k in computeparams.qualifiers})
-                    l3s = self.compute_l3s(compute=compute, use_pbfluxes=pbfluxes, ret_structured_dicts=True, skip_checks=True, skip_compute_ld_coeffs=True, **{k:v for k,v in kwargs.items() if k in computeparams.qualifiers})
+                    self.compute_ld_coeffs(compute=compute, skip_checks=True, set_value=True, **compute_kwargs)
+
+                if compute_session is not None:
+                    # drop anything cached by the session that is affected by
+                    # the changes since its last evaluation (including any
+                    # changes to the ld_coeffs)
+                    compute_session._update(self, compute, compute_kwargs)
+                    session_reusable = compute_session._get_reusable(compute)
+                else:
+                    session_reusable = {}
+
+                if mesh_needed:
+                    if 'pblums' in session_reusable.keys():
+                        # only the orientation of the system changed since the
+                        # last evaluation of the session, so we can re-use the
+                        # pblums, l3s, and meshes at t0
+                        pblums_abs, pblums_scale, pblums_rel, pbfluxes, l3s = session_reusable['pblums']
+                        system = compute_session._create_system(self, compute, session_reusable.get('standard_meshes', None), **compute_kwargs) if computeparams.kind == 'phoebe' else None
+                    else:
+                        # NOTE that if pblum_method != 'phoebe', then system will be None
+                        # otherwise the system will be create which we can pass on to the backend
+                        # the phoebe backend can then skip initializing the system at least on the master proc
+                        # (workers will need to recreate the mesh)
+                        # If the session still has the meshes at t0, then those
+                        # are used instead of remeshing.
+                        system, pblums_abs, pblums_scale, pblums_rel, pbfluxes = self.compute_pblums(compute=compute, ret_structured_dicts=True, skip_checks=True, standard_meshes=session_reusable.get('standard_meshes', None), **compute_kwargs)
+                        l3s = self.compute_l3s(compute=compute, use_pbfluxes=pbfluxes, ret_structured_dicts=True, skip_checks=True, skip_compute_ld_coeffs=True, **compute_kwargs)
+                        if compute_session is not None:
+                            compute_session._store(compute, system, (pblums_abs, pblums_scale, pblums_rel, pbfluxes), l3s)
                 else:
                     system = None
                     pblums_scale = {}
@@ -11980,6 +12463,7 @@ class Bundle(ParameterSet):
                 if computeparams.kind == 'phoebe':
                     kwargs['system'] = system
                     kwargs['pblums_scale'] = pblums_scale
+                    kwargs['compute_session'] = compute_session
                 elif computeparams.kind in ['legacy', 'jktebop', 'ellc']:
                     # legacy uses pblums directly
                     # jktebop, ellc use pblums for sbratio if decoupled, otherwise will ignore and use teffs
@@ -13162,7 +13646,10 @@ class Bundle(ParameterSet):
             useful if running in an interactive notebook or a script.
         * `autocontinue` (bool, optional, default=True): override `continue_from`
             in `solver` to continue from `out_fname` (or `script_fname`.out or
-            .progress files) if those files exist.  This is useful to set to True
+            .progress files) if those files exist.  Note that .progress files
+            only hold placeholders for the chains, which are stored in the
+            accompanying .progress.chain file (see <phoebe.parameters.chains>)
+            and must be kept alongside.  This is useful to set to True
             and then resubmit the same script if not converged (although care should
             be taken to ensure multiple scripts aren't reading/writing from the
             same filenames).  If `continue_from` is not a parameter in `solver` options,
@@ -0,0 +1,427 @@
+"""
+Precomputed residual plans for repeated calls to
+<phoebe.parameters.ParameterSet.calculate_lnlikelihood> and
+<phoebe.parameters.ParameterSet.calculate_chi2>.
+
+See <phoebe.frontend.bundle.Bundle.residual_plan>.
+"""
+
+import numpy as np
+
+from phoebe.utils import phase_mask_inds
+
+import logging
+logger = logging.getLogger("RESIDUALS")
+logger.addHandler(logging.NullHandler())
+
+_skip_filter_checks = {'check_default': False, 'check_visible': False}
+
+_qualifier_for_kind = {'lc': 'fluxes', 'rv': 'rvs'}
+
+
+def _interp_plan(xp, x):
+    """
+    Precompute the indices and weights to reproduce np.interp(x, xp, fp)
+    (with `xp` sorted as in <phoebe.parameters.FloatArrayParameter.interp_value>)
+    for any `fp`.  Returns None if any of `x` are outside the range of `xp`,
+    in which case interp_value interpolates in phase instead.
+    """
+    sort = xp.argsort()
+    xp_sorted = xp[sort]
+    if not len(xp_sorted) or np.any(x < xp_sorted[0]) or np.any(x > xp_sorted[-1]):
+        return None
+
+    lo = np.searchsorted(xp_sorted, x, side='right') - 1
+    hi = np.minimum(lo + 1, len(xp_sorted) - 1)
+    return {'lo': sort[lo], 'hi': sort[hi],
+            'exact': xp_sorted[lo] == x,
+            'dx_lo': x - xp_sorted[lo], 'dx_hi': x - xp_sorted[hi],
+            'step': xp_sorted[hi] - xp_sorted[lo]}
+
+
+def _interp_apply(plan, fp):
+    """
+    Apply a plan from _interp_plan to the values `fp`, following the
+    same arithmetic as np.interp.
+    """
+    ret = fp[plan['lo']]
+    interp = ~plan['exact']
+    if np.any(interp):
+        fp_lo = ret[interp]
+        fp_hi = fp[plan['hi'][interp]]
+        slope = (fp_hi - fp_lo) / plan['step'][interp]
+        value = slope * plan['dx_lo'][interp] + fp_lo
+        isnan = np.isnan(value)
+        if np.any(isnan):
+            # np.interp retries from the upper point to avoid non-finite
+            # results from infinite values
+            value[isnan] = slope[isnan] * plan['dx_hi'][interp][isnan] + fp_hi[isnan]
+            isnan = np.isnan(value) & (fp_lo == fp_hi)
+            value[isnan] = fp_lo[isnan]
+        ret[interp] = value
+    return ret
+
+
+class ResidualPlan(object):
+    """
+    Precomputed plan for repeated likelihood evaluations of a model (with the
+    same label) against the observations of a <phoebe.frontend.bundle.Bundle>.
+
+    Create with <phoebe.frontend.bundle.Bundle.residual_plan>.
+
+    The observations, sigmas, and masks of each dataset (and component) are
+    read once, and the indices and weights to interpolate the model to the
+    observed times are computed once for the times of the model.  Each
+    evaluation then only accesses the synthetic model (and `sigmas_lnf`)
+    and so assumes that the observations themselves are not changed between
+    evaluations (use <phoebe.frontend.residuals.ResidualPlan.clear> otherwise).
+    The results are identical to those of
+    <phoebe.parameters.ParameterSet.calculate_lnlikelihood> and
+    <phoebe.parameters.ParameterSet.calculate_chi2>.
+    """
+    def __init__(self, b, model=None, dataset=None, component=None,
+                 consider_gaussian_process=True, mask_enabled=None,
+                 mask_phases=None):
+        self._bundle = b
+        self._model = model
+        self._dataset = dataset
+        self._component = component
+        self._consider_gaussian_process = consider_gaussian_process
+        self._mask_enabled = mask_enabled
+        self._mask_phases = mask_phases
+        # cache per (dataset, component)
+        self._entries = {}
+
+    def __repr__(self):
+        return "<ResidualPlan model={}>".format(self._model)
+
+    @property
+    def model(self):
+        """
+        Label of the model that this plan evaluates.
+        """
+        return self._model
+
+    def clear(self):
+        """
+        Clear all cached observations and interpolation weights.
+        """
+        self._entries = {}
+
+    def _get_entry(self, b, dataset, component):
+        key = (dataset, component)
+        entry = self._entries.get(key, None)
+        if entry is not None:
+            return entry
+
+        ds_ps = b.get_dataset(dataset=dataset, **_skip_filter_checks)
+        kind = ds_ps.kind
+        qualifier = _qualifier_for_kind.get(kind, None)
+        if qualifier is None:
+            raise NotImplementedError("calculate_residuals not implemented for dataset with kind='{}' (model={}, dataset={}, component={})".format(kind, self._model, dataset, component))
+
+        dataset_param = ds_ps.get_parameter(qualifier=qualifier, component=component, **_skip_filter_checks)
+        times = ds_ps.get_value(qualifier='times', component=component, **_skip_filter_checks)
+
+        entry = {'dataset': dataset, 'component': component,
+                 'kind': kind, 'qualifier': qualifier,
+                 'default_unit': dataset_param.default_unit,
+                 'times': times, 'interp': None}
+
+        if not len(times) or not len(dataset_param.get_value()):
+            # nothing to compare against, will not contribute
+            entry['empty'] = True
+            self._entries[key] = entry
+            return entry
+        elif len(dataset_param.get_value()) != len(times):
+            raise ValueError("{}@{}@{} and {}@{}@{} do not have the same length, cannot compute residuals".format(qualifier, component, dataset, 'times', component, dataset))
+
+        entry['empty'] = False
+        entry['observations'] = np.asarray(dataset_param.interp_value(times=times, consider_gaussian_process=self._consider_gaussian_process))
+        entry['sigmas'] = ds_ps.get_value(qualifier='sigmas', component=component, unit=dataset_param.default_unit, **_skip_filter_checks)
+
+        mask = None
+        if ds_ps.get_value(qualifier='mask_enabled', default=False, mask_enabled=self._mask_enabled, **_skip_filter_checks):
+            mask_phases = ds_ps.get_value(qualifier='mask_phases', mask_phases=self._mask_phases, **_skip_filter_checks)
+            if len(mask_phases):
+                # the phases depend on the ephemeris (which may change between
+                # evaluations), so only the options are stored here
+                mask = {'mask_phases': mask_phases,
+                        'period': ds_ps.get_value(qualifier='phases_period', default='period', **_skip_filter_checks),
+                        'dpdt': ds_ps.get_value(qualifier='phases_dpdt', default='dpdt', **_skip_filter_checks),
+                        't0': ds_ps.get_value(qualifier='phases_t0', **_skip_filter_checks)}
+        entry['mask'] = mask
+
+        # sigmas_lnf may be sampled, so only its uniqueid is stored here
+        sigmas_lnf_params = ds_ps.filter(qualifier='sigmas_lnf', component=component, **_skip_filter_checks).to_list()
+        entry['sigmas_lnf_uniqueid'] = sigmas_lnf_params[0].uniqueid if len(sigmas_lnf_params) == 1 else None
+
+        self._entries[key] = entry
+        return entry
+
+    def _get_model_params(self, b):
+        # model parameters per (dataset, component) in the same order as
+        # ParameterSet._calculate_cf, accessed in a single pass over the model
+        model_ps = b.filter(model=self._model, context='model', dataset=self._dataset, component=self._component, **_skip_filter_checks)
+        if self._model is not None and self._model not in model_ps.models:
+            raise ValueError("model '{}' not found".format(self._model))
+
+        components_per_dataset = {}
+        params = {}
+        for param in model_ps.to_list():
+            if param.dataset is None:
+                continue
+            components = components_per_dataset.setdefault(param.dataset, [])
+            if param.component is not None and param.component not in components:
+                components.append(param.component)
+            params.setdefault((param.dataset, param.qualifier), {})[param.component] = param
+
+        ret = []
+        for dataset, components in components_per_dataset.items():
+            for component in components if len(components) else [None]:
+                ret.append((dataset, component, params))
+        return ret
+
+    def interp_models(self, b=None):
+        """
+        Interpolate the model to the (unmasked) observed times of each dataset
+        (and component).
+
+        Arguments
+        ----------
+        * `b` (<phoebe.frontend.bundle.Bundle>, optional): bundle containing
+            the model.  Must be the bundle that created this plan or a copy of
+            it.  If not provided, will use the bundle that created this plan.
+
+        Returns
+        ----------
+        * (list) dictionaries with the `dataset`, `component`, masking `inds`
+            (or None), interpolated `model`, and `sigmas_lnf` of each dataset
+            (and component), in the same order as they are considered by
+            <phoebe.parameters.ParameterSet.calculate_lnlikelihood>.
+        """
+        if b is None:
+            b = self._bundle
+
+        model_params = self._get_model_params(b)
+
+        sigmas_lnf = None
+        ret = []
+        for dataset, component, params in model_params:
+            entry = self._get_entry(b, dataset, component)
+            if entry['empty']:
+                continue
+
+            value_params = params.get((dataset, entry['qualifier']), {})
+            model_param = value_params.get(component, None)
+            if model_param is None:
+                if component is None and len(value_params) == 1:
+                    model_param = list(value_params.values())[0]
+                else:
+                    raise ValueError("{} not found in model '{}' for dataset='{}', component={}".format(entry['qualifier'], self._model, dataset, component))
+            if entry['default_unit'] != model_param.default_unit:
+                raise ValueError("model and dataset do not have the same default_unit, cannot interpolate")
+
+            times = entry['times']
+            inds = None
+            mask = entry['mask']
+            if mask is not None:
+                phases = b.to_phase(times, period=mask['period'], dpdt=mask['dpdt'], t0=mask['t0'])
+                inds = phase_mask_inds(phases, mask['mask_phases'])
+
+            model_times_param = params.get((dataset, 'times'), {}).get(model_param.component, None)
+            model_times = model_times_param.get_value() if model_times_param is not None else None
+            model_values = model_param.get_value()
+
+            # the interpolation weights only need to be recomputed if the
+            # times of the model changed
+            interp = None
+            if model_times is not None and model_values.ndim == 1 and len(model_times) == len(model_values):
+                if entry['interp'] is None or not np.array_equal(entry['interp']['model_times'], model_times):
+                    entry['interp'] = {'model_times': model_times, 'plan': _interp_plan(model_times, times)}
+                interp = entry['interp']['plan']
+
+            if interp is not None:
+                model_interp = _interp_apply(interp, model_values)
+                if inds is not None:
+                    model_interp = model_interp[inds]
+            else:
+                # outside the time-range of the model (so interpolating in
+                # phase) or otherwise not supported by the plan
+                model_interp = np.asarray(model_param.interp_value(times=times if inds is None else times[inds], consider_gaussian_process=self._consider_gaussian_process), dtype=float)
+
+            if entry['sigmas_lnf_uniqueid'] is None:
+                entry_sigmas_lnf = -np.inf
+            else:
+                if sigmas_lnf is None:
+                    sigmas_lnf = {param.uniqueid: param.get_value() for param in b.filter(qualifier='sigmas_lnf', context='dataset', **_skip_filter_checks).to_list()}
+                entry_sigmas_lnf = sigmas_lnf.get(entry['sigmas_lnf_uniqueid'], -np.inf)
+
+            ret.append({'dataset': dataset, 'component': component,
+                        'inds': inds, 'model': model_interp,
+                        'sigmas_lnf': entry_sigmas_lnf})
+
+        return ret
+
+    def calculate_cf(self, b=None, cf='lnf', interp_models=None):
+        """
+        Compute the cost-function of the model.
+
+        Arguments
+        ----------
+        * `b` (<phoebe.frontend.bundle.Bundle>, optional): bundle containing
+            the model.  If not provided, will use the bundle that created this
+            plan.
+        * `cf` (string, optional, default='lnf'): either 'lnf' (for -2 times
+            the log-likelihood) or 'chi2'.
+        * `interp_models` (list, optional): the result from
+            <phoebe.frontend.residuals.ResidualPlan.interp_models>, if already
+            available.  If provided, `b` is ignored.
+
+        Returns
+        ----------
+        * (float)
+        """
+        if cf not in ['lnf', 'chi2']:
+            raise ValueError("cf must be either 'lnf' or 'chi2'")
+
+        if interp_models is None:
+            interp_models = self.interp_models(b)
+
+        ret = 0.
+        for model in interp_models:
+            entry = self._entries[(model['dataset'], model['component'])]
+            inds = model['inds']
+            observations = entry['observations'] if inds is None else entry['observations'][inds]
+            residuals = np.asarray(observations - model['model'])
+
+            sigmas = entry['sigmas']
+            if inds is not None:
+                sigmas = sigmas[inds]
+
+            if len(sigmas):
+                sigmas2 = sigmas**2
+
+                if cf == 'lnf' and model['sigmas_lnf'] != -np.inf:
+                    if entry['kind'] == 'rv':
+                        sigmas2 += np.exp(2 * model['sigmas_lnf'])
+                    else:
+                        sigmas2 += model['model']**2 * np.exp(2 * model['sigmas_lnf'])
+
+                if cf == 'lnf':
+                    ret += np.sum((residuals**2 / sigmas2) + np.log(2*np.pi*sigmas2))
+                else:
+                    ret += np.sum(residuals**2 / sigmas2)
+            else:
+                ret += np.sum(residuals**2)
+
+        return ret
+
+    def calculate_cf_batch(self, interp_models, cf='lnf'):
+        """
+        Compute the cost-function for a batch of models at once.
+
+        Arguments
+        ----------
+        * `interp_models` (list): the results from
+            <phoebe.frontend.residuals.ResidualPlan.interp_models> for each
+            model (computed on copies of the bundle).  Any entry that is not a
+            list will be skipped (and will result in nan).
+        * `cf` (string, optional, default='lnf'): either 'lnf' (for -2 times
+            the log-likelihood) or 'chi2'.
+
+        Returns
+        ----------
+        * (array) cost-function per model.
+        """
+        if cf not in ['lnf', 'chi2']:
+            raise ValueError("cf must be either 'lnf' or 'chi2'")
+
+        nmodels = len(interp_models)
+        ret = np.full(nmodels, np.nan)
+
+        # gather the models per (dataset, component)
+        per_entry = {}
+        for i, models in enumerate(interp_models):
+            if not isinstance(models, list):
+                continue
+            ret[i] = 0.
+            for model in models:
+                per_entry.setdefault((model['dataset'], model['component']), []).append((i, model))
+
+        for key, models in per_entry.items():
+            entry = self._get_entry(self._bundle, *key)
+            rows = np.array([i for i, model in models])
+            shape = (len(models), len(entry['times']))
+
+            values = np.zeros(shape)
+            weights = np.zeros(shape, dtype=bool)
+            sigmas_lnf = np.empty(len(models))
+            for j, (i, model) in enumerate(models):
+                inds = slice(None) if model['inds'] is None else model['inds']
+                values[j, inds] = model['model']
+                weights[j, inds] = True
+                sigmas_lnf[j] = model['sigmas_lnf']
+
+            residuals = entry['observations'] - values
+            sigmas = entry['sigmas']
+            if len(sigmas):
+                sigmas2 = np.broadcast_to(sigmas**2, shape).copy()
+                use_lnf = sigmas_lnf != -np.inf
+                if cf == 'lnf' and np.any(use_lnf):
+                    if entry['kind'] == 'rv':
+                        sigmas2[use_lnf] += np.exp(2 * sigmas_lnf[use_lnf])[:, np.newaxis]
+                    else:
+                        sigmas2[use_lnf] += values[use_lnf]**2 * np.exp(2 * sigmas_lnf[use_lnf])[:, np.newaxis]
+
+                # NOTE: masked entries are excluded below
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    if cf == 'lnf':
+                        terms = (residuals**2 / sigmas2) + np.log(2*np.pi*sigmas2)
+                    else:
+                        terms = residuals**2 / sigmas2
+            else:
+                terms = residuals**2
+
+            ret[rows] += np.sum(np.where(weights, terms, 0.0), axis=1)
+
+        return ret
+
+    def calculate_lnlikelihood(self, b=None, interp_models=None):
+        """
+        Compute the log-likelihood of the model.  Identical to
+        <phoebe.parameters.ParameterSet.calculate_lnlikelihood> with the
+        options of this plan.
+
+        Arguments
+        ----------
+        * `b` (<phoebe.frontend.bundle.Bundle>, optional): bundle containing
+            the model.  If not provided, will use the bundle that created this
+            plan.
+        * `interp_models` (list, optional): the result from
+            <phoebe.frontend.residuals.ResidualPlan.interp_models>, if already
+            available.  If provided, `b` is ignored.
+
+        Returns
+        ----------
+        * (float) log-likelihood value
+        """
+        return -0.5 * self.calculate_cf(b, cf='lnf', interp_models=interp_models)
+
+    def calculate_chi2(self, b=None):
+        """
+        Compute the chi2 of the model.  Identical to
+        <phoebe.parameters.ParameterSet.calculate_chi2> with the options of
+        this plan.
+
+        Arguments
+        ----------
+        * `b` (<phoebe.frontend.bundle.Bundle>, optional): bundle containing
+            the model.  If not provided, will use the bundle that created this
+            plan.
+
+        Returns
+        ----------
+        * (float) chi2 value
+        """
+        return self.calculate_cf(b, cf='chi2')
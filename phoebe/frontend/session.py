@@ -0,0 +1,283 @@
+"""
+Persistent forward-model sessions for repeated calls to
+<phoebe.frontend.bundle.Bundle.run_compute>.
+
+See <phoebe.frontend.bundle.Bundle.compute_session>.
+"""
+
+import numpy as np
+
+from phoebe.backend import universe
+
+import logging
+logger = logging.getLogger("SESSION")
+logger.addHandler(logging.NullHandler())
+
+_skip_filter_checks = {'check_default': False, 'check_visible': False}
+
+# contexts of parameters that can affect the forward-model
+_session_contexts = ['system', 'component', 'dataset', 'compute', 'feature', 'constraint']
+
+# qualifiers which only change the orientation of the system on the sky
+# (and so do not affect the intrinsic meshes, pblums, or l3s).  Note that
+# pitch and yaw are intentionally excluded as they affect the alignment of the
+# stars and therefore the meshes themselves.  requiv_max is constrained through
+# the inclination of the star (and so picks up round-off changes), but is only
+# used when running checks.
+_orientation_qualifiers = ['incl', 'long_an', 'asini', 'requiv_max']
+
+# component and system qualifiers which only affect the local quantities (and
+# so not the meshes, the dynamics, or which times need to be computed)
+_radiative_qualifiers = ['teff', 'teffratio', 'abun', 'gravb_bol',
+                         'irrad_frac_refl_bol', 'irrad_frac_lost_bol',
+                         'ld_mode_bol', 'ld_func_bol', 'ld_coeffs_source_bol', 'ld_coeffs_bol',
+                         'ebv', 'Av', 'Rv']
+
+# dataset qualifiers which do not affect which times and observables need to
+# be computed (see backends._extract_from_bundle)
+_observational_qualifiers = ['fluxes', 'rvs', 'sigmas', 'sigmas_lnf',
+                             'passband', 'intens_weighting',
+                             'ld_mode', 'ld_func', 'ld_coeffs_source', 'ld_coeffs',
+                             'pblum_mode', 'pblum_component', 'pblum_dataset', 'pblum',
+                             'l3_mode', 'l3', 'l3_frac',
+                             'mask_enabled', 'mask_phases',
+                             'phases_period', 'phases_dpdt', 'phases_t0']
+
+
+def _affects(artifact, context, qualifier, include_times=False):
+    """
+    Whether a change to the parameter with `context` and `qualifier` affects
+    the cached `artifact`.  Anything not known to be independent is assumed to
+    affect all artifacts.
+
+    * 'pblums': the pblums and l3s (depend on everything but the orientation)
+    * 'standard_meshes': the meshes at t0 (depend on the geometry)
+    * 'dynamics': the positions, velocities and euler angles at all times
+    * 'infos': the times and infolists (see backends._extract_from_bundle),
+        which only depend on the orbit if any mesh dataset includes times
+        from the components or system (`include_times`).
+    """
+    if context in ['compute', 'constraint']:
+        return True
+
+    if artifact == 'pblums':
+        return not (context == 'component' and qualifier in _orientation_qualifiers)
+    elif artifact == 'standard_meshes':
+        if context == 'dataset':
+            return False
+        return qualifier not in _orientation_qualifiers + _radiative_qualifiers
+    elif artifact == 'dynamics':
+        if context in ['dataset', 'feature']:
+            return False
+        return qualifier not in _radiative_qualifiers
+    elif artifact == 'infos':
+        if context == 'dataset':
+            return qualifier not in _observational_qualifiers
+        if context == 'feature':
+            return False
+        return include_times and qualifier not in _orientation_qualifiers + _radiative_qualifiers
+    else:
+        raise NotImplementedError("artifact='{}' not implemented".format(artifact))
+
+
+def _values_equal(a, b):
+    if a is b:
+        return True
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, (tuple, list)):
+        return len(a) == len(b) and np.all([_values_equal(ai, bi) for ai, bi in zip(a, b)])
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and np.all([_values_equal(v, b[k]) for k, v in a.items()])
+    if isinstance(a, np.ndarray):
+        # NOTE: this includes astropy quantities
+        return a.shape == b.shape and bool(np.all(a == b))
+    try:
+        return bool(a == b)
+    except Exception:
+        # ambiguous comparisons (ie. nparray objects), assume changed
+        return False
+
+
+class ComputeSession(object):
+    """
+    Persistent forward-model session bound to a
+    <phoebe.frontend.bundle.Bundle> and set of compute options.
+
+    Create with <phoebe.frontend.bundle.Bundle.compute_session> and compute
+    models with <phoebe.frontend.session.ComputeSession.run_compute>.
+
+    The session tracks which parameters changed since its previous evaluation
+    and re-uses each of the following from the previous evaluation for as long
+    as none of the parameters it depends on changed:
+    * the passband luminosities and third lights (re-used if only the
+      orientation of the system changed: `incl`, `long_an`, and `asini`, but
+      not `pitch` or `yaw`).
+    * the meshes at t0 (re-used if only the orientation or the local
+      quantities changed: ie. `teff`, `abun` or any dataset parameters).
+    * the dynamics (re-used if only the local quantities changed).
+    * the times and observables that need to be computed (re-used unless the
+      times or compute options changed).
+
+    Any other change results in a full computation, identical to calling
+    <phoebe.frontend.bundle.Bundle.run_compute> directly.
+    """
+    def __init__(self, b, compute=None):
+        self._bundle = b
+        self._compute = compute
+        # cache per compute label: {'values', 'kwargs', and per-artifact entries}
+        self._cache = {}
+
+    def __repr__(self):
+        return "<ComputeSession compute={}>".format(self._compute)
+
+    @property
+    def compute(self):
+        """
+        Label of the compute options that this session is bound to.
+        """
+        return self._compute
+
+    def clear(self):
+        """
+        Clear all cached results, forcing the next call to
+        <phoebe.frontend.session.ComputeSession.run_compute> to do a full
+        computation.
+        """
+        self._cache = {}
+
+    def run_compute(self, model=None, b=None, **kwargs):
+        """
+        Run <phoebe.frontend.bundle.Bundle.run_compute> with the compute options
+        of this session, reusing any results from the previous evaluation
+        which are not affected by changed parameters.
+
+        Arguments
+        ----------
+        * `model` (string, optional): name of the resulting model.
+        * `b` (<phoebe.frontend.bundle.Bundle>, optional): bundle to compute.
+            Must be the bundle that created this session or a copy of it
+            (see <phoebe.frontend.bundle.Bundle.copy>).  If not provided, will
+            use the bundle that created this session.
+        * `**kwargs`: all additional keyword arguments are passed directly to
+            <phoebe.frontend.bundle.Bundle.run_compute>.
+
+        Returns
+        ----------
+        * a <phoebe.parameters.ParameterSet> of the newly-created model
+            containing the synthetic data.
+        """
+        if b is None:
+            b = self._bundle
+        return b.run_compute(compute=self._compute, model=model, compute_session=self, **kwargs)
+
+    def _snapshot(self, b):
+        # NOTE: set_value replaces (rather than edits) the values, so the
+        # values themselves can be stored (and are usually compared by identity)
+        return {param.uniqueid: (param.context, param.qualifier, param._value) for param in b._params if param.context in _session_contexts}
+
+    def _update(self, b, compute, compute_kwargs):
+        """
+        Compare the current state of the bundle with that from the previous
+        evaluation and drop any cached artifacts that are affected by the
+        changes.  This must be called once per evaluation, before any of the
+        cached artifacts are accessed.
+        """
+        values = self._snapshot(b)
+        cache = self._cache.get(compute, None)
+        self._cache[compute] = {'values': values, 'kwargs': dict(compute_kwargs)}
+
+        if cache is None:
+            return
+
+        if not _values_equal(cache['kwargs'], compute_kwargs):
+            logger.debug("compute_session: compute options overrides changed, not reusing")
+            return
+
+        values_prev = cache['values']
+        if values_prev.keys() != values.keys():
+            logger.debug("compute_session: parameters added or removed, not reusing")
+            return
+
+        changed = set([(context, qualifier) for uniqueid, (context, qualifier, value) in values.items() if not _values_equal(value, values_prev[uniqueid][2])])
+        include_times = np.any([len(value) > 0 for context, qualifier, value in values.values() if context == 'dataset' and qualifier == 'include_times'])
+
+        for artifact in ['pblums', 'standard_meshes', 'dynamics', 'infos']:
+            if artifact not in cache.keys():
+                continue
+            affected_by = [(context, qualifier) for context, qualifier in changed if _affects(artifact, context, qualifier, include_times=include_times)]
+            if len(affected_by):
+                logger.debug("compute_session: {} changed, not reusing {}".format(affected_by, artifact))
+            else:
+                self._cache[compute][artifact] = cache[artifact]
+
+    def _get_reusable(self, compute):
+        """
+        Return a dictionary with the cached 'pblums' (pblums and l3s) and
+        'standard_meshes' (per-component) which can be re-used in this
+        evaluation, see <phoebe.frontend.session.ComputeSession._update>.
+        """
+        cache = self._cache.get(compute, {})
+        reusable = {artifact: cache[artifact] for artifact in ['pblums', 'standard_meshes'] if cache.get(artifact, None) is not None}
+        logger.debug("compute_session: reusing {}".format(list(reusable.keys())))
+        return reusable
+
+    def _get_cached(self, compute, artifact, key, func):
+        """
+        Return the cached `artifact` if it was last computed for the same `key`
+        (and is still valid, see
+        <phoebe.frontend.session.ComputeSession._update>), otherwise call
+        `func` and cache its returned value for `key`.  The returned value must
+        not be edited.
+        """
+        cache = self._cache.setdefault(compute, {})
+        if artifact in cache.keys() and _values_equal(cache[artifact][0], key):
+            logger.debug("compute_session: reusing {}".format(artifact))
+            return cache[artifact][1]
+
+        value = func()
+        cache[artifact] = (key, value)
+        return value
+
+    def _store(self, compute, system, pblums, l3s):
+        """
+        Store the pblums, l3s and the standard meshes of `system` (as computed
+        at t0 by <phoebe.frontend.bundle.Bundle.compute_pblums>) so that they
+        can be re-used.  This must be called before `system` is passed to the
+        backend.
+        """
+        cache = self._cache[compute]
+        cache['pblums'] = pblums + (l3s,)
+        if system is None:
+            cache['standard_meshes'] = None
+        elif cache.get('standard_meshes', None) is None:
+            # NOTE: this is the only copy of the meshes, the standard meshes
+            # are not edited when placing the system in orbit (see
+            # Body._get_scaled_standard_mesh_cached), so the cached meshes
+            # can be shared by all following systems
+            cache['standard_meshes'] = {body.component: {theta: protomesh.copy() for theta, protomesh in body._standard_meshes.items()} for body in system.mesh_bodies}
+
+    def _create_system(self, b, compute, standard_meshes, **kwargs):
+        """
+        Create a new system with the cached standard meshes so that the
+        backend does not need to remesh.
+        """
+        if standard_meshes is None:
+            return None
+
+        system = universe.System.from_bundle(b, compute, datasets=b.datasets, **kwargs)
+        _transplant_standard_meshes(system, standard_meshes)
+
+        return system
+
+
+def _transplant_standard_meshes(system, standard_meshes):
+    """
+    Use the (cached) `standard_meshes` (per-component) for the bodies of
+    `system` so that they do not need to be remeshed at t0.
+    """
+    for body in system.mesh_bodies:
+        body._standard_meshes = dict(standard_meshes[body.component])
+
+    # local quantities still need to be computed on the transplanted meshes
+    system.reset(force_recompute_instantaneous=True)
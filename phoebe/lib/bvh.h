@@ -0,0 +1,232 @@
+#pragma once
+
+/*
+  Bounding volume hierarchy (BVH) of axis-aligned bounding boxes used to
+  quickly find the objects (e.g. triangles, disks) which might intersect
+  a line segment or a box.
+
+  The queries only cull the objects: the boxes are conservative and the
+  objects returned need to be checked with the exact intersection test.
+  The tree is read-only after it is built, so it can be queried from
+  several threads at the same time.
+*/
+
+#include <vector>
+#include <algorithm>
+#include <numeric>
+#include <limits>
+
+template <class T>
+class Tbvh {
+
+  struct Tnode {
+    T lo[3], hi[3];   // bounding box of the node
+
+    int left, right,  // children, if inner node
+        first, count; // range of items, if leaf (count > 0)
+  };
+
+  std::vector<Tnode> nodes;
+
+  std::vector<int> items;
+
+  int build_node(
+    const std::vector<T> & lo,
+    const std::vector<T> & hi,
+    int first, int count,
+    const T & pad,
+    int leaf_size) {
+
+    int idx = nodes.size();
+
+    nodes.emplace_back();
+
+    {
+      Tnode & node = nodes[idx];
+
+      for (int k = 0; k < 3; ++k) {
+        node.lo[k] = +std::numeric_limits<T>::infinity();
+        node.hi[k] = -std::numeric_limits<T>::infinity();
+      }
+
+      for (int *it = items.data() + first, *ite = it + count; it != ite; ++it)
+        for (int k = 0; k < 3; ++k) {
+          node.lo[k] = std::min(node.lo[k], lo[3*(*it) + k] - pad);
+          node.hi[k] = std::max(node.hi[k], hi[3*(*it) + k] + pad);
+        }
+    }
+
+    if (count <= leaf_size) {
+      nodes[idx].first = first;
+      nodes[idx].count = count;
+      return idx;
+    }
+
+    //
+    // split at the median of the centers along the longest axis
+    //
+
+    int axis = 0;
+    {
+      T c, clo[3], chi[3];
+
+      for (int k = 0; k < 3; ++k) {
+        clo[k] = +std::numeric_limits<T>::infinity();
+        chi[k] = -std::numeric_limits<T>::infinity();
+      }
+
+      for (int *it = items.data() + first, *ite = it + count; it != ite; ++it)
+        for (int k = 0; k < 3; ++k) {
+          c = lo[3*(*it) + k] + hi[3*(*it) + k];
+          if (c < clo[k]) clo[k] = c;
+          if (c > chi[k]) chi[k] = c;
+        }
+
+      for (int k = 1; k < 3; ++k)
+        if (chi[k] - clo[k] > chi[axis] - clo[axis]) axis = k;
+    }
+
+    int half = count/2;
+
+    std::nth_element(
+      items.begin() + first,
+      items.begin() + first + half,
+      items.begin() + first + count,
+      [&](int a, int b) {
+        return lo[3*a + axis] + hi[3*a + axis] < lo[3*b + axis] + hi[3*b + axis];
+      });
+
+    int left = build_node(lo, hi, first, half, pad, leaf_size),
+        right = build_node(lo, hi, first + half, count - half, pad, leaf_size);
+
+    nodes[idx].left = left;
+    nodes[idx].right = right;
+    nodes[idx].count = 0;
+
+    return idx;
+  }
+
+  /*
+    Check if the segment a + d t, t in [0,1] intersects the box of node.
+  */
+  static bool segment_cuts_box(const Tnode & node, const T a[3], const T d[3]) {
+
+    T t0 = 0, t1 = 1, s0, s1;
+
+    for (int k = 0; k < 3; ++k) {
+      if (d[k] == 0) {
+        if (a[k] < node.lo[k] || a[k] > node.hi[k]) return false;
+      } else {
+        s0 = (node.lo[k] - a[k])/d[k];
+        s1 = (node.hi[k] - a[k])/d[k];
+        if (s0 > s1) std::swap(s0, s1);
+        if (s0 > t0) t0 = s0;
+        if (s1 < t1) t1 = s1;
+        if (t0 > t1) return false;
+      }
+    }
+
+    return true;
+  }
+
+  /*
+    Check if the box [lo, hi] intersects the box of node.
+  */
+  static bool box_cuts_box(const Tnode & node, const T lo[3], const T hi[3]) {
+
+    for (int k = 0; k < 3; ++k)
+      if (hi[k] < node.lo[k] || lo[k] > node.hi[k]) return false;
+
+    return true;
+  }
+
+  public:
+
+  Tbvh() {}
+
+  /*
+    Build the hierarchy.
+
+    Input:
+      lo - vector of lower corners of boxes of n items (3*n values)
+      hi - vector of upper corners of boxes of n items (3*n values)
+      pad - absolute padding added to all boxes
+      leaf_size - maximal number of items in a leaf
+  */
+  void build(
+    const std::vector<T> & lo,
+    const std::vector<T> & hi,
+    const T & pad = 0,
+    int leaf_size = 4) {
+
+    int n = lo.size()/3;
+
+    nodes.clear();
+    items.resize(n);
+    std::iota(items.begin(), items.end(), 0);
+
+    if (n == 0) return;
+
+    nodes.reserve(2*(n/leaf_size + 1));
+
+    build_node(lo, hi, 0, n, pad, leaf_size);
+  }
+
+  /*
+    Call f(i) for all items i whose box intersects the line segment
+
+      r = c1 + (c2 - c1)t      t in [0,1]
+  */
+  template <class F>
+  void segment(const T c1[3], const T c2[3], F && f) const {
+
+    if (nodes.empty()) return;
+
+    T d[3] = {c2[0] - c1[0], c2[1] - c1[1], c2[2] - c1[2]};
+
+    int stack[64], n = 0;
+
+    stack[n++] = 0;
+
+    while (n) {
+
+      const Tnode & node = nodes[stack[--n]];
+
+      if (!segment_cuts_box(node, c1, d)) continue;
+
+      if (node.count > 0) {
+        for (int k = node.first, ke = k + node.count; k < ke; ++k) f(items[k]);
+      } else {
+        stack[n++] = node.right;
+        stack[n++] = node.left;
+      }
+    }
+  }
+
+  /*
+    Call f(i) for all items i whose box intersects the box [lo, hi].
+  */
+  template <class F>
+  void box(const T lo[3], const T hi[3], F && f) const {
+
+    if (nodes.empty()) return;
+
+    int stack[64], n = 0;
+
+    stack[n++] = 0;
+
+    while (n) {
+
+      const Tnode & node = nodes[stack[--n]];
+
+      if (!box_cuts_box(node, lo, hi)) continue;
+
+      if (node.count > 0) {
+        for (int k = node.first, ke = k + node.count; k < ke; ++k) f(items[k]);
+      } else {
+        stack[n++] = node.right;
+        stack[n++] = node.left;
+      }
+    }
+  }
+};
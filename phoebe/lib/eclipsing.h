@@ -22,6 +22,8 @@
 #include "utils.h"
 #include "triang_mesh.h"
 #include "clipper.h"
+#include "parallel.h"
+#include "bvh.h"
 
 //#include "clipper_orig.h"
 
@@ -759,6 +761,186 @@ void triangle_mesh_rough_visibility_elegant(
 }
 
 
+/*
+  Determining the visible part of the potentially visible triangles,
+  which are sorted w.r.t. depth, by clipping each triangle only with the
+  triangles in front of it that overlap with it on the screen. As the
+  triangles are processed independently, this is done in several threads.
+
+  The visible parts agree with those obtained by the painter's algorithm
+  with a growing shadow (see triangle_mesh_visibility_boolean) to the
+  precision of the polygon clipping and do not depend on the number of
+  threads.
+
+  Input:
+    index - indices of triangles ordered in depth
+    Tri - on-screen triangles ordered in depth
+    Sub - on-screen parts of the triangles that can be visible (e.g. cut
+          w.r.t. mu), the first one is assumed to be fully visible
+    nthreads - number of threads
+
+  Output:
+    M - vector of the fractions of triangle that is visible
+    W - weights for averaging over visible area of triangles
+*/
+template <class T>
+void triangle_mesh_eclipse_threaded(
+  std::vector<int> & index,
+  std::vector<ClipperLib::Path> & Tri,
+  std::vector<ClipperLib::Path> & Sub,
+  std::vector<T> *M,
+  std::vector<T3Dpoint<T>> *W,
+  int nthreads) {
+
+  int n = index.size();
+
+  if (n == 0) return;
+
+  //
+  // Shadows casted by the triangles with a consistent orientation,
+  // as the shadows of several triangles are clipped at once
+  //
+
+  std::vector<ClipperLib::Path> S(n);
+
+  std::vector<ClipperLib::cInt> bb(4*n); // {minX, maxX, minY, maxY}
+
+  std::vector<T> lo(3*n), hi(3*n);
+
+  for (int i = 0; i < n; ++i) {
+
+    // we assume that the first triangle is surely visible
+    // whole triangle is casting the shadow
+    S[i] = (i == 0 ? Tri[i] : Sub[i]);
+
+    if (!ClipperLib::Orientation(S[i])) ClipperLib::ReversePath(S[i]);
+
+    ClipperLib::cInt *b = bb.data() + 4*i;
+
+    b[0] = b[2] = std::numeric_limits<ClipperLib::cInt>::max();
+    b[1] = b[3] = std::numeric_limits<ClipperLib::cInt>::min();
+
+    for (auto && p : S[i]) {
+      if (b[0] > p.X) b[0] = p.X;
+      if (b[1] < p.X) b[1] = p.X;
+      if (b[2] > p.Y) b[2] = p.Y;
+      if (b[3] < p.Y) b[3] = p.Y;
+    }
+
+    lo[3*i] = b[0];
+    hi[3*i] = b[1];
+    lo[3*i + 1] = b[2];
+    hi[3*i + 1] = b[3];
+    lo[3*i + 2] = hi[3*i + 2] = 0;
+  }
+
+  // as the conversion to floats is monotonic no padding is needed
+  Tbvh<T> bvh;
+  bvh.build(lo, hi);
+
+  //
+  // Process the first triangle
+  //
+
+  if (M) (*M)[index[0]] = 1;
+
+  if (W) (*W)[index[0]].fill(1./3);
+
+  //
+  // Clip other triangles with triangles in front of them
+  //
+
+  parallel::for_chunks(n - 1, parallel::nthreads(nthreads, n - 1),
+    [&](long begin, long end, [[maybe_unused]] int chunk) {
+
+    ClipperLib::Clipper c;    // clipping engine
+
+    ClipperLib::Paths P;      // visible part
+
+    std::vector<int> front;   // overlapping triangles in front
+
+    ClipperLib::cInt *bk, *bq;
+
+    double r;
+
+    for (int k = begin + 1; k < end + 1; ++k) {
+
+      bk = bb.data() + 4*k;
+
+      front.clear();
+
+      bvh.box(lo.data() + 3*k, hi.data() + 3*k,
+        [&](int q) {
+          bq = bb.data() + 4*q;
+          if (q < k &&
+              bq[0] <= bk[1] && bq[1] >= bk[0] &&
+              bq[2] <= bk[3] && bq[3] >= bk[2])
+            front.push_back(q);
+        });
+
+      // Loading polygons
+      c.Clear();
+      c.AddPath(Sub[k], ClipperLib::ptSubject, true);
+      for (auto && q : front) c.AddPath(S[q], ClipperLib::ptClip, true);
+
+      // calculate remainder: P = T - S
+      // P is the visible part of T
+      c.Execute(ClipperLib::ctDifference, P, ClipperLib::pftNonZero, ClipperLib::pftNonZero);
+
+      r = ClipperLib::Area(P);
+
+      // if it is perfectly hidden
+      if (r == 0) continue;
+
+      // detemine ratio of visibility
+      // due to round off errors it can be slightly bigger than 1
+
+      ClipperLib::Path & s = Tri[k];
+
+      r /= std::abs(ClipperLib::Area(s));
+
+      if (M) (*M)[index[k]] = r;
+
+      if (W) {
+        if (r == 1)   // triangle if fully visible
+          (*W)[index[k]].fill(1./3);
+        else  {       // triangle is partially hidden or initially cut
+
+          // calculate barycenter of the polygon == centroids
+          ClipperLib::DoublePoint u;
+
+          ClipperLib::PolygonCentroid(P, u);
+
+          // transform in barycentric coordinates (x[0],x[1])
+          // solving
+          //  <r> = s[0] + x[0]*(s[1] - s[0]) + x[1]*(s[2] - s[0])
+          // equivalent to 2x2 lin system
+          //   A x = b = ave_r - s[0]
+
+          int i, j;
+
+          T x[2], A[2][2], b[2], det;
+
+          // define matrix A and vector b
+          for (i = 0; i < 2; ++i) {
+            b[i] = u[i] - s[0][i];
+            for (j = 0; j < 2; ++j)  A[i][j] = s[j+1][i] - s[0][i];
+          }
+          det = A[0][0]*A[1][1] - A[0][1]*A[1][0];
+
+          // solve 2x2 eq. A x = b
+          x[0] = (A[1][1]*b[0] - A[0][1]*b[1])/det;
+          x[1] = (A[0][0]*b[1] - A[1][0]*b[0])/det;
+
+          // storing the results
+          (*W)[index[k]].assign(1-x[0]-x[1], x[0], x[1]);
+        }
+      }
+    }
+  });
+}
+
+
 /*
   Determining the visibility ratio of triangles in a triangulated surfaces.
   It can be a union of closed surfaces.  The algorithm is the sequence of
@@ -781,6 +963,8 @@ void triangle_mesh_rough_visibility_elegant(
     V - vector of vertices used in triangles
     Tr - vector of triangles defined by indices vertices
     N - vector of normals to triangles (to speed up repeated use)
+    nthreads - number of threads, if nthreads > 1 the triangles are
+               clipped independently (see triangle_mesh_eclipse_threaded)
 
   Output: optional
     M - vector of the fractions of triangle that is visible
@@ -802,7 +986,8 @@ void triangle_mesh_visibility_boolean(
   std::vector<T3Dpoint<T>> & N,
   std::vector<T> *M = 0,
   std::vector<T3Dpoint<T>> *W = 0,
-  std::vector<std::vector<int>> *H = 0)
+  std::vector<std::vector<int>> *H = 0,
+  int nthreads = 1)
 {
 
   if (M == 0 && W == 0 && H == 0) return;
@@ -943,7 +1128,28 @@ void triangle_mesh_visibility_boolean(
   //
   //  Perform the eclipsing
   //
-  if (M || W) {
+  if ((M || W) && parallel::nthreads(nthreads, Tv.size()) > 1) {
+
+    std::vector<int> index;
+
+    std::vector<ClipperLib::Path> S(Tv.size(), ClipperLib::Path(3));
+
+    index.reserve(Tv.size());
+
+    for (auto && tr : Tv) {
+      int *t = Tr[tr.index].data;
+      for (int i = 0; i < 3; ++i) S[index.size()][i] = VsI[t[i]];
+      index.push_back(tr.index);
+    }
+
+    if (W) {                  // if we generate weights of visible areas
+      W->clear();
+      W->resize(Nt, T3Dpoint<T>(0,0,0)); // default is hidden
+    }
+
+    triangle_mesh_eclipse_threaded(index, S, S, M, W, nthreads);
+
+  } else if (M || W) {
 
     int *t;
 
@@ -1269,6 +1475,8 @@ void cut_triangle_based_on_mu(
     V - vector of vertices used in triangles
     Tr - vector of triangles defined by indices vertices
     N - vector of normals at vertices
+    nthreads - number of threads, if nthreads > 1 the triangles are
+               clipped independently (see triangle_mesh_eclipse_threaded)
 
   Output: optional
     M - vector of the fractions of triangle that is visible
@@ -1289,7 +1497,8 @@ void triangle_mesh_visibility_linear(
   std::vector<T3Dpoint<T>> & N,
   std::vector<T> *M = 0,
   std::vector<T3Dpoint<T>> *W = 0,
-  std::vector<std::vector<int>> *H = 0)
+  std::vector<std::vector<int>> *H = 0,
+  int nthreads = 1)
 {
 
   if (M == 0 && W == 0 && H == 0) return;
@@ -1441,7 +1650,37 @@ void triangle_mesh_visibility_linear(
   //
   //  Perform the eclipsing
   //
-  if (M || W) {
+  if ((M || W) && parallel::nthreads(nthreads, Tv.size()) > 1) {
+
+    std::vector<int> index;
+
+    std::vector<ClipperLib::Path> S0(Tv.size(), ClipperLib::Path(3)), S(Tv.size());
+
+    index.reserve(Tv.size());
+
+    for (auto && tr : Tv) {
+
+      int k = index.size(), *t = Tr[tr.index].data;
+
+      // get vertices of the base triangle
+      for (int i = 0; i < 3; ++i) S0[k][i] = VsI[t[i]];
+
+      if (tr.mu[0] >= 0 && tr.mu[1] >= 0 && tr.mu[2] >= 0)
+        S[k] = S0[k];  // whole triangle
+      else             // cutting triangle as some vertices are not visible
+        cut_triangle_based_on_mu(tr.mu, S0[k], S[k]);
+
+      index.push_back(tr.index);
+    }
+
+    if (W) {                    // if we generate weights of visible areas
+      W->clear();
+      W->resize(Nt, T3Dpoint<T>(0,0,0)); // default is hidden
+    }
+
+    triangle_mesh_eclipse_threaded(index, S0, S, M, W, nthreads);
+
+  } else if (M || W) {
 
     int *t;
 
@@ -88,7 +88,7 @@ struct Tlinear_interpolation {
 
   // own data
 
-  T *lo, *hi, *prod, **n, **fvv, *__ret;
+  T *lo, *dx, *prod, **fvv, *__ret;
 
   int *axelen, *axidx, Nf;
 
@@ -109,14 +109,18 @@ struct Tlinear_interpolation {
    : Na(Na), Nv(Nv), L(L), A(A), G(G), Nf(1<< Na) {
 
     lo = new T [3*Na + Nv];
-    hi = lo + Na,
-    prod = hi + Na,
+    dx = lo + Na,
+    prod = dx + Na,
     __ret = prod + Na;
 
     axidx = new int [Na];
 
-    n = utils::matrix<T>(Nf, Na);   // space to hold all the nodes
     fvv = utils::matrix<T>(Nf, Nv); // function value arrays
+
+    // strides of the axes within the grid (in units of Nv) do not depend
+    // on the interpolated point, so we only compute them once
+    for (int j = Na-1; j >= 0; --j)
+      prod[j] = (j == Na - 1) ? 1.0 : prod[j+1]*L[j+1];
   }
 
 
@@ -124,7 +128,6 @@ struct Tlinear_interpolation {
     delete [] lo;
     delete [] axidx;
 
-    utils::free_matrix(n);
     utils::free_matrix(fvv);
   }
 
@@ -159,10 +162,13 @@ struct Tlinear_interpolation {
       }
     }
 
+    // lower node and width of the bracketing interval along each axis
+    // NOTE: the width is computed as (lo + (hi - lo)) - lo, which is how the
+    // difference between the upper and lower nodes was previously evaluated,
+    // to keep the results identical.
     for (j = Na-1; j >= 0; --j) {
       lo[j] = A[j][axidx[j]-1];
-      hi[j] = A[j][axidx[j]];
-      prod[j] = (j == Na - 1) ? 1.0 : prod[j+1]*L[j+1];
+      dx[j] = (lo[j] + (A[j][axidx[j]] - lo[j])) - lo[j];
     }
 
     for (k = 0; k < Nf; ++k) {
@@ -174,15 +180,10 @@ struct Tlinear_interpolation {
       for (l = 0; l < Nv; ++l) fvv[k][l] = g[l];
     }
 
-    // Populate the nodes:
-    for (k = 0; k < Na; ++k)
-      for (j = 0; j < Nf; ++j)
-        n[j][k] = lo[k] + ((j >> k) & 1)*(hi[k] - lo[k]);
-
     for (k = 0, o = Na - 1, m = Nf >> 1; k < Na; ++k, --o, m >>=1)
       for (j = 0; j < m; ++j)
         for (l = 0; l < Nv; ++l)
-          fvv[j][l] += (x[o] - n[j][o])*(fvv[j + m][l] - fvv[j][l])/(n[j + m][o] - n[j][o]);
+          fvv[j][l] += (x[o] - lo[o])*(fvv[j + m][l] - fvv[j][l])/dx[o];
 
     for (l = 0; l < Nv; ++l) r[l] = fvv[0][l];
 
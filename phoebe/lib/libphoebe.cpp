@@ -4310,12 +4310,18 @@ static PyObject *roche_marching_mesh([[maybe_unused]] PyObject *self, PyObject *
 
   if (b_vnormgrads) GatV = new std::vector<double>;
 
-  int error =
+  int error;
+
+  Py_BEGIN_ALLOW_THREADS
+
+  error =
     (b_full ?
       march.triangulize_full_clever(r, g, delta, max_triangles, V, NatV, Tr, GatV, init_phi) :
       march.triangulize(r, g, delta, max_triangles, V, NatV, Tr, GatV, init_phi)
     );
 
+  Py_END_ALLOW_THREADS
+
   switch(error) {
     case 1:
       raise_exception("There are too many triangles!");
@@ -4351,8 +4357,12 @@ static PyObject *roche_marching_mesh([[maybe_unused]] PyObject *self, PyObject *
 
   if (b_volume) p_volume = &volume;
 
+  Py_BEGIN_ALLOW_THREADS
+
   mesh_attributes(V, NatV, Tr, A, NatT, p_area, p_volume, vertex_choice, true);
 
+  Py_END_ALLOW_THREADS
+
   //
   // Calculte the central points
   //
@@ -4368,8 +4378,12 @@ static PyObject *roche_marching_mesh([[maybe_unused]] PyObject *self, PyObject *
   if (b_cnormgrads) GatC = new std::vector<double>;
 
 
+  Py_BEGIN_ALLOW_THREADS
+
   march.central_points(V, Tr, C, NatC, GatC);
 
+  Py_END_ALLOW_THREADS
+
 
   if (b_vertices)
     PyDict_SetItemStringStealRef(results, "vertices", PyArray_From3DPointVector(V));
@@ -4681,12 +4695,18 @@ static PyObject *rotstar_marching_mesh([[maybe_unused]] PyObject *self, PyObject
 
   if (b_vnormgrads) GatV = new std::vector<double>;
 
-  int error =
+  int error;
+
+  Py_BEGIN_ALLOW_THREADS
+
+  error =
     (b_full ?
       march.triangulize_full_clever(r, g, delta, max_triangles, V, NatV, Tr, GatV, init_phi) :
       march.triangulize(r, g, delta, max_triangles, V, NatV, Tr, GatV, init_phi)
     );
 
+  Py_END_ALLOW_THREADS
+
   switch(error) {
     case 1:
       raise_exception("There are too many triangles!");
@@ -4720,9 +4740,13 @@ static PyObject *rotstar_marching_mesh([[maybe_unused]] PyObject *self, PyObject
 
   if (b_volume) p_volume = &volume;
 
+  Py_BEGIN_ALLOW_THREADS
+
   // We do reordering triangles, so that NatT is pointing out
   mesh_attributes(V, NatV, Tr, A, NatT, p_area, p_volume, vertex_choice, true);
 
+  Py_END_ALLOW_THREADS
+
   //
   // Calculte the central points
   //
@@ -4737,8 +4761,12 @@ static PyObject *rotstar_marching_mesh([[maybe_unused]] PyObject *self, PyObject
 
   if (b_cnormgrads) GatC = new std::vector<double>;
 
+  Py_BEGIN_ALLOW_THREADS
+
   march.central_points(V, Tr, C, NatC, GatC);
 
+  Py_END_ALLOW_THREADS
+
   //
   // Returning results
   //
@@ -5086,11 +5114,17 @@ static PyObject *rotstar_misaligned_marching_mesh([[maybe_unused]] PyObject *sel
   if (b_vnormgrads) GatV = new std::vector<double>;
 
 
-  int error =(b_full ?
+  int error;
+
+  Py_BEGIN_ALLOW_THREADS
+
+  error =(b_full ?
       march.triangulize_full_clever(r, g, delta, max_triangles, V, NatV, Tr, GatV, init_phi):
       march.triangulize(r, g, delta, max_triangles, V, NatV, Tr, GatV, init_phi)
       );
 
+  Py_END_ALLOW_THREADS
+
   switch(error) {
     case 1:
       raise_exception("There are too many triangles!");
@@ -5121,9 +5155,13 @@ static PyObject *rotstar_misaligned_marching_mesh([[maybe_unused]] PyObject *sel
 
   if (b_volume) p_volume = &volume;
 
+  Py_BEGIN_ALLOW_THREADS
+
   // We do reordering triangles, so that NatT is pointing out
   mesh_attributes(V, NatV, Tr, A, NatT, p_area, p_volume, vertex_choice, true);
 
+  Py_END_ALLOW_THREADS
+
   //
   // Calculte the central points
   //
@@ -5138,8 +5176,12 @@ static PyObject *rotstar_misaligned_marching_mesh([[maybe_unused]] PyObject *sel
 
   if (b_cnormgrads) GatC = new std::vector<double>;
 
+  Py_BEGIN_ALLOW_THREADS
+
   march.central_points(V, Tr, C, NatC, GatC);
 
+  Py_END_ALLOW_THREADS
+
   //
   // Returning results
   //
@@ -5420,12 +5462,18 @@ static PyObject *sphere_marching_mesh([[maybe_unused]] PyObject *self, PyObject
   std::vector<T3Dpoint<int>> Tr;
   std::vector<double> *GatV = 0;
 
-  int error =
+  int error;
+
+  Py_BEGIN_ALLOW_THREADS
+
+  error =
     (b_full ?
       march.triangulize_full_clever(r, g, delta, max_triangles, V, NatV, Tr, GatV, init_phi) :
       march.triangulize(r, g, delta, max_triangles, V, NatV, Tr, GatV, init_phi)
     );
 
+  Py_END_ALLOW_THREADS
+
   switch(error) {
     case 1:
       raise_exception("There are too many triangles!");
@@ -5460,8 +5508,12 @@ static PyObject *sphere_marching_mesh([[maybe_unused]] PyObject *self, PyObject
 
   if (b_volume) p_volume = &volume;
 
+  Py_BEGIN_ALLOW_THREADS
+
   mesh_attributes(V, NatV, Tr, A, NatT, p_area, p_volume, vertex_choice, true);
 
+  Py_END_ALLOW_THREADS
+
   //
   // Calculte the central points
   //
@@ -5879,6 +5931,8 @@ static PyObject *roche_misaligned_marching_mesh([[maybe_unused]] PyObject *self,
 
   int error = 0;
 
+  Py_BEGIN_ALLOW_THREADS
+
   if (aligned) {
     double params[] = {q, F, d, Omega0};
 
@@ -5920,6 +5974,8 @@ static PyObject *roche_misaligned_marching_mesh([[maybe_unused]] PyObject *self,
     }
   }
 
+  Py_END_ALLOW_THREADS
+
 
   if (error && verbosity_level>=2) {
     report_stream << fname
@@ -5970,8 +6026,12 @@ static PyObject *roche_misaligned_marching_mesh([[maybe_unused]] PyObject *self,
 
   if (b_volume) p_volume = &volume;
 
+  Py_BEGIN_ALLOW_THREADS
+
   mesh_attributes(V, NatV, Tr, A, NatT, p_area, p_volume, vertex_choice, true);
 
+  Py_END_ALLOW_THREADS
+
 
   if (b_vertices)
     PyDict_SetItemStringStealRef(results, "vertices", PyArray_From3DPointVector(V));
@@ -6048,6 +6108,11 @@ static PyObject *roche_misaligned_marching_mesh([[maybe_unused]] PyObject *self,
     tvisibilities: boolean, default True
     taweights: boolean, default False
     horizon: boolean, default False
+    nthreads: integer, default 1
+      number of threads used to determine visibility of triangles,
+      if nthreads <= 0 all hardware threads are used. With nthreads > 1
+      triangles are clipped independently and results agree with the
+      serial ones to the precision of the polygon clipping.
 
   Returns: dictionary with keywords
 
@@ -6085,8 +6150,11 @@ static PyObject *mesh_visibility([[maybe_unused]] PyObject *self, PyObject *args
     (char*)"tvisibilities",
     (char*)"taweights",
     (char*)"horizon",
+    (char*)"nthreads",
     NULL};
 
+  int nthreads = 1;
+
   PyArrayObject *ov = 0, *oV = 0, *oT = 0, *oN = 0;
 
   PyObject
@@ -6102,7 +6170,7 @@ static PyObject *mesh_visibility([[maybe_unused]] PyObject *self, PyObject *args
 
   // parse arguments
   if (!PyArg_ParseTupleAndKeywords(
-        args, keywds, "O!O!O!O!O!|O!O!O!", kwlist,
+        args, keywds, "O!O!O!O!O!|O!O!O!i", kwlist,
         &PyArray_Type, &ov,
         &PyArray_Type, &oV,
         &PyArray_Type, &oT,
@@ -6110,7 +6178,8 @@ static PyObject *mesh_visibility([[maybe_unused]] PyObject *self, PyObject *args
         &PyString_Type, &o_method,
         &PyBool_Type, &o_tvisibilities,
         &PyBool_Type, &o_taweights,
-        &PyBool_Type, &o_horizon
+        &PyBool_Type, &o_horizon,
+        &nthreads
         )
       ){
     raise_exception(fname + "::Problem reading arguments");
@@ -6158,18 +6227,22 @@ static PyObject *mesh_visibility([[maybe_unused]] PyObject *self, PyObject *args
   {
     char *s = PyString_AsString(o_method);
 
+    Py_BEGIN_ALLOW_THREADS
+
     switch (fnv1a_32::hash(s)) {
 
       case "boolean"_hash32:
         // N - normal of traingles
-        triangle_mesh_visibility_boolean(view, V, T, N, M, W, H);
+        triangle_mesh_visibility_boolean(view, V, T, N, M, W, H, nthreads);
         break;
 
       case "linear"_hash32:
         // N - normals at vertices
-        triangle_mesh_visibility_linear(view, V, T, N, M, W, H);
+        triangle_mesh_visibility_linear(view, V, T, N, M, W, H, nthreads);
         break;
     }
+
+    Py_END_ALLOW_THREADS
   }
   //
   // Storing results in dictionary
@@ -6419,10 +6492,17 @@ static PyObject *mesh_offseting([[maybe_unused]] PyObject *self, PyObject *args,
   //
   // Running mesh offseting
   //
-  if (b_curvature ?
-       !mesh_offseting_matching_area_curvature(area, V, NatV, Tr, max_iter):
-       !mesh_offseting_matching_area(area, V, NatV, Tr, max_iter) ){
+  bool success;
+
+  Py_BEGIN_ALLOW_THREADS
+
+  success = (b_curvature ?
+       mesh_offseting_matching_area_curvature(area, V, NatV, Tr, max_iter):
+       mesh_offseting_matching_area(area, V, NatV, Tr, max_iter));
+
+  Py_END_ALLOW_THREADS
 
+  if (!success) {
     raise_exception(fname + "::Offseting failed");
     return NULL;
   }
@@ -6442,9 +6522,13 @@ static PyObject *mesh_offseting([[maybe_unused]] PyObject *self, PyObject *args,
   if (b_area) p_area = &area_new;
   if (b_volume) p_volume = &volume;
 
+  Py_BEGIN_ALLOW_THREADS
+
   // note: no need to reorder
   mesh_attributes(V, NatV, Tr, A, NatT, p_area, p_volume);
 
+  Py_END_ALLOW_THREADS
+
   //
   // Returning results
   //
@@ -6495,6 +6579,9 @@ static PyObject *mesh_offseting([[maybe_unused]] PyObject *self, PyObject *args,
     areas: boolean, default False
     area: boolean, default False
     volume: boolean, default False
+    nthreads: integer, default 1
+      number of threads used to process the triangles,
+      if nthreads <= 0 all hardware threads are used
 
   Returns:
 
@@ -6528,6 +6615,7 @@ static PyObject *mesh_properties([[maybe_unused]] PyObject *self, PyObject *args
     (char*)"areas",
     (char*)"area",
     (char*)"volume",
+    (char*)"nthreads",
     NULL};
 
   bool
@@ -6536,6 +6624,8 @@ static PyObject *mesh_properties([[maybe_unused]] PyObject *self, PyObject *args
     b_area = false,
     b_volume = false;
 
+  int nthreads = 1;
+
   PyArrayObject *oV, *oT;
 
   PyObject
@@ -6545,13 +6635,14 @@ static PyObject *mesh_properties([[maybe_unused]] PyObject *self, PyObject *args
     *o_volume = 0;
 
   if (!PyArg_ParseTupleAndKeywords(
-      args, keywds,  "O!O!|O!O!O!O!", kwlist,
+      args, keywds,  "O!O!|O!O!O!O!i", kwlist,
       &PyArray_Type, &oV, // neccesary
       &PyArray_Type, &oT,
       &PyBool_Type, &o_tnormals,  // optional
       &PyBool_Type, &o_areas,
       &PyBool_Type, &o_area,
-      &PyBool_Type, &o_volume
+      &PyBool_Type, &o_volume,
+      &nthreads
       )){
     raise_exception("mesh_properties::Problem reading arguments");
     return NULL;
@@ -6594,8 +6685,11 @@ static PyObject *mesh_properties([[maybe_unused]] PyObject *self, PyObject *args
 
   if (b_volume) p_volume = &volume;
 
+  Py_BEGIN_ALLOW_THREADS
 
-  mesh_attributes(V, Tr, A, NatT, p_area, p_volume);
+  mesh_attributes(V, Tr, A, NatT, p_area, p_volume, nthreads);
+
+  Py_END_ALLOW_THREADS
 
   //
   // Returning results
@@ -6934,6 +7028,10 @@ bool LDmodelFromListOfTuples(
           relative precision of radiosity vector in sense of L_infty norm
     max_iter: integer, default 100
           maximal number of iterations in the solver of the radiosity eq.
+    nthreads: integer, default 1
+          number of threads used to calculate the view-factor matrix,
+          if nthreads <= 0 all hardware threads are used. The results
+          do not depend on the number of threads.
 
   Returns:
     F[]: 1-rank numpy array of radiosities (intrinsic and reflection)
@@ -6967,10 +7065,13 @@ static PyObject *mesh_radiosity_problem(
     (char*)"epsC",
     (char*)"epsF",
     (char*)"max_iter",
+    (char*)"nthreads",
     NULL
   };
 
-  int max_iter = 100;         // default value
+  int
+    max_iter = 100,           // default value
+    nthreads = 1;             // default value
 
   double
     epsC = 0.00872654,        // default value
@@ -6981,7 +7082,7 @@ static PyObject *mesh_radiosity_problem(
   PyObject *oLDmod, *omodel, *osupport;
 
   if (!PyArg_ParseTupleAndKeywords(
-      args, keywds,  "O!O!O!O!O!O!O!O!O!O!|ddi", kwlist,
+      args, keywds,  "O!O!O!O!O!O!O!O!O!O!|ddii", kwlist,
       &PyArray_Type, &oV,         // neccesary
       &PyArray_Type, &oT,
       &PyArray_Type, &oN,
@@ -6994,7 +7095,476 @@ static PyObject *mesh_radiosity_problem(
       &PyString_Type, &osupport,
       &epsC,                      // optional
       &epsF,
-      &max_iter)){
+      &max_iter,
+      &nthreads)){
+
+    raise_exception(fname + "::Problem reading arguments");
+    return NULL;
+  }
+
+  //
+  // Storing input data
+  //
+
+  std::vector<TLDmodel<double>*> LDmod;
+
+  if (!LDmodelFromListOfTuples(oLDmod, LDmod)){
+    raise_exception(fname +  "::Not able to read LD models");
+    return NULL;
+  }
+
+
+  std::vector<int> LDidx;
+  PyArray_ToVector(oLDidx, LDidx);
+
+  std::vector<T3Dpoint<double>> V, N;
+  std::vector<T3Dpoint<int>> Tr;
+
+  std::vector<double> A;
+  PyArray_ToVector(oA, A);
+
+  PyArray_To3DPointVector(oV, V);
+  PyArray_To3DPointVector(oT, Tr);
+  PyArray_To3DPointVector(oN, N);
+
+  //
+  // Determine the LD view-factor matrix
+  //
+
+  std::vector<Tview_factor<double>> Fmat;
+  {
+    char *s =  PyString_AsString(osupport);
+
+    switch (fnv1a_32::hash(s)) {
+
+      case "triangles"_hash32:
+        Py_BEGIN_ALLOW_THREADS
+        triangle_mesh_radiosity_matrix_triangles(
+          V, Tr, N, A, LDmod, LDidx,  Fmat, epsC, nthreads);
+        Py_END_ALLOW_THREADS
+      break;
+
+      case "vertices"_hash32:
+        Py_BEGIN_ALLOW_THREADS
+        triangle_mesh_radiosity_matrix_vertices(
+          V, Tr, N, A, LDmod, LDidx,  Fmat, epsC, nthreads);
+        Py_END_ALLOW_THREADS
+      break;
+
+      default:
+        raise_exception(fname + "::This support type is not supported");
+      return NULL;
+    }
+  }
+
+  for (auto && ld: LDmod) delete ld;
+  LDmod.clear();
+
+  // some clean up to reduce memory footprint
+  LDidx.clear(); V.clear(); Tr.clear(); N.clear();  A.clear();
+
+  //
+  // Solving the radiosity equation depending on the model
+  //
+
+  std::vector<double> F0, F, R;
+
+  PyArray_ToVector(oR, R);
+  PyArray_ToVector(oF0, F0);
+
+  {
+    bool success = false;
+
+    char *s = PyString_AsString(omodel);
+
+    switch (fnv1a_32::hash(s)) {
+
+      case "Wilson"_hash32:
+        Py_BEGIN_ALLOW_THREADS
+        success = solve_radiosity_equation_Wilson(Fmat, R, F0, F);
+        Py_END_ALLOW_THREADS
+
+        break;
+
+      case "Horvat"_hash32:
+        Py_BEGIN_ALLOW_THREADS
+        success = solve_radiosity_equation_Horvat(Fmat, R, F0, F);
+        Py_END_ALLOW_THREADS
+        break;
+
+      default:
+        raise_exception(fname + "::This radiosity model =" + std::string(s) + " does not exist");
+        return NULL;
+    }
+
+    if (!success)
+      raise_exception(fname + "::slow convergence");
+  }
+
+  return PyArray_FromVector(F);
+}
+
+/*
+  C++ wrapper for Python code:
+
+  Calculate radiosity of triangles on n convex bodies due to reflection
+  according to a chosen reflection model using triangles or vertices as
+  support of the surface.
+
+  Python:
+
+    F = mesh_radiosity_problem_nbody_convex(
+        V, Tr, N, A, R, F0, LDmod, model, support, <keyword> = <value>, ... )
+
+  where positional parameters:
+
+    V = {V1, V2, ...} :
+      list of 2-rank numpy array of vertices V[][3],
+      length of the list is n, as number of bodies
+
+    Tr = {Tr1, Tr2, ...} :
+      list of 2-rank numpy array of 3 indices of vertices Tr[][3]
+      composing triangles of the mesh aka connectivity matrix
+      length of the list is n, as number of bodies
+
+    N = {N1, N2, ...} :
+      list of 2-rank numpy array of normals at triangles or vertices N[][3]
+
+    A = {A1, A2, ...} :
+      list of 1-rank numpy array of areas of triangles A[]
+
+    R = {R1, R2, ...} :
+      list of 1-rank numpy array of albedo/reflection at triangles
+      or vertices R[]
+
+    F0 = {F0_0, F0_1, ...} :
+      list of 1-rank numpy array of intrisic radiant exitance at
+      triangles or vertices F0[]
+
+    LDmod = {LDmod1, LDmod2,..}: list of tuples of the format
+
+            ("name", sequence of parameters)
+            with one model per body. Supported ld models:
+              "uniform"     0 parameters
+              "linear"      1 parameters
+              "quadratic"   2 parameters
+              "nonlinear"   3 parameters
+              "logarithmic" 2 parameters
+              "square_root" 2 parameters
+              "power"       4 parameters
+
+
+     model : string - name of the reflection model in use
+             method in {"Wilson", "Horvat"}
+
+    support: string
+              {"triangles","vertices"}
+
+  optionally:
+
+    epsC: float, default 0.00872654 = cos(89.5deg)
+          threshold for permitted cos(view-angle)
+    epsF: float, default 1e-12
+          relative precision of radiosity vector in sense of L_infty norm
+    max_iter: integer, default 100
+          maximal number of iterations in the solver of the radiosity eq.
+    nthreads: integer, default 1
+          number of threads used to calculate the view-factor matrix,
+          if nthreads <= 0 all hardware threads are used. The results
+          do not depend on the number of threads.
+
+  Returns:
+    F = {F_0, F_1, ...} : list of 1-rank numpy array of total radiosities
+                      (intrinsic and reflection) at triangles or vertices
+
+  Ref:
+  * Wilson, R. E.  Accuracy and efficiency in the binary star reflection effect,
+    Astrophysical Journal,  356, 613-622, 1990 June
+*/
+
+static PyObject *mesh_radiosity_problem_nbody_convex(
+  [[maybe_unused]] PyObject *self, PyObject *args, PyObject *keywds) {
+
+  auto fname = "mesh_radiosity_problem_nbody_convex"_s;
+
+  //
+  // Reading arguments
+  //
+
+ char *kwlist[] = {
+    (char*)"V",
+    (char*)"Tr",
+    (char*)"N",
+    (char*)"A",
+    (char*)"R",
+    (char*)"F0",
+    (char*)"LDmod",
+    (char*)"model",
+    (char*)"support",
+    (char*)"epsC",
+    (char*)"epsF",
+    (char*)"max_iter",
+    (char*)"nthreads",
+    NULL
+  };
+
+  int
+    max_iter = 100,           // default value
+    nthreads = 1;             // default value
+
+  double
+    epsC = 0.00872654,        // default value
+    epsF = 1e-12;             // default value
+
+  PyObject *oLDmod, *omodel, *oV, *oTr, *oN, *oA, *oR, *oF0, *osupport;
+
+  if (!PyArg_ParseTupleAndKeywords(
+        args, keywds,  "O!O!O!O!O!O!O!O!O!|ddii", kwlist,
+        &PyList_Type, &oV,         // neccesary
+        &PyList_Type, &oTr,
+        &PyList_Type, &oN,
+        &PyList_Type, &oA,
+        &PyList_Type, &oR,
+        &PyList_Type, &oF0,
+        &PyList_Type, &oLDmod,
+        &PyString_Type, &omodel,
+        &PyString_Type, &osupport,
+        &epsC,                     // optional
+        &epsF,
+        &max_iter,
+        &nthreads)
+      ){
+    raise_exception(fname + "::Problem reading arguments");
+    return NULL;
+  }
+
+  //
+  // Storing input data
+  //
+
+  std::vector<TLDmodel<double>*> LDmod;
+
+  if (!LDmodelFromListOfTuples(oLDmod, LDmod)){
+    raise_exception(fname + "::Not able to read LD models");
+    return NULL;
+  }
+
+  //
+  // Checking number of bodies
+  //
+
+  int n = LDmod.size();
+
+  if (n <= 1){
+    raise_exception(fname + "::There seem to just n=" + std::to_string(n) + " bodies.");
+    return NULL;
+  }
+
+  //
+  // Check is there is interpolation is used
+  //
+  std::vector<std::vector<T3Dpoint<double>>> V(n), N(n);
+  std::vector<std::vector<T3Dpoint<int>>> Tr(n);
+  std::vector<std::vector<double>> A(n), R(n), F0(n), F;
+
+  for (int b = 0; b < n; ++b){
+    PyArray_To3DPointVector((PyArrayObject *)PyList_GetItem(oV, b), V[b]);
+    PyArray_To3DPointVector((PyArrayObject *)PyList_GetItem(oN, b), N[b]);
+    PyArray_To3DPointVector((PyArrayObject *)PyList_GetItem(oTr, b), Tr[b]);
+
+    PyArray_ToVector((PyArrayObject *)PyList_GetItem(oA, b), A[b]);
+    PyArray_ToVector((PyArrayObject *)PyList_GetItem(oR, b), R[b]);
+    PyArray_ToVector((PyArrayObject *)PyList_GetItem(oF0, b), F0[b]);
+  }
+
+  //
+  // Determine the LD view-factor matrix
+  //
+
+  std::vector<Tview_factor_nbody<double>> Fmat;
+
+  {
+    char *s =  PyString_AsString(osupport);
+
+    switch (fnv1a_32::hash(s)) {
+
+      case "triangles"_hash32:
+        Py_BEGIN_ALLOW_THREADS
+        triangle_mesh_radiosity_matrix_triangles_nbody_convex(
+          V, Tr, N, A, LDmod, Fmat, epsC, nthreads);
+        Py_END_ALLOW_THREADS
+        break;
+
+      case "vertices"_hash32:
+        Py_BEGIN_ALLOW_THREADS
+        triangle_mesh_radiosity_matrix_vertices_nbody_convex(
+          V, Tr, N, A, LDmod, Fmat, epsC, nthreads);
+        Py_END_ALLOW_THREADS
+        break;
+
+      default:
+        raise_exception(fname + "::This support type is not supported");
+        return NULL;
+    }
+  }
+
+
+  for (auto && ld: LDmod) delete ld;
+  LDmod.clear();
+
+
+  //
+  // Solving the radiosity equation depending on the model
+  //
+  {
+    bool success = false;
+
+    char *s = PyString_AsString(omodel);
+
+    switch (fnv1a_32::hash(s)) {
+
+      case "Wilson"_hash32:
+        Py_BEGIN_ALLOW_THREADS
+        success = solve_radiosity_equation_Wilson_nbody(Fmat, R, F0, F);
+        Py_END_ALLOW_THREADS
+      break;
+
+      case "Horvat"_hash32:
+        Py_BEGIN_ALLOW_THREADS
+        success = solve_radiosity_equation_Horvat_nbody(Fmat, R, F0, F);
+        Py_END_ALLOW_THREADS
+      break;
+
+      default:
+        raise_exception(fname + "::This radiosity model ="+ std::string(s) + " does not exist");
+        return NULL;
+    }
+
+    if (!success) raise_exception(fname + "::slow convergence");
+  }
+
+
+  PyObject *results = PyList_New(n);
+
+  for (int b = 0; b < n; ++b)
+    PyList_SetItem(results, b, PyArray_FromVector(F[b]));
+
+  return results;
+}
+
+
+/*
+  Store a vector of trivially copyable elements (e.g. the sparse view-factor
+  matrix) as a 1-rank numpy array of bytes, which can be kept in Python and
+  passed back to the routines below.
+*/
+template <typename T>
+PyObject *PyArray_FromPackedVector(std::vector<T> &V){
+
+  npy_intp dims[1] = {npy_intp(V.size()*sizeof(T))};
+
+  PyObject *pya = PyArray_SimpleNew(1, dims, NPY_UINT8);
+
+  if (V.size()) std::memcpy(PyArray_DATA((PyArrayObject *)pya), V.data(), dims[0]);
+
+  return pya;
+}
+
+template <typename T>
+bool PyArray_ToPackedVector(PyArrayObject *oV, std::vector<T> &V){
+
+  if (PyArray_TYPE(oV) != NPY_UINT8 ||
+      PyArray_NDIM(oV) != 1 ||
+      !PyArray_IS_C_CONTIGUOUS(oV) ||
+      PyArray_DIM(oV, 0) % sizeof(T) != 0) return false;
+
+  V.resize(PyArray_DIM(oV, 0)/sizeof(T));
+
+  if (V.size()) std::memcpy(V.data(), PyArray_DATA(oV), PyArray_DIM(oV, 0));
+
+  return true;
+}
+
+/*
+  C++ wrapper for Python code:
+
+  Calculate the limb-darkened view-factor matrix of the radiosity problem
+  using triangles or vertices as support of the surface. The matrix
+  depends only on the geometry of the mesh and limb darkening and can be
+  reused with mesh_radiosity_solve for different radiant exitances or
+  reflection coefficients.
+
+  Python:
+
+    Fmat = mesh_radiosity_matrix(
+        V, Tr, N, A, LDmod, LDidx, support, <keyword>=<value>, ... )
+
+  where positional parameters are as in mesh_radiosity_problem:
+
+    V[][3]: 2-rank numpy array of vertices
+    Tr[][3]: 2-rank numpy array of 3 indices of vertices
+            composing triangles of the mesh aka connectivity matrix
+    N[][3]: 2-rank numpy array of normals at triangles/vertices
+    A[]: 1-rank numpy array of areas of triangles
+    LDmod: list of tuples of the format ("name", sequence of parameters)
+    LDidx[]: 1-rank numpy array of indices of LD models used on each triangle/vertex
+    support: string
+              {"triangles","vertices"}
+
+  optionally:
+
+    epsC: float, default 0.00872654 = cos(89.5deg)
+          threshold for permitted cos(view-angle)
+    nthreads: integer, default 1
+          number of threads used to calculate the view-factor matrix,
+          if nthreads <= 0 all hardware threads are used.
+
+  Returns:
+    Fmat[]: 1-rank numpy array of bytes (uint8) with the packed sparse
+            view-factor matrix
+*/
+
+static PyObject *mesh_radiosity_matrix(
+  [[maybe_unused]] PyObject *self, PyObject *args, PyObject *keywds) {
+
+  auto fname = "mesh_radiosity_matrix"_s;
+
+  //
+  // Reading arguments
+  //
+
+  char *kwlist[] = {
+    (char*)"V",
+    (char*)"Tr",
+    (char*)"N",
+    (char*)"A",
+    (char*)"LDmod",
+    (char*)"LDidx",
+    (char*)"support",
+    (char*)"epsC",
+    (char*)"nthreads",
+    NULL
+  };
+
+  int nthreads = 1;           // default value
+
+  double epsC = 0.00872654;   // default value
+
+  PyArrayObject *oV, *oT, *oN, *oA, *oLDidx;
+
+  PyObject *oLDmod, *osupport;
+
+  if (!PyArg_ParseTupleAndKeywords(
+      args, keywds,  "O!O!O!O!O!O!O!|di", kwlist,
+      &PyArray_Type, &oV,         // neccesary
+      &PyArray_Type, &oT,
+      &PyArray_Type, &oN,
+      &PyArray_Type, &oA,
+      &PyList_Type, &oLDmod,
+      &PyArray_Type, &oLDidx,
+      &PyString_Type, &osupport,
+      &epsC,                      // optional
+      &nthreads)){
 
     raise_exception(fname + "::Problem reading arguments");
     return NULL;
@@ -7011,61 +7581,141 @@ static PyObject *mesh_radiosity_problem(
     return NULL;
   }
 
+  std::vector<int> LDidx;
+  PyArray_ToVector(oLDidx, LDidx);
+
+  std::vector<T3Dpoint<double>> V, N;
+  std::vector<T3Dpoint<int>> Tr;
+
+  std::vector<double> A;
+  PyArray_ToVector(oA, A);
+
+  PyArray_To3DPointVector(oV, V);
+  PyArray_To3DPointVector(oT, Tr);
+  PyArray_To3DPointVector(oN, N);
+
+  //
+  // Determine the LD view-factor matrix
+  //
+
+  std::vector<Tview_factor<double>> Fmat;
+  {
+    char *s =  PyString_AsString(osupport);
+
+    switch (fnv1a_32::hash(s)) {
+
+      case "triangles"_hash32:
+        Py_BEGIN_ALLOW_THREADS
+        triangle_mesh_radiosity_matrix_triangles(
+          V, Tr, N, A, LDmod, LDidx,  Fmat, epsC, nthreads);
+        Py_END_ALLOW_THREADS
+      break;
+
+      case "vertices"_hash32:
+        Py_BEGIN_ALLOW_THREADS
+        triangle_mesh_radiosity_matrix_vertices(
+          V, Tr, N, A, LDmod, LDidx,  Fmat, epsC, nthreads);
+        Py_END_ALLOW_THREADS
+      break;
+
+      default:
+        for (auto && ld: LDmod) delete ld;
+        raise_exception(fname + "::This support type is not supported");
+      return NULL;
+    }
+  }
+
+  for (auto && ld: LDmod) delete ld;
+
+  return PyArray_FromPackedVector(Fmat);
+}
+
+/*
+  C++ wrapper for Python code:
+
+  Calculate radiosity of triangles/vertices due to reflection according
+  to a chosen reflection model using a view-factor matrix calculated by
+  mesh_radiosity_matrix.
+
+  Python:
+
+    F = mesh_radiosity_solve(Fmat, R, F0, model, <keyword>=<value>, ... )
+
+  where positional parameters:
+
+    Fmat[]: 1-rank numpy array of bytes with the packed view-factor matrix
+    R[]: 1-rank numpy array of albedo/reflection at triangle/vertices
+    F0[]: 1-rank numpy array of intrisic radiant exitance at triangle/vertices
+    model : string - name of the reflection model in use
+             method in {"Wilson", "Horvat"}
+
+  optionally:
 
-  std::vector<int> LDidx;
-  PyArray_ToVector(oLDidx, LDidx);
+    epsF: float, default 1e-12
+          relative precision of radiosity vector in sense of L_infty norm
+    max_iter: integer, default 100
+          maximal number of iterations in the solver of the radiosity eq.
 
-  std::vector<T3Dpoint<double>> V, N;
-  std::vector<T3Dpoint<int>> Tr;
+  Returns:
+    F[]: 1-rank numpy array of radiosities (intrinsic and reflection)
+          at triangles/vertices
+*/
 
-  std::vector<double> A;
-  PyArray_ToVector(oA, A);
+static PyObject *mesh_radiosity_solve(
+  [[maybe_unused]] PyObject *self, PyObject *args, PyObject *keywds) {
 
-  PyArray_To3DPointVector(oV, V);
-  PyArray_To3DPointVector(oT, Tr);
-  PyArray_To3DPointVector(oN, N);
+  auto fname = "mesh_radiosity_solve"_s;
 
   //
-  // Determine the LD view-factor matrix
+  // Reading arguments
   //
 
-  std::vector<Tview_factor<double>> Fmat;
-  {
-    char *s =  PyString_AsString(osupport);
+  char *kwlist[] = {
+    (char*)"Fmat",
+    (char*)"R",
+    (char*)"F0",
+    (char*)"model",
+    (char*)"epsF",
+    (char*)"max_iter",
+    NULL
+  };
 
-    switch (fnv1a_32::hash(s)) {
+  int max_iter = 100;         // default value
 
-      case "triangles"_hash32:
-        triangle_mesh_radiosity_matrix_triangles(
-          V, Tr, N, A, LDmod, LDidx,  Fmat);
-      break;
+  double epsF = 1e-12;        // default value
 
-      case "vertices"_hash32:
-        triangle_mesh_radiosity_matrix_vertices(
-          V, Tr, N, A, LDmod, LDidx,  Fmat);
-      break;
+  PyArrayObject *oFmat, *oR, *oF0;
 
-      default:
-        raise_exception(fname + "::This support type is not supported");
-      return NULL;
-    }
-  }
+  PyObject *omodel;
 
-  for (auto && ld: LDmod) delete ld;
-  LDmod.clear();
+  if (!PyArg_ParseTupleAndKeywords(
+      args, keywds,  "O!O!O!O!|di", kwlist,
+      &PyArray_Type, &oFmat,      // neccesary
+      &PyArray_Type, &oR,
+      &PyArray_Type, &oF0,
+      &PyString_Type, &omodel,
+      &epsF,                      // optional
+      &max_iter)){
 
-  // some clean up to reduce memory footprint
-  LDidx.clear(); V.clear(); Tr.clear(); N.clear();  A.clear();
+    raise_exception(fname + "::Problem reading arguments");
+    return NULL;
+  }
 
-  //
-  // Solving the radiosity equation depending on the model
-  //
+  std::vector<Tview_factor<double>> Fmat;
+
+  if (!PyArray_ToPackedVector(oFmat, Fmat)) {
+    raise_exception(fname + "::Fmat is not a packed view-factor matrix");
+    return NULL;
+  }
 
   std::vector<double> F0, F, R;
 
   PyArray_ToVector(oR, R);
   PyArray_ToVector(oF0, F0);
 
+  //
+  // Solving the radiosity equation depending on the model
+  //
   {
     bool success = false;
 
@@ -7074,12 +7724,15 @@ static PyObject *mesh_radiosity_problem(
     switch (fnv1a_32::hash(s)) {
 
       case "Wilson"_hash32:
-        success = solve_radiosity_equation_Wilson(Fmat, R, F0, F);
-
+        Py_BEGIN_ALLOW_THREADS
+        success = solve_radiosity_equation_Wilson(Fmat, R, F0, F, epsF, double(max_iter));
+        Py_END_ALLOW_THREADS
         break;
 
       case "Horvat"_hash32:
-        success = solve_radiosity_equation_Horvat(Fmat, R, F0, F);
+        Py_BEGIN_ALLOW_THREADS
+        success = solve_radiosity_equation_Horvat(Fmat, R, F0, F, epsF, double(max_iter));
+        Py_END_ALLOW_THREADS
         break;
 
       default:
@@ -7097,56 +7750,25 @@ static PyObject *mesh_radiosity_problem(
 /*
   C++ wrapper for Python code:
 
-  Calculate radiosity of triangles on n convex bodies due to reflection
-  according to a chosen reflection model using triangles or vertices as
-  support of the surface.
+  Calculate the limb-darkened view-factor matrix of the radiosity problem
+  of n convex bodies using triangles or vertices as support of the
+  surface, which can be reused with mesh_radiosity_solve_nbody.
 
   Python:
 
-    F = mesh_radiosity_problem_nbody_convex(
-        V, Tr, N, A, R, F0, LDmod, model, support, <keyword> = <value>, ... )
-
-  where positional parameters:
-
-    V = {V1, V2, ...} :
-      list of 2-rank numpy array of vertices V[][3],
-      length of the list is n, as number of bodies
-
-    Tr = {Tr1, Tr2, ...} :
-      list of 2-rank numpy array of 3 indices of vertices Tr[][3]
-      composing triangles of the mesh aka connectivity matrix
-      length of the list is n, as number of bodies
-
-    N = {N1, N2, ...} :
-      list of 2-rank numpy array of normals at triangles or vertices N[][3]
-
-    A = {A1, A2, ...} :
-      list of 1-rank numpy array of areas of triangles A[]
-
-    R = {R1, R2, ...} :
-      list of 1-rank numpy array of albedo/reflection at triangles
-      or vertices R[]
+    Fmat = mesh_radiosity_matrix_nbody_convex(
+        V, Tr, N, A, LDmod, support, <keyword> = <value>, ... )
 
-    F0 = {F0_0, F0_1, ...} :
-      list of 1-rank numpy array of intrisic radiant exitance at
-      triangles or vertices F0[]
+  where positional parameters are as in mesh_radiosity_problem_nbody_convex:
 
+    V = {V1, V2, ...} : list of 2-rank numpy array of vertices V[][3]
+    Tr = {Tr1, Tr2, ...} : list of 2-rank numpy array of 3 indices of
+      vertices Tr[][3] composing triangles of the mesh
+    N = {N1, N2, ...} : list of 2-rank numpy array of normals at triangles
+      or vertices N[][3]
+    A = {A1, A2, ...} : list of 1-rank numpy array of areas of triangles A[]
     LDmod = {LDmod1, LDmod2,..}: list of tuples of the format
-
-            ("name", sequence of parameters)
-            with one model per body. Supported ld models:
-              "uniform"     0 parameters
-              "linear"      1 parameters
-              "quadratic"   2 parameters
-              "nonlinear"   3 parameters
-              "logarithmic" 2 parameters
-              "square_root" 2 parameters
-              "power"       4 parameters
-
-
-     model : string - name of the reflection model in use
-             method in {"Wilson", "Horvat"}
-
+            ("name", sequence of parameters) with one model per body
     support: string
               {"triangles","vertices"}
 
@@ -7154,67 +7776,52 @@ static PyObject *mesh_radiosity_problem(
 
     epsC: float, default 0.00872654 = cos(89.5deg)
           threshold for permitted cos(view-angle)
-    epsF: float, default 1e-12
-          relative precision of radiosity vector in sense of L_infty norm
-    max_iter: integer, default 100
-          maximal number of iterations in the solver of the radiosity eq.
+    nthreads: integer, default 1
+          number of threads used to calculate the view-factor matrix,
+          if nthreads <= 0 all hardware threads are used.
 
   Returns:
-    F = {F_0, F_1, ...} : list of 1-rank numpy array of total radiosities
-                      (intrinsic and reflection) at triangles or vertices
-
-  Ref:
-  * Wilson, R. E.  Accuracy and efficiency in the binary star reflection effect,
-    Astrophysical Journal,  356, 613-622, 1990 June
+    Fmat[]: 1-rank numpy array of bytes (uint8) with the packed sparse
+            view-factor matrix
 */
 
-static PyObject *mesh_radiosity_problem_nbody_convex(
+static PyObject *mesh_radiosity_matrix_nbody_convex(
   [[maybe_unused]] PyObject *self, PyObject *args, PyObject *keywds) {
 
-  auto fname = "mesh_radiosity_problem_nbody_convex"_s;
+  auto fname = "mesh_radiosity_matrix_nbody_convex"_s;
 
   //
   // Reading arguments
   //
 
- char *kwlist[] = {
+  char *kwlist[] = {
     (char*)"V",
     (char*)"Tr",
     (char*)"N",
     (char*)"A",
-    (char*)"R",
-    (char*)"F0",
     (char*)"LDmod",
-    (char*)"model",
     (char*)"support",
     (char*)"epsC",
-    (char*)"epsF",
-    (char*)"max_iter",
+    (char*)"nthreads",
     NULL
   };
 
-  int max_iter = 100;         // default value
+  int nthreads = 1;           // default value
 
-  double
-    epsC = 0.00872654,        // default value
-    epsF = 1e-12;             // default value
+  double epsC = 0.00872654;   // default value
 
-  PyObject *oLDmod, *omodel, *oV, *oTr, *oN, *oA, *oR, *oF0, *osupport;
+  PyObject *oLDmod, *oV, *oTr, *oN, *oA, *osupport;
 
   if (!PyArg_ParseTupleAndKeywords(
-        args, keywds,  "O!O!O!O!O!O!O!O!O!|ddi", kwlist,
+        args, keywds,  "O!O!O!O!O!O!|di", kwlist,
         &PyList_Type, &oV,         // neccesary
         &PyList_Type, &oTr,
         &PyList_Type, &oN,
         &PyList_Type, &oA,
-        &PyList_Type, &oR,
-        &PyList_Type, &oF0,
         &PyList_Type, &oLDmod,
-        &PyString_Type, &omodel,
         &PyString_Type, &osupport,
         &epsC,                     // optional
-        &epsF,
-        &max_iter)
+        &nthreads)
       ){
     raise_exception(fname + "::Problem reading arguments");
     return NULL;
@@ -7231,32 +7838,23 @@ static PyObject *mesh_radiosity_problem_nbody_convex(
     return NULL;
   }
 
-  //
-  // Checking number of bodies
-  //
-
   int n = LDmod.size();
 
   if (n <= 1){
+    for (auto && ld: LDmod) delete ld;
     raise_exception(fname + "::There seem to just n=" + std::to_string(n) + " bodies.");
     return NULL;
   }
 
-  //
-  // Check is there is interpolation is used
-  //
   std::vector<std::vector<T3Dpoint<double>>> V(n), N(n);
   std::vector<std::vector<T3Dpoint<int>>> Tr(n);
-  std::vector<std::vector<double>> A(n), R(n), F0(n), F;
+  std::vector<std::vector<double>> A(n);
 
   for (int b = 0; b < n; ++b){
     PyArray_To3DPointVector((PyArrayObject *)PyList_GetItem(oV, b), V[b]);
     PyArray_To3DPointVector((PyArrayObject *)PyList_GetItem(oN, b), N[b]);
     PyArray_To3DPointVector((PyArrayObject *)PyList_GetItem(oTr, b), Tr[b]);
-
     PyArray_ToVector((PyArrayObject *)PyList_GetItem(oA, b), A[b]);
-    PyArray_ToVector((PyArrayObject *)PyList_GetItem(oR, b), R[b]);
-    PyArray_ToVector((PyArrayObject *)PyList_GetItem(oF0, b), F0[b]);
   }
 
   //
@@ -7271,25 +7869,119 @@ static PyObject *mesh_radiosity_problem_nbody_convex(
     switch (fnv1a_32::hash(s)) {
 
       case "triangles"_hash32:
+        Py_BEGIN_ALLOW_THREADS
         triangle_mesh_radiosity_matrix_triangles_nbody_convex(
-          V, Tr, N, A, LDmod, Fmat);
+          V, Tr, N, A, LDmod, Fmat, epsC, nthreads);
+        Py_END_ALLOW_THREADS
         break;
 
       case "vertices"_hash32:
+        Py_BEGIN_ALLOW_THREADS
         triangle_mesh_radiosity_matrix_vertices_nbody_convex(
-          V, Tr, N, A, LDmod, Fmat);
+          V, Tr, N, A, LDmod, Fmat, epsC, nthreads);
+        Py_END_ALLOW_THREADS
         break;
 
       default:
+        for (auto && ld: LDmod) delete ld;
         raise_exception(fname + "::This support type is not supported");
         return NULL;
     }
   }
 
-
   for (auto && ld: LDmod) delete ld;
-  LDmod.clear();
 
+  return PyArray_FromPackedVector(Fmat);
+}
+
+/*
+  C++ wrapper for Python code:
+
+  Calculate radiosity of triangles/vertices on n convex bodies due to
+  reflection according to a chosen reflection model using a view-factor
+  matrix calculated by mesh_radiosity_matrix_nbody_convex.
+
+  Python:
+
+    F = mesh_radiosity_solve_nbody(Fmat, R, F0, model, <keyword> = <value>, ... )
+
+  where positional parameters:
+
+    Fmat[]: 1-rank numpy array of bytes with the packed view-factor matrix
+    R = {R1, R2, ...} : list of 1-rank numpy array of albedo/reflection
+      at triangles or vertices R[]
+    F0 = {F0_0, F0_1, ...} : list of 1-rank numpy array of intrisic radiant
+      exitance at triangles or vertices F0[]
+    model : string - name of the reflection model in use
+             method in {"Wilson", "Horvat"}
+
+  optionally:
+
+    epsF: float, default 1e-12
+          relative precision of radiosity vector in sense of L_infty norm
+    max_iter: integer, default 100
+          maximal number of iterations in the solver of the radiosity eq.
+
+  Returns:
+    F = {F_0, F_1, ...} : list of 1-rank numpy array of total radiosities
+                      (intrinsic and reflection) at triangles or vertices
+*/
+
+static PyObject *mesh_radiosity_solve_nbody(
+  [[maybe_unused]] PyObject *self, PyObject *args, PyObject *keywds) {
+
+  auto fname = "mesh_radiosity_solve_nbody"_s;
+
+  //
+  // Reading arguments
+  //
+
+  char *kwlist[] = {
+    (char*)"Fmat",
+    (char*)"R",
+    (char*)"F0",
+    (char*)"model",
+    (char*)"epsF",
+    (char*)"max_iter",
+    NULL
+  };
+
+  int max_iter = 100;         // default value
+
+  double epsF = 1e-12;        // default value
+
+  PyArrayObject *oFmat;
+
+  PyObject *oR, *oF0, *omodel;
+
+  if (!PyArg_ParseTupleAndKeywords(
+        args, keywds,  "O!O!O!O!|di", kwlist,
+        &PyArray_Type, &oFmat,     // neccesary
+        &PyList_Type, &oR,
+        &PyList_Type, &oF0,
+        &PyString_Type, &omodel,
+        &epsF,                     // optional
+        &max_iter)
+      ){
+    raise_exception(fname + "::Problem reading arguments");
+    return NULL;
+  }
+
+  std::vector<Tview_factor_nbody<double>> Fmat;
+
+  if (!PyArray_ToPackedVector(oFmat, Fmat)) {
+    raise_exception(fname + "::Fmat is not a packed view-factor matrix");
+    return NULL;
+  }
+
+  int n = PyList_Size(oF0);
+
+  std::vector<std::vector<double>> R(n), F0(n), F;
+
+  for (int b = 0; b < n; ++b){
+    PyArray_ToVector((PyArrayObject *)PyList_GetItem(oR, b), R[b]);
+    PyArray_ToVector((PyArrayObject *)PyList_GetItem(oF0, b), F0[b]);
+  }
 
   //
   // Solving the radiosity equation depending on the model
@@ -7302,11 +7994,15 @@ static PyObject *mesh_radiosity_problem_nbody_convex(
     switch (fnv1a_32::hash(s)) {
 
       case "Wilson"_hash32:
-        success = solve_radiosity_equation_Wilson_nbody(Fmat, R, F0, F);
+        Py_BEGIN_ALLOW_THREADS
+        success = solve_radiosity_equation_Wilson_nbody(Fmat, R, F0, F, epsF, double(max_iter));
+        Py_END_ALLOW_THREADS
       break;
 
       case "Horvat"_hash32:
-      	success = solve_radiosity_equation_Horvat_nbody(Fmat, R, F0, F);
+        Py_BEGIN_ALLOW_THREADS
+        success = solve_radiosity_equation_Horvat_nbody(Fmat, R, F0, F, epsF, double(max_iter));
+        Py_END_ALLOW_THREADS
       break;
 
       default:
@@ -7317,7 +8013,6 @@ static PyObject *mesh_radiosity_problem_nbody_convex(
     if (!success) raise_exception(fname + "::slow convergence");
   }
 
-
   PyObject *results = PyList_New(n);
 
   for (int b = 0; b < n; ++b)
@@ -10249,7 +10944,7 @@ static PyObject *wd_atmint([[maybe_unused]] PyObject *self, PyObject *args, PyOb
 
   Python:
 
-    results = interp(req, axes, grid)
+    results = interp(req, axes, grid, out=None)
 
   with arguments:
     req: 2-rank numpy array = MxN array (M rows, N columns) where
@@ -10263,6 +10958,13 @@ static PyObject *wd_atmint([[maybe_unused]] PyObject *self, PyObject *args, PyOb
           where Ni are lengths of individual axes, and the last element
           is the vertex value of dimension Nv
 
+  optionally:
+    out: 2-rank numpy array = MxNv C-contiguous array of floats in which
+         to store the results (and which is then returned)
+    nthreads: integer, default 1
+         number of threads used to interpolate the points,
+         if nthreads <= 0 all hardware threads are used
+
   Example: we have the following vertices with corresponding values:
 
     v0 = (0, 2), f(v0) = 5
@@ -10286,24 +10988,32 @@ static PyObject *interp([[maybe_unused]] PyObject *self, PyObject *args, PyObjec
         (char*)"req",
         (char*)"axes",
         (char*)"grid",
+        (char*)"out",
+        (char*)"nthreads",
         NULL
     };
 
-    PyObject *o_axes;
+    int nthreads = 1;
+
+    PyObject *o_axes, *o_out = 0;
 
     // PyObject *o_req, *o_grid;
     PyArrayObject *o_req, *o_grid;
 
     if (!PyArg_ParseTupleAndKeywords(
-          args, keywds, "O!O!O!", kwlist,
+          args, keywds, "O!O!O!|Oi", kwlist,
           &PyArray_Type, &o_req,
           &PyTuple_Type, &o_axes,
-          &PyArray_Type, &o_grid))
+          &PyArray_Type, &o_grid,
+          &o_out,
+          &nthreads))
         {
           raise_exception("interp::argument type mismatch: req and grid need to be numpy arrays and axes a tuple of numpy arrays.");
           return NULL;
         }
 
+    if (o_out == Py_None) o_out = 0;
+
     // if (!PyArg_ParseTuple(args, "OOO", &o_req, &o_axes, &o_grid)) {
     //     raise_exception("arguments for interp(req, axes, grid) could not be parsed.");
     //     return NULL;
@@ -10348,8 +11058,7 @@ static PyObject *interp([[maybe_unused]] PyObject *self, PyObject *args, PyObjec
         Na = PyArray_DIM((PyArrayObject *) o_axes, 0);
 
     int Np = PyArray_DIM(o_req1, 0),     /* number of points */
-        Nv = PyArray_DIM(o_grid1, Na),   /* number of values interpolated */
-        Nr = Np*Nv;                      /* number of returned values */
+        Nv = PyArray_DIM(o_grid1, Na);   /* number of values interpolated */
 
     double
         *Q = (double *) PyArray_DATA(o_req1),  // requested values
@@ -10380,23 +11089,61 @@ static PyObject *interp([[maybe_unused]] PyObject *self, PyObject *args, PyObjec
   //
   npy_intp dims[2] = {Np, Nv};
 
-  #if defined(USING_SimpleNewFromData)
-  double *R = new double [Nr];
-	PyObject *o_ret = PyArray_SimpleNewFromData(2, dims, NPY_DOUBLE, R);
-  PyArray_ENABLEFLAGS((PyArrayObject *)o_ret, NPY_ARRAY_OWNDATA);
-  #else
-	PyObject *o_ret = PyArray_SimpleNew(2, dims, NPY_DOUBLE);
-  double *R = (double *) PyArray_DATA((PyArrayObject *)o_ret);
-  #endif
+  PyObject *o_ret;
+  double *R;
+
+  if (o_out) {
+    PyArrayObject *p = (PyArrayObject *) o_out;
+
+    if (!PyArray_Check(o_out) ||
+        PyArray_TYPE(p) != NPY_DOUBLE ||
+        !PyArray_ISCARRAY(p) ||
+        !PyArray_ISNOTSWAPPED(p) ||
+        PyArray_NDIM(p) != 2 ||
+        PyArray_DIM(p, 0) != Np ||
+        PyArray_DIM(p, 1) != Nv) {
+
+      raise_exception("interp::argument `out` needs to be a writeable, C-contiguous 2-rank numpy array of floats with shape (len(req), grid.shape[-1]).");
+
+      Py_DECREF(o_req1);
+      Py_DECREF(o_grid1);
+      delete [] L;
+      delete [] A;
+      return NULL;
+    }
+
+    Py_INCREF(o_out);
+    o_ret = o_out;
+    R = (double *) PyArray_DATA(p);
+  } else {
+    #if defined(USING_SimpleNewFromData)
+    R = new double [Np*Nv];
+    o_ret = PyArray_SimpleNewFromData(2, dims, NPY_DOUBLE, R);
+    PyArray_ENABLEFLAGS((PyArrayObject *)o_ret, NPY_ARRAY_OWNDATA);
+    #else
+    o_ret = PyArray_SimpleNew(2, dims, NPY_DOUBLE);
+    R = (double *) PyArray_DATA((PyArrayObject *)o_ret);
+    #endif
+  }
 
   //
   // Do interpolation
   //
 
-  Tlinear_interpolation<double> lin_iterp(Na, Nv, L, A, G);
+  Py_BEGIN_ALLOW_THREADS
+
+  // the interpolator keeps a workspace, so there is one per chunk;
+  // points are split among threads only if there are many of them
+  parallel::for_chunks(Np, parallel::nthreads(nthreads, Np/1024),
+    [&](long begin, long end, [[maybe_unused]] int chunk) {
+
+      Tlinear_interpolation<double> lin_iterp(Na, Nv, L, A, G);
+
+      for (double *q = Q + begin*Na, *r = R + begin*Nv, *re = R + end*Nv; r != re; q += Na, r += Nv)
+        lin_iterp.get(q, r);
+    });
 
-  for (double *q = Q, *r = R, *re = r + Nr; r != re; q += Na, r += Nv)
-    lin_iterp.get(q, r);
+  Py_END_ALLOW_THREADS
 
   // clean copies of objects
   Py_DECREF(o_req1);
@@ -11834,6 +12581,30 @@ static PyMethodDef Methods[] = {
     "Solving the radiosity problem with limb darkening for n separate "
     "convex bodies using chosen reflection model."},
 
+  { "mesh_radiosity_matrix",
+    O2F mesh_radiosity_matrix,
+    METH_VARARGS|METH_KEYWORDS,
+    "Calculating the limb-darkened view-factor matrix of the radiosity "
+    "problem."},
+
+  { "mesh_radiosity_solve",
+    O2F mesh_radiosity_solve,
+    METH_VARARGS|METH_KEYWORDS,
+    "Solving the radiosity problem with a given view-factor matrix "
+    "using a chosen reflection model."},
+
+  { "mesh_radiosity_matrix_nbody_convex",
+    O2F mesh_radiosity_matrix_nbody_convex,
+    METH_VARARGS|METH_KEYWORDS,
+    "Calculating the limb-darkened view-factor matrix of the radiosity "
+    "problem for n separate convex bodies."},
+
+  { "mesh_radiosity_solve_nbody",
+    O2F mesh_radiosity_solve_nbody,
+    METH_VARARGS|METH_KEYWORDS,
+    "Solving the radiosity problem for n separate convex bodies with a "
+    "given view-factor matrix using a chosen reflection model."},
+
    { "mesh_radiosity_redistrib_problem_nbody_convex",
     O2F mesh_radiosity_redistrib_problem_nbody_convex,
     METH_VARARGS|METH_KEYWORDS,
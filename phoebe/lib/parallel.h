@@ -0,0 +1,195 @@
+#pragma once
+
+/*
+  Minimal support for running loops over independent items in several
+  threads (std::thread) without external dependencies such as OpenMP.
+
+  The items are split into contiguous chunks, which are processed in
+  increasing order by each thread so that results collected per chunk
+  can be merged in the same order as in a serial loop, making the
+  results independent of the number of threads.
+*/
+
+#include <thread>
+#include <atomic>
+#include <vector>
+#include <algorithm>
+#include <exception>
+#include <cmath>
+
+namespace parallel {
+
+  /*
+    Number of threads to be actually used.
+
+    Input:
+      nthreads - requested number of threads,
+                 if nthreads <= 0 all hardware threads are used
+      nitems - number of items to process (no more threads than items)
+
+    Return:
+      number of threads >= 1
+  */
+  inline int nthreads(int nthreads, long nitems = -1) {
+
+    if (nthreads <= 0) {
+      nthreads = std::thread::hardware_concurrency();
+      if (nthreads <= 0) nthreads = 1;
+    }
+
+    if (nitems >= 0 && nthreads > nitems) nthreads = (nitems > 0 ? nitems : 1);
+
+    return nthreads;
+  }
+
+  /*
+    Call func(begin, end, chunk) for consecutive chunks [begin, end) of
+    the items with indices [0, nitems), using nthreads threads.
+
+    Input:
+      nitems - number of items
+      nthreads - number of threads, if nthreads <= 1 the chunks are
+                 processed serially in the calling thread
+      func - function called per chunk, needs to be thread-safe
+      nchunks - number of chunks, if nchunks <= 0 four chunks per thread
+                are used (to balance the load)
+      bounds - optional boundaries of chunks, vector of length nchunks + 1
+               starting with 0 and ending with nitems, overriding the
+               uniform split of the items
+
+    Note:
+      exceptions thrown by func are re-thrown in the calling thread
+  */
+  template <class F>
+  void for_chunks(
+    long nitems,
+    int nthreads,
+    F && func,
+    int nchunks = 0,
+    const std::vector<long> *bounds = 0) {
+
+    if (nitems <= 0) return;
+
+    std::vector<long> b;
+
+    if (bounds)
+      b = *bounds;
+    else {
+      if (nchunks <= 0) nchunks = 4*std::max(nthreads, 1);
+      if (nchunks > nitems) nchunks = nitems;
+      b.resize(nchunks + 1);
+      for (int k = 0; k <= nchunks; ++k) b[k] = (nitems*k)/nchunks;
+    }
+
+    nchunks = int(b.size()) - 1;
+
+    if (nthreads <= 1 || nchunks <= 1) {
+      for (int k = 0; k < nchunks; ++k) func(b[k], b[k+1], k);
+      return;
+    }
+
+    std::atomic<int> next(0);
+
+    std::vector<std::exception_ptr> errors(nthreads);
+
+    auto work = [&](int t) {
+      try {
+        int k;
+        while ((k = next++) < nchunks) func(b[k], b[k+1], k);
+      } catch (...) {
+        errors[t] = std::current_exception();
+        next = nchunks;
+      }
+    };
+
+    std::vector<std::thread> threads;
+    threads.reserve(nthreads - 1);
+
+    for (int t = 1; t < nthreads; ++t) threads.emplace_back(work, t);
+
+    work(0);
+
+    for (auto && th : threads) th.join();
+
+    for (auto && e : errors) if (e) std::rethrow_exception(e);
+  }
+
+  /*
+    Boundaries of nchunks chunks of rows of a lower-triangular loop
+
+      for i in [0, n): for j in [0, i)
+
+    so that each chunk contains roughly the same number of (i, j) pairs.
+
+    Input:
+      n - number of rows
+      nchunks - number of chunks
+
+    Return:
+      vector of nchunks + 1 increasing boundaries from 0 to n
+  */
+  inline std::vector<long> triangular_bounds(long n, int nchunks) {
+
+    if (nchunks > n) nchunks = (n > 0 ? n : 1);
+
+    std::vector<long> b(nchunks + 1);
+
+    double total = 0.5*double(n)*double(n);
+
+    b[0] = 0;
+    for (int k = 1; k < nchunks; ++k) {
+      long i = long(std::sqrt(2*total*k/nchunks));
+      b[k] = std::min(std::max(i, b[k-1]), n);
+    }
+    b[nchunks] = n;
+
+    return b;
+  }
+
+  /*
+    Collect results of a loop over items [0, nitems) into a vector in
+    the same order as in the serial loop
+
+      for i in [0, nitems): func(i, i + 1, out)
+
+    Input:
+      nitems - number of items
+      nthreads - number of threads
+      func - function func(begin, end, buf) appending the results of the
+             items [begin, end) to the vector buf, needs to be thread-safe
+      bounds - optional boundaries of chunks (see for_chunks)
+
+    Output:
+      out - vector to which the results are appended
+  */
+  template <class V, class F>
+  void collect(
+    long nitems,
+    int nthreads,
+    V & out,
+    F && func,
+    const std::vector<long> *bounds = 0) {
+
+    if (nthreads <= 1) {
+      if (nitems > 0) func(0, nitems, out);
+      return;
+    }
+
+    int nchunks = (bounds ? int(bounds->size()) - 1 : std::min(long(4*nthreads), nitems));
+
+    std::vector<V> bufs(std::max(nchunks, 0));
+
+    for_chunks(nitems, nthreads,
+      [&](long begin, long end, int k){ func(begin, end, bufs[k]); },
+      nchunks, bounds);
+
+    size_t n = out.size();
+    for (auto && buf : bufs) n += buf.size();
+    out.reserve(n);
+
+    for (auto && buf : bufs) {
+      out.insert(out.end(), buf.begin(), buf.end());
+      V().swap(buf);
+    }
+  }
+}
@@ -26,10 +26,13 @@
 #include <tuple>
 #include <utility>
 #include <cstring>
+#include <algorithm>
 
 #include "utils.h"
 #include "triang_mesh.h"
 #include "ld_models.h"
+#include "parallel.h"
+#include "bvh.h"
 
 /*
   Check if the line segment
@@ -155,111 +158,111 @@ struct Tview_factor {
 };
 
 /*
-  Calculating limb-darkened radiosity/view factor matrices with elements
-  defined per TRIANGLE.
+  Element of the depth and view-factor matrix DF used while building
+  the view-factor matrix of a general (not necessarily convex) mesh.
+*/
+template <class T>
+struct Tdepth_view_factor {
 
-  Input:
+  int i;      // index of the triangle/vertex
 
-    V - vector of vertices
-    Tr - vector of triangles
-    NatT - vector of normals at triangles
-    A - vector of areas of triangles
-    LDmodels - vector of limb darkening models in use
-    LDidx - vector of indices of models used on each of triangles
-
-    epsC - threshold for permitted cos(theta)
-              cos(theta_i) > epsC to be considered in line-of-sight
-           ideally epsC = 0, epsC=0.00872654 corresponds to 89.5deg
-  Output:
-    Fmat - matrix of LD view factors
-            F0 - Lambert view-factor
-            F - limb-darkened view-factor
-              - cos(theta') if LDmodels[i] == 0, evaluation of LD is
-                postponed to routines outside the routine
-*/
+  T h,        // depth
+    F0,       // Lambert view factor
+    F;        // LD view-factor
 
-template <class T>
-void triangle_mesh_radiosity_matrix_triangles(
-  std::vector <T3Dpoint<T>> & V,                  // inputs
-  std::vector <T3Dpoint<int>> & Tr,
-  std::vector <T3Dpoint<T>> & NatT,
-  std::vector <T> & A,
-  std::vector <TLDmodel<T>*> &LDmodels,
-  std::vector <int> &LDidx,
+  int o, n;   // offset and number of possible obstructions of the line
+              // of sight (see radiosity_remove_obstructed)
 
-  std::vector <Tview_factor<T>> & Fmat,              // output
-  const T & epsC = 0.00872654) {
+  bool operator < (const Tdepth_view_factor & rhs) const { return h < rhs.h; }
+};
 
-  //
-  // Calculate the centroids of triangles
-  //
+/*
+  Calculate depth and view-factor matrix DF of N triangles/vertices
+  thereby using over-simplified check visibility, where only pairs
+  which are facing each other are kept.
 
-  int Nt = Tr.size();
+  Input:
+    N - number of triangles/vertices
+    pos - function returning pointer to the position of i-th element
+    nrm - function returning pointer to the normal of i-th element
+    A - vector of areas associated to elements
+    LDmodels - vector of limb darkening models in use
+    LDidx - vector of indices of models used on each of elements
+    epsC - threshold for permitted cos(theta)
+    nthreads - number of threads
 
-  T *CatT = new T [3*Nt];
+  Output:
+    DF - depth and view-factor matrix, DF[i] lists pairs (i <- j) in
+         order of increasing j, independent of the number of threads
+*/
+template <class T, class Fpos, class Fnrm>
+void radiosity_depth_view_factor_matrix(
+  int N,
+  Fpos && pos,
+  Fnrm && nrm,
+  std::vector <T> & A,
+  std::vector <TLDmodel<T>*> & LDmodels,
+  std::vector <int> & LDidx,
+  const T & epsC,
+  std::vector<std::vector<Tdepth_view_factor<T>>> & DF,
+  int nthreads) {
 
-  {
-    T *c = CatT, *v[3];
+  typedef Tdepth_view_factor<T> Tp;
 
-    for (auto && t : Tr){
+  DF.clear();
+  DF.resize(N);
 
-      // pointers to vertices
-      for (int k = 0; k < 3; ++k) v[k] = V[t[k]].data;
+  nthreads = parallel::nthreads(nthreads, N);
 
-      // centroid
-      for (int k = 0; k < 3; ++k)
-        c[k] = (v[0][k] + v[1][k] + v[2][k])/3;
+  std::vector<long> bounds = parallel::triangular_bounds(N, nthreads > 1 ? 4*nthreads : 1);
 
-      c += 3;
-    }
-  }
+  int nchunks = bounds.size() - 1;
 
   //
-  // Calculate depth and view-factor matrix DF thereby
-  // using over-simplified check visibility, where only line-of-sight
-  // between centroids of triangles is checked
+  // When working in several chunks of rows the conjugate pairs (j <- i),
+  // j < i are collected per chunk and distributed to the rows afterwards
   //
 
-  struct Tp {
-
-    int i;
-
-    T h, F0, F;
+  std::vector<std::vector<std::pair<int, Tp>>> conj;
 
-    bool operator < (const Tp & rhs) const { return h < rhs.h; }
-  };
+  std::vector<std::vector<int>> offset;
 
-  // depth and view-factor matrix
-  std::vector<std::vector<Tp>> DF(Nt);
+  if (nchunks > 1) {
+    conj.resize(nchunks);
+    offset.resize(nchunks);
+  }
 
-  {
+  parallel::for_chunks(N, nthreads, [&](long begin, long end, int chunk) {
 
     T tmp, tmp2, s, s2, *n[2], *c[2], a[3];
 
     Tp p[2];
 
-
     TLDmodel<T> *pld;
 
-    // loop over triangles Ti
-    for (p[0].i = 1, c[0] = CatT + 3; p[0].i < Nt; ++p[0].i, c[0] += 3) {
+    if (nchunks > 1) offset[chunk].assign(N, 0);
 
-      n[0] = NatT[p[0].i].data;                  // normal of Ti
+    // loop over elements Ei
+    for (p[0].i = std::max(begin, 1L); p[0].i < end; ++p[0].i) {
 
-      // loop over triangles Tj
-      for (p[1].i = 0, c[1] = CatT; p[1].i < p[0].i; ++p[1].i, c[1] += 3) {
+      c[0] = pos(p[0].i);
+      n[0] = nrm(p[0].i);                  // normal of Ei
+
+      // loop over elements Ej
+      for (p[1].i = 0; p[1].i < p[0].i; ++p[1].i) {
 
         //
-        // Check if it is possible to see the centroid of Tj from
-        // the centroid of Ti and vice versa
+        // Check if it is possible to see Ej from Ei and vice versa
         //
 
-        // vector connected centroids c -> c1: a = c1 - c
+        c[1] = pos(p[1].i);
+
+        // vector connected elements c -> c1: a = c1 - c
         utils::sub3D(c[1], c[0], a);
 
-        n[1] = NatT[p[1].i].data;            // normal of Tj
+        n[1] = nrm(p[1].i);                // normal of Ej
 
-        // looking at Tj from Ti
+        // looking at Ej from Ei
         if ((p[0].h = utils::dot3D(n[0], a)) > 0 &&
             (p[1].h = -utils::dot3D(n[1], a)) > 0) {
 
@@ -268,7 +271,7 @@ void triangle_mesh_radiosity_matrix_triangles(
           // throw away also all pairs with to large viewing angle
           if (p[0].h > tmp && p[1].h > tmp) {
 
-            // conclusion: probably Tj illuminates Ti and vice versa
+            // conclusion: probably Ej illuminates Ei and vice versa
 
             //
             // calculate Lambert view factor
@@ -296,82 +299,313 @@ void triangle_mesh_radiosity_matrix_triangles(
             //
 
             DF[p[0].i].push_back(p[1]);  // registering pair (p.i <- p1)
-            DF[p[1].i].push_back(p[0]);  // registering pair (p1.i <- p)
+
+            // registering pair (p1.i <- p)
+            if (nchunks > 1) {
+              conj[chunk].emplace_back(p[1].i, p[0]);
+              ++offset[chunk][p[1].i];
+            } else
+              DF[p[1].i].push_back(p[0]);
           }
         }
       }
     }
+  }, nchunks, &bounds);
+
+  if (nchunks > 1) {
+
+    // positions of the conjugate pairs of each chunk in the rows, which
+    // follow in the same order as in the serial loop
+    for (int j = 0; j < N; ++j) {
+      int o = DF[j].size(), m;
+      for (auto && off : offset) {
+        m = off[j];
+        off[j] = o;
+        o += m;
+      }
+      DF[j].resize(o);
+    }
+
+    parallel::for_chunks(nchunks, nthreads, [&](long begin, long end, [[maybe_unused]] int chunk) {
+      for (long k = begin; k < end; ++k) {
+        auto & off = offset[k];
+        for (auto && q : conj[k]) DF[q.first][off[q.first]++] = q.second;
+        std::vector<std::pair<int, Tp>>().swap(conj[k]);
+      }
+    }, nchunks);
   }
+}
+
+/*
+  Check if the line of sight between elements (triangles/vertices) of
+  the depth and view-factor matrix DF is obstructed by another element
+  closer to the observer and remove such pairs from DF.
+
+  The lines of sight are tested only against the elements whose boxes
+  intersect them (using a bounding volume hierarchy) and these tests are
+  done in parallel. The removal of pairs, which depends on the order in
+  which elements are processed, is done in serial and exactly reproduces
+  the order of the serial algorithm, i.e. the result is independent of
+  the number of threads.
+
+  Input:
+    DF - depth and view-factor matrix
+    pos - function returning pointer to the position of i-th element
+    box - function box(i, lo, hi) storing the bounding box of i-th element
+    cuts - function cuts(i, c1, c2) checking if i-th element cuts the line
+            between c1 and c2
+    nthreads - number of threads
+
+  Output:
+    DF - reduced depth and view-factor matrix
+*/
+template <class T, class Fpos, class Fbox, class Fcuts>
+void radiosity_remove_obstructed(
+  std::vector<std::vector<Tdepth_view_factor<T>>> & DF,
+  Fpos && pos,
+  Fbox && box,
+  Fcuts && cuts,
+  int nthreads) {
+
+  int N = DF.size();
+
+  nthreads = parallel::nthreads(nthreads, N);
 
   //
-  // Check if the line of sign from centroids of triangles is obstructed
-  // and generate reduced depth-view factor matrix DF
+  // Build hierarchy of the bounding boxes of elements
   //
 
+  Tbvh<T> bvh;
   {
-    int *t, i = 0;
+    std::vector<T> lo(3*N), hi(3*N);
 
-    bool ok_visible;
+    T e[2][3];
 
-    T *c = CatT, *c1, *n, *v[3];
+    for (int k = 0; k < 3; ++k) {
+      e[0][k] = +std::numeric_limits<T>::infinity();
+      e[1][k] = -std::numeric_limits<T>::infinity();
+    }
 
-    for (auto && q : DF) {
+    for (int i = 0; i < N; ++i) {
+      box(i, lo.data() + 3*i, hi.data() + 3*i);
+      for (int k = 0; k < 3; ++k) {
+        e[0][k] = std::min(e[0][k], lo[3*i + k]);
+        e[1][k] = std::max(e[1][k], hi[3*i + k]);
+      }
+    }
 
-        // if there is one element visible there is no obstruction possible
-        if (q.size() > 1) {
+    // padding of the boxes covering round-off errors in tests of cuts
+    T pad = 0;
+    for (int k = 0; k < 3; ++k) pad = std::max(pad, e[1][k] - e[0][k]);
+
+    bvh.build(lo, hi, 1e-7*pad);
+  }
 
-        // sorting w.r.t. depth from triangle with index p.first
-        std::sort(q.begin(), q.end());
+  //
+  // For every pair (i <- j) collect elements at less or equal depth
+  // (from i) which cut the line of sight between them
+  //
 
-        auto it_b = q.begin(), it = it_b + 1;
+  std::vector<std::vector<int>> H(N);
 
-        // look over triangles and see is line-of-sight is obstructed
-        while (it != q.end()) {
+  parallel::for_chunks(N, nthreads, [&](long begin, long end, [[maybe_unused]] int chunk) {
 
-          // centroid of the triangle view from c
-          c1 = CatT + 3*it->i;
+    std::vector<int> row(N, -1);
 
-          ok_visible = true;
+    std::vector<T> depth(N);
 
-          // check if line c1 <-> c is cut by triangle at less depth
-          // from triangle with index p.first
-          for (auto it1 = it_b; ok_visible && it1 != it; ++it1) {
+    T *c[2];
 
-            // pointers to vertices
-            t = Tr[it1->i].data;
-            for (int k = 0; k < 3; ++k) v[k] = V[t[k]].data;
+    for (long i = begin; i < end; ++i) {
 
-            // normal of the triangle
-            n = NatT[it1->i].data;
+      auto & q = DF[i];
 
-            // check if triangle cuts the line
-            //ok_visible = !triangle_cuts_line(v, c, c1);
-            ok_visible = !triangle_cuts_line(n, v, c, c1);
-          }
+      // if there is one element visible there is no obstruction possible
+      if (q.size() <= 1) continue;
+
+      for (auto && p : q) {
+        row[p.i] = i;
+        depth[p.i] = p.h;
+      }
+
+      auto & h = H[i];
+
+      c[0] = pos(i);
+
+      for (auto && p : q) {
+
+        c[1] = pos(p.i);
+
+        p.o = h.size();
+
+        bvh.segment(c[0], c[1], [&](int k) {
+          if (k != p.i && row[k] == i && depth[k] <= p.h && cuts(k, c[0], c[1]))
+            h.push_back(k);
+        });
+
+        p.n = h.size() - p.o;
+      }
+    }
+  });
+
+  //
+  // Remove the pairs with obstructed line of sight
+  //
+
+  std::vector<int> visible(N, -1);
+
+  for (int i = 0; i < N; ++i) {
+
+    auto & q = DF[i];
+
+    // if there is one element visible there is no obstruction possible
+    if (q.size() > 1) {
+
+      // sorting w.r.t. depth from element with index i
+      std::sort(q.begin(), q.end());
+
+      auto it = q.begin();
+
+      visible[it->i] = i;
+
+      ++it;
 
-          // line-of-sight of triangles with indices (p.first, it->i)
-          // is obstructed, erasing *it element
-          if (!ok_visible) {
-
-            // erase conjugate pair (it->i, p.first) from DF[it->i]
-            auto & z = DF[it->i];
-            for (auto it1 = z.begin(), it1_e = z.end(); it1 != it1_e; ++it1)
-              if (it1->i == i) {
-                z.erase(it1);
-                break;
-              }
-
-            // erase (u.first, it->i) from DF[p.first]
-            it = q.erase(it);
-          } else ++it;
+      // look over elements and see is line-of-sight is obstructed by
+      // visible elements at less depth
+      while (it != q.end()) {
+
+        bool ok_visible = true;
+
+        for (int *k = H[i].data() + it->o, *ke = k + it->n; ok_visible && k != ke; ++k)
+          if (visible[*k] == i) ok_visible = false;
+
+        // line-of-sight of elements with indices (i, it->i)
+        // is obstructed, erasing *it element
+        if (!ok_visible) {
+
+          // erase conjugate pair (it->i, i) from DF[it->i]
+          auto & z = DF[it->i];
+          for (auto it1 = z.begin(), it1_e = z.end(); it1 != it1_e; ++it1)
+            if (it1->i == i) {
+              z.erase(it1);
+              break;
+            }
+
+          // erase (i, it->i) from DF[i]
+          it = q.erase(it);
+        } else {
+          visible[it->i] = i;
+          ++it;
         }
       }
+    }
+
+    std::vector<int>().swap(H[i]);
+  }
+}
+
+/*
+  Calculating limb-darkened radiosity/view factor matrices with elements
+  defined per TRIANGLE.
+
+  Input:
+
+    V - vector of vertices
+    Tr - vector of triangles
+    NatT - vector of normals at triangles
+    A - vector of areas of triangles
+    LDmodels - vector of limb darkening models in use
+    LDidx - vector of indices of models used on each of triangles
+
+    epsC - threshold for permitted cos(theta)
+              cos(theta_i) > epsC to be considered in line-of-sight
+           ideally epsC = 0, epsC=0.00872654 corresponds to 89.5deg
+  Output:
+    Fmat - matrix of LD view factors
+            F0 - Lambert view-factor
+            F - limb-darkened view-factor
+              - cos(theta') if LDmodels[i] == 0, evaluation of LD is
+                postponed to routines outside the routine
+*/
+
+template <class T>
+void triangle_mesh_radiosity_matrix_triangles(
+  std::vector <T3Dpoint<T>> & V,                  // inputs
+  std::vector <T3Dpoint<int>> & Tr,
+  std::vector <T3Dpoint<T>> & NatT,
+  std::vector <T> & A,
+  std::vector <TLDmodel<T>*> &LDmodels,
+  std::vector <int> &LDidx,
+
+  std::vector <Tview_factor<T>> & Fmat,              // output
+  const T & epsC = 0.00872654,
+  int nthreads = 1) {
+
+  //
+  // Calculate the centroids of triangles
+  //
+
+  int Nt = Tr.size();
+
+  T *CatT = new T [3*Nt];
+
+  {
+    T *c = CatT, *v[3];
+
+    for (auto && t : Tr){
+
+      // pointers to vertices
+      for (int k = 0; k < 3; ++k) v[k] = V[t[k]].data;
+
+      // centroid
+      for (int k = 0; k < 3; ++k)
+        c[k] = (v[0][k] + v[1][k] + v[2][k])/3;
 
-      ++i;
       c += 3;
     }
   }
 
+  auto pos = [&](int i) { return CatT + 3*i; };
+
+  //
+  // Calculate depth and view-factor matrix DF thereby
+  // using over-simplified check visibility, where only line-of-sight
+  // between centroids of triangles is checked
+  //
+
+  // depth and view-factor matrix
+  std::vector<std::vector<Tdepth_view_factor<T>>> DF;
+
+  radiosity_depth_view_factor_matrix(
+    Nt, pos, [&](int i) { return NatT[i].data; },
+    A, LDmodels, LDidx, epsC, DF, nthreads);
+
+  //
+  // Check if the line of sign from centroids of triangles is obstructed
+  // and generate reduced depth-view factor matrix DF
+  //
+
+  radiosity_remove_obstructed(
+    DF, pos,
+    [&](int i, T *lo, T *hi) {
+      int *t = Tr[i].data;
+      for (int k = 0; k < 3; ++k) {
+        lo[k] = std::min(std::min(V[t[0]][k], V[t[1]][k]), V[t[2]][k]);
+        hi[k] = std::max(std::max(V[t[0]][k], V[t[1]][k]), V[t[2]][k]);
+      }
+    },
+    [&](int i, T *c, T *c1) {
+
+      // pointers to vertices
+      T *v[3];
+      int *t = Tr[i].data;
+      for (int k = 0; k < 3; ++k) v[k] = V[t[k]].data;
+
+      // check if triangle cuts the line
+      return triangle_cuts_line(NatT[i].data, v, c, c1);
+    },
+    nthreads);
+
   delete [] CatT;
 
   //
@@ -440,7 +674,8 @@ void triangle_mesh_radiosity_matrix_triangles_nbody_convex(
   std::vector <TLDmodel<T>*> & LDmodels,
 
   std::vector <Tview_factor_nbody<T>> & Fmat,                  // output
-  const T & epsC = 0.00872654) {
+  const T & epsC = 0.00872654,
+  int nthreads = 1) {
 
   //
   // Check if the LDmodels are supplied
@@ -490,68 +725,73 @@ void triangle_mesh_radiosity_matrix_triangles_nbody_convex(
 
   if (nb == 2) {
 
-    T tmp, s, s2, F, *n[2], *c[2], a[3], h[2];
+    // rows of the matrix are collected in chunks in parallel
+    parallel::collect(Nt[0], parallel::nthreads(nthreads, Nt[0]), Fmat,
+      [&](long begin, long end, std::vector <Tview_factor_nbody<T>> & Fmat) {
 
-    TLDmodel<T> *pld;
+      T tmp, s, s2, F, *n[2], *c[2], a[3], h[2];
 
-    for (int i1 = 0, mi = Nt[0]; i1 < mi; ++i1) {
+      TLDmodel<T> *pld;
 
-      c[0] = CatT[0][i1].data;
-      n[0] = NatT[0][i1].data;
+      for (int i1 = begin; i1 < end; ++i1) {
 
-      for (int j1 = 0, mj = Nt[1]; j1 < mj; ++j1) {
+        c[0] = CatT[0][i1].data;
+        n[0] = NatT[0][i1].data;
 
-        c[1] = CatT[1][j1].data;
-        n[1] = NatT[1][j1].data;
+        for (int j1 = 0, mj = Nt[1]; j1 < mj; ++j1) {
 
-        //
-        // Check if it is possible to see the centroid of Tj from
-        // the centroid of Ti and vice versa
-        //
+          c[1] = CatT[1][j1].data;
+          n[1] = NatT[1][j1].data;
 
-        // vector connected centroids c -> c1: a = c1 - c
-        utils::sub3D(c[1], c[0], a);
+          //
+          // Check if it is possible to see the centroid of Tj from
+          // the centroid of Ti and vice versa
+          //
 
-        // looking at Tj from Ti
-        if ((h[0] = utils::dot3D(n[0], a)) > 0 &&
-            (h[1] = -utils::dot3D(n[1], a)) > 0) {
+          // vector connected centroids c -> c1: a = c1 - c
+          utils::sub3D(c[1], c[0], a);
 
-          tmp = epsC*(s = std::sqrt(s2 = utils::norm2(a)));
+          // looking at Tj from Ti
+          if ((h[0] = utils::dot3D(n[0], a)) > 0 &&
+              (h[1] = -utils::dot3D(n[1], a)) > 0) {
 
-          // throw away also all pairs with to large viewing angle
-          if (h[0] > tmp && h[1] > tmp) {
+            tmp = epsC*(s = std::sqrt(s2 = utils::norm2(a)));
 
-            // conclusion: probably Tj illuminates Ti and vice versa
+            // throw away also all pairs with to large viewing angle
+            if (h[0] > tmp && h[1] > tmp) {
 
-            //
-            // calculate Lambert view factor
-            //
+              // conclusion: probably Tj illuminates Ti and vice versa
 
-            F = h[0]*h[1]/(s2*s2);
+              //
+              // calculate Lambert view factor
+              //
 
-            //
-            // calculate LD view factors and store results in the matrix
-            //
+              F = h[0]*h[1]/(s2*s2);
 
-            // F_{(0, i1) -> (1,j1) } = F_{(1,j1), (0, i1)}
-            tmp = F*A[0][i1];
+              //
+              // calculate LD view factors and store results in the matrix
+              //
 
-            if ((pld = LDmodels[0]))
-              Fmat.emplace_back(1, j1, 0, i1, tmp/utils::m_pi, tmp*pld->F(h[0]/s));
-            else
-              Fmat.emplace_back(1, j1, 0, i1, tmp/utils::m_pi, h[0]/s);
+              // F_{(0, i1) -> (1,j1) } = F_{(1,j1), (0, i1)}
+              tmp = F*A[0][i1];
+
+              if ((pld = LDmodels[0]))
+                Fmat.emplace_back(1, j1, 0, i1, tmp/utils::m_pi, tmp*pld->F(h[0]/s));
+              else
+                Fmat.emplace_back(1, j1, 0, i1, tmp/utils::m_pi, h[0]/s);
 
-            // F_{(1,j1) -> (0,i1) } = F_{(0, i1), (1,j1)}
-            tmp = F*A[1][j1];
+              // F_{(1,j1) -> (0,i1) } = F_{(0, i1), (1,j1)}
+              tmp = F*A[1][j1];
 
-            if ((pld = LDmodels[1]))
-              Fmat.emplace_back(0, i1, 1, j1, tmp/utils::m_pi, tmp*pld->F(h[1]/s));
-            else
-              Fmat.emplace_back(0, i1, 1, j1, tmp/utils::m_pi, h[1]/s);
+              if ((pld = LDmodels[1]))
+                Fmat.emplace_back(0, i1, 1, j1, tmp/utils::m_pi, tmp*pld->F(h[1]/s));
+              else
+                Fmat.emplace_back(0, i1, 1, j1, tmp/utils::m_pi, h[1]/s);
+            }
           }
         }
       }
-    }
+    });
 
     return;
   }
@@ -866,7 +1106,8 @@ void triangle_mesh_radiosity_matrix_vertices(
   std::vector <TLDmodel<T>*> & LDmodels,
   std::vector <int> & LDidx,
   std::vector <Tview_factor<T>> & Fmat,              // output
-  const T & epsC = 0.00872654) {
+  const T & epsC = 0.00872654,
+  int nthreads = 1) {
 
   //
   // Calculate the areas associated to vertices
@@ -888,117 +1129,20 @@ void triangle_mesh_radiosity_matrix_vertices(
     }
   }
 
+  auto pos = [&](int i) { return V[i].data; };
+
   //
   // Calculate depth and view-factor matrix DF thereby
   // using over-simplified check visibility, where only line-of-sight
   // between centroids of triangles is checked
   //
 
-  struct Tp {
-
-    int i;
-
-    T h, F0, F;
-
-    bool operator < (const Tp & rhs) const { return h < rhs.h; }
-  };
-
   // depth and view-factor matrix
-  std::vector<std::vector<Tp>> DF(Nv);
-
-  {
-    T tmp, tmp2, s, s2, a[3];
-
-    Tp p[2];
-
-    TLDmodel<T>* pld;
-
-    std::vector<int>::iterator itLb = LDidx.begin(), itL[2];
-
-    typename std::vector<T>::iterator itAb = AatV.begin(), itA[2];
-
-    typename std::vector<T3Dpoint<T>>::iterator
-      itVb = V.begin(), itVe = V.end(), itV[2],
-      itNb = NatV.begin(), itN[2];
-
-    p[0].i = 1;
-    itV[0] = itVb+1;
-    itA[0] = itAb+1;
-    itN[0] = itNb+1;
-    itL[0] = itLb+1;
+  std::vector<std::vector<Tdepth_view_factor<T>>> DF;
 
-    while (itV[0] != itVe) {
-
-      p[1].i = 0;
-      itV[1] = itVb;
-      itA[1] = itAb;
-      itN[1] = itNb;
-      itL[1] = itLb;
-
-      while (itV[1] != itV[0]) {
-
-        //
-        // Check if it is possible to see the vertex V1 from to V and
-        // vice versa: itV pointing to V, itV1 pointing to V1
-        //
-
-        // vector connecting vertices  a = V1 - V
-        utils::sub3D(itV[1]->data, itV[0]->data, a);
-
-        // looking at V1 from V and vice versa
-        if ((p[0].h = +utils::dot3D(itN[0]->data, a)) > 0 &&
-            (p[1].h = -utils::dot3D(itN[1]->data, a)) > 0) {
-
-          tmp = epsC*(s = std::sqrt(s2 = utils::norm2(a)));
-
-          // throw away also all pairs with to large viewing angle
-          if (p[0].h > tmp && p[1].h > tmp) {
-
-            // conclusion: probably V illuminates V1 and vice versa
-
-            //
-            // calculate Lambert view factor
-            //
-            tmp = p[0].h*p[1].h/(s2*s2);
-
-            //
-            // calculate LD view factors
-            //
-
-            // looking at V1 from V and vice versa
-            for (int i = 0; i < 2; ++i) {
-              tmp2 = tmp*(*itA[i]);
-
-              p[i].F0 = tmp2/utils::m_pi;
-
-              if ((pld = LDmodels[*itL[i]]))
-                p[i].F = tmp2*pld->F(p[i].h/s);
-              else
-                p[i].F = p[i].h/s;
-            }
-            //
-            // storing the results in depth and view-factor matrix
-            //
-
-            DF[p[0].i].push_back(p[1]);  // registering pair (p[1].i -> p[0])
-            DF[p[1].i].push_back(p[0]);  // registering pair (p[0].i -> p[1])
-          }
-        }
-
-        ++p[1].i;
-        ++itV[1];
-        ++itN[1];
-        ++itA[1];
-        ++itL[1];
-      }
-
-      ++p[0].i;
-      ++itV[0];
-      ++itN[0];
-      ++itA[0];
-      ++itL[0];
-    }
-  }
+  radiosity_depth_view_factor_matrix(
+    Nv, pos, [&](int i) { return NatV[i].data; },
+    AatV, LDmodels, LDidx, epsC, DF, nthreads);
 
   //
   // Divide areas associated to vertices by pi do get effective r^2
@@ -1007,68 +1151,26 @@ void triangle_mesh_radiosity_matrix_vertices(
     T fac = 1/utils::m_pi;
     for (auto && a : AatV) a *= fac;
   }
+
   //
-  // Check if the line of sign from centroids of triangles is obstructed
-  // and generate reduced depth-view factor matrix DF
+  // Check if the line of sign from vertices is obstructed by a disk
+  // at less depth and generate reduced depth-view factor matrix DF
   //
 
-  {
-    int i = 0;
-
-    bool ok_visible;
-
-    T *v[2];
-
-    typename std::vector<T3Dpoint<T>>::iterator itV = V.begin();
-
-    typename std::vector<Tp>::iterator itb, it;
-
-    for (auto && q : DF) {
-
-        // if there is one element visible there is no obstruction possible
-        if (q.size() > 1) {
-
-        // sorting w.r.t. depth from triangle with index p.first
-        std::sort(q.begin(), q.end());
-
-        it = (itb = q.begin()) + 1;
-
-        v[0] = itV->data;
-
-        // look over triangles and see is line-of-sight is obstructed
-        while (it != q.end()) {
-
-          // centroid of the triangle view from c
-          v[1] = V[it->i].data;
-
-          ok_visible = true;
-
-          // check if line v <-> it->V.data is cut by a circle at less depth
-          for (auto it1 = itb; ok_visible && it1 != it; ++it1)
-            ok_visible = !disk_cuts_line(V[it1->i].data, NatV[it1->i].data, AatV[it1->i], v);
-
-          // line-of-sight between vertices with indices (i, it->i)
-          // is obstructed, erasing these pairs
-          if (!ok_visible) {
-
-            // erase conjugate pair (it->i, i) from DF[it->i]
-            auto & z = DF[it->i];
-            for (auto it1 = z.begin(), it1e = z.end(); it1 != it1e; ++it1)
-              if (it1->i == i) {
-                z.erase(it1);
-                break;
-              }
-
-            // erase (i, it->i) from DF[i]
-            it = q.erase(it);
-          } else ++it;
-        }
+  radiosity_remove_obstructed(
+    DF, pos,
+    [&](int i, T *lo, T *hi) {
+      T r = std::sqrt(AatV[i]);
+      for (int k = 0; k < 3; ++k) {
+        lo[k] = V[i][k] - r;
+        hi[k] = V[i][k] + r;
       }
-
-      ++i;
-      ++itV;
-    }
-  }
+    },
+    [&](int i, T *c, T *c1) {
+      T *v[2] = {c, c1};
+      return disk_cuts_line(V[i].data, NatV[i].data, AatV[i], v);
+    },
+    nthreads);
 
   //
   // Generate LD view factor matrix F by collecting data
@@ -1119,7 +1221,8 @@ void triangle_mesh_radiosity_matrix_vertices_nbody_convex(
   std::vector <TLDmodel<T>*> & LDmodels,
 
   std::vector <Tview_factor_nbody<T>> & Fmat,                  // output
-  const T & epsC = 0.00872654) {
+  const T & epsC = 0.00872654,
+  int nthreads = 1) {
 
   //
   // Check if the LDmodels are supplied
@@ -1165,66 +1268,71 @@ void triangle_mesh_radiosity_matrix_vertices_nbody_convex(
 
   if (nb == 2) {
 
-    T tmp, s, s2, F, *n[2], *v[2], a[3], h[2];
+    // rows of the matrix are collected in chunks in parallel
+    parallel::collect(Nv[0], parallel::nthreads(nthreads, Nv[0]), Fmat,
+      [&](long begin, long end, std::vector <Tview_factor_nbody<T>> & Fmat) {
 
-    TLDmodel<T>* pld;
+      T tmp, s, s2, F, *n[2], *v[2], a[3], h[2];
 
-    for (int i1 = 0, mi = Nv[0]; i1 < mi; ++i1) {
+      TLDmodel<T>* pld;
 
-      v[0] = V[0][i1].data;
-      n[0] = NatV[0][i1].data;
+      for (int i1 = begin; i1 < end; ++i1) {
 
-      for (int j1 = 0, mj = Nv[1]; j1 < mj; ++j1) {
+        v[0] = V[0][i1].data;
+        n[0] = NatV[0][i1].data;
 
-        v[1] = V[1][j1].data;
-        n[1] = NatV[1][j1].data;
+        for (int j1 = 0, mj = Nv[1]; j1 < mj; ++j1) {
 
-        //
-        // Check if vertex v[0] is visible from v[1]
-        //
+          v[1] = V[1][j1].data;
+          n[1] = NatV[1][j1].data;
 
-        // vector connected centroids v -> v1: a = v1 - v
-        utils::sub3D(v[1], v[0], a);
+          //
+          // Check if vertex v[0] is visible from v[1]
+          //
 
-        // looking at Tj from Ti
-        if ((h[0] = utils::dot3D(n[0], a)) > 0 &&
-            (h[1] = -utils::dot3D(n[1], a)) > 0) {
+          // vector connected centroids v -> v1: a = v1 - v
+          utils::sub3D(v[1], v[0], a);
 
-          tmp = epsC*(s = std::sqrt(s2 = utils::norm2(a)));
+          // looking at Tj from Ti
+          if ((h[0] = utils::dot3D(n[0], a)) > 0 &&
+              (h[1] = -utils::dot3D(n[1], a)) > 0) {
 
-          // throw away also all pairs with to large viewing angle
-          if (h[0] > tmp && h[1] > tmp) {
+            tmp = epsC*(s = std::sqrt(s2 = utils::norm2(a)));
 
-            // conclusion: probably Tj illuminates Ti and vice versa
+            // throw away also all pairs with to large viewing angle
+            if (h[0] > tmp && h[1] > tmp) {
 
-            //
-            // calculate Lambert view factor
-            //
+              // conclusion: probably Tj illuminates Ti and vice versa
 
-            F = h[0]*h[1]/(s2*s2);
+              //
+              // calculate Lambert view factor
+              //
 
-            //
-            // calculate LD view factors and store results in the matrix
-            //
+              F = h[0]*h[1]/(s2*s2);
 
-            // F_{(0, i1) -> (1,j1) } = F_{(1,j1), (0, i1)}
-            tmp = F*AatV[0][i1];
-            if ((pld = LDmodels[0]))
-              Fmat.emplace_back(1, j1, 0, i1, tmp/utils::m_pi, tmp*pld->F(h[0]/s));
-            else
-              Fmat.emplace_back(1, j1, 0, i1, tmp/utils::m_pi, h[0]/s);
+              //
+              // calculate LD view factors and store results in the matrix
+              //
 
-            // F_{(1,j1) -> (0,i1) } = F_{(0, i1), (1,j1)}
-            tmp = F*AatV[1][j1];
-            if ((pld = LDmodels[1]))
-              Fmat.emplace_back(0, i1, 1, j1, tmp/utils::m_pi, tmp*pld->F(h[1]/s));
-            else
-              Fmat.emplace_back(0, i1, 1, j1, tmp/utils::m_pi, h[1]/s);
+              // F_{(0, i1) -> (1,j1) } = F_{(1,j1), (0, i1)}
+              tmp = F*AatV[0][i1];
+              if ((pld = LDmodels[0]))
+                Fmat.emplace_back(1, j1, 0, i1, tmp/utils::m_pi, tmp*pld->F(h[0]/s));
+              else
+                Fmat.emplace_back(1, j1, 0, i1, tmp/utils::m_pi, h[0]/s);
+
+              // F_{(1,j1) -> (0,i1) } = F_{(0, i1), (1,j1)}
+              tmp = F*AatV[1][j1];
+              if ((pld = LDmodels[1]))
+                Fmat.emplace_back(0, i1, 1, j1, tmp/utils::m_pi, tmp*pld->F(h[1]/s));
+              else
+                Fmat.emplace_back(0, i1, 1, j1, tmp/utils::m_pi, h[1]/s);
 
+            }
           }
         }
       }
-    }
+    });
 
     return;
   }
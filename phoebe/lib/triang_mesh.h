@@ -16,6 +16,7 @@
 #include <limits>
 
 #include "utils.h"
+#include "parallel.h"
 
 /*
   Structure describing 3D point
@@ -428,6 +429,7 @@ T mesh_area(
     Tr - vector of triangles
     choice in {0,1,2} - which vertex is choosen as the reference
     reorientate - if Tr should be reorientated so that normal point outwards
+    nthreads - number of threads used to process the triangles
 
   Output:
     A - triangle areas
@@ -435,6 +437,10 @@ T mesh_area(
     area - total area of the triangles
     volume - volume of the body enclosed by the mesh
 
+  Note:
+  * the total area and volume are summed in the order of triangles so
+    that the results do not depend on the number of threads
+
   Ref:
   * Cha Zhang and Tsuhan Chen, Efficient feature extraction for 2d/3d
     objects in mesh representation, Image Processing, 2001.
@@ -449,29 +455,24 @@ void mesh_attributes(
   T *area = 0,
   T *volume = 0,
   int choice = 0,
-  bool reorientate = false
+  bool reorientate = false,
+  int nthreads = 1
 ) {
 
   if (A == 0 && area == 0 && volume == 0 && N == 0) return;
 
+  long Nt = Tr.size();
 
   if (A) {
     A->clear();
-    A->reserve(Tr.size());
+    A->resize(Nt);
   }
 
   if (N) {
     N->clear();
-    N->reserve(Tr.size());
+    N->resize(Nt);
   }
 
-  if (area)  *area = 0;
-  if (volume) *volume = 0;
-
-  int i, j;
-
-  T a[3], b[3], c[3], v[3][3], *p, f, fv, norm;
-
   bool
     st_area = (area != 0) || (A != 0),
     st_N = (N != 0),
@@ -479,91 +480,117 @@ void mesh_attributes(
     st_volume = (volume != 0),
     st_N_volume = st_N || st_volume || reorientate;
 
-  for (auto && t: Tr) {
+  // areas and signed volumes of tetrahedrons per triangle
+  std::vector<T> dA, dV;
 
-    //
-    // copy data
-    //
+  if (area && !A) dA.resize(Nt);
+  if (volume) dV.resize(Nt, 0);
 
-    for (i = 0; i < 3; ++i) {
-      p = V[t[i]].data;
-      for (j = 0; j < 3; ++j) v[i][j] = p[j];
-    }
+  parallel::for_chunks(Nt, parallel::nthreads(nthreads, Nt),
+    [&](long begin, long end, [[maybe_unused]] int chunk) {
 
-    //
-    // Computing surface element
-    //
+    int i, j;
 
-    for (i = 0; i < 3; ++i) {
-      a[i] = v[1][i] - v[0][i]; // v1-v0
-      b[i] = v[2][i] - v[0][i]; // v2-v0
-    }
+    T a[3], b[3], c[3], v[3][3], *p, f, fv, norm = 0;
 
-    // Cross[{a[0], a[1], a[2]}, {b[0], b[1], b[2]}]
-    // {-a[2] b[1] + a[1] b[2], a[2] b[0] - a[0] b[2], -a[1] b[0] + a[0] b[1]}
+    for (long k = begin; k < end; ++k) {
 
-    c[0] = a[1]*b[2] - a[2]*b[1];
-    c[1] = a[2]*b[0] - a[0]*b[2];
-    c[2] = a[0]*b[1] - a[1]*b[0];
+      int *t = Tr[k].data;
+
+      //
+      // copy data
+      //
 
-    if (st_area_N) {
+      for (i = 0; i < 3; ++i) {
+        p = V[t[i]].data;
+        for (j = 0; j < 3; ++j) v[i][j] = p[j];
+      }
 
-      norm = utils::hypot3(c[0], c[1], c[2]); // std::hypot(,,) is comming in C++17
+      //
+      // Computing surface element
+      //
 
-      f  = norm/2;
+      for (i = 0; i < 3; ++i) {
+        a[i] = v[1][i] - v[0][i]; // v1-v0
+        b[i] = v[2][i] - v[0][i]; // v2-v0
+      }
 
-      if (A) A->emplace_back(f);
-      if (area) *area += f;
-    }
+      // Cross[{a[0], a[1], a[2]}, {b[0], b[1], b[2]}]
+      // {-a[2] b[1] + a[1] b[2], a[2] b[0] - a[0] b[2], -a[1] b[0] + a[0] b[1]}
 
-    if (st_N_volume) {
+      c[0] = a[1]*b[2] - a[2]*b[1];
+      c[1] = a[2]*b[0] - a[0]*b[2];
+      c[2] = a[0]*b[1] - a[1]*b[0];
 
-      //
-      // Compute normal to the surface element
-      //
+      if (st_area_N) {
 
-      // orienting normal vector along the normal at vertex t[choice]
-      p = NatV[t[choice]].data,
+        norm = utils::hypot3(c[0], c[1], c[2]); // std::hypot(,,) is comming in C++17
 
-      f = 0;
-      for (i = 0; i < 3; ++i) f += p[i]*c[i];
+        f  = norm/2;
 
-      if (f < 0) {
-        for (i = 0; i < 3; ++i) c[i] = -c[i];
-        // change the order of indices
-        if (reorientate) {i = t[1]; t[1] = t[2]; t[2] = i; }
+        if (A) (*A)[k] = f;
+        if (area && !A) dA[k] = f;
       }
 
-      // normalize the normal
-      if (st_N) {
-        f = 1/norm;
-        for (i = 0; i < 3; ++i) c[i] *= f;
-        N->emplace_back(c);
-      }
+      if (st_N_volume) {
 
-      //
-      // Computing volume of signed tetrahedron
-      //
+        //
+        // Compute normal to the surface element
+        //
 
-      if (st_volume) {
+        // orienting normal vector along the normal at vertex t[choice]
+        p = NatV[t[choice]].data,
 
-        // determine the sign tetrahedron
-        p = v[0];
         f = 0;
         for (i = 0; i < 3; ++i) f += p[i]*c[i];
 
-        if (f != 0) {
-          // volume of tetrahedron
-          fv = std::abs(
-            (-v[2][0]*v[1][1] + v[1][0]*v[2][1])*v[0][2] +
-            (+v[2][0]*v[0][1] - v[0][0]*v[2][1])*v[1][2] +
-            (-v[1][0]*v[0][1] + v[0][0]*v[1][1])*v[2][2]
-          )/6;
+        if (f < 0) {
+          for (i = 0; i < 3; ++i) c[i] = -c[i];
+          // change the order of indices
+          if (reorientate) {i = t[1]; t[1] = t[2]; t[2] = i; }
+        }
 
-          if (f > 0) *volume += fv; else  *volume -= fv;
+        // normalize the normal
+        if (st_N) {
+          f = 1/norm;
+          for (i = 0; i < 3; ++i) c[i] *= f;
+          (*N)[k].assign(c[0], c[1], c[2]);
+        }
+
+        //
+        // Computing volume of signed tetrahedron
+        //
+
+        if (st_volume) {
+
+          // determine the sign tetrahedron
+          p = v[0];
+          f = 0;
+          for (i = 0; i < 3; ++i) f += p[i]*c[i];
+
+          if (f != 0) {
+            // volume of tetrahedron
+            fv = std::abs(
+              (-v[2][0]*v[1][1] + v[1][0]*v[2][1])*v[0][2] +
+              (+v[2][0]*v[0][1] - v[0][0]*v[2][1])*v[1][2] +
+              (-v[1][0]*v[0][1] + v[0][0]*v[1][1])*v[2][2]
+            )/6;
+
+            dV[k] = (f > 0 ? fv : -fv);
+          }
         }
       }
     }
+  });
+
+  if (area) {
+    *area = 0;
+    for (auto && f : (A ? *A : dA)) *area += f;
+  }
+
+  if (volume) {
+    *volume = 0;
+    for (auto && f : dV) if (f != 0) *volume += f;
   }
 }
 
@@ -575,6 +602,7 @@ void mesh_attributes(
   Input:
     V - vector of vertices
     Tr - vector of triangles
+    nthreads - number of threads used to process the triangles
 
   Output:
     A - triangle areas
@@ -582,6 +610,10 @@ void mesh_attributes(
     area - total area of the triangles
     volume - volume of the body enclosed by the mesh
 
+  Note:
+  * the total area and volume are summed in the order of triangles so
+    that the results do not depend on the number of threads
+
   Ref:
   * Cha Zhang and Tsuhan Chen, Efficient feature extraction for 2d/3d
     objects in mesh representation, Image Processing, 2001.
@@ -593,29 +625,24 @@ void mesh_attributes(
   std::vector <T> *A = 0,
   std::vector <T3Dpoint<T>> * N = 0,
   T *area = 0,
-  T *volume = 0
+  T *volume = 0,
+  int nthreads = 1
 ) {
 
   if (A == 0 && area == 0 && volume == 0 && N == 0) return;
 
+  long Nt = Tr.size();
 
   if (A) {
     A->clear();
-    A->reserve(Tr.size());
+    A->resize(Nt);
   }
 
   if (N) {
     N->clear();
-    N->reserve(Tr.size());
+    N->resize(Nt);
   }
 
-  if (area)  *area = 0;
-  if (volume) *volume = 0;
-
-  int i, j;
-
-  T a[3], b[3], c[3], v[3][3], *p, f, fv, norm;
-
   bool
     st_area = (area != 0) || (A != 0),
     st_N = (N != 0),
@@ -623,80 +650,106 @@ void mesh_attributes(
     st_volume = (volume != 0),
     st_N_volume = st_N || st_volume;
 
-  for (auto && t: Tr) {
+  // areas and signed volumes of tetrahedrons per triangle
+  std::vector<T> dA, dV;
 
-    //
-    // copy data
-    //
+  if (area && !A) dA.resize(Nt);
+  if (volume) dV.resize(Nt, 0);
 
-    for (i = 0; i < 3; ++i) {
-      p = V[t[i]].data;
-      for (j = 0; j < 3; ++j) v[i][j] = p[j];
-    }
+  parallel::for_chunks(Nt, parallel::nthreads(nthreads, Nt),
+    [&](long begin, long end, [[maybe_unused]] int chunk) {
 
-    //
-    // Computing surface element
-    //
+    int i, j;
 
-    for (i = 0; i < 3; ++i) {
-      a[i] = v[1][i] - v[0][i]; // v1-v0
-      b[i] = v[2][i] - v[0][i]; // v2-v0
-    }
+    T a[3], b[3], c[3], v[3][3], *p, f, fv, norm = 0;
 
-    // Cross[{a[0], a[1], a[2]}, {b[0], b[1], b[2]}]
-    // {-a[2] b[1] + a[1] b[2], a[2] b[0] - a[0] b[2], -a[1] b[0] + a[0] b[1]}
+    for (long k = begin; k < end; ++k) {
 
-    c[0] = a[1]*b[2] - a[2]*b[1];
-    c[1] = a[2]*b[0] - a[0]*b[2];
-    c[2] = a[0]*b[1] - a[1]*b[0];
+      int *t = Tr[k].data;
 
-    if (st_area_N) {
+      //
+      // copy data
+      //
 
-      // std::hypot(,,) is comming in C++17
-      norm = utils::hypot3(c[0], c[1], c[2]);
+      for (i = 0; i < 3; ++i) {
+        p = V[t[i]].data;
+        for (j = 0; j < 3; ++j) v[i][j] = p[j];
+      }
 
-      f  = norm/2;
+      //
+      // Computing surface element
+      //
 
-      if (A) A->emplace_back(f);
-      if (area) *area += f;
-    }
+      for (i = 0; i < 3; ++i) {
+        a[i] = v[1][i] - v[0][i]; // v1-v0
+        b[i] = v[2][i] - v[0][i]; // v2-v0
+      }
 
-    if (st_N_volume) {
+      // Cross[{a[0], a[1], a[2]}, {b[0], b[1], b[2]}]
+      // {-a[2] b[1] + a[1] b[2], a[2] b[0] - a[0] b[2], -a[1] b[0] + a[0] b[1]}
 
-      //
-      // Compute normal to the surface element
-      //
+      c[0] = a[1]*b[2] - a[2]*b[1];
+      c[1] = a[2]*b[0] - a[0]*b[2];
+      c[2] = a[0]*b[1] - a[1]*b[0];
+
+      if (st_area_N) {
+
+        // std::hypot(,,) is comming in C++17
+        norm = utils::hypot3(c[0], c[1], c[2]);
 
-      // normalize the normal
-      if (st_N) {
-        f = 1/norm;
-        for (i = 0; i < 3; ++i) c[i] *= f;
-        N->emplace_back(c);
+        f  = norm/2;
+
+        if (A) (*A)[k] = f;
+        if (area && !A) dA[k] = f;
       }
 
-      //
-      // Computing volume of signed tetrahedron
-      //
+      if (st_N_volume) {
 
-      if (st_volume) {
+        //
+        // Compute normal to the surface element
+        //
 
-        // determine the sign tetrahedron
-        p = v[0];
-        f = 0;
-        for (i = 0; i < 3; ++i) f += p[i]*c[i];
+        // normalize the normal
+        if (st_N) {
+          f = 1/norm;
+          for (i = 0; i < 3; ++i) c[i] *= f;
+          (*N)[k].assign(c[0], c[1], c[2]);
+        }
+
+        //
+        // Computing volume of signed tetrahedron
+        //
+
+        if (st_volume) {
 
-        if (f != 0) {
-          // volume of tetrahedron
-          fv = std::abs(
-            (-v[2][0]*v[1][1] + v[1][0]*v[2][1])*v[0][2] +
-            (+v[2][0]*v[0][1] - v[0][0]*v[2][1])*v[1][2] +
-            (-v[1][0]*v[0][1] + v[0][0]*v[1][1])*v[2][2]
-          )/6;
+          // determine the sign tetrahedron
+          p = v[0];
+          f = 0;
+          for (i = 0; i < 3; ++i) f += p[i]*c[i];
 
-          if (f > 0) *volume += fv; else  *volume -= fv;
+          if (f != 0) {
+            // volume of tetrahedron
+            fv = std::abs(
+              (-v[2][0]*v[1][1] + v[1][0]*v[2][1])*v[0][2] +
+              (+v[2][0]*v[0][1] - v[0][0]*v[2][1])*v[1][2] +
+              (-v[1][0]*v[0][1] + v[0][0]*v[1][1])*v[2][2]
+            )/6;
+
+            dV[k] = (f > 0 ? fv : -fv);
+          }
         }
       }
     }
+  });
+
+  if (area) {
+    *area = 0;
+    for (auto && f : (A ? *A : dA)) *area += f;
+  }
+
+  if (volume) {
+    *volume = 0;
+    for (auto && f : dV) if (f != 0) *volume += f;
   }
 }
 
@@ -0,0 +1,288 @@
+"""
+Binary on-disk format for <phoebe.parameters.ParameterSet.save> and
+<phoebe.frontend.bundle.Bundle.save> (with `binary=True`).
+
+The file is an uncompressed zip archive in which the metadata of the
+parameters is stored as JSON (one member per context, in the same format as
+<phoebe.parameters.ParameterSet.to_json>), but the values of numeric arrays are
+replaced by a reference to a separate `.npy` member.  As the members are not
+compressed, the arrays can be accessed directly from a memory-map of the file
+without reading (or parsing) the arrays of any other parameters.
+"""
+
+import io
+import json
+import os
+import struct
+import zipfile
+
+import numpy as np
+
+from phoebe.utils import parse_json
+
+import logging
+logger = logging.getLogger("ARCHIVE")
+logger.addHandler(logging.NullHandler())
+
+_format = 'phoebe-archive'
+_format_version = 1
+
+# key of the placeholder dictionary that replaces an array in the JSON
+_array_key = '__array__'
+
+
+def is_archive(filename):
+    """
+    Determine whether `filename` (a path or file object) is a binary archive
+    (as opposed to a JSON file).
+    """
+    try:
+        return zipfile.is_zipfile(filename)
+    except (OSError, TypeError):
+        return False
+
+
+def extract_array(value, arrays):
+    """
+    Return the placeholder for `value` (appending it to `arrays`) if it is a
+    numeric array that should be stored in its own block, otherwise None.
+    """
+    if _is_block_array(value):
+        arrays.append(value)
+        return {_array_key: len(arrays)-1}
+    return None
+
+
+def placeholder_index(value):
+    """
+    Return the index of the array referred to by `value` if it is a
+    placeholder (see <phoebe.parameters.archive.extract_array>), otherwise None.
+    """
+    if isinstance(value, dict) and len(value) == 1 and _array_key in value:
+        return value[_array_key]
+    return None
+
+
+def _is_block_array(value):
+    return isinstance(value, np.ndarray) and value.ndim and value.dtype.kind in 'biufc'
+
+
+def write(filename, params_per_context, arrays):
+    """
+    Write an archive.
+
+    Arguments
+    ----------
+    * `filename` (string): path of the file to write.
+    * `params_per_context` (dict): lists of the parameter dictionaries
+        (see <phoebe.parameters.Parameter.to_json>) per context.
+    * `arrays` (list): arrays referred to by the placeholders in the
+        parameter dictionaries.
+
+    Returns
+    ---------
+    * (string) filename
+    """
+    writer = ArchiveWriter(filename)
+    try:
+        for array in arrays:
+            writer.add_array(array)
+    except:
+        writer.abort()
+        raise
+    return writer.close(params_per_context)
+
+
+class ArchiveWriter(object):
+    """
+    Write an archive incrementally: each array is written to disk as soon as
+    it is added (see <phoebe.parameters.archive.ArchiveWriter.extract_array>)
+    and the metadata is written by
+    <phoebe.parameters.archive.ArchiveWriter.close>.
+
+    The archive is written to a temporary file which replaces `filename` when
+    closed, so that any existing file (which may still be memory-mapped) is
+    never changed in-place.
+    """
+    def __init__(self, filename):
+        self._filename = filename
+        self._tmp_filename = '{}.{}.tmp'.format(filename, os.getpid())
+        self._zf = zipfile.ZipFile(self._tmp_filename, 'w', compression=zipfile.ZIP_STORED, allowZip64=True)
+        self._narrays = 0
+
+    @property
+    def filename(self):
+        return self._filename
+
+    def add_array(self, array):
+        """
+        Write `array` to the archive and return its placeholder.
+        """
+        index = self._narrays
+        with self._zf.open('arrays/{}.npy'.format(index), 'w', force_zip64=array.nbytes > 2**30) as f:
+            np.lib.format.write_array(f, array, allow_pickle=False)
+        self._narrays += 1
+        return {_array_key: index}
+
+    def extract_array(self, value):
+        """
+        Same as <phoebe.parameters.archive.extract_array> but writing the
+        array to the archive immediately.
+        """
+        if _is_block_array(value):
+            return self.add_array(value)
+        return None
+
+    def close(self, params_per_context={}):
+        """
+        Write the metadata and move the archive to its final location.
+
+        Arguments
+        ----------
+        * `params_per_context` (dict, optional, default={}): lists of the
+            parameter dictionaries (see <phoebe.parameters.Parameter.to_json>)
+            per context.
+
+        Returns
+        ---------
+        * (string) filename
+        """
+        header = {'format': _format,
+                  'format_version': _format_version,
+                  'contexts': list(params_per_context.keys()),
+                  'narrays': self._narrays}
+
+        self._zf.writestr('phoebe.json', json.dumps(header))
+        for context, params in params_per_context.items():
+            self._zf.writestr('contexts/{}.json'.format(context), json.dumps(params, sort_keys=True, separators=(',', ':')))
+        self._zf.close()
+
+        os.replace(self._tmp_filename, self._filename)
+        return self._filename
+
+    def abort(self):
+        """
+        Discard the archive, leaving any existing file untouched.
+        """
+        self._zf.close()
+        if os.path.isfile(self._tmp_filename):
+            os.remove(self._tmp_filename)
+
+
+class Archive(object):
+    """
+    Read access to a binary archive created by <phoebe.parameters.archive.write>.
+
+    The JSON metadata is read when opening, but the arrays are only accessed
+    when resolving the parameters of a context (see
+    <phoebe.parameters.archive.Archive.resolve>).  If `mmap=True` and a
+    path is provided, the arrays are copy-on-write views into a memory-map of
+    the file, otherwise the whole file is read into memory.
+    """
+    def __init__(self, filename, mmap=True):
+        self._filename = filename if isinstance(filename, str) else None
+        self._mmap = mmap
+
+        if self._filename is not None and mmap:
+            self._buffer = np.memmap(filename, dtype=np.uint8, mode='c')
+        else:
+            if self._filename is not None:
+                with open(filename, 'rb') as f:
+                    data = f.read()
+            else:
+                data = filename.read()
+            self._buffer = np.frombuffer(bytearray(data), dtype=np.uint8)
+
+        # NOTE: when reading from the path, only the headers are read here
+        with zipfile.ZipFile(self._filename if self._filename is not None else io.BytesIO(self._buffer)) as zf:
+            header = json.loads(zf.read('phoebe.json'))
+            if header.get('format') != _format:
+                raise ValueError("file is not a PHOEBE binary archive")
+            if header.get('format_version') > _format_version:
+                raise ValueError("archive format version {} is not supported by this version of PHOEBE".format(header.get('format_version')))
+
+            self._contexts = header['contexts']
+            self._json = {context: zf.read('contexts/{}.json'.format(context)) for context in self._contexts}
+            self._offsets = [self._member_offset(zf.getinfo('arrays/{}.npy'.format(i))) for i in range(header['narrays'])]
+
+    def __deepcopy__(self, memo):
+        # the archive is read-only, so can be shared between copies of bundles
+        return self
+
+    def __getstate__(self):
+        if self._filename is not None:
+            return {'filename': self._filename, 'mmap': self._mmap}
+        return {'buffer': self._buffer.tobytes(), 'mmap': self._mmap}
+
+    def __setstate__(self, state):
+        if 'filename' in state:
+            self.__init__(state['filename'], mmap=state['mmap'])
+        else:
+            self.__init__(io.BytesIO(state['buffer']), mmap=state['mmap'])
+
+    def _member_offset(self, info):
+        if info.compress_type != zipfile.ZIP_STORED:
+            raise ValueError("arrays in the archive must not be compressed")
+        # the local file header has a fixed size of 30 bytes followed by the
+        # filename and the extra field (whose lengths may differ from those
+        # in the central directory)
+        local_header = self._buffer[info.header_offset:info.header_offset+30].tobytes()
+        name_length, extra_length = struct.unpack('<HH', local_header[26:30])
+        return info.header_offset + 30 + name_length + extra_length
+
+    @property
+    def contexts(self):
+        """
+        Contexts stored in the archive (in order).
+        """
+        return self._contexts
+
+    def get_params(self, context):
+        """
+        Parse the parameter dictionaries of `context`.  Arrays are left as
+        placeholders, see <phoebe.parameters.archive.Archive.resolve>.
+        """
+        return json.loads(self._json[context], object_pairs_hook=parse_json)
+
+    def get_array(self, index):
+        """
+        Access the array with a given `index`.
+        """
+        offset = self._offsets[index]
+        f = io.BytesIO(self._buffer[offset:offset+16].tobytes())
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            header_length = 10 + struct.unpack('<H', f.read(2))[0]
+        else:
+            header_length = 12 + struct.unpack('<I', f.read(4))[0]
+
+        f = io.BytesIO(self._buffer[offset:offset+header_length].tobytes())
+        np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+
+        return np.ndarray(shape, dtype=dtype, buffer=self._buffer,
+                          offset=offset+header_length,
+                          order='F' if fortran_order else 'C')
+
+    def resolve(self, param_dict):
+        """
+        Return a copy of a parameter dictionary (from
+        <phoebe.parameters.archive.Archive.get_params>) with any placeholders
+        in its value replaced by the arrays.
+        """
+        def _resolve(value):
+            if isinstance(value, dict):
+                index = placeholder_index(value)
+                if index is not None:
+                    return self.get_array(index)
+                return {k: _resolve(v) for k, v in value.items()}
+            return value
+
+        if 'value' not in param_dict:
+            return param_dict
+        param_dict = dict(param_dict)
+        param_dict['value'] = _resolve(param_dict['value'])
+        return param_dict
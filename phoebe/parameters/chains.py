@@ -0,0 +1,362 @@
+"""
+Append-only on-disk storage for the per-iteration arrays (ie. the chains of
+samples and lnprobabilities) of a solution while a solver is still running.
+
+When saving the progress of a solver (see `progress_every_niters`), the arrays
+which grow with every iteration are appended to a separate chain file (with
+the same filename as the progress file suffixed by `.chain`, see
+<phoebe.parameters.chains.chain_filename>) so that each checkpoint only needs to
+write the new iterations.  The values of these parameters in the (JSON)
+progress file itself are replaced by a placeholder which refers to the chain
+file and the number of iterations at the time of the checkpoint, and are
+resolved by <phoebe.parameters.ParameterSet.open>.
+
+The chain file consists of a header (magic string, length of the header, and
+the JSON-encoded description of the arrays) followed by fixed-size records,
+each containing a single iteration of all arrays.  A record that was only
+partially written (ie. if the process was killed while writing) is ignored
+when reading.
+
+Note that a progress file is therefore not self-contained: the chain file
+must be kept (and copied or moved) alongside it.  The final solution is saved
+as a regular (self-contained) file once the solver completes.
+"""
+
+import json
+import os
+import struct
+import uuid
+
+import numpy as np
+
+import logging
+logger = logging.getLogger("CHAINS")
+logger.addHandler(logging.NullHandler())
+
+_magic = b'\x93PHOEBECHAIN'
+_format_version = 1
+# align the records to a multiple of this many bytes
+_alignment = 64
+
+# key of the placeholder dictionary that replaces an array in the JSON
+_chain_key = '__chain__'
+
+
+def chain_filename(filename):
+    """
+    Filename of the chain file that accompanies `filename`.
+    """
+    return '{}.chain'.format(filename)
+
+
+def placeholder(qualifier, nrows):
+    """
+    Placeholder to store in the JSON instead of the array of `qualifier`,
+    referring to the first `nrows` iterations in the chain file.
+    """
+    return {_chain_key: qualifier, 'nrows': nrows}
+
+
+def is_placeholder(value):
+    """
+    Determine whether `value` is a placeholder (see
+    <phoebe.parameters.chains.placeholder>).
+    """
+    return isinstance(value, dict) and _chain_key in value
+
+
+def has_placeholders(data):
+    """
+    Determine whether any of the parameter dictionaries in `data` contain a
+    placeholder.
+    """
+    return any(is_placeholder(param_dict.get('value', None)) for param_dict in data if isinstance(param_dict, dict))
+
+
+def _record_dtype(description):
+    return np.dtype([(name, np.dtype(dtype), tuple(shape)) for name, dtype, shape in description])
+
+
+class ChainWriter(object):
+    """
+    Append the per-iteration arrays of a running solver to a chain file.
+
+    The file is (re)created by the first call to
+    <phoebe.parameters.chains.ChainWriter.append>, after which only the new
+    iterations are written.
+    """
+    def __init__(self, filename):
+        self._filename = filename
+        self._description = None
+        self._nrows = 0
+        # bytes of the last written iteration per array
+        self._last_rows = None
+
+    @property
+    def filename(self):
+        return self._filename
+
+    @property
+    def nrows(self):
+        """
+        Number of iterations written to the chain file.
+        """
+        return self._nrows
+
+    def _create(self, description):
+        header = json.dumps({'format_version': _format_version,
+                             'id': uuid.uuid4().hex,
+                             'arrays': description}).encode('utf-8')
+        offset = len(_magic) + 4 + len(header)
+        header += b' ' * (-offset % _alignment)
+
+        # write to a temporary file first so that any reader never sees a
+        # file without a complete header
+        tmp_filename = '{}.{}.tmp'.format(self._filename, os.getpid())
+        with open(tmp_filename, 'wb') as f:
+            f.write(_magic)
+            f.write(struct.pack('<I', len(header)))
+            f.write(header)
+        os.replace(tmp_filename, self._filename)
+
+        self._description = description
+        self._nrows = 0
+        self._last_rows = None
+
+    def _changed(self, arrays):
+        # whether the last iteration that was already written changed.  The
+        # solvers only ever append iterations, so comparing the earlier
+        # iterations as well would only make each checkpoint scale with the
+        # length of the chain.
+        if not self._nrows:
+            return False
+        for name, array in arrays.items():
+            if array[self._nrows-1].tobytes() != self._last_rows[name]:
+                return True
+        return False
+
+    def append(self, arrays):
+        """
+        Append the iterations of `arrays` that have not yet been written.
+
+        If the arrays changed in shape or type, have fewer iterations than
+        were already written, or the last written iteration changed, the
+        chain file is rewritten from the start.
+
+        Arguments
+        ----------
+        * `arrays` (dict): arrays (with the iterations along the first axis)
+            per qualifier.  All arrays must have the same number of iterations.
+
+        Returns
+        ---------
+        * (int) number of iterations in the chain file.
+        """
+        arrays = {name: np.asarray(array) for name, array in arrays.items()}
+        nrows = set(array.shape[0] for array in arrays.values())
+        if len(nrows) != 1:
+            raise ValueError("all arrays must have the same number of iterations")
+        nrows = nrows.pop()
+
+        description = [[name, array.dtype.str, list(array.shape[1:])] for name, array in arrays.items()]
+        if description != self._description or nrows < self._nrows or self._changed(arrays):
+            if self._description is not None:
+                logger.info("chain in {} changed, rewriting".format(self._filename))
+            self._create(description)
+
+        if nrows > self._nrows:
+            records = np.empty(nrows - self._nrows, dtype=_record_dtype(description))
+            for name, array in arrays.items():
+                records[name] = array[self._nrows:]
+
+            with open(self._filename, 'ab') as f:
+                f.write(records.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+            self._last_rows = {name: array[nrows-1].tobytes() for name, array in arrays.items()}
+            self._nrows = nrows
+
+        return self._nrows
+
+    def write_progress(self, ps, filename, qualifiers):
+        """
+        Save the progress of a solution: append the arrays of `qualifiers` to
+        the chain file and save the remaining parameters of `ps` (with
+        placeholders for the arrays) as JSON to `filename`.
+
+        The chain is written before the JSON file, which is replaced
+        atomically, so that the JSON file always refers to iterations that
+        are complete in the chain file.  The JSON file only contains
+        placeholders for the arrays of `qualifiers`, so can only be loaded
+        (see <phoebe.parameters.ParameterSet.open>) if the chain file (see
+        <phoebe.parameters.chains.chain_filename>) is kept alongside it.
+
+        Arguments
+        ----------
+        * `ps` (<phoebe.parameters.ParameterSet>): the solution.
+        * `filename` (string): path of the JSON file.
+        * `qualifiers` (list): qualifiers of the parameters with an array
+            per-iteration.  Any of these that are not arrays with the same
+            number of iterations as the first will be included in the JSON
+            file instead.
+
+        Returns
+        ---------
+        * (string) filename
+        """
+        chain_params = {}
+        for qualifier in qualifiers:
+            params = ps.filter(qualifier=qualifier, check_visible=False, check_default=False).to_list()
+            if len(params) != 1:
+                continue
+            value = params[0].get_value()
+            if not isinstance(value, np.ndarray) or not value.ndim or value.dtype.kind not in 'biufc':
+                continue
+            if len(chain_params) and value.shape[0] != list(chain_params.values())[0][1].shape[0]:
+                continue
+            chain_params[qualifier] = (params[0], value)
+
+        nrows = self.append({qualifier: value for qualifier, (param, value) in chain_params.items()}) if len(chain_params) else 0
+
+        data = []
+        for param in ps.to_list():
+            if param.qualifier in chain_params.keys() and chain_params[param.qualifier][0] is param:
+                param_dict = param.to_json(exclude=['value'])
+                param_dict['value'] = placeholder(param.qualifier, nrows)
+            else:
+                param_dict = param.to_json()
+            data.append(param_dict)
+
+        tmp_filename = '{}.{}.tmp'.format(filename, os.getpid())
+        with open(tmp_filename, 'w') as f:
+            json.dump(data, f, sort_keys=False, indent=0)
+        os.replace(tmp_filename, filename)
+
+        return filename
+
+
+class ChainReader(object):
+    """
+    Read a chain file written by <phoebe.parameters.chains.ChainWriter>.
+
+    The reader keeps the iterations that were already read, so that repeated
+    calls to <phoebe.parameters.chains.ChainReader.read> (ie. while a solver
+    is still running) only read the iterations appended since the previous
+    call.
+    """
+    def __init__(self, filename):
+        self._filename = filename
+        self._header = None
+        self._records = None
+        self._nrows = 0
+
+    def __repr__(self):
+        return "<ChainReader filename={} nrows={}>".format(self._filename, self._nrows)
+
+    @property
+    def filename(self):
+        return self._filename
+
+    @filename.setter
+    def filename(self, filename):
+        if filename != self._filename:
+            self._filename = filename
+            self._header = None
+
+    @property
+    def nrows(self):
+        """
+        Number of iterations read so far.
+        """
+        return self._nrows
+
+    def read(self, nrows=None):
+        """
+        Read any new iterations from the chain file.
+
+        Arguments
+        ----------
+        * `nrows` (int, optional, default=None): number of iterations to
+            return.  If not provided, will return all complete iterations.
+
+        Returns
+        ---------
+        * (dict) arrays per qualifier
+
+        Raises
+        --------
+        * IOError: if the chain file does not exist.
+        * ValueError: if the file is not a chain file or does not (yet)
+            contain `nrows` iterations.
+        """
+        if not os.path.exists(self._filename):
+            raise IOError("chain file {} not found.  Progress files store the chains of the solution in this separate file, which must be kept alongside the progress file.".format(self._filename))
+
+        with open(self._filename, 'rb') as f:
+            if f.read(len(_magic)) != _magic:
+                raise ValueError("{} is not a chain file".format(self._filename))
+            header_length = struct.unpack('<I', f.read(4))[0]
+            header = json.loads(f.read(header_length))
+            if header.get('format_version') > _format_version:
+                raise ValueError("chain format version {} is not supported by this version of PHOEBE".format(header.get('format_version')))
+
+            if self._header is None or header['id'] != self._header['id']:
+                # new (or rewritten) file
+                self._header = header
+                self._records = np.empty(0, dtype=_record_dtype(header['arrays']))
+                self._nrows = 0
+
+            dtype = self._records.dtype
+            offset = len(_magic) + 4 + header_length
+            nrows_available = (os.fstat(f.fileno()).st_size - offset) // dtype.itemsize
+
+            if nrows_available > self._nrows:
+                f.seek(offset + self._nrows * dtype.itemsize)
+                new_records = np.frombuffer(f.read((nrows_available - self._nrows) * dtype.itemsize), dtype=dtype)
+
+                if nrows_available > len(self._records):
+                    # grow the buffer geometrically so that reading the
+                    # progress repeatedly does not copy all iterations every time
+                    records = np.empty(max(nrows_available, 2 * len(self._records)), dtype=dtype)
+                    records[:self._nrows] = self._records[:self._nrows]
+                    self._records = records
+
+                self._records[self._nrows:nrows_available] = new_records
+                self._nrows = nrows_available
+
+        if nrows is None:
+            nrows = self._nrows
+        elif nrows > self._nrows:
+            raise ValueError("{} only contains {} of {} iterations".format(self._filename, self._nrows, nrows))
+
+        return {name: self._records[name][:nrows] for name in self._records.dtype.names}
+
+    def resolve(self, data):
+        """
+        Replace the placeholders in the parameter dictionaries in `data` with
+        the arrays from the chain file.
+
+        Arguments
+        ----------
+        * `data` (list): parameter dictionaries (as loaded from the JSON file).
+
+        Returns
+        ---------
+        * (list) parameter dictionaries
+        """
+        nrows = [param_dict['value']['nrows'] for param_dict in data if isinstance(param_dict, dict) and is_placeholder(param_dict.get('value', None))]
+        if not len(nrows):
+            return data
+
+        arrays = self.read(nrows=max(nrows))
+
+        ret = []
+        for param_dict in data:
+            value = param_dict.get('value', None) if isinstance(param_dict, dict) else None
+            if is_placeholder(value):
+                param_dict = dict(param_dict)
+                # copy so that the parameter does not share the buffer of the reader
+                param_dict['value'] = np.array(arrays[value[_chain_key]][:value['nrows']])
+            ret.append(param_dict)
+        return ret
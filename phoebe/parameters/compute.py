@@ -92,6 +92,19 @@ def phoebe(**kwargs):
         if `mesh_method` is 'marching').
     * `eclipse_method` (string, optional, default='native'): which method to use
         for determinging eclipses.
+    * `ooe_method` (string, optional, default='mesh'): which method to use
+        for out-of-eclipse light curve fluxes.  If 'interp', circular, aligned
+        binaries without features will interpolate out-of-eclipse fluxes in
+        phase from a cached horizon-only integration and only integrate the
+        mesh at times where eclipses are possible.  If 'batch', circular, aligned
+        binaries with keplerian dynamics and without features will integrate
+        all out-of-eclipse fluxes and rvs at once in vectorized chunks.
+    * `ooe_nphases` (int, optional, default=200): number of phases at which
+        to cache the horizon-only integration (only applicable if `ooe_method`
+        is 'interp').
+    * `ooe_batch_memory` (float, optional, default=256): approximate memory
+        (in MB) to use per chunk of times (only applicable if `ooe_method`
+        is 'batch').
     * `lc_method` (string, optional, default='numerical'): which method to use
         for computing light curves.
     * `fti_method` (string, optional, default='oversample'): method to use for
@@ -167,6 +180,9 @@ def phoebe(**kwargs):
     # ECLIPSE DETECTION
     params += [ChoiceParameter(qualifier='eclipse_method', value=kwargs.get('eclipse_method', 'native'), choices=['only_horizon', 'graham', 'none', 'visible_partial', 'native', 'wd_horizon'] if conf.devel else ['native', 'only_horizon'], advanced=True, description='Type of eclipse algorithm')]
     params += [ChoiceParameter(visible_if='eclipse_method:native', qualifier='horizon_method', value=kwargs.get('horizon_method', 'boolean'), choices=['boolean', 'linear'] if conf.devel else ['boolean'], advanced=True, description='Type of horizon method')]
+    params += [ChoiceParameter(qualifier='ooe_method', value=kwargs.get('ooe_method', 'mesh'), choices=['mesh', 'interp', 'batch'], advanced=True, description='Method to use for out-of-eclipse light curve fluxes.  mesh: integrate the mesh at every time.  interp: for circular, aligned binaries without features, interpolate in phase from a cached horizon-only integration and only integrate the mesh at times where eclipses are possible.  batch: for circular, aligned binaries with keplerian dynamics and without features, integrate all out-of-eclipse fluxes and rvs at once in vectorized chunks and only integrate the mesh per-time at times where eclipses are possible.')]
+    params += [IntParameter(visible_if='ooe_method:interp', qualifier='ooe_nphases', value=kwargs.get('ooe_nphases', 200), limits=(10,None), advanced=True, default_unit=u.dimensionless_unscaled, description='Number of phases at which to cache the horizon-only integration for ooe_method=\'interp\'')]
+    params += [FloatParameter(visible_if='ooe_method:batch', qualifier='ooe_batch_memory', value=kwargs.get('ooe_batch_memory', 256), limits=(1,None), advanced=True, default_unit=u.dimensionless_unscaled, description='Approximate memory (in MB) to use per chunk of times for ooe_method=\'batch\'')]
 
 
     # PER-COMPONENT
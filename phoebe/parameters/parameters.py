@@ -8,6 +8,8 @@ from phoebe.constraints.expression import ConstraintVar
 # from phoebe.constraints import builtin
 from phoebe.parameters.twighelpers import _uniqueid_to_uniquetwig
 from phoebe.parameters.twighelpers import _twig_to_uniqueid
+from phoebe.parameters import archive as _archive
+from phoebe.parameters import chains as _chains
 from phoebe.frontend import tabcomplete
 from phoebe.dependencies import nparray, distl
 from phoebe.dependencies import crimpl as _crimpl
@@ -152,6 +154,9 @@ _meta_fields_twig = ['time', 'qualifier', 'feature', 'component',
 
 _meta_fields_all = _meta_fields_twig + ['twig', 'uniquetwig', 'uniqueid']
 _meta_fields_filter = _meta_fields_all + ['constraint_func', 'value']
+# tags which the Bundle indexes for exact-match filtering (time requires a
+# tolerance, so is always matched by scanning)
+_meta_fields_index = [f for f in _meta_fields_twig if f != 'time'] + ['uniqueid']
 
 _contexts = ['system', 'component', 'feature',
              'dataset', 'constraint', 'distribution', 'compute', 'model',
@@ -245,6 +250,7 @@ _forbidden_labels += ['enabled', 'dynamics_method', 'ltte', 'comments',
                       'irrad_method', 'boosting_method', 'mesh_method', 'distortion_method',
                       'ntriangles', 'rv_grav',
                       'mesh_offset', 'mesh_init_phi', 'horizon_method', 'eclipse_method',
+                      'ooe_method', 'ooe_nphases', 'ooe_batch_memory',
                       'atm', 'lc_method', 'rv_method', 'fti_method', 'fti_oversample',
                       'pblum_method', 'requiv_max_limit',
                       'etv_method', 'etv_tol',
@@ -266,7 +272,7 @@ _forbidden_labels += ['nwalkers', 'niters', 'priors', 'priors_requires', 'init_f
                       'priors_combine', 'maxiter', 'maxfev', 'adaptive',
                       'xatol', 'fatol', 'bounds', 'bounds_combine', 'bounds_sigma',
                       'strategy', 'popsize', 'recombination', 'tol', 'atol', 'polish',
-                      'continue_from', 'continue_from_iter', 'init_from_combine',
+                      'continue_from', 'continue_from_iter', 'init_from_combine', 'vectorize',
                       'burnin_factor', 'thin_factor', 'nlags_factor', 'progress_every_niters',
                       'nlive', 'maxcall', 'lc_geometry', 'rv_geometry', 'lc_periodogram', 'rv_periodogram', 'ebai',
                       'nelder_mead', 'differential_evolution', 'cg', 'powell', 'emcee', 'dynesty',
@@ -530,6 +536,72 @@ def _fnmatch(to_this, expression_or_string):
     else:
         return expression_or_string == to_this
 
+def _filter_index_values(key, value):
+    """
+    Return the list of values to look up in the filter index for filtering
+    by `key`=`value`, or None if this filter cannot use the index (wildcards,
+    non-string values, or tags which are not indexed).
+    """
+    if key not in _meta_fields_index or value is None:
+        return None
+    values = value if isinstance(value, list) else [value]
+    for v in values:
+        if not isinstance(v, str) or '*' in v or '?' in v:
+            return None
+    if key == 'kind':
+        return [v.lower() for v in values]
+    return values
+
+# twig prefixes which filter_or_get strips to determine the method to call
+_twig_methods = ['value', 'quantity', 'unit', 'default_unit', 'timederiv',
+                 'description', 'choices', 'result']
+
+def _lazy_context(archive, context):
+    """
+    Create the entry for a context of an archive that will only be loaded
+    into the Bundle when accessed (see `ParameterSet._load_lazy_contexts`).
+    The tags of the (not-yet created) parameters are kept so that filters that
+    cannot match any of them do not trigger loading the context.
+    """
+    params = archive.get_params(context)
+    tags = {field: {} for field in _meta_fields_index}
+    values = {}
+    for param_dict in params:
+        for field in _meta_fields_index:
+            value = param_dict.get(field, None)
+            if value is None:
+                continue
+            tags[field][value] = None
+            values[value] = None
+    return {'archive': archive, 'params': params, 'tags': tags, 'values': values}
+
+def _lazy_context_may_match(lazy, twig, kwargs):
+    """
+    Whether any of the parameters of a lazy context could match a filter.
+    This only rejects on exact-matches (so may return True even if no
+    parameters will match).
+    """
+    for key, value in kwargs.items():
+        values = _filter_index_values(key, value)
+        if values is None:
+            continue
+        options = lazy['tags'][key] if key != 'kind' else [k.lower() for k in lazy['tags'][key]]
+        if not np.any([v in options for v in values]):
+            return False
+
+    if isinstance(twig, str):
+        twig, _ = _extract_index_from_string(twig)
+        for ti in twig.split('@'):
+            if ti in _twig_methods or '*' in ti or '?' in ti:
+                continue
+            try:
+                float(ti)
+            except ValueError:
+                if ti not in lazy['values']:
+                    return False
+
+    return True
+
 class JupyterUI(object):
     def __init__(self, url):
         self.url = url
@@ -581,6 +653,23 @@ class ParameterSetInfo(dict):
 
 
 
+# attributes of ParameterSet which are set by _set_meta
+_meta_attrs_lazy = ['_'+field for field in _meta_fields_twig]
+
+def _install_tab_completer():
+    """
+    set the tab completer (once per session)
+    """
+    global _tab_completer_installed
+    if _tab_completer_installed:
+        return
+    readline.set_completer(tabcomplete.Completer().complete)
+    readline.set_completer_delims(_twig_delims)
+    readline.parse_and_bind("tab: complete")
+    _tab_completer_installed = True
+
+_tab_completer_installed = False
+
 class ParameterSet(object):
     """ParameterSet.
 
@@ -604,6 +693,10 @@ class ParameterSet(object):
         """
         self._bundle = None
         self._filter = {}
+        self._filter_index = None
+        # contexts which will be loaded (into the Bundle) once accessed, see
+        # _load_lazy_contexts
+        self._lazy_contexts = {}
 
         if isinstance(params, str):
             params = json.loads(params)
@@ -619,34 +712,23 @@ class ParameterSet(object):
         else:
             self._params = params
 
-        self._qualifier = None
-        self._time = None
-        self._component = None
-        self._dataset = None
-        self._figure = None
-        self._server = None
-        self._constraint = None
-        self._distribution = None
-        self._compute = None
-        self._model = None
-        self._solver = None
-        self._solution = None
-        # self._plugin = None
-        self._kind = None
-        self._context = None
-
-        # just as a dummy, this'll be filled and handled by to_dict()
-        self._next_field = 'key'
-
-        self._set_meta()
-
-        # force an update to _next_field
-        self.to_dict(skip_return=True)
-
-        # set tab completer
-        readline.set_completer(tabcomplete.Completer().complete)
-        readline.set_completer_delims(_twig_delims)
-        readline.parse_and_bind("tab: complete")
+        # NOTE: the meta-tags (see _set_meta) and _next_field (see to_dict)
+        # are only determined when first accessed (see __getattr__) as most
+        # ParameterSets (ie. the results of internal filters) never need them.
+
+        _install_tab_completer()
+
+    def __getattr__(self, attr):
+        # only called if attr is not (yet) an attribute, see __init__
+        if attr in _meta_attrs_lazy:
+            self._set_meta()
+            return self.__dict__[attr]
+        elif attr == '_next_field':
+            # this'll be filled by to_dict()
+            self._next_field = 'key'
+            self.to_dict(skip_return=True)
+            return self.__dict__[attr]
+        raise AttributeError("'{}' object has no attribute '{}'".format(self.__class__.__name__, attr))
 
     def __repr__(self):
         """Representation for the ParameterSet."""
@@ -665,6 +747,7 @@ class ParameterSet(object):
 
     def __str__(self):
         """String representation for the ParameterSet."""
+        self._load_lazy_contexts()
         if len(self._params):
             param_info = "\n".join([p.to_string_short() for p in self._params])
         else:
@@ -806,6 +889,9 @@ class ParameterSet(object):
                 if getattr(param, '_{}'.format(k)) is None:
                     setattr(param, '_{}'.format(k), v)
 
+        if self._bundle is not None:
+            self._bundle._invalidate_filter_index()
+
     def _options_for_tag(self, tag, include_default=True):
         # keys_for_this_field = set([getattr(p, tag)
         #                            for p in self.to_list()
@@ -814,11 +900,17 @@ class ParameterSet(object):
         # especially as the PS gets larger, this is actually somewhat cheaper
         # than building the large list and taking the set.
         keys_for_this_field = []
-        for p in self.to_list():
+        for p in self._params:
             key = getattr(p, tag)
             if key is not None and key not in keys_for_this_field and (include_default or key!='_default'):
                 keys_for_this_field.append(key)
 
+        # include the options from any contexts that have not been loaded yet
+        for lazy in self._lazy_contexts.values():
+            for key in lazy['tags'].get(tag, {}).keys():
+                if key not in keys_for_this_field and (include_default or key!='_default'):
+                    keys_for_this_field.append(key)
+
         return keys_for_this_field
 
     @property
@@ -1737,8 +1829,8 @@ class ParameterSet(object):
             # NOTE: used to have the following but doesn't work in python3
             # because the Parameters aren't hashable:
             # return ParameterSet(list(set(self._params+other._params)))
-            lst = self._params
-            for p in other._params:
+            lst = self.to_list()
+            for p in other.to_list():
                 if p not in lst:
                     lst.append(p)
 
@@ -1757,7 +1849,7 @@ class ParameterSet(object):
             other = ParameterSet(other)
 
         if isinstance(other, ParameterSet):
-            ps = ParameterSet([p for p in self._params if p not in other._params])
+            ps = ParameterSet([p for p in self.to_list() if p not in other.to_list()])
             ps._bundle = self._bundle
             return ps
         else:
@@ -1773,16 +1865,22 @@ class ParameterSet(object):
             other = ParameterSet([other])
 
         if isinstance(other, ParameterSet):
-            ps = ParameterSet([p for p in self._params if p in other._params])
+            ps = ParameterSet([p for p in self.to_list() if p in other.to_list()])
             ps._bundle = self._bundle
             return ps
         else:
             return NotImplemented
 
     @classmethod
-    def open(cls, filename):
+    def open(cls, filename, chain_reader=None):
         """
-        Open a ParameterSet from a JSON-formatted file.
+        Open a ParameterSet from a JSON-formatted file or a binary file (see
+        <phoebe.parameters.ParameterSet.save>).
+
+        If the file is the progress of a running solver (see
+        `progress_every_niters`) in which the chains are stored in a separate
+        append-only file (see <phoebe.parameters.chains>), the chains will be
+        loaded from that file as well.
         This is a constructor so should be called as:
 
         ```py
@@ -1798,6 +1896,10 @@ class ParameterSet(object):
         * `filename` (string): relative or full path to the file.  Alternatively,
             this can be the json string itself or a list of dictionaries (the
             unpacked json).
+        * `chain_reader` (<phoebe.parameters.chains.ChainReader>, optional):
+            reader to use for the chains (if applicable).  Passing the same
+            reader when repeatedly opening the progress of a running solver
+            will only read the iterations added since the previous call.
 
         Returns
         ---------
@@ -1807,6 +1909,9 @@ class ParameterSet(object):
             data = filename
         elif isinstance(filename, str) and "{" in filename:
             data = json.loads(filename)
+        elif _archive.is_archive(os.path.expanduser(filename)):
+            archive = _archive.Archive(os.path.expanduser(filename))
+            data = [archive.resolve(param_dict) for context in archive.contexts for param_dict in archive.get_params(context)]
         else:
             filename = os.path.expanduser(filename)
             with open(filename, 'r') as f:
@@ -1817,11 +1922,26 @@ class ParameterSet(object):
                 else:
                     data = json.load(f, object_pairs_hook=parse_json)
 
+            if _chains.has_placeholders(data):
+                if chain_reader is None:
+                    chain_reader = _chains.ChainReader(_chains.chain_filename(filename))
+                else:
+                    chain_reader.filename = _chains.chain_filename(filename)
+                data = chain_reader.resolve(data)
+
         return cls(data)
 
-    def save(self, filename, incl_uniqueid=False, compact=False, sort_by_context=True):
+    def save(self, filename, incl_uniqueid=False, compact=False, sort_by_context=True, binary=False):
         """
-        Save the ParameterSet to a JSON-formatted ASCII file.
+        Save the ParameterSet to a JSON-formatted ASCII file (or a binary file
+        if `binary=True`).
+
+        The binary format is an uncompressed zip archive in which the
+        metadata of each context is stored as JSON, but numeric arrays are
+        stored as separate `.npy` blocks.  This is much quicker to save and load
+        for large arrays (ie. models with meshes) and allows opening the file
+        with the arrays memory-mapped and the models only loaded once accessed
+        (see <phoebe.frontend.bundle.Bundle.open>).
 
         See also:
         * <phoebe.parameters.Parameter.save>
@@ -1835,12 +1955,21 @@ class ParameterSet(object):
             uniqueids when reloading)
         * `compact` (bool, optional, default=False): whether to use compact
             file-formatting (may be quicker to save/load, but not as easily readable)
+        * `binary` (bool, optional, default=False): whether to save in the
+            binary format instead of JSON.  `compact` is ignored if `binary=True`.
 
         Returns
         --------
         * (string) filename
         """
         filename = os.path.expanduser(filename)
+        if binary:
+            arrays = []
+            params_per_context = {}
+            for param_dict in self.to_json(incl_uniqueid=incl_uniqueid, sort_by_context=sort_by_context, arrays=arrays):
+                params_per_context.setdefault(param_dict.get('context', None), []).append(param_dict)
+            return _archive.write(filename, params_per_context, arrays)
+
         f = open(filename, 'w')
         if compact:
             if _can_ujson:
@@ -2128,6 +2257,7 @@ class ParameterSet(object):
         """
         if kwargs:
             return self.filter(**kwargs).to_list()
+        self._load_lazy_contexts()
         return self._params
 
     def tolist(self, **kwargs):
@@ -2166,6 +2296,7 @@ class ParameterSet(object):
         """
         if kwargs:
             return self.filter(**kwargs).to_list_of_dicts()
+        self._load_lazy_contexts()
         return [param.to_dict() for param in self._params]
 
     # @property
@@ -2193,6 +2324,7 @@ class ParameterSet(object):
         """
         if kwargs:
             return self.filter(**kwargs).to_flat_dict()
+        self._load_lazy_contexts()
         return {param.uniquetwig: param for param in self._params}
 
     def to_dict(self, field=None, include_none=False, **kwargs):
@@ -2421,6 +2553,7 @@ class ParameterSet(object):
     def __len__(self):
         """
         """
+        self._load_lazy_contexts()
         return len(self._params)
 
     def __iter__(self):
@@ -2428,7 +2561,7 @@ class ParameterSet(object):
         """
         return iter(self.to_dict())
 
-    def to_json(self, incl_uniqueid=False, incl_none=False, exclude=[], sort_by_context=True):
+    def to_json(self, incl_uniqueid=False, incl_none=False, exclude=[], sort_by_context=True, arrays=None):
         """
         Convert the <phoebe.parameters.ParameterSet> to a json-compatible
         object.
@@ -2450,6 +2583,8 @@ class ParameterSet(object):
         * `incl_none` (bool, optional, default=False): whether to include tags
             whose values are None.
         * `exclude` (list, optional, default=[]): tags to exclude when saving.
+        * `arrays` (list, optional, default=None): passed to
+            <phoebe.parameters.Parameter.to_json>.
 
         Returns
         -----------
@@ -2458,12 +2593,12 @@ class ParameterSet(object):
         lst = []
         if sort_by_context:
             for context in _contexts:
-                lst += [v.to_json(incl_uniqueid=incl_uniqueid, incl_none=incl_none, exclude=exclude)
+                lst += [v.to_json(incl_uniqueid=incl_uniqueid, incl_none=incl_none, exclude=exclude, arrays=arrays)
                         for v in self.filter(context=context,
                                              check_visible=False,
                                              check_default=False).to_list()]
         else:
-            lst = [v.to_json(incl_uniqueid=incl_uniqueid, exclude=exclude) for v in self.to_list()]
+            lst = [v.to_json(incl_uniqueid=incl_uniqueid, exclude=exclude, arrays=arrays) for v in self.to_list()]
         return lst
         # return {k: v.to_json() for k,v in self.to_flat_dict().items()}
 
@@ -2665,6 +2800,69 @@ class ParameterSet(object):
             # then only 1 item, so return the parameter
             return ps._params[0]
 
+    def _update_filter_index(self):
+        """
+        Return the index from exact tag values to positions in the list of
+        parameters, used by <phoebe.parameters.ParameterSet.filter_or_get>.
+
+        The index is only maintained for the Bundle (None is returned for any
+        other ParameterSet).  Parameters appended since the last call are
+        added to the index and the index is rebuilt if parameters have been
+        removed or their tags have changed (see `_invalidate_filter_index`).
+        """
+        if self._bundle is not self:
+            return None
+
+        index = self._filter_index
+        params = self._params
+        if index is None or index['params'] is not params or index['nparams'] > len(params):
+            index = {'params': params, 'nparams': 0,
+                     'tags': {field: {} for field in _meta_fields_index}}
+            self._filter_index = index
+
+        tags = index['tags']
+        for i in range(index['nparams'], len(params)):
+            param = params[i]
+            for field in _meta_fields_index:
+                value = getattr(param, field)
+                if isinstance(value, str):
+                    if field == 'kind':
+                        value = value.lower()
+                    tags[field].setdefault(value, []).append(i)
+
+        index['nparams'] = len(params)
+        return index
+
+    def _invalidate_filter_index(self):
+        """
+        Drop the filter index.  This must be called whenever the tags of any
+        parameter in the Bundle are changed in-place.
+        """
+        self._filter_index = None
+
+    def _load_lazy_contexts(self, twig=None, kwargs=None):
+        """
+        Create and attach the parameters of any contexts that were deferred when
+        opening a binary file (see <phoebe.frontend.bundle.Bundle.open>).
+
+        If `kwargs` (and `twig`) are passed from a filter, only the contexts
+        which could contain matching parameters are loaded, otherwise all
+        are loaded.
+        """
+        if not self._lazy_contexts:
+            return
+
+        for context, lazy in list(self._lazy_contexts.items()):
+            if kwargs is not None and not _lazy_context_may_match(lazy, twig, kwargs):
+                continue
+
+            logger.debug("loading {} parameters in the '{}' context".format(len(lazy['params']), context))
+            del self._lazy_contexts[context]
+            for param_dict in lazy['params']:
+                param = parameter_from_json(lazy['archive'].resolve(param_dict), self)
+                param._bundle = self
+                self._params.append(param)
+
     def filter_or_get(self, twig=None, autocomplete=False, force_ps=False,
                       check_visible=True, check_default=True,
                       check_advanced=False, check_single=False, **kwargs):
@@ -2796,7 +2994,30 @@ class ParameterSet(object):
                 return_ += self.filter_or_get(**kwargs)
             return return_
 
-        params = self.to_list()
+        # load any lazy contexts (only the Bundle has these) which could
+        # contain matches
+        self._load_lazy_contexts(None if autocomplete else twig, kwargs)
+        params = self._params
+
+        # use the index (only maintained by the Bundle) to narrow down the
+        # candidates for exact-match tags.  The candidates are still checked
+        # against all tags below.
+        index = self._update_filter_index()
+        if index is not None:
+            candidates = None
+            for key, value in kwargs.items():
+                values = _filter_index_values(key, value)
+                if values is None:
+                    continue
+                tag_index = index['tags'][key]
+                if len(values) == 1:
+                    positions = tag_index.get(values[0], [])
+                else:
+                    positions = sorted(set().union(*(tag_index.get(v, []) for v in values)))
+                if candidates is None or len(positions) < len(candidates):
+                    candidates = positions
+            if candidates is not None:
+                params = [params[i] for i in candidates]
 
         def string_to_time(string):
             try:
@@ -3081,6 +3302,7 @@ class ParameterSet(object):
         if param.__class__.__name__ == 'ConstraintParameter':
             param._remove_bookkeeping()
         self._params = [p for p in self._params if p.uniqueid != param.uniqueid]
+        self._invalidate_filter_index()
 
     def remove_parameter(self, twig=None, **kwargs):
         """
@@ -3149,6 +3371,7 @@ class ParameterSet(object):
 
         removed_ids = [p.uniqueid for p in params.to_list()]
         self._params = [p for p in self._params if p.uniqueid not in removed_ids]
+        self._invalidate_filter_index()
 
         return params
 
@@ -3839,17 +4062,19 @@ class ParameterSet(object):
                 ds_ps = self._bundle.get_dataset(dataset=ds, **_skip_filter_checks)
                 sigmas = ds_ps.get_value(qualifier='sigmas', component=ds_comp, unit=residuals.unit, **_skip_filter_checks)
 
-                mask_enabled = ds_ps.get_value(qualifier='mask_enabled', default=False, mask_enabled=mask_enabled, **_skip_filter_checks)
-                if mask_enabled:
-                    mask_phases = ds_ps.get_value(qualifier='mask_phases', mask_phases=mask_phases, **_skip_filter_checks)
+                # NOTE: mask_enabled and mask_phases must not be overwritten
+                # here, otherwise the masks would leak to subsequent datasets
+                ds_mask_enabled = ds_ps.get_value(qualifier='mask_enabled', default=False, mask_enabled=mask_enabled, **_skip_filter_checks)
+                if ds_mask_enabled:
+                    ds_mask_phases = ds_ps.get_value(qualifier='mask_phases', mask_phases=mask_phases, **_skip_filter_checks)
                     mask_period = ds_ps.get_value(qualifier='phases_period', default='period', **_skip_filter_checks)
                     mask_dpdt = ds_ps.get_value(qualifier='phases_dpdt', default='dpdt', **_skip_filter_checks)
                     mask_t0 = ds_ps.get_value(qualifier='phases_t0', **_skip_filter_checks)
-                    if len(mask_phases):
+                    if len(ds_mask_phases):
                         times = ds_ps.get_value(qualifier='times', component=ds_comp, unit=u.d, **_skip_filter_checks)
                         phases = self._bundle.to_phase(times, period=mask_period, dpdt=mask_dpdt, t0=mask_t0)
 
-                        inds = phase_mask_inds(phases, mask_phases)
+                        inds = phase_mask_inds(phases, ds_mask_phases)
 
                         sigmas = sigmas[inds]
 
@@ -6532,7 +6757,7 @@ class Parameter(object):
 
         return filename
 
-    def to_json(self, incl_uniqueid=False, incl_none=False, exclude=[]):
+    def to_json(self, incl_uniqueid=False, incl_none=False, exclude=[], arrays=None):
         """
         Convert the <phoebe.parameters.Parameter> to a json-compatible
         object.
@@ -6550,6 +6775,10 @@ class Parameter(object):
         * `incl_none` (bool, optional, default=False): whether to include tags
             whose values are None.
         * `exclude` (list, optional, default=[]): tags to exclude when saving.
+        * `arrays` (list, optional, default=None): if provided, numeric arrays
+            in the value are appended to this list and replaced by a placeholder
+            (as used by the binary format, see <phoebe.parameters.ParameterSet.save>)
+            instead of being converted to lists.
 
         Returns
         -----------
@@ -6572,8 +6801,9 @@ class Parameter(object):
                 if isinstance(v, u.Quantity):
                     v = self.get_value() # force to be in default units
                 if isinstance(v, np.ndarray):
+                    placeholder = _archive.extract_array(v, arrays) if arrays is not None else None
                     # can handle N-dim arrays
-                    v = v.tolist()
+                    v = v.tolist() if placeholder is None else placeholder
                 if _is_unit(v):
                     v = str(v.to_string())
                 return v
@@ -8137,14 +8367,13 @@ class ChoiceParameter(Parameter):
 
         if run_constraints:
             if len(self._in_constraints):
-                logger.debug("changing value of {} triggers {} constraints".format(self.twig, [c.twig for c in self.in_constraints]))
-            for constraint_id in self._in_constraints:
-                self._bundle.run_constraint(uniqueid=constraint_id, skip_kwargs_checks=True, run_constraints=run_constraints)
+                logger.debug("changing value of {} triggers {} constraints".format(self.twig, self._in_constraints))
+                self._bundle._run_constraints_downstream(self._in_constraints)
         else:
             # then we want to delay running constraints... so we need to track
             # which ones need to be run once requested
             if len(self._in_constraints):
-                logger.debug("changing value of {} triggers delayed constraints {}".format(self.twig, [c.twig for c in self.in_constraints]))
+                logger.debug("changing value of {} triggers delayed constraints {}".format(self.twig, self._in_constraints))
             for constraint_id in self._in_constraints:
                 if constraint_id not in self._bundle._delayed_constraints:
                     self._bundle._delayed_constraints.append(constraint_id)
@@ -9947,14 +10176,13 @@ class FloatParameter(Parameter):
             logger.debug("value of {} didn't change within 1e-12, skipping triggering of constraints".format(self.twig))
         elif run_constraints:
             if len(self._in_constraints):
-                logger.debug("changing value of {} triggers {} constraints".format(self.twig, [c.twig for c in self.in_constraints]))
-            for constraint_id in self._in_constraints:
-                self._bundle.run_constraint(uniqueid=constraint_id, skip_kwargs_checks=True, run_constraints=run_constraints)
+                logger.debug("changing value of {} triggers {} constraints".format(self.twig, self._in_constraints))
+                self._bundle._run_constraints_downstream(self._in_constraints)
         else:
             # then we want to delay running constraints... so we need to track
             # which ones need to be run once requested
             if len(self._in_constraints):
-                logger.debug("changing value of {} triggers delayed constraints {}".format(self.twig, [c.twig for c in self.in_constraints]))
+                logger.debug("changing value of {} triggers delayed constraints {}".format(self.twig, self._in_constraints))
             for constraint_id in self._in_constraints:
                 if constraint_id not in self._bundle._delayed_constraints:
                     self._bundle._delayed_constraints.append(constraint_id)
@@ -10302,7 +10530,9 @@ class FloatArrayParameter(FloatParameter):
         -----------
         * `index` (int): the index of the value to be replaced
         * `value` (float): the value to be replaced
-        * `**kwargs`: IGNORED
+        * `**kwargs`: `ignore_readonly`, `run_checks` and `run_constraints`
+            are passed along to <phoebe.parameters.FloatArrayParameter.set_value>,
+            all others are IGNORED.
         """
         if isinstance(value, u.Quantity):
             value = value.to(self.default_unit).value
@@ -10312,7 +10542,9 @@ class FloatArrayParameter(FloatParameter):
             #value = value*self.default_unit
         lst =self.get_value()#.value
         lst[index] = value
-        self.set_value(lst, ignore_readonly=kwargs.get('ignore_readonly', False))
+        self.set_value(lst, ignore_readonly=kwargs.get('ignore_readonly', False),
+                       run_checks=kwargs.get('run_checks', None),
+                       run_constraints=kwargs.get('run_constraints', None))
 
     def __add__(self, other):
         if not (isinstance(other, list) or isinstance(other, np.ndarray)):
@@ -11969,7 +12201,7 @@ class ConstraintParameter(Parameter):
             def _value(var, string_safe_arrays=False, use_distribution=None, needs_builtin=False):
                 param = var.get_parameter()
 
-                if use_distribution and param != self.constrained_parameter:
+                if use_distribution and param != constrained_parameter:
                     # print("\n\n*** {}.get_result param={}".format(self.twig, param.twig))
                     dist = param.get_distribution(use_distribution, distribution_uniqueids=distribution_uniqueids, follow_constraints=True)
 
@@ -11981,14 +12213,62 @@ class ConstraintParameter(Parameter):
                             # will we need to force distribution_uniqueids to be included in the json?
                             return "distl_from_json('{}')".format(_single_value(dist).to_json(export_func_as_path=True, exclude=['label_latex', 'labels_latex']))
 
-                if param != self.constrained_parameter:
+                if param != constrained_parameter:
                     return _single_value(var.get_quantity(t=t), string_safe_arrays)
                 else:
                     return _single_value(var.get_quantity(), string_safe_arrays)
 
             return {var.safe_label if safe_label else var.user_label: _value(var, string_safe_arrays, use_distribution, needs_builtin) for var in vars}
 
-        eq = self.get_value()
+        # NOTE: the expression in terms of the safe labels (self._value) is
+        # used wherever possible as updating the user labels to the current
+        # unique twigs (in self.get_value()) is expensive
+        constrained_parameter = self.constrained_parameter if self.qualifier is not None else None
+        code, needs_builtin_or_math, needs_builtin = self._compile(eq_needs_builtin)
+
+        if use_distribution is None and not _use_sympy and needs_builtin_or_math:
+            # same as the eval of the formatted user expression below, but
+            # passing the values (as they would have been parsed from the
+            # string) to the compiled expression
+            values = get_values([v for v in self._vars+self._addl_vars if v.safe_label in self._value], safe_label=True, string_safe_arrays=True)
+            for k, v in values.items():
+                if isinstance(v, np.floating):
+                    values[k] = float(v)
+                elif isinstance(v, str) and len(v) >= 2 and v[0] == v[-1] == "'":
+                    values[k] = v[1:-1]
+            for func in _constraint_builtin_funcs + _constraint_math_funcs:
+                values.setdefault(func, getattr(builtin, func))
+
+            value = eval(code, globals(), values)
+
+            if value is None:
+                if suppress_error:
+                    value = np.nan
+                    logger.error("{} constraint returned None".format(self.twig))
+                else:
+                    raise ValueError("constraint returned None")
+            else:
+                try:
+                    value = float(value)
+                except TypeError as err:
+                    try:
+                        value = np.asarray(value)
+                    except:
+                        if suppress_error:
+                            value = np.nan
+                            logger.error("{} constraint raised the following error: {}".format(self.twig, str(err)))
+                        else:
+                            raise
+                except ValueError as err:
+                    if suppress_error:
+                        value = np.nan
+                        logger.error("{} constraint raised the following error: {}".format(self.twig, str(err)))
+                    else:
+                        raise
+
+            return self._result_to_default_unit(value)
+
+        eq = self.get_value() if (_use_sympy or use_distribution or needs_builtin_or_math) else self._value
 
         if _use_sympy and not eq_needs_builtin(eq) and not use_distribution:
             values = get_values(self._vars+self._addl_vars, safe_label=True)
@@ -12102,7 +12382,7 @@ class ConstraintParameter(Parameter):
                     var_value = var.get_value()
                     #print "***", self.twig, self.constrained_parameter.twig, var.user_label, var_value, isinstance(var_value, np.ndarray), var.unique_label != self.constrained_parameter.uniqueid
                     # if self.qualifier is None then this isn't attached to solve anything yet, so we don't need to worry about checking to see if the var is the constrained parameter
-                    if isinstance(var_value, np.ndarray) and len(var_value)==0 and (var.unique_label != self.constrained_parameter.uniqueid or self.qualifier is None):
+                    if isinstance(var_value, np.ndarray) and len(var_value)==0 and (self.qualifier is None or var.unique_label != constrained_parameter.uniqueid):
                         #print "*** found empty array", self.constrainted_parameter.twig, var.safe_label, var_value
                         arrays_filled = False
                         #break  # out of the for loop
@@ -12110,13 +12390,37 @@ class ConstraintParameter(Parameter):
                 if arrays_filled:
                     #print "*** else else", self._value, values
                     #print "***", _use_sympy, self._value, value
-                    value = eval(self._value, values)
+                    value = eval(code, values)
                 else:
                     #print "*** EMPTY ARRAY FROM CONSTRAINT"
                     value = np.array([])
 
-        #~ return value
+        return self._result_to_default_unit(value)
+
+    def _compile(self, eq_needs_builtin):
+        """
+        Return the compiled code of the expression (in terms of the safe labels
+        of the variables), and whether it needs any builtin or math functions
+        and whether it needs any builtin functions.  These only depend on the
+        expression so are kept on the parameter until the expression changes
+        (but are not pickled, see __getstate__).
+        """
+        compiled = self.__dict__.get('_compiled', None)
+        if compiled is None or compiled[0] != self._value:
+            compiled = (self._value,
+                        compile(self._value, '<constraint>', 'eval'),
+                        eq_needs_builtin(self._value),
+                        eq_needs_builtin(self._value, include_math=False))
+            self._compiled = compiled
+        return compiled[1:]
+
+    def __getstate__(self):
+        # code objects cannot be pickled, they are recompiled when needed
+        state = self.__dict__.copy()
+        state.pop('_compiled', None)
+        return state
 
+    def _result_to_default_unit(self, value):
         # let's assume the math was correct to give SI and we want units stored in self.default_units
 
         if self.default_unit is not None:
@@ -12219,6 +12523,8 @@ class ConstraintParameter(Parameter):
         self._qualifier = newly_constrained_param.qualifier
         self._component = newly_constrained_param.component
         self._kind = newly_constrained_param.kind
+        if self._bundle is not None:
+            self._bundle._invalidate_filter_index()
 
         # self._value, self._vars = self._parse_expr(rhs)
         # self.set_value(rhs)
@@ -12277,6 +12583,8 @@ class JobParameter(Parameter):
 
         self._cached_crimpl_server = None
         self._cached_crimpl_job = None
+        # keeps the chains already read from the progress of a solver
+        self._chain_reader = None
 
         self._results_fname = '_{}.out'.format(self.uniqueid)
 
@@ -12408,7 +12716,7 @@ class JobParameter(Parameter):
         else:
             crimpl_name = ''
 
-        retrieved_fnames = self.crimpl_job.check_output([self._results_fname, self._results_fname+'.progress'])
+        retrieved_fnames = self.crimpl_job.check_output([self._results_fname, self._results_fname+'.progress', _chains.chain_filename(self._results_fname+'.progress')])
         if not len(retrieved_fnames):
             # try retrieving any error logs
             output_files = self.crimpl_job.output_files
@@ -12433,8 +12741,11 @@ class JobParameter(Parameter):
         else:
             raise ValueError("no matching files retrieved from remote server")
 
+        if is_progress and self._chain_reader is None:
+            self._chain_reader = _chains.ChainReader(_chains.chain_filename(fname))
+
         try:
-            ret_ps = ParameterSet.open(fname)
+            ret_ps = ParameterSet.open(fname, chain_reader=self._chain_reader if is_progress else None)
         except Exception as err:
             if is_progress:
                 return ParameterSet([])
@@ -12528,6 +12839,10 @@ class JobParameter(Parameter):
         try:
             os.remove(self._results_fname+".progress")
         except: pass
+        try:
+            os.remove(_chains.chain_filename(self._results_fname+".progress"))
+        except: pass
+        self._chain_reader = None
 
     def attach(self, wait=True, sleep=10, cleanup=True, return_changes=False):
         """
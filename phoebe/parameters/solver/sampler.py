@@ -116,11 +116,22 @@ def emcee(**kwargs):
         to <phoebe.frontend.bundle.Bundle.export_solver> suffixed with .progress.
         If using detach=True within run_solver, attach job will load the progress
         and allow re-attaching until the job is completed.  If 0 will not save
-        and will only return after completion.
+        and will only return after completion.  The chains themselves are
+        appended to a separate file (the progress filename suffixed with
+        .chain, see <phoebe.parameters.chains>) so that each save only writes
+        the new iterations.  The progress file only holds placeholders for the
+        chains, so the .chain file must be kept alongside it to load (or
+        import) the progress.
     * `expose_failed` (bool, optional, default=True): only applicable if
         `continue_from` is 'None'. whether to expose dictionary of failed samples
         and their error messages.  Note: depending on the number of failed
         samples, this could add overhead.
+    * `vectorize` (bool, optional, default=False): whether to evaluate all
+        walkers of each iteration as a batch.  The forward-models are still
+        computed per-walker (in parallel, if available), but the observations
+        are only accessed once per iteration (see
+        <phoebe.frontend.bundle.Bundle.residual_plan>) and the likelihoods of
+        all walkers are computed simultaneously.
 
     Returns
     --------
@@ -151,6 +162,7 @@ def emcee(**kwargs):
     params += [IntParameter(qualifier='progress_every_niters', value=kwargs.get('progress_every_niters', 0), limits=(0,1e6), description='save the progress of the solution every n iterations.  The solution can only be recovered from an early termination by loading the bundle from a saved file and then calling b.import_solution(filename).  The filename of the saved file will default to solution.ps.progress within run_solver, or the output filename provided to export_solver suffixed with .progress.  If using detach=True within run_solver, attach job will load the progress and allow re-attaching until the job is completed.  If 0 will not save and will only return after completion.')]
 
     params += [BoolParameter(visible_if='continue_from:None', qualifier='expose_failed', value=kwargs.get('expose_failed', True), description='whether to expose dictionary of failed samples and their error messages.  Note: depending on the number of failed samples, this could add overhead.')]
+    params += [BoolParameter(qualifier='vectorize', value=kwargs.get('vectorize', False), advanced=True, description='whether to evaluate all walkers of each iteration as a batch, accessing the observations once per iteration and computing the likelihoods of all walkers simultaneously')]
 
     return ParameterSet(params)
 
@@ -240,7 +252,12 @@ def dynesty(**kwargs):
         to <phoebe.frontend.bundle.Bundle.export_solver> suffixed with .progress.
         If using detach=True within run_solver, attach job will load the progress
         and allow re-attaching until the job is completed.  If 0 will not save
-        and will only return after completion.
+        and will only return after completion.  The chains themselves are
+        appended to a separate file (the progress filename suffixed with
+        .chain, see <phoebe.parameters.chains>) so that each save only writes
+        the new iterations.  The progress file only holds placeholders for the
+        chains, so the .chain file must be kept alongside it to load (or
+        import) the progress.
     * `expose_failed` (bool, optional, default=True): only applicable if
         `continue_from` is 'None'. whether to expose dictionary of failed samples
         and their error messages.  Note: depending on the number of failed
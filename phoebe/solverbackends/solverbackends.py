@@ -1,5 +1,6 @@
 from ast import Import
 import os
+import functools
 import numpy as np
 
 # try:
@@ -10,6 +11,7 @@ import numpy as np
 # import tempfile
 # from phoebe.parameters import ParameterSet
 import phoebe.parameters as _parameters
+from phoebe.parameters import chains as _chains
 import phoebe.frontend.bundle
 from phoebe import u, c
 from phoebe import conf, mpi
@@ -24,6 +26,7 @@ from packaging.version import parse
 from copy import deepcopy as _deepcopy
 import multiprocessing
 import pickle
+import uuid
 
 from . import rv_geometry
 from .ebai import ebai_forward
@@ -84,6 +87,9 @@ def _bsolver(b, solver, compute, distributions, wrap_central_values={}):
     # TODO: re-enable removing unused compute options - currently causes some constraints to fail
     # TODO: is it quicker to initialize a new bundle around b.exclude?  Or just leave everything?
     bexcl = b.copy()
+    # identifies the solver bundle (and any pickled copies) for the per-process
+    # caches of _lnprobability
+    bexcl._solver_id = uuid.uuid4().hex
     bexcl.remove_parameters_all(context=['model', 'solution', 'figure'], **_skip_filter_checks)
     if len(b.solvers) > 1:
         bexcl.remove_parameters_all(solver=[f for f in b.solvers if f!=solver and solver is not None], **_skip_filter_checks)
@@ -103,54 +109,93 @@ def _bsolver(b, solver, compute, distributions, wrap_central_values={}):
     return bexcl
 
 
-def _lnprobability(sampled_values, b, params_uniqueids, compute,
-                  priors, priors_combine,
-                  solution,
-                  compute_kwargs={},
-                  custom_lnprobability_callable=None,
-                  failed_samples_buffer=False):
+def _failed_sample_message(msg, sampled_values):
+    return (_simplify_error_message(msg), np.asarray(sampled_values).tolist())
 
-
-    def _return(lnprob, msg):
-        if msg != 'success' and failed_samples_buffer is not False:
-            msg_tuple = (_simplify_error_message(msg), sampled_values.tolist())
-            if failed_samples_buffer.__class__.__name__ == 'ListProxy':
-                failed_samples_buffer.append(msg_tuple)
-            elif mpi._within_mpirun:
-                # then emcee is in serial mode, run_compute is within mpi
+def _return_lnprobability(lnprob, msg, sampled_values, failed_samples_buffer=False):
+    if msg != 'success' and failed_samples_buffer is not False:
+        msg_tuple = _failed_sample_message(msg, sampled_values)
+        if failed_samples_buffer.__class__.__name__ == 'ListProxy':
+            failed_samples_buffer.append(msg_tuple)
+        elif mpi._within_mpirun:
+            # then emcee is in serial mode, run_compute is within mpi
+            failed_samples_buffer.append(msg_tuple)
+        else:
+            try:
+                # then emcee is using MPI so we need to pass the messages
+                # through the MPI pool
+                comm = _MPI.COMM_WORLD
+            except NameError:
+                # then we're using a Serial Pool - this is an ugly way
+                # to detect this though... would it be better to pass another
+                # argument through everything or to set another global variable?
                 failed_samples_buffer.append(msg_tuple)
             else:
-                try:
-                    # then emcee is using MPI so we need to pass the messages
-                    # through the MPI pool
-                    comm = _MPI.COMM_WORLD
-                except NameError:
-                    # then we're using a Serial Pool - this is an ugly way
-                    # to detect this though... would it be better to pass another
-                    # argument through everything or to set another global variable?
-                    failed_samples_buffer.append(msg_tuple)
-                else:
-                    comm.ssend(msg_tuple, 0, tag=99999999)
+                comm.ssend(msg_tuple, 0, tag=99999999)
+
+    return lnprob
+
+# per-process cache of the residual plans and compute sessions of the solver
+# bundle.  These are not stored on the bundle itself as the pools pickle the
+# bundle (and everything attached to it) for every task.  Instead the cache is
+# keyed on the solver id of the bundle (see _bsolver), which does survive
+# pickling, and only holds the entries of the most recent solver bundle.
+_lnprobability_cache = {}
+
+def _lnprobability_cached(b, kind, label, func):
+    solver_id = getattr(b, '_solver_id', None)
+    if solver_id is None:
+        # not created by _bsolver (ie. when calling _lnprobability directly)
+        solver_id = b._solver_id = uuid.uuid4().hex
+
+    key = (solver_id, kind, label)
+    if key not in _lnprobability_cache.keys():
+        if any(k[0] != solver_id for k in _lnprobability_cache.keys()):
+            _lnprobability_cache.clear()
+        _lnprobability_cache[key] = func()
+    return _lnprobability_cache[key]
+
+def _lnprobability_residual_plan(b, solution):
+    # the observations are only read once per process
+    return _lnprobability_cached(b, 'residual_plan', solution,
+                                 lambda: b.residual_plan(model=solution, consider_gaussian_process=False))
+
+def _lnprobability_compute_session(b, compute):
+    # anything unaffected by the sampled parameters is re-used between
+    # evaluations within the same process (see phoebe.solver_compute_session_on)
+    return _lnprobability_cached(b, 'compute_session', compute,
+                                 lambda: b.compute_session(compute=compute))
+
+def _lnprobability_model(sampled_values, b, params_uniqueids, compute,
+                         priors, priors_combine,
+                         solution,
+                         compute_kwargs={},
+                         failed_samples_buffer=False):
+    """
+    Set `sampled_values` on a copy of `b` and compute the forward model.
 
-        return lnprob
+    Returns the copy of the bundle and the lnpriors or, if the sample failed
+    (in which case the failure is already reported to `failed_samples_buffer`),
+    None and -inf.
+    """
+    def _return(lnprob, msg):
+        return None, _return_lnprobability(lnprob, msg, sampled_values, failed_samples_buffer)
+
+    compute_session = _lnprobability_compute_session(b, compute) if conf.solver_compute_session else None
 
     # copy the bundle to make sure any changes by setting values/running models
-    # doesn't affect the user-copy (or in other processors)
-    b = b.copy()
+    # doesn't affect the user-copy (or in other processors).  Only the sampled
+    # parameters need their values copied.
+    b = b._copy_lightweight(uniqueids=params_uniqueids)
     # prevent any *_around distributions from adjusting to the changes in
     # face-values
     b._within_solver = True
     if sampled_values is not False:
-        for uniqueid, value in zip(params_uniqueids, sampled_values):
-            uniqueid, index = _extract_index_from_string(uniqueid)
-            try:
-                if index is not None:
-                    b.get_parameter(uniqueid=uniqueid, **_skip_filter_checks).set_index_value(index=index, value=value, run_checks=False, run_constraints=False)
-                else:
-                    b.set_value(uniqueid=uniqueid, value=value, run_checks=False, run_constraints=False, **_skip_filter_checks)
-            except ValueError as err:
-                logger.warning("received error while setting values: {}. lnprobability=-inf".format(err))
-                return _return(-np.inf, str(err))
+        try:
+            b.set_values(dict(zip(params_uniqueids, sampled_values)), run_checks=False, run_constraints=False)
+        except ValueError as err:
+            logger.warning("received error while setting values: {}. lnprobability=-inf".format(err))
+            return _return(-np.inf, str(err))
 
     # run delayed constraints and failed constraints would be run within calculate_lnp or run_compute,
     # but here we can catch the error in advance and return it appropriately
@@ -178,21 +223,130 @@ def _lnprobability(sampled_values, b, params_uniqueids, compute,
         compute_kwargs['progressbar'] = False
         compute_kwargs['use_server'] = 'none'
         compute_kwargs['detach'] = False
-        b.run_compute(compute=compute, model=solution, do_create_fig_params=False, **compute_kwargs)
+        b.run_compute(compute=compute, model=solution, do_create_fig_params=False, compute_session=compute_session, **compute_kwargs)
     except Exception as err:
         logger.warning("received error from run_compute: {}.  lnprobability=-inf".format(err))
         return _return(-np.inf, str(err))
 
+    return b, lnpriors
+
+def _lnprobability(sampled_values, b, params_uniqueids, compute,
+                  priors, priors_combine,
+                  solution,
+                  compute_kwargs={},
+                  custom_lnprobability_callable=None,
+                  failed_samples_buffer=False):
+
+    result = _lnprobability_walker(sampled_values, b, params_uniqueids, compute,
+                                   priors, priors_combine,
+                                   solution,
+                                   compute_kwargs,
+                                   custom_lnprobability_callable,
+                                   failed_samples_buffer)
+    if not isinstance(result, dict):
+        return result
+
     # print("*** _lnprobability returning from rank: {}".format(mpi.myrank))
-    if custom_lnprobability_callable is None:
-        lnprob = lnpriors + b.calculate_lnlikelihood(model=solution, consider_gaussian_process=False)
-    else:
-        lnprob = custom_lnprobability_callable(b, model=solution, lnpriors=lnpriors, priors=priors, priors_combine=priors_combine)
+    lnprob = result['lnpriors'] + _lnprobability_residual_plan(b, solution).calculate_lnlikelihood(interp_models=result['models'])
 
     if np.isnan(lnprob):
-        return _return(-np.inf, 'lnprobability returned nan')
+        return _return_lnprobability(-np.inf, 'lnprobability returned nan', sampled_values, failed_samples_buffer)
+
+    return lnprob
+
+def _lnprobability_walker(sampled_values, b, params_uniqueids, compute,
+                          priors, priors_combine,
+                          solution,
+                          compute_kwargs={},
+                          custom_lnprobability_callable=None,
+                          failed_samples_buffer=False):
+    """
+    Compute the forward-model for `sampled_values` and interpolate it to the
+    observations through the residual plan of `b`.  The likelihood is then
+    computed from the returned dictionary, either for a single walker (see
+    _lnprobability) or for all walkers at once (see _lnprobability_vectorized).
+
+    Returns a dictionary with the `lnpriors` and interpolated `models` or, if
+    the sample failed or `custom_lnprobability_callable` is provided, the
+    lnprobability itself.
+    """
+    # NOTE: the returned value must not be a tuple, as the callback of the
+    # MPIPool treats tuples as failed-sample messages.
+    residual_plan = _lnprobability_residual_plan(b, solution) if custom_lnprobability_callable is None else None
+
+    b, lnpriors = _lnprobability_model(sampled_values, b, params_uniqueids, compute,
+                                       priors, priors_combine,
+                                       solution,
+                                       compute_kwargs,
+                                       failed_samples_buffer)
+    if b is None:
+        return lnpriors
+
+    if custom_lnprobability_callable is not None:
+        lnprob = custom_lnprobability_callable(b, model=solution, lnpriors=lnpriors, priors=priors, priors_combine=priors_combine)
+        if np.isnan(lnprob):
+            return _return_lnprobability(-np.inf, 'lnprobability returned nan', sampled_values, failed_samples_buffer)
+        return lnprob
 
-    return _return(lnprob, 'success')
+    return {'lnpriors': lnpriors, 'models': residual_plan.interp_models(b)}
+
+def _lnprobability_vectorized(sampled_values, b, params_uniqueids, compute,
+                              priors, priors_combine,
+                              solution,
+                              compute_kwargs={},
+                              custom_lnprobability_callable=None,
+                              failed_samples_buffer=False,
+                              pool=None):
+    """
+    Vectorized version of _lnprobability for an array of `sampled_values`
+    with shape (nwalkers, ndim), as called by emcee with `vectorize=True`.
+
+    The forward-models are computed per-walker (through `pool`, if provided),
+    but the observations are only accessed once and the likelihoods of all
+    walkers are computed at once.
+    """
+    sampled_values = np.atleast_2d(sampled_values)
+    nwalkers = sampled_values.shape[0]
+
+    worker = functools.partial(_lnprobability_walker,
+                               b=b, params_uniqueids=params_uniqueids, compute=compute,
+                               priors=priors, priors_combine=priors_combine,
+                               solution=solution, compute_kwargs=compute_kwargs,
+                               custom_lnprobability_callable=custom_lnprobability_callable,
+                               failed_samples_buffer=failed_samples_buffer)
+
+    if pool is None:
+        results = list(map(worker, sampled_values))
+    else:
+        results = list(pool.map(worker, sampled_values))
+
+    lnprobs = np.full(nwalkers, -np.inf)
+    walkers = []
+    for i, result in enumerate(results):
+        if isinstance(result, dict):
+            walkers.append(i)
+        else:
+            lnprobs[i] = result
+
+    if not len(walkers):
+        return lnprobs
+
+    # the likelihoods of all walkers are computed at once from the
+    # observations cached in the residual plan
+    residual_plan = _lnprobability_residual_plan(b, solution)
+    cf = residual_plan.calculate_cf_batch([result['models'] if isinstance(result, dict) else None for result in results])
+
+    for i in walkers:
+        lnprob = results[i]['lnpriors'] + -0.5 * cf[i]
+        if np.isnan(lnprob):
+            # NOTE: this is on the master process, so the message can be
+            # added to the buffer directly
+            if failed_samples_buffer is not False:
+                failed_samples_buffer.append(_failed_sample_message('lnprobability returned nan', sampled_values[i]))
+            lnprob = -np.inf
+        lnprobs[i] = lnprob
+
+    return lnprobs
 
 def _lnprobability_negative(sampled_values, b, params_uniqueids, compute,
                            priors, priors_combine,
@@ -1626,7 +1780,14 @@ class EmceeBackend(BaseSolverBackend):
             esargs['pool'] = pool
             esargs['nwalkers'] = nwalkers
             esargs['ndim'] = len(params_uniqueids)
-            esargs['log_prob_fn'] = _lnprobability
+            if kwargs.get('vectorize', False):
+                # emcee passes all walkers of a generation at once, the
+                # forward-models are then distributed over the pool within
+                # _lnprobability_vectorized
+                esargs['log_prob_fn'] = _lnprobability_vectorized
+                esargs['vectorize'] = True
+            else:
+                esargs['log_prob_fn'] = _lnprobability
             # esargs['a'] = kwargs.pop('a', None),
             # esargs['moves'] = kwargs.pop('moves', None)
             # esargs['args'] = None
@@ -1640,6 +1801,8 @@ class EmceeBackend(BaseSolverBackend):
                                 'compute_kwargs': {k:v for k,v in kwargs.items() if k in b.get_compute(compute=compute, **_skip_filter_checks).qualifiers},
                                 'custom_lnprobability_callable': kwargs.pop('custom_lnprobability_callable', None),
                                 'failed_samples_buffer': False if not expose_failed else failed_samples_buffer}
+            if esargs.get('vectorize', False):
+                esargs['kwargs']['pool'] = esargs.pop('pool')
 
             # esargs['live_dangerously'] = kwargs.pop('live_dangerously', None)
             # esargs['runtime_sortingfn'] = kwargs.pop('runtime_sortingfn', None)
@@ -1654,6 +1817,9 @@ class EmceeBackend(BaseSolverBackend):
             sargs['skip_initial_state_check'] = continue_from != 'None' or 'compute' in init_from_requires
 
 
+            # progress files only append the new iterations to the chains
+            chain_writer = None
+
             logger.debug("sampler.sample(p0, {})".format(sargs))
             for sample in sampler.sample(p0.T, **sargs):
                 # TODO: parameters and options for checking convergence
@@ -1707,7 +1873,12 @@ class EmceeBackend(BaseSolverBackend):
                             else:
                                 fname = '{}.progress.ps'.format(solution)
 
-                        solution_ps.save(fname, compact=True, sort_by_context=False)
+                        if sampler.iteration - start_iteration == niters:
+                            solution_ps.save(fname, compact=True, sort_by_context=False)
+                        else:
+                            if chain_writer is None:
+                                chain_writer = _chains.ChainWriter(_chains.chain_filename(fname))
+                            chain_writer.write_progress(solution_ps, fname, qualifiers=['samples', 'lnprobabilities'])
 
         else:
             if pool is not None:
@@ -1727,6 +1898,12 @@ class EmceeBackend(BaseSolverBackend):
         return
 
 
+# per-iteration arrays of a dynesty solution, which are appended to the chain
+# file when saving the progress (see phoebe.parameters.chains)
+_dynesty_chain_qualifiers = ['samples', 'samples_id', 'samples_it', 'samples_u',
+                             'logwt', 'logl', 'logvol', 'logz', 'logzerr',
+                             'information', 'bound_iter', 'samples_bound', 'scale']
+
 class DynestyBackend(BaseSolverBackend):
     """
     See <phoebe.parameters.solver.sampler.dynesty>.
@@ -1953,6 +2130,10 @@ class DynestyBackend(BaseSolverBackend):
 
 
             sampler.run_nested(**sargs)
+
+            # progress files only append the new iterations to the chains
+            chain_writer = None
+
             for iter,result in enumerate(sampler.sample(**sargs)):
                 # check for kill signal
                 if kwargs.get('out_fname', False) and os.path.isfile(kwargs.get('out_fname')+'.kill'):
@@ -1985,7 +2166,12 @@ class DynestyBackend(BaseSolverBackend):
                             fname = '{}.progress.ps'.format(solution)
 
                     if progress_every_niters > 0:
-                        solution_ps.save(fname, compact=True, sort_by_context=False)
+                        if iter == maxiter:
+                            solution_ps.save(fname, compact=True, sort_by_context=False)
+                        else:
+                            if chain_writer is None:
+                                chain_writer = _chains.ChainWriter(_chains.chain_filename(fname))
+                            chain_writer.write_progress(solution_ps, fname, qualifiers=_dynesty_chain_qualifiers)
 
 
         else:
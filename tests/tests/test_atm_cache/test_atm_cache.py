@@ -0,0 +1,117 @@
+"""
+"""
+
+import phoebe
+from phoebe.backend import universe
+from phoebe import dynamics
+import numpy as np
+
+
+_columns = ['abs_normal_intensities', 'ldint', 'abs_intensities']
+
+
+def _populate(star, cached=True, **kwargs):
+    if not cached:
+        star._atm_cache = {}
+    return star._populate_lc('lc01', **kwargs)
+
+
+def _assert_uncached(star, **kwargs):
+    # the (possibly cached) intensities agree with those computed from scratch
+    ret = _populate(star, **kwargs)
+    ret_uncached = _populate(star, cached=False, **kwargs)
+    for column in _columns:
+        assert np.array_equal(ret[column], ret_uncached[column])
+    return ret
+
+
+def test_atm_cache(verbose=False):
+    phoebe.reset_settings()
+    b = phoebe.default_binary()
+    b.set_value('ecc', 0.2)
+    b.set_value_all('ntriangles', 300)
+    b.add_dataset('lc', compute_times=[0.0, 0.25], dataset='lc01')
+    times = b.get_value(qualifier='compute_times', dataset='lc01')
+
+    system = universe.System.from_bundle(b, 'phoebe01', datasets=b.datasets)
+    star = system.get_body('primary')
+    ts, xs, ys, zs, vxs, vys, vzs, ethetas, elongans, eincls = dynamics.keplerian.dynamics_from_bundle(b, times, 'phoebe01', return_euler=True)
+
+    system.update_positions(times[0], *dynamics.dynamics_at_i(xs, ys, zs, vxs, vys, vzs, ethetas, elongans, eincls, i=0))
+    ret0 = _populate(star)
+
+    # nothing changed, so the mu-independent quantities are re-used
+    ret = _populate(star)
+    assert ret['ldint'] is ret0['ldint']
+    assert np.array_equal(ret['abs_normal_intensities'], ret0['abs_normal_intensities'])
+
+    # the local quantities of an eccentric orbit are recomputed at the next
+    # time, which must invalidate the cache
+    system.update_positions(times[1], *dynamics.dynamics_at_i(xs, ys, zs, vxs, vys, vzs, ethetas, elongans, eincls, i=1))
+    ret = _assert_uncached(star)
+    if verbose:
+        print("t={}: {} elements (was {})".format(times[1], len(ret['ldint']), len(ret0['ldint'])))
+    assert ret['ldint'] is not ret0['ldint']
+    assert not np.array_equal(ret['abs_normal_intensities'], ret0['abs_normal_intensities'])
+
+    # as must any change to teffs, loggs or abuns
+    for column, offset in [('teffs', 100.), ('loggs', 0.05), ('abuns', 0.1)]:
+        ret_before = _populate(star)
+        star.mesh.update_columns(**{column: star.mesh[column].for_computations + offset})
+        ret = _assert_uncached(star)
+        if verbose:
+            print("{}: max change in Inorm={}".format(column, np.max(np.abs(ret['abs_normal_intensities'] - ret_before['abs_normal_intensities']))))
+        assert not np.array_equal(ret['abs_normal_intensities'], ret_before['abs_normal_intensities'])
+
+    # or to any of the atmosphere options
+    ret_before = _populate(star)
+    for kwargs in [{'ld_mode': 'manual', 'ld_func': 'linear', 'ld_coeffs': [0.5]},
+                   {'ld_mode': 'manual', 'ld_func': 'linear', 'ld_coeffs': [0.3]},
+                   {'ld_mode': 'manual', 'ld_func': 'linear', 'ld_coeffs': [0.3], 'atm': 'blackbody'}]:
+        ret = _assert_uncached(star, **kwargs)
+        if verbose:
+            print("{}: max change in Imu={}".format(kwargs, np.max(np.abs(ret['abs_intensities'] - ret_before['abs_intensities']))))
+        assert not np.array_equal(ret['abs_intensities'], ret_before['abs_intensities'])
+        ret_before = ret
+
+    # and the extinction (ie. between computes with different ebv or Rv)
+    if 'ck2004:ext' in phoebe.get_passband(star.passband['lc01']).content:
+        ret_before = _populate(star)
+        for extinct, Rv in [(0.1, 3.1), (0.1, 2.5), (0.0, 2.5)]:
+            ret = _assert_uncached(star, extinct=extinct, Rv=Rv)
+            if verbose:
+                print("ebv={} Rv={}: max change in Imu={}".format(extinct, Rv, np.max(np.abs(ret['abs_intensities'] - ret_before['abs_intensities']))))
+            if extinct == 0.0:
+                assert np.array_equal(ret['abs_intensities'], ret_before['abs_intensities'])
+            else:
+                assert not np.array_equal(ret['abs_intensities'], ret_before['abs_intensities'])
+
+    return b
+
+
+def test_atm_cache_compute(verbose=False):
+    phoebe.reset_settings()
+    b = phoebe.default_binary()
+    b.set_value_all('ntriangles', 300)
+    b.add_dataset('lc', compute_times=phoebe.linspace(0, 1, 5), dataset='lc01')
+
+    # changing teff or abun between computes that re-use the compute session
+    # agrees with a fresh compute
+    session = b.compute_session(compute='phoebe01')
+    session.run_compute(model='session')
+    for twig, value in [('teff@primary', 6500), ('abun@secondary', -0.5)]:
+        b.set_value(twig, value)
+        session.run_compute(model='session', overwrite=True)
+        b.run_compute(model='fresh', overwrite=True)
+        if verbose:
+            print("{}={}: {} {}".format(twig, value, b.get_value(qualifier='fluxes', model='session'), b.get_value(qualifier='fluxes', model='fresh')))
+        assert np.array_equal(b.get_value(qualifier='fluxes', model='session'), b.get_value(qualifier='fluxes', model='fresh'))
+
+    return b
+
+
+if __name__ == '__main__':
+    logger = phoebe.logger(clevel='INFO')
+
+    b = test_atm_cache(verbose=True)
+    b = test_atm_cache_compute(verbose=True)
@@ -0,0 +1,53 @@
+"""
+"""
+
+import phoebe
+import numpy as np
+import os
+import tempfile
+
+
+def test_binary_io(verbose=False):
+    phoebe.reset_settings()
+
+    b = phoebe.Bundle.default_binary()
+    b.add_dataset('lc', times=np.linspace(0, 1, 21), dataset='lc01')
+    b.add_dataset('rv', times=np.linspace(0, 1, 11), dataset='rv01')
+    b.set_value_all(qualifier='irrad_method', value='none')
+    b.run_compute(model='m1')
+
+    tmpdir = tempfile.mkdtemp()
+    fname_json = os.path.join(tmpdir, 'binary_io.json')
+    fname_binary = os.path.join(tmpdir, 'binary_io.phoebe')
+    b.save(fname_json)
+    b.save(fname_binary, binary=True)
+
+    bj = phoebe.open(fname_json)
+    bb = phoebe.open(fname_binary)
+
+    # the model is not loaded until accessed
+    assert 'model' in bb._lazy_contexts
+    assert bb.get_value(qualifier='incl', component='binary', context='component') == bj.get_value(qualifier='incl', component='binary', context='component')
+    assert 'model' in bb._lazy_contexts
+    assert bb.models == ['m1']
+    assert np.all(bb.get_value(qualifier='fluxes', model='m1') == b.get_value(qualifier='fluxes', model='m1'))
+    assert 'model' not in bb._lazy_contexts
+
+    assert len(bb.to_list()) == len(bj.to_list())
+    for param in bj.to_list():
+        value_json = param.get_value()
+        value_binary = bb.get_parameter(uniqueid=param.uniqueid, check_visible=False, check_default=False).get_value()
+        if isinstance(value_json, np.ndarray):
+            assert np.all(value_json == value_binary)
+
+    # loading without lazy contexts
+    bb = phoebe.open(fname_binary, lazy_contexts=[])
+    assert not len(bb._lazy_contexts)
+    assert np.all(bb.get_value(qualifier='rvs', component='primary', model='m1') == b.get_value(qualifier='rvs', component='primary', model='m1'))
+
+    return bb
+
+if __name__ == '__main__':
+    logger = phoebe.logger(clevel='INFO')
+
+    b = test_binary_io(verbose=True)
@@ -0,0 +1,127 @@
+"""
+"""
+
+import phoebe
+import numpy as np
+import os
+import tempfile
+from phoebe.parameters import chains
+from phoebe.solverbackends import solverbackends
+
+
+def test_chains(verbose=False):
+    phoebe.reset_settings()
+    b = phoebe.default_binary()
+    b.add_solver('sampler.emcee', solver='emcee01')
+    _, solution_ps = solverbackends.EmceeBackend()._get_packet_and_solution(b, 'emcee01', solution='progress')
+    metawargs = {'context': 'solution', 'solver': 'emcee01', 'kind': 'emcee', 'solution': 'progress'}
+
+    tmpdir = tempfile.mkdtemp()
+    filename = os.path.join(tmpdir, 'solution.progress')
+    writer = chains.ChainWriter(chains.chain_filename(filename))
+    reader = chains.ChainReader(chains.chain_filename(filename))
+
+    rng = np.random.RandomState(0)
+    samples = np.empty((0, 8, 3))
+    lnprobabilities = np.empty((0, 8))
+    for i in range(4):
+        samples = np.concatenate([samples, rng.normal(size=(5, 8, 3))])
+        lnprobabilities = np.concatenate([lnprobabilities, rng.normal(size=(5, 8))])
+        packet = [{'qualifier': 'samples', 'value': samples},
+                  {'qualifier': 'lnprobabilities', 'value': lnprobabilities},
+                  {'qualifier': 'niters', 'value': len(samples)},
+                  {'qualifier': 'nwalkers', 'value': 8},
+                  {'qualifier': 'progress', 'value': 25.*(i+1)}]
+        solution_ps = solverbackends.EmceeBackend()._fill_solution(solution_ps, [[packet]], metawargs)
+        writer.write_progress(solution_ps, filename, qualifiers=['samples', 'lnprobabilities'])
+
+        # the reader is reused (as while monitoring a running solver), so
+        # only the new iterations are read
+        ps = phoebe.parameters.ParameterSet.open(filename, chain_reader=reader)
+        if verbose:
+            print("iteration {}: {}".format(i, reader))
+
+        assert reader.nrows == len(samples)
+        assert np.array_equal(ps.get_value(qualifier='samples'), samples)
+        assert np.array_equal(ps.get_value(qualifier='lnprobabilities'), lnprobabilities)
+        assert ps.get_value(qualifier='niters') == len(samples)
+
+    # a partially written iteration at the end of the chain is ignored
+    with open(chains.chain_filename(filename), 'ab') as f:
+        f.write(b'\x00' * 10)
+
+    b.import_solution(filename, solution='progress')
+    assert np.array_equal(b.get_value(qualifier='samples', solution='progress'), samples)
+    assert np.array_equal(b.get_value(qualifier='lnprobabilities', solution='progress'), lnprobabilities)
+
+    # changing the last written iteration rewrites the chain
+    samples = samples.copy()
+    samples[-1] += 1
+    packet[0]['value'] = samples
+    solution_ps = solverbackends.EmceeBackend()._fill_solution(solution_ps, [[packet]], metawargs)
+    writer.write_progress(solution_ps, filename, qualifiers=['samples', 'lnprobabilities'])
+    ps = phoebe.parameters.ParameterSet.open(filename)
+    assert np.array_equal(ps.get_value(qualifier='samples'), samples)
+
+    # the progress file cannot be loaded without the chain file
+    os.remove(chains.chain_filename(filename))
+    try:
+        phoebe.parameters.ParameterSet.open(filename)
+    except IOError as err:
+        assert '.chain' in str(err)
+    else:
+        raise AssertionError("expected IOError")
+
+    return b
+
+
+def test_chains_dynesty(verbose=False):
+    phoebe.reset_settings()
+    b = phoebe.default_binary()
+    b.add_solver('sampler.dynesty', solver='dynesty01')
+    _, solution_ps = solverbackends.DynestyBackend()._get_packet_and_solution(b, 'dynesty01', solution='progress')
+    metawargs = {'context': 'solution', 'solver': 'dynesty01', 'kind': 'dynesty', 'solution': 'progress'}
+
+    tmpdir = tempfile.mkdtemp()
+    filename = os.path.join(tmpdir, 'solution.progress')
+    writer = chains.ChainWriter(chains.chain_filename(filename))
+
+    rng = np.random.RandomState(0)
+    shapes = {'samples': (3,), 'samples_u': (3,), 'scale': ()}
+    ints = ['samples_id', 'samples_it', 'bound_iter', 'samples_bound']
+    results = {qualifier: np.empty((0,)+shapes.get(qualifier, ()), dtype=int if qualifier in ints else float)
+               for qualifier in solverbackends._dynesty_chain_qualifiers}
+    for i in range(3):
+        for qualifier, value in results.items():
+            new = rng.randint(0, 10, size=(7,)+value.shape[1:]) if qualifier in ints else rng.normal(size=(7,)+value.shape[1:])
+            results[qualifier] = np.concatenate([value, new])
+        packet = [{'qualifier': qualifier, 'value': value} for qualifier, value in results.items()]
+        packet += [{'qualifier': 'nlive', 'value': 7},
+                   {'qualifier': 'niter', 'value': len(results['samples'])},
+                   {'qualifier': 'progress', 'value': 33.*(i+1)}]
+        solution_ps = solverbackends.DynestyBackend()._fill_solution(solution_ps, [[packet]], metawargs)
+        writer.write_progress(solution_ps, filename, qualifiers=solverbackends._dynesty_chain_qualifiers)
+
+        with open(filename, 'r') as f:
+            assert '__chain__' in f.read()
+
+        ps = phoebe.parameters.ParameterSet.open(filename)
+        if verbose:
+            print("iteration {}: {} iterations".format(i, writer.nrows))
+
+        assert writer.nrows == len(results['samples'])
+        for qualifier, value in results.items():
+            assert np.array_equal(ps.get_value(qualifier=qualifier), value)
+        assert ps.get_value(qualifier='niter') == len(results['samples'])
+
+    b.import_solution(filename, solution='progress')
+    assert np.array_equal(b.get_value(qualifier='logz', solution='progress'), results['logz'])
+
+    return b
+
+
+if __name__ == '__main__':
+    logger = phoebe.logger(clevel='INFO')
+
+    b = test_chains(verbose=True)
+    b = test_chains_dynesty(verbose=True)
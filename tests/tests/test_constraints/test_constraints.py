@@ -3,6 +3,7 @@
 
 import phoebe
 import pytest
+import pickle
 
 
 def test_esinw_ecosw(verbose=False):
@@ -89,8 +90,62 @@ def test_pot_filloutfactor(verbose=False):
     assert b.run_checks().passed
 
 
+def test_delayed_constraints(verbose=False):
+    if verbose:
+        print("b = phoebe.default_binary()")
+    b = phoebe.default_binary()
+
+    def _check_consistent(b):
+        for constraint in b.filter(context='constraint', check_visible=False).to_list():
+            result = constraint.get_result()
+            value = constraint.constrained_parameter.get_quantity()
+            assert abs((result - value).to(value.unit).value) < 1e-8 * max(abs(value.value), 1)
+
+    nruns = {}
+    _run_constraint = b._run_constraint
+    def _counting_run_constraint(expression_param, *args, **kwargs):
+        nruns[expression_param.uniqueid] = nruns.get(expression_param.uniqueid, 0) + 1
+        return _run_constraint(expression_param, *args, **kwargs)
+    b._run_constraint = _counting_run_constraint
+
+    b.set_value('sma@binary', 6.0, run_constraints=False)
+    b.set_value('period@binary', 1.2, run_constraints=False)
+    b.set_value('q@binary', 0.8, run_constraints=False)
+    b.run_delayed_constraints()
+    _check_consistent(b)
+
+    # each constraint should only have been run once, even though several
+    # depend on more than one of the changed parameters
+    assert len(nruns) and max(nruns.values()) == 1
+
+    if verbose:
+        print("b.flip_constraint('mass@primary', solve_for='q')")
+    b.flip_constraint('mass@primary', solve_for='q')
+
+    # mass@secondary (which depends on q) is now circular with q (which
+    # depends on the masses)
+    b.set_value('mass@primary@component', 1.1)
+    _check_consistent(b)
+
+    b.set_value('sma@binary', 5.5, run_constraints=False)
+    b.set_value('mass@primary@component', 1.2, run_constraints=False)
+    b.run_delayed_constraints()
+    _check_consistent(b)
+    assert len(b._delayed_constraints) == 0
+
+    # the compiled expressions are kept on the constraints, but are not
+    # pickled (ie. when sending the bundle to other processes)
+    del b._run_constraint
+    b2 = pickle.loads(pickle.dumps(b))
+    assert all('_compiled' not in constraint.__dict__ for constraint in b2.filter(context='constraint', check_visible=False).to_list())
+    _check_consistent(b2)
+
+    return b
+
+
 if __name__ == '__main__':
     logger = phoebe.logger(clevel='WARNING')
 
     test_esinw_ecosw(verbose=True)
     test_pot_filloutfactor(verbose=True)
+    test_delayed_constraints(verbose=True)
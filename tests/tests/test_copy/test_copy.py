@@ -0,0 +1,42 @@
+"""
+"""
+
+import phoebe
+import numpy as np
+
+
+def test_copy_lightweight(verbose=False):
+    phoebe.reset_settings()
+
+    b = phoebe.Bundle.default_binary()
+    b.add_dataset('lc', times=np.linspace(0, 1, 11), fluxes=np.ones(11), dataset='lc01')
+
+    incl = b.get_parameter(qualifier='incl', component='binary', context='component')
+    b2 = b._copy_lightweight(uniqueids=[incl.uniqueid])
+
+    # constraints in the copy need to act on the copy only
+    b2.set_value(qualifier='sma', component='binary', context='component', value=5.5)
+    b2.set_value(uniqueid=incl.uniqueid, value=80)
+    assert b.get_value(qualifier='sma', component='binary', context='component') != 5.5
+    assert b.get_value(qualifier='incl', component='binary', context='component') != 80
+    assert b2.get_value(qualifier='incl', component='binary', context='component') == 80
+    assert np.isclose(b2.get_value(qualifier='sma', component='primary', context='component'),
+                      5.5 * b2.get_value(qualifier='q') / (1 + b2.get_value(qualifier='q')))
+    assert not np.isclose(b.get_value(qualifier='sma', component='primary', context='component'),
+                          b2.get_value(qualifier='sma', component='primary', context='component'))
+
+    # observations are shared, models are attached to the copy only
+    assert b2.get_parameter(qualifier='fluxes', context='dataset')._value is b.get_parameter(qualifier='fluxes', context='dataset')._value
+    b2.run_compute(irrad_method='none', model='model_copy')
+    assert 'model_copy' in b2.models
+    assert 'model_copy' not in b.models
+
+    b2.remove_dataset('lc01')
+    assert 'lc01' in b.datasets
+    assert b.get_parameter(qualifier='fluxes', context='dataset')._bundle is b
+
+    return b, b2
+
+if __name__ == '__main__':
+    logger = phoebe.logger(clevel='INFO')
+    b, b2 = test_copy_lightweight(verbose=True)
@@ -0,0 +1,89 @@
+"""
+"""
+
+import phoebe
+import numpy as np
+from scipy.optimize import minimize_scalar
+
+from phoebe.backend import etvs
+
+
+def test_crossings(verbose=False):
+    phoebe.reset_settings()
+
+    b = phoebe.Bundle.default_binary()
+    b.set_value('ecc', component='binary', value=0.2)
+    b.set_value('per0', component='binary', value=30)
+    b.set_value('incl', component='binary', value=85)
+
+    times = np.arange(0, 10, 0.5) + 0.03
+    time_ecls = etvs.crossings(b, 'primary', times, 'keplerian', ltte=False, tol=1e-8)
+
+    elements = phoebe.dynamics.keplerian.elements_from_bundle(b)
+    elements['ltte'] = False
+    def projected_separation_sq(t):
+        ts, xs, ys, zs, vxs, vys, vzs = phoebe.dynamics.keplerian.dynamics(np.atleast_1d(t), **elements)
+        return ((xs[1]-xs[0])**2 + (ys[1]-ys[0])**2)[0]
+
+    for time, time_ecl in zip(times, time_ecls):
+        expected = minimize_scalar(projected_separation_sq, bracket=(time_ecl-0.1, time_ecl, time_ecl+0.1), tol=1e-12).x
+        if verbose:
+            print("time={} time_ecl={} expected={}".format(time, time_ecl, expected))
+        assert abs(time_ecl - expected) < 1e-6
+
+    # the scalar version should agree with the vectorized version
+    assert abs(etvs.crossing(b, 'primary', times[0], 'keplerian', ltte=False, tol=1e-8) - time_ecls[0]) < 1e-8
+
+    return b
+
+
+def test_crossings_spline(verbose=False):
+    phoebe.reset_settings()
+
+    b = phoebe.Bundle.default_binary()
+    b.set_value('ecc', component='binary', value=0.2)
+    b.set_value('per0', component='binary', value=30)
+    b.set_value('incl', component='binary', value=85)
+
+    # unsorted, with overlapping windows and a gap of several orbits
+    times = np.array([5.53, 0.03, 0.53, 1.03, 12.03])
+    time_ecls = etvs.crossings(b, 'primary', times, 'keplerian', ltte=False, tol=1e-8)
+
+    elements = phoebe.dynamics.keplerian.elements_from_bundle(b)
+    elements['ltte'] = False
+    ncalls = []
+    def projected_separation_sq(ts):
+        ncalls.append(len(ts))
+        ts, xs, ys, zs, vxs, vys, vzs = phoebe.dynamics.keplerian.dynamics(ts, **elements)
+        return (xs[1]-xs[0])**2 + (ys[1]-ys[0])**2
+
+    # the cubic spline through the grid used by the n-body methods should
+    # agree with the root-finding of the keplerian method
+    time_ecls_spline = etvs._minimize_spline(projected_separation_sq, times, step=1./200, nsteps=200)
+    assert len(ncalls) == 1
+    for time, time_ecl, time_ecl_spline in zip(times, time_ecls, time_ecls_spline):
+        if verbose:
+            print("time={} time_ecl={} spline={}".format(time, time_ecl, time_ecl_spline))
+        assert abs(time_ecl_spline - time_ecl) < 1e-6
+
+    if phoebe.dynamics.nbody._can_rebound:
+        # n-body orbit of the same system, compared against root-finding on
+        # the projected separation integrated at single times
+        time_ecls = etvs.crossings(b, 'primary', times[:3], 'nbody', ltte=False)
+
+        def projected_separation_sq(t):
+            ts, xs, ys, zs, vxs, vys, vzs = phoebe.dynamics.nbody.dynamics_from_bundle(b, np.array([0., t]), compute=None, ltte=False)[:7]
+            return (xs[1][-1]-xs[0][-1])**2 + (ys[1][-1]-ys[0][-1])**2
+
+        for time, time_ecl in zip(times[:3], time_ecls):
+            expected = minimize_scalar(projected_separation_sq, bracket=(time_ecl-0.1, time_ecl, time_ecl+0.1), tol=1e-12).x
+            if verbose:
+                print("nbody: time={} time_ecl={} expected={}".format(time, time_ecl, expected))
+            assert abs(time_ecl - expected) < 1e-5
+
+    return b
+
+if __name__ == '__main__':
+    logger = phoebe.logger(clevel='INFO')
+    b = test_crossings(verbose=True)
+    b = test_crossings_spline(verbose=True)
@@ -0,0 +1,92 @@
+"""
+"""
+
+import phoebe
+from phoebe.backend import backends
+import numpy as np
+import copy
+
+
+def _per_value_packetlists(rpacketlists_per_worker):
+    # split the columns (see backends._SynColumns) back into a packet per
+    # value and time, as sent by the workers before the columns were added
+    ret = []
+    for packetlists in rpacketlists_per_worker:
+        ret_packetlists = []
+        for packetlist in packetlists:
+            ret_packetlist = []
+            for packet in packetlist:
+                if 'times' in packet.keys():
+                    for time, value in zip(packet['times'], packet['value']):
+                        ret_packetlist.append({'dataset': packet['dataset'],
+                                               'component': packet['component'],
+                                               'kind': packet['kind'],
+                                               'qualifier': packet['qualifier'],
+                                               'value': value,
+                                               'time': time})
+                else:
+                    ret_packetlist.append(packet)
+            ret_packetlists.append(ret_packetlist)
+        ret.append(ret_packetlists)
+    return ret
+
+
+def test_fill_syns(verbose=False):
+    phoebe.reset_settings()
+    b = phoebe.default_binary()
+    b.set_value_all('ntriangles', 300)
+    # unsorted and duplicate times, different per dataset
+    b.add_dataset('lc', compute_times=[0.5, 0.1, 0.3, 0.1], dataset='lc01')
+    b.add_dataset('lc', compute_times=[0.45, 0.05], dataset='lc02')
+    b.add_dataset('rv', compute_times=[0.4, 0.2, 0.2, 0.0], dataset='rv01')
+    b.add_dataset('orb', compute_times=[0.3, 0.0], dataset='orb01')
+    b.add_dataset('mesh', include_times='lc01', columns=['volume', 'teffs'], dataset='mesh01')
+
+    # keep a copy of what is passed to _fill_syns so that the same packets
+    # can be filled per-value
+    fill_syns = backends.PhoebeBackend._fill_syns
+    calls = []
+    def _fill_syns(self, new_syns, rpacketlists_per_worker, stream=None):
+        calls.append((new_syns.copy(), copy.deepcopy(rpacketlists_per_worker)))
+        return fill_syns(self, new_syns, rpacketlists_per_worker, stream=stream)
+
+    backends.PhoebeBackend._fill_syns = _fill_syns
+    try:
+        b.run_compute(model='syncolumns')
+    finally:
+        backends.PhoebeBackend._fill_syns = fill_syns
+
+    assert len(calls) == 1
+    new_syns, rpacketlists_per_worker = calls[0]
+    assert any('times' in packet.keys() for packetlists in rpacketlists_per_worker for packetlist in packetlists for packet in packetlist)
+
+    columns_syns = fill_syns(backends.PhoebeBackend(), new_syns.copy(), rpacketlists_per_worker)
+    per_value_syns = fill_syns(backends.PhoebeBackend(), new_syns.copy(), _per_value_packetlists(rpacketlists_per_worker))
+
+    assert len(columns_syns.to_list()) == len(per_value_syns.to_list())
+    for param in columns_syns.to_list():
+        per_value_param = per_value_syns.get_parameter(qualifier=param.qualifier, dataset=param.dataset,
+                                                       component=param.component, kind=param.kind, time=param.time,
+                                                       check_visible=False, check_default=False)
+        value, per_value = param.get_value(), per_value_param.get_value()
+        if verbose:
+            print("{}@{}@{}@{}: {}".format(param.qualifier, param.dataset, param.component, param.time, np.shape(value)))
+        if isinstance(value, np.ndarray):
+            assert np.array_equal(value, per_value, equal_nan=value.dtype.kind == 'f')
+        else:
+            assert value == per_value
+
+    # duplicate times are filled for each entry
+    times = b.get_value(qualifier='times', dataset='lc01', model='syncolumns')
+    fluxes = b.get_value(qualifier='fluxes', dataset='lc01', model='syncolumns')
+    assert np.all(np.diff(times) >= 0)
+    assert np.all(np.isfinite(fluxes))
+    assert fluxes[0] == fluxes[1]
+
+    return b
+
+
+if __name__ == '__main__':
+    logger = phoebe.logger(clevel='INFO')
+
+    b = test_fill_syns(verbose=True)
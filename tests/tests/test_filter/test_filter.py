@@ -0,0 +1,65 @@
+"""
+"""
+
+import phoebe
+import numpy as np
+from phoebe.parameters import parameters
+
+
+def _filter_uniqueids(b, queries, use_index=True):
+    update_filter_index = parameters.ParameterSet._update_filter_index
+    if not use_index:
+        parameters.ParameterSet._update_filter_index = lambda self: None
+    try:
+        return [[p.uniqueid for p in b.filter(**query).to_list()] for query in queries]
+    finally:
+        parameters.ParameterSet._update_filter_index = update_filter_index
+
+
+def test_filter_index(verbose=False):
+    phoebe.reset_settings()
+
+    b = phoebe.Bundle.default_binary()
+    b.add_dataset('lc', times=np.linspace(0, 1, 5), dataset='lc01')
+    b.add_dataset('rv', times=np.linspace(0, 1, 5), dataset='rv01')
+
+    queries = [dict(qualifier='incl', component='binary'),
+               dict(qualifier='incl', component='binary', check_visible=False),
+               dict(kind='LC'),
+               dict(qualifier=['teff', 'requiv'], context='component'),
+               dict(dataset='lc*'),
+               dict(component=['primary', None], context='dataset'),
+               dict(twig='incl@binary'),
+               dict(uniqueid=b.get_parameter(qualifier='q').uniqueid),
+               dict(dataset='lc02'),
+               dict(qualifier='mass', component='primary')]
+
+    def check():
+        for query, with_index, without_index in zip(queries, _filter_uniqueids(b, queries), _filter_uniqueids(b, queries, use_index=False)):
+            if verbose:
+                print("{}: {} parameters".format(query, len(with_index)))
+            assert with_index == without_index
+
+    check()
+
+    # adding, renaming, flipping and removing must all be reflected in the index
+    b.add_dataset('lc', times=[0], dataset='lc02')
+    check()
+    assert len(b.filter(dataset='lc02'))
+
+    b.rename_dataset('lc02', 'lc03')
+    check()
+    assert not len(b.filter(dataset='lc02'))
+
+    b.flip_constraint('mass', component='primary', solve_for='q')
+    check()
+
+    b.remove_dataset('rv01')
+    check()
+    assert not len(b.filter(dataset='rv01'))
+
+    return b
+
+if __name__ == '__main__':
+    logger = phoebe.logger(clevel='INFO')
+    b = test_filter_index(verbose=True)
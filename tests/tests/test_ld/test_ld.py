@@ -187,6 +187,32 @@ def test_binary(plot=False, gen_comp=False):
             assert diff_med_fluxes < 0.035
 
 
+def test_imu_mask():
+    pb = phoebe.get_passband('Johnson:V')
+
+    teffs = np.linspace(5000, 7000, 11)
+    loggs = np.full(11, 4.2)
+    abuns = np.zeros(11)
+    mus = np.linspace(0.05, 1, 11)
+    mask = mus > 0.5
+
+    for ld_func in ['interp', 'quadratic']:
+        kwargs = {'atm': 'ck2004', 'ldatm': 'ck2004', 'ld_func': ld_func}
+        if ld_func != 'interp':
+            kwargs['ld_coeffs'] = pb.interpolate_ldcoeffs(teffs, loggs, abuns, 'ck2004', ld_func)
+            kwargs['ldint'] = pb.ldint(teffs, loggs, abuns, ldatm='ck2004', ld_func=ld_func, ld_coeffs=kwargs['ld_coeffs'])
+
+        intensities = pb.Imu(teffs, loggs, abuns, mus.copy(), **kwargs)
+        intensities_masked = pb.Imu(teffs, loggs, abuns, mus.copy(), mask=mask, **kwargs)
+
+        assert np.all(intensities_masked[mask] == intensities[mask])
+        assert np.all(intensities_masked[~mask] == 0.0)
+
+        # index arrays should behave the same as boolean masks
+        assert np.all(pb.Imu(teffs, loggs, abuns, mus.copy(), mask=np.where(mask)[0], **kwargs) == intensities_masked)
+
+
 if __name__ == '__main__':
     logger = phoebe.logger(clevel='INFO')
     test_binary(plot=False, gen_comp=True)
+    test_imu_mask()
@@ -0,0 +1,112 @@
+"""
+"""
+
+import phoebe
+import numpy as np
+import pickle
+from phoebe.solverbackends import solverbackends
+
+
+def test_lnprobability_vectorized(verbose=False):
+    phoebe.reset_settings()
+    b = phoebe.default_binary()
+    b.add_dataset('lc', compute_times=phoebe.linspace(0, 1, 11), dataset='lc01')
+    b.add_dataset('rv', compute_times=phoebe.linspace(0, 1, 11), dataset='rv01')
+    b.set_value_all('atm', 'blackbody')
+    b.set_value_all('ld_mode', 'manual')
+    b.set_value_all('ntriangles', 300)
+
+    b.run_compute(model='synthetic')
+    b.set_value('times', dataset='lc01', context='dataset', value=np.linspace(0, 1, 11))
+    b.set_value('fluxes', dataset='lc01', context='dataset', value=b.get_value('fluxes', model='synthetic') * 1.01)
+    b.set_value('sigmas', dataset='lc01', context='dataset', value=np.full(11, 0.01))
+    for component in ['primary', 'secondary']:
+        b.set_value('times', dataset='rv01', component=component, context='dataset', value=np.linspace(0, 1, 11))
+        b.set_value('rvs', dataset='rv01', component=component, context='dataset', value=b.get_value('rvs', component=component, model='synthetic') + 1)
+        b.set_value('sigmas', dataset='rv01', component=component, context='dataset', value=np.full(11, 2.))
+    b.set_value_all('sigmas_lnf', dataset='rv01', value=-3)
+    b.set_value('mask_enabled', dataset='lc01', value=True)
+    b.set_value('mask_phases', dataset='lc01', value=[(-0.1, 0.1)])
+    b.remove_model('synthetic')
+
+    b.add_distribution('teff@primary', phoebe.uniform(5000, 7000), distribution='lnprior')
+    b.add_distribution('t0_supconj@binary', phoebe.uniform(-0.2, 0.2), distribution='lnprior')
+    params_uniqueids = [b.get_parameter(qualifier=qualifier, component=component, context='component').uniqueid for qualifier, component in [('incl', 'binary'), ('teff', 'primary'), ('t0_supconj', 'binary')]]
+
+    # the third walker is outside the priors
+    sampled_values = np.array([[85., 6000., 0.],
+                               [80., 6500., 0.05],
+                               [88., 8000., 0.]])
+    args = (b, params_uniqueids, 'phoebe01', ['lnprior'], 'and', 'lnprob')
+
+    failed_samples = []
+    lnprobs = np.array([solverbackends._lnprobability(values, *args, failed_samples_buffer=failed_samples) for values in sampled_values])
+
+    failed_samples_vectorized = []
+    lnprobs_vectorized = solverbackends._lnprobability_vectorized(sampled_values, *args, failed_samples_buffer=failed_samples_vectorized)
+
+    if verbose:
+        print("lnprobs: {}, vectorized: {}".format(lnprobs, lnprobs_vectorized))
+
+    assert np.isfinite(lnprobs[:2]).all()
+    assert lnprobs[2] == -np.inf
+    assert np.allclose(lnprobs_vectorized, lnprobs, rtol=1e-12, atol=0)
+    assert failed_samples_vectorized == failed_samples
+
+    return b
+
+def test_lnprobability_compute_session(verbose=False):
+    phoebe.reset_settings()
+    b = phoebe.default_binary()
+    b.add_dataset('lc', times=phoebe.linspace(0, 1, 11), dataset='lc01')
+    b.set_value_all('atm', 'blackbody')
+    b.set_value_all('ld_mode', 'manual')
+    b.set_value_all('ntriangles', 300)
+    b.set_value('fluxes', dataset='lc01', context='dataset', value=np.full(11, 1.9))
+    b.set_value('sigmas', dataset='lc01', context='dataset', value=np.full(11, 0.01))
+
+    b.add_distribution('incl@binary', phoebe.uniform(70, 90), distribution='lnprior')
+    params_uniqueids = [b.get_parameter(qualifier='incl', component='binary', context='component').uniqueid]
+    args = (params_uniqueids, 'phoebe01', ['lnprior'], 'and', 'lnprob')
+
+    def lnprobability_fresh(incl):
+        b_fresh = b.copy()
+        b_fresh.set_value(qualifier='incl', component='binary', context='component', value=incl)
+        b_fresh.run_compute(model='lnprob')
+        return b_fresh.calculate_lnp(distribution='lnprior', include_constrained=True) + b_fresh.calculate_lnlikelihood(model='lnprob')
+
+    # by default, the compute session re-uses the meshes of the first sample
+    b_solver = b.copy()
+    lnprobs = [solverbackends._lnprobability([incl], b_solver, *args) for incl in [85., 80.]]
+    lnprob_fresh = lnprobability_fresh(80.)
+    if verbose:
+        print("lnprobability (session): {}, fresh: {}".format(lnprobs[1], lnprob_fresh))
+    compute_session = solverbackends._lnprobability_cache[(b_solver._solver_id, 'compute_session', 'phoebe01')]
+    assert compute_session._cache['phoebe01'].get('pblums', None) is not None
+
+    # the cached session (and residual plan) survive pickling the bundle, as
+    # is done by the pools for every sample
+    b_pickled = pickle.loads(pickle.dumps(b_solver))
+    assert solverbackends._lnprobability_compute_session(b_pickled, 'phoebe01') is compute_session
+    assert solverbackends._lnprobability_residual_plan(b_pickled, 'lnprob') is solverbackends._lnprobability_residual_plan(b_solver, 'lnprob')
+    assert np.allclose(lnprobs[1], lnprob_fresh, rtol=1e-6, atol=0)
+
+    # without the compute session, each sample is a fresh computation
+    # (independent of the previous samples)
+    phoebe.solver_compute_session_off()
+    b_solver = b.copy()
+    lnprobs = [solverbackends._lnprobability([incl], b_solver, *args) for incl in [85., 80.]]
+    phoebe.reset_settings()
+    if verbose:
+        print("lnprobability: {}, fresh: {}".format(lnprobs[1], lnprob_fresh))
+    assert (b_solver._solver_id, 'compute_session', 'phoebe01') not in solverbackends._lnprobability_cache.keys()
+    assert lnprobs[1] == lnprob_fresh
+
+    return b
+
+
+if __name__ == '__main__':
+    logger = phoebe.logger(clevel='INFO')
+
+    b = test_lnprobability_vectorized(verbose=True)
+    b = test_lnprobability_compute_session(verbose=True)
@@ -0,0 +1,42 @@
+"""
+"""
+
+import phoebe
+import numpy as np
+
+
+def test_mask_phases(verbose=False):
+    phoebe.reset_settings()
+    b = phoebe.default_binary()
+    times = np.linspace(0, 1, 21)
+    for dataset, mask_phases in [('lc01', [(-0.1, 0.1)]), ('lc02', [(0.3, 0.45)])]:
+        b.add_dataset('lc', times=times, dataset=dataset)
+        b.set_value('fluxes', dataset=dataset, context='dataset', value=np.full(21, 1.9))
+        b.set_value('sigmas', dataset=dataset, context='dataset', value=np.full(21, 0.01))
+        b.set_value('mask_enabled', dataset=dataset, value=True)
+        b.set_value('mask_phases', dataset=dataset, value=mask_phases)
+    b.set_value_all('atm', 'blackbody')
+    b.set_value_all('ld_mode', 'manual')
+    b.set_value_all('ntriangles', 300)
+
+    b.run_compute(model='latest')
+
+    # each dataset is masked by its own mask_phases, so the masks of the
+    # first dataset must not leak into the second
+    chi2s = [b.calculate_chi2(model='latest', dataset=dataset) for dataset in ['lc01', 'lc02']]
+    chi2s_expected = [np.sum((b.calculate_residuals(model='latest', dataset=dataset).value / 0.01)**2) for dataset in ['lc01', 'lc02']]
+    chi2 = b.calculate_chi2(model='latest')
+    if verbose:
+        print("chi2s={} expected={} chi2={}".format(chi2s, chi2s_expected, chi2))
+
+    assert len(b.calculate_residuals(model='latest', dataset='lc01')) != len(b.calculate_residuals(model='latest', dataset='lc02'))
+    assert np.allclose(chi2s, chi2s_expected, rtol=1e-12, atol=0)
+    assert np.isclose(chi2, np.sum(chi2s), rtol=1e-12, atol=0)
+
+    return b
+
+
+if __name__ == '__main__':
+    logger = phoebe.logger(clevel='INFO')
+
+    b = test_mask_phases(verbose=True)
@@ -0,0 +1,97 @@
+"""
+"""
+
+import phoebe
+from phoebe.backend import universe
+from phoebe import dynamics
+import numpy as np
+
+
+_columns = ['us', 'vs', 'ws', 'vus', 'vvs', 'vws', 'nus', 'nvs', 'nws', 'areas', 'mus', 'visibilities', 'teffs', 'intensities@lc01']
+
+
+def _bundle(ecc):
+    b = phoebe.default_binary()
+    b.set_value('ecc', ecc)
+    b.set_value_all('ntriangles', 300)
+    b.add_dataset('lc', compute_times=[0.6, 0.1, 0.35, 0.85], dataset='lc01')
+    b.add_dataset('mesh', include_times='lc01', columns=_columns, dataset='mesh01')
+    return b
+
+
+def test_mesh_buffers_compute(verbose=False):
+    for ecc in [0.0, 0.2]:
+        phoebe.reset_settings()
+        b = _bundle(ecc)
+        times = b.get_value(qualifier='compute_times', dataset='lc01')
+
+        # the meshes of the earlier times must not be changed when the work
+        # buffers are re-used for the later times, so should match computing
+        # each time on its own (with fresh buffers)
+        b.run_compute(model='multi')
+        for i, time in enumerate(times):
+            b.run_compute(times=[time], model='single{}'.format(i))
+            for column in [column.split('@')[0] for column in _columns]:
+                for component in ['primary', 'secondary']:
+                    multi = b.get_value(qualifier=column, component=component, time=time, model='multi')
+                    single = b.get_value(qualifier=column, component=component, time=time, model='single{}'.format(i))
+                    if verbose and not np.allclose(multi, single, rtol=1e-12, atol=1e-12, equal_nan=True):
+                        print("ecc={} t={} {}@{}: max diff={}".format(ecc, time, column, component, np.nanmax(np.abs(multi-single))))
+                    assert np.allclose(multi, single, rtol=1e-12, atol=1e-12, equal_nan=True)
+
+            for component in ['primary', 'secondary']:
+                multi = b.get_value(qualifier='uvw_normals', component=component, time=time, model='multi')
+                single = b.get_value(qualifier='uvw_normals', component=component, time=time, model='single{}'.format(i))
+                assert np.allclose(multi, single, rtol=1e-12, atol=1e-12)
+
+            multi_times = b.get_value(qualifier='times', dataset='lc01', model='multi')
+            assert np.allclose(b.get_value(qualifier='fluxes', dataset='lc01', model='multi')[multi_times==time],
+                               b.get_value(qualifier='fluxes', dataset='lc01', model='single{}'.format(i)),
+                               rtol=1e-12, atol=0)
+
+    return b
+
+
+def test_mesh_buffers_protomesh(verbose=False):
+    phoebe.reset_settings()
+    b = _bundle(0.0)
+    times = b.get_value(qualifier='compute_times', dataset='lc01')
+
+    system = universe.System.from_bundle(b, 'phoebe01', datasets=b.datasets)
+    ts, xs, ys, zs, vxs, vys, vzs, ethetas, elongans, eincls = dynamics.keplerian.dynamics_from_bundle(b, times, 'phoebe01', return_euler=True)
+
+    protomeshes = {}
+    meshes = {}
+    for i, time in enumerate(times):
+        system.update_positions(time, *dynamics.dynamics_at_i(xs, ys, zs, vxs, vys, vzs, ethetas, elongans, eincls, i=i))
+        for body in system.bodies:
+            # the cached scaled standard mesh is re-used for all times, but
+            # placing the mesh in orbit must not change it
+            scaledprotomesh = body._get_scaled_standard_mesh_cached()
+            if i == 0:
+                protomeshes[body.component] = (scaledprotomesh, {k: np.array(scaledprotomesh[k]) for k in ['vertices', 'pvertices', 'centers', 'vnormals', 'tnormals', 'velocities'] if scaledprotomesh[k] is not None})
+            assert scaledprotomesh is protomeshes[body.component][0]
+            for k, value in protomeshes[body.component][1].items():
+                assert np.array_equal(scaledprotomesh[k], value)
+
+            meshes.setdefault(body.component, []).append({k: np.array(body.mesh[k]) for k in ['vertices', 'centers', 'tnormals', 'velocities']})
+
+    # placing the meshes of a separate system at each time (and so without
+    # re-using the work buffers) gives the same meshes
+    for i, time in enumerate(times):
+        system_i = universe.System.from_bundle(b, 'phoebe01', datasets=b.datasets)
+        system_i.update_positions(time, *dynamics.dynamics_at_i(xs, ys, zs, vxs, vys, vzs, ethetas, elongans, eincls, i=i))
+        for body in system_i.bodies:
+            for k, value in meshes[body.component][i].items():
+                if verbose:
+                    print("t={} {}@{}: max diff={}".format(time, k, body.component, np.max(np.abs(body.mesh[k] - value))))
+                assert np.array_equal(body.mesh[k], value)
+
+    return b
+
+
+if __name__ == '__main__':
+    logger = phoebe.logger(clevel='INFO')
+
+    b = test_mesh_buffers_compute(verbose=True)
+    b = test_mesh_buffers_protomesh(verbose=True)
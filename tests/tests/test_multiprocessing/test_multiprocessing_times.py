@@ -0,0 +1,42 @@
+"""
+"""
+
+import phoebe
+import numpy as np
+
+
+def test_multiprocessing_times(verbose=False, npoints=12):
+    phoebe.reset_settings()
+
+    b = phoebe.Bundle.default_binary()
+
+    b.add_dataset('lc', times=np.linspace(0, 1, npoints), dataset='lc01')
+    b.add_dataset('rv', times=np.linspace(0, 1, npoints), dataset='rv01')
+
+    if verbose:
+        print("calling compute in serial")
+    b.run_compute(irrad_method='none', model='serial')
+
+    phoebe.multiprocessing_times_on()
+    phoebe.multiprocessing_set_nprocs(2)
+
+    if verbose:
+        print("calling compute with multiprocessing over times")
+    b.run_compute(irrad_method='none', model='multiprocessing')
+
+    phoebe.reset_settings()
+
+    assert np.allclose(b.get_value(qualifier='fluxes', model='serial'),
+                       b.get_value(qualifier='fluxes', model='multiprocessing'),
+                       rtol=0, atol=1e-12)
+
+    for comp in ['primary', 'secondary']:
+        assert np.allclose(b.get_value(qualifier='rvs', component=comp, model='serial'),
+                           b.get_value(qualifier='rvs', component=comp, model='multiprocessing'),
+                           rtol=0, atol=1e-12)
+
+    return b
+
+if __name__ == '__main__':
+    logger = phoebe.logger(clevel='INFO')
+    b = test_multiprocessing_times(verbose=True)
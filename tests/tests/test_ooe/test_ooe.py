@@ -0,0 +1,97 @@
+"""
+"""
+
+import phoebe
+from phoebe.backend import backends
+import numpy as np
+
+
+def test_ooe_interp(verbose=False, npoints=60):
+    phoebe.reset_settings()
+
+    b = phoebe.Bundle.default_binary()
+    b.set_value('incl', component='binary', value=86)
+    b.set_value_all('ntriangles', 500)
+
+    b.add_dataset('lc', times=np.linspace(0, 1, npoints), dataset='lc01')
+
+    if verbose:
+        print("calling compute with ooe_method='mesh'")
+    b.run_compute(irrad_method='none', ooe_method='mesh', model='mesh_model')
+
+    if verbose:
+        print("calling compute with ooe_method='interp'")
+    b.run_compute(irrad_method='none', ooe_method='interp', ooe_nphases=20, model='interp_model')
+
+    fluxes_mesh = b.get_value(qualifier='fluxes', model='mesh_model')
+    fluxes_interp = b.get_value(qualifier='fluxes', model='interp_model')
+
+    if verbose:
+        print("max relative difference: {}".format(abs(fluxes_interp/fluxes_mesh-1).max()))
+
+    assert np.allclose(fluxes_interp, fluxes_mesh, rtol=2e-3, atol=0)
+
+    # eccentric systems are not supported and should fall back on the mesh
+    b.set_value('ecc', component='binary', value=0.1)
+    b.run_compute(irrad_method='none', ooe_method='mesh', model='mesh_model', overwrite=True)
+    b.run_compute(irrad_method='none', ooe_method='interp', ooe_nphases=20, model='interp_model', overwrite=True)
+
+    assert np.all(b.get_value(qualifier='fluxes', model='mesh_model') == b.get_value(qualifier='fluxes', model='interp_model'))
+
+    return b
+
+def test_ooe_batch(verbose=False, npoints=60):
+    # count the calls to the batch integration, to make sure the batch path
+    # is taken (rather than silently falling back on the mesh)
+    compute_ooe_batch = backends.PhoebeBackend._compute_ooe_batch
+    calls = []
+    def _compute_ooe_batch(self, system, times, infolists, ooe_mask, *args, **kwargs):
+        calls.append(ooe_mask.sum())
+        return compute_ooe_batch(self, system, times, infolists, ooe_mask, *args, **kwargs)
+
+    # NOTE: at most inclinations, round-off in the polar direction causes
+    # ooe_method='mesh' to remesh (aligned) stars at some times, so that the
+    # fluxes and rvs only agree to within the discretization of the mesh.
+    # At incl=90 the same mesh is used at all times and they agree exactly.
+    for incl, tol in [(80, 1e-3), (86, 1e-3), (90, 1e-10)]:
+        phoebe.reset_settings()
+
+        b = phoebe.Bundle.default_binary()
+        b.set_value('incl', component='binary', value=incl)
+        b.set_value_all('ntriangles', 500)
+
+        b.add_dataset('lc', times=np.linspace(0, 1, npoints), dataset='lc01')
+        b.add_dataset('rv', times=np.linspace(0, 1, npoints), dataset='rv01')
+
+        if verbose:
+            print("incl={}: calling compute with ooe_method='mesh'".format(incl))
+        b.run_compute(ooe_method='mesh', model='mesh_model')
+
+        if verbose:
+            print("incl={}: calling compute with ooe_method='batch'".format(incl))
+        calls[:] = []
+        backends.PhoebeBackend._compute_ooe_batch = _compute_ooe_batch
+        try:
+            # use a small memory budget to force several chunks
+            b.run_compute(ooe_method='batch', ooe_batch_memory=1, model='batch_model')
+        finally:
+            backends.PhoebeBackend._compute_ooe_batch = compute_ooe_batch
+
+        assert len(calls) == 1
+        assert 0 < calls[0] < npoints
+
+        for qualifier, component in [('fluxes', None), ('rvs', 'primary'), ('rvs', 'secondary')]:
+            values_mesh = b.get_value(qualifier=qualifier, component=component, model='mesh_model')
+            values_batch = b.get_value(qualifier=qualifier, component=component, model='batch_model')
+
+            if verbose:
+                print("incl={} {}@{} max difference: {}".format(incl, qualifier, component, abs(values_batch-values_mesh).max()))
+
+            assert abs(values_batch-values_mesh).max() <= tol*abs(values_mesh).max()
+
+    return b
+
+if __name__ == '__main__':
+    logger = phoebe.logger(clevel='INFO')
+    b = test_ooe_interp(verbose=True)
+    b = test_ooe_batch(verbose=True)
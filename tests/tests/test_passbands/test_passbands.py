@@ -0,0 +1,141 @@
+"""
+"""
+
+import phoebe
+from phoebe.atmospheres import passbands
+from astropy.io import fits
+import numpy as np
+import libphoebe
+import os
+import glob
+import shutil
+import tempfile
+import types
+
+
+def test_lazy_tables(verbose=False):
+    fname = passbands._pbtable['Johnson:V']['fname']
+    pb = passbands.Passband.load(fname, load_content=True)
+
+    # tables are only read when first accessed
+    assert '_ck2004_Imu_energy_grid' not in pb.__dict__
+    assert '_ck2004_Imu_energy_grid' in pb._lazy_tables
+
+    grid = pb._ck2004_Imu_energy_grid
+    axes = pb._ck2004_intensity_axes
+    assert '_ck2004_Imu_energy_grid' in pb.__dict__
+    assert grid.dtype.isnative
+
+    with fits.open(fname) as hdul:
+        assert np.all(grid == hdul['ckfegrid'].data)
+        assert np.all(axes[3] == hdul['ck_mus'].data['mu'])
+
+    # a second load should use the cached (memory-mapped) copy
+    pb2 = passbands.Passband.load(fname, load_content=True)
+    if verbose:
+        print("type of cached grid: {}".format(type(pb2._ck2004_Imu_energy_grid)))
+    assert np.all(pb2._ck2004_Imu_energy_grid == grid)
+
+    try:
+        pb._nonexistent_attribute
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("expected AttributeError")
+
+
+def test_table_cache(verbose=False):
+    fname = passbands._pbtable['Johnson:V']['fname']
+    tmpdir = tempfile.mkdtemp()
+    pbcachedir = passbands._pbcachedir
+    try:
+        passbands._pbcachedir = os.path.join(tmpdir, 'cache')
+
+        # passband files with the same name in different directories must not
+        # remove each other's cached tables
+        fnames = []
+        for subdir in ['local', 'global']:
+            os.makedirs(os.path.join(tmpdir, subdir))
+            fnames.append(shutil.copy(fname, os.path.join(tmpdir, subdir)))
+
+        tables = [passbands._load_table(f, 'ck_mus', 'mu') for f in fnames]
+        tables += [passbands._load_table(f, 'ck_mus', 'mu') for f in fnames]
+        cachedirs = [passbands._table_cachedir(f)[0] for f in fnames]
+        if verbose:
+            print("cached tables: {}".format(os.listdir(passbands._pbcachedir)))
+        assert cachedirs[0] != cachedirs[1]
+        assert sorted(os.listdir(passbands._pbcachedir)) == sorted([os.path.basename(d) for d in cachedirs])
+        assert all(isinstance(t, np.memmap) for t in tables[2:])
+        assert all(np.all(t == tables[0]) for t in tables[1:])
+
+        # modifying a file only replaces the cache for that file
+        os.utime(fnames[0], ns=(0, 0))
+        passbands._load_table(fnames[0], 'ck_mus', 'mu')
+        assert not os.path.exists(cachedirs[0])
+        assert os.path.exists(passbands._table_cachedir(fnames[0])[0])
+        assert os.path.exists(cachedirs[1])
+
+        # another process creating the same cache directory while this one
+        # removes the caches of previous versions must keep its tables
+        os.utime(fnames[1], ns=(0, 0))
+        cachedir = passbands._table_cachedir(fnames[1])[0]
+        def glob_after_other_process(pattern):
+            os.makedirs(cachedir)
+            np.save(os.path.join(cachedir, 'other.npy'), np.zeros(3))
+            return glob.glob(pattern)
+
+        passbands.glob = types.SimpleNamespace(glob=glob_after_other_process)
+        try:
+            table = passbands._load_table(fnames[1], 'ck_mus', 'mu')
+        finally:
+            passbands.glob = glob
+        assert isinstance(table, np.memmap)
+        assert np.all(table == tables[0])
+        assert os.path.exists(os.path.join(cachedir, 'other.npy'))
+        assert not os.path.exists(cachedirs[1])
+
+        # with the cache disabled the tables are read into memory
+        passbands._pbcachedir = None
+        table = passbands._load_table(fnames[0], 'ck_mus', 'mu')
+        assert not isinstance(table, np.memmap)
+        assert np.all(table == tables[0])
+    finally:
+        passbands._pbcachedir = pbcachedir
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def test_interpolator():
+    pb = phoebe.get_passband('Johnson:V')
+
+    teffs = np.linspace(5000, 7000, 11)
+    loggs = np.full(11, 4.2)
+    abuns = np.zeros(11)
+    mus = np.linspace(0.05, 0.95, 11)
+
+    interpolator = pb.get_interpolator('ck2004')
+    assert pb.get_interpolator('ck2004') is interpolator
+
+    # Inorm and ldint are interpolated from a single (memory-mapped) grid
+    assert len(interpolator._normal_sweeps) == 1
+    assert isinstance(interpolator._normal_sweeps[0][2], np.memmap)
+
+    out = (np.empty(11), np.empty(11), np.empty(11))
+    Inorm, ldint, Imu = interpolator.evaluate(teffs, loggs, abuns, mus, out=out)
+    assert Inorm is out[0] and ldint is out[1] and Imu is out[2]
+
+    # the interpolator does not change the results of the individual methods
+    assert np.all(Inorm == pb.Inorm(teffs, loggs, abuns, atm='ck2004', ldatm='ck2004'))
+    assert np.all(ldint == pb.ldint(teffs, loggs, abuns, ldatm='ck2004'))
+    req = np.vstack((teffs, loggs, abuns, mus)).T
+    assert np.all(Imu == 10**libphoebe.interp(req, pb._ck2004_intensity_axes, pb._ck2004_Imu_energy_grid)[:,0])
+
+    # out of bounds elements are returned as nan
+    Inorm, ldint, Imu = interpolator.evaluate(np.array([1e6]), 4.2, 0.0, mu=None)
+    assert np.isnan(Inorm[0]) and np.isnan(ldint[0]) and Imu is None
+
+
+if __name__ == '__main__':
+    logger = phoebe.logger(clevel='INFO')
+    test_lazy_tables(verbose=True)
+    test_table_cache(verbose=True)
+    test_interpolator()
@@ -0,0 +1,52 @@
+"""
+"""
+
+import phoebe
+import numpy as np
+
+
+def test_residual_plan(verbose=False):
+    phoebe.reset_settings()
+    b = phoebe.default_binary()
+    b.add_dataset('lc', compute_times=phoebe.linspace(0, 1, 21), dataset='lc01')
+    b.add_dataset('rv', compute_times=phoebe.linspace(0, 1, 21), dataset='rv01')
+    b.set_value_all('atm', 'blackbody')
+    b.set_value_all('ld_mode', 'manual')
+    b.set_value_all('ntriangles', 300)
+
+    # observed times between (and on) the compute_times, so that the model
+    # needs to be interpolated
+    times = np.sort(np.random.RandomState(0).uniform(0, 1, 40))
+    times[0] = 0.
+    b.set_value('times', dataset='lc01', context='dataset', value=times)
+    b.set_value('fluxes', dataset='lc01', context='dataset', value=np.full(40, 1.9))
+    b.set_value('sigmas', dataset='lc01', context='dataset', value=np.full(40, 0.01))
+    b.set_value('sigmas_lnf', dataset='lc01', value=-4)
+    b.set_value('mask_enabled', dataset='lc01', value=True)
+    b.set_value('mask_phases', dataset='lc01', value=[(-0.1, 0.1), (0.3, 0.45)])
+    for component in ['primary', 'secondary']:
+        b.set_value('times', dataset='rv01', component=component, context='dataset', value=times[:20])
+        b.set_value('rvs', dataset='rv01', component=component, context='dataset', value=np.zeros(20))
+        b.set_value('sigmas', dataset='rv01', component=component, context='dataset', value=np.full(20, 2.))
+    b.set_value_all('sigmas_lnf', dataset='rv01', value=-3)
+
+    plan = b.residual_plan(model='latest')
+    for incl in [80, 89]:
+        b.set_value(qualifier='incl', component='binary', context='component', value=incl)
+        b.run_compute(model='latest', overwrite=True)
+
+        lnlikelihood = b.calculate_lnlikelihood(model='latest')
+        chi2 = b.calculate_chi2(model='latest')
+        if verbose:
+            print("incl={} lnlikelihood={} plan={}".format(incl, lnlikelihood, plan.calculate_lnlikelihood()))
+
+        assert plan.calculate_lnlikelihood() == lnlikelihood
+        assert plan.calculate_chi2() == chi2
+
+    return b
+
+
+if __name__ == '__main__':
+    logger = phoebe.logger(clevel='INFO')
+
+    b = test_residual_plan(verbose=True)
@@ -0,0 +1,73 @@
+"""
+"""
+
+import phoebe
+import numpy as np
+
+
+def test_session(verbose=False):
+    phoebe.reset_settings()
+
+    b = phoebe.Bundle.default_binary()
+    b.add_dataset('lc', times=np.linspace(0, 1, 21), dataset='lc01')
+    b.add_dataset('rv', times=np.linspace(0, 1, 11), dataset='rv01')
+    b.set_value_all(qualifier='irrad_method', value='none')
+
+    session = b.compute_session()
+
+    # first evaluation is a full computation
+    session.run_compute(model='session')
+    b.run_compute(model='full')
+    assert np.all(b.get_value(qualifier='fluxes', model='session') == b.get_value(qualifier='fluxes', model='full'))
+    pblums = session._cache['phoebe01']['pblums']
+
+    # changing the orientation re-uses the pblums and meshes (which may differ
+    # from a fresh computation by mesh-discretization only)
+    b.set_value(qualifier='incl', component='binary', value=80)
+    session.run_compute(model='session', overwrite=True)
+    b.run_compute(model='full', overwrite=True)
+    assert session._cache['phoebe01']['pblums'] is pblums
+    assert np.allclose(b.get_value(qualifier='fluxes', model='session'), b.get_value(qualifier='fluxes', model='full'), rtol=1e-3)
+    assert np.allclose(b.get_value(qualifier='rvs', component='primary', model='session'), b.get_value(qualifier='rvs', component='primary', model='full'), atol=0.1)
+
+    # changing teff only affects the local quantities, so the meshes, dynamics
+    # and infolists are re-used, but the pblums are recomputed
+    cache = session._cache['phoebe01']
+    standard_meshes, dynamics, infos = cache['standard_meshes'], cache['dynamics'], cache['infos']
+    b.set_value(qualifier='teff', component='primary', value=6500)
+    session.run_compute(model='session', overwrite=True)
+    b.run_compute(model='full', overwrite=True)
+    cache = session._cache['phoebe01']
+    assert cache['pblums'] is not pblums
+    assert cache['standard_meshes'] is standard_meshes
+    assert cache['dynamics'] is dynamics
+    assert cache['infos'] is infos
+    if verbose:
+        print("teff: max difference in fluxes: {}".format(abs(b.get_value(qualifier='fluxes', model='session') - b.get_value(qualifier='fluxes', model='full')).max()))
+    assert np.allclose(b.get_value(qualifier='fluxes', model='session'), b.get_value(qualifier='fluxes', model='full'), rtol=1e-3)
+
+    # changing the times requires new infolists and dynamics, but not meshes
+    b.set_value(qualifier='times', dataset='lc01', context='dataset', value=np.linspace(0, 1, 31))
+    session.run_compute(model='session', overwrite=True)
+    cache = session._cache['phoebe01']
+    assert cache['standard_meshes'] is standard_meshes
+    assert cache['dynamics'] is not dynamics
+    assert cache['infos'] is not infos
+    assert len(b.get_value(qualifier='fluxes', model='session')) == 31
+
+    # any change to the geometry forces remeshing (but the same times are
+    # still needed)
+    standard_meshes, infos = cache['standard_meshes'], cache['infos']
+    b.set_value(qualifier='requiv', component='primary', value=1.1)
+    session.run_compute(model='session', overwrite=True)
+    b.run_compute(model='full', overwrite=True)
+    cache = session._cache['phoebe01']
+    assert cache['standard_meshes'] is not standard_meshes
+    assert cache['infos'] is infos
+    assert np.all(b.get_value(qualifier='fluxes', model='session') == b.get_value(qualifier='fluxes', model='full'))
+
+    return b, session
+
+if __name__ == '__main__':
+    logger = phoebe.logger(clevel='INFO')
+    b, session = test_session(verbose=True)
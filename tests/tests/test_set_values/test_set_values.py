@@ -0,0 +1,62 @@
+"""
+"""
+
+import phoebe
+from phoebe import u
+import numpy as np
+import pytest
+
+
+def test_set_values(verbose=False):
+    phoebe.reset_settings()
+    b = phoebe.default_binary()
+    b.add_dataset('lc', times=np.linspace(0, 1, 11), dataset='lc01')
+    b.add_dataset('rv', times=np.linspace(0, 1, 11), dataset='rv01')
+
+    sma = b.get_parameter(qualifier='sma', component='binary', context='component')
+    incl = b.get_parameter(qualifier='incl', component='binary', context='component')
+    teff = b.get_parameter(qualifier='teff', component='primary', context='component')
+    rv_offset = b.get_parameter(qualifier='rv_offset', component='primary', dataset='rv01', context='dataset')
+
+    if verbose:
+        print("b.set_values({sma, incl, teff, rv_offset})")
+    changed = b.set_values({sma.uniqueid: 6.0,
+                            incl.uniqueid: 80 * u.deg,
+                            teff.uniqueid: 5800,
+                            rv_offset.uniqueid: 1.5})
+
+    assert sma.get_value() == 6.0
+    assert incl.get_value() == 80.0
+    assert teff.get_value() == 5800.0
+    assert rv_offset.get_value() == 1.5
+    assert len(b._delayed_constraints) == 0
+
+    # constraints should have been run
+    assert abs(b.get_value(qualifier='asini', component='binary', context='component') - 6.0*np.sin(np.deg2rad(80))) < 1e-8
+    assert 'asini@binary@orbit@component' in changed.twigs
+    assert 'teffratio@binary@orbit@component' in changed.twigs
+
+    # delayed constraints
+    b.set_values({sma.uniqueid: 7.0}, run_constraints=False)
+    assert len(b._delayed_constraints)
+    b.run_delayed_constraints()
+    assert abs(b.get_value(qualifier='asini', component='binary', context='component') - 7.0*np.sin(np.deg2rad(80))) < 1e-8
+
+    # all failures are reported together, while the remaining values are set
+    ecc = b.get_parameter(qualifier='ecc', component='binary', context='component')
+    with pytest.raises(ValueError) as excinfo:
+        b.set_values({ecc.uniqueid: 2.0,
+                      teff.uniqueid: -10,
+                      'notauniqueid': 1.0,
+                      sma.uniqueid: 8.0})
+    assert 'ecc' in str(excinfo.value)
+    assert 'teff' in str(excinfo.value)
+    assert 'notauniqueid' in str(excinfo.value)
+    assert sma.get_value() == 8.0
+
+    return b
+
+if __name__ == '__main__':
+    logger = phoebe.logger(clevel='INFO')
+
+    b = test_set_values(verbose=True)
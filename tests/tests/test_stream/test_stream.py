@@ -0,0 +1,34 @@
+"""
+"""
+
+import phoebe
+import numpy as np
+import os
+import tempfile
+
+
+def test_stream(verbose=False):
+    phoebe.reset_settings()
+
+    b = phoebe.Bundle.default_binary()
+    b.add_dataset('lc', times=np.linspace(0, 1, 11), dataset='lc01')
+    b.add_dataset('mesh', times=np.linspace(0, 1, 4), columns=['teffs', 'areas', 'intensities@lc01'], dataset='mesh01')
+    b.set_value_all(qualifier='irrad_method', value='none')
+
+    stream_fname = os.path.join(tempfile.mkdtemp(), 'stream.phoebe')
+    b.run_compute(model='m1')
+    b.run_compute(model='m2', stream_fname=stream_fname)
+    assert os.path.isfile(stream_fname)
+
+    for param in b.filter(context='model', model='m1', kind=['lc', 'mesh']).to_list():
+        param_stream = b.get_parameter(qualifier=param.qualifier, dataset=param.dataset, component=param.component, time=param.time, kind=param.kind, context='model', model='m2', check_visible=False)
+        if verbose:
+            print("{}: {}".format(param.twig, param_stream.get_value()))
+        assert np.array_equal(param.get_value(), param_stream.get_value(), equal_nan=True)
+
+    return b
+
+if __name__ == '__main__':
+    logger = phoebe.logger(clevel='INFO')
+
+    b = test_stream(verbose=True)
@@ -0,0 +1,96 @@
+"""
+"""
+
+import phoebe
+import numpy as np
+
+
+def test_threading_reflection(verbose=False):
+    phoebe.reset_settings()
+    # otherwise the second run would reuse the cached view-factors
+    phoebe.view_factors_cache_set_maxsize(0)
+
+    for b in [phoebe.default_binary(), phoebe.default_contact_binary()]:
+        b.add_dataset('lc', times=np.linspace(0, 1, 5), dataset='lc01')
+        b.set_value_all('irrad_method', 'wilson')
+        b.set_value_all('ntriangles', 1000)
+        b.set_value_all('atm', 'blackbody')
+        b.set_value_all('ld_mode', 'manual')
+
+        for nthreads in [1, 3]:
+            phoebe.threading_set_nthreads(nthreads)
+            b.run_compute(model='nthreads{}'.format(nthreads))
+
+        fluxes = b.get_value(qualifier='fluxes', model='nthreads1')
+        if verbose:
+            print("fluxes: {}".format(fluxes))
+
+        # the view-factors do not depend on the number of threads, the
+        # eclipses only to the precision of the polygon clipping
+        assert np.allclose(b.get_value(qualifier='fluxes', model='nthreads3'), fluxes, rtol=1e-8, atol=0)
+
+    phoebe.reset_settings()
+
+    return b
+
+def test_threading_eclipse(verbose=False):
+    phoebe.reset_settings()
+
+    b = phoebe.default_binary()
+    b.add_dataset('lc', compute_phases=np.linspace(-0.1, 0.1, 11), dataset='lc01')
+    b.set_value_all('ntriangles', 2000)
+    b.set_value_all('atm', 'blackbody')
+    b.set_value_all('ld_mode', 'manual')
+
+    for nthreads in [1, 3]:
+        phoebe.threading_set_nthreads(nthreads)
+        b.run_compute(model='nthreads{}'.format(nthreads))
+
+    phoebe.reset_settings()
+
+    fluxes = b.get_value(qualifier='fluxes', model='nthreads1')
+    if verbose:
+        print("fluxes: {}".format(fluxes))
+
+    # the triangles in eclipse are clipped independently with threads,
+    # which agrees to the precision of the polygon clipping
+    assert np.allclose(b.get_value(qualifier='fluxes', model='nthreads3'), fluxes, rtol=1e-8, atol=0)
+
+    return b
+
+def test_threading_times(verbose=False):
+    phoebe.reset_settings()
+
+    b = phoebe.default_binary()
+    b.add_dataset('lc', times=np.linspace(0, 1, 11), dataset='lc01')
+    b.add_dataset('rv', times=np.linspace(0, 1, 5), dataset='rv01')
+    b.set_value_all('irrad_method', 'wilson')
+    b.set_value_all('ntriangles', 1000)
+    b.set_value_all('atm', 'blackbody')
+    b.set_value_all('ld_mode', 'manual')
+
+    b.run_compute(model='serial')
+
+    phoebe.threading_times_on()
+    phoebe.threading_set_nthreads(3)
+    b.run_compute(model='threads')
+
+    phoebe.reset_settings()
+
+    fluxes = b.get_value(qualifier='fluxes', model='serial')
+    if verbose:
+        print("fluxes: {}".format(fluxes))
+
+    # each thread computes its times serially, just as without threads
+    assert np.array_equal(b.get_value(qualifier='fluxes', model='threads'), fluxes)
+    for component in ['primary', 'secondary']:
+        assert np.array_equal(b.get_value(qualifier='rvs', component=component, model='threads'),
+                              b.get_value(qualifier='rvs', component=component, model='serial'))
+
+    return b
+
+if __name__ == '__main__':
+    logger = phoebe.logger(clevel='INFO')
+    b = test_threading_reflection(verbose=True)
+    b = test_threading_eclipse(verbose=True)
+    b = test_threading_times(verbose=True)
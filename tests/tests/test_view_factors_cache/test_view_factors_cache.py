@@ -0,0 +1,52 @@
+"""
+"""
+
+import phoebe
+import numpy as np
+from phoebe.backend import universe
+
+
+def test_view_factors_cache(verbose=False):
+    phoebe.reset_settings()
+
+    for b in [phoebe.default_binary(), phoebe.default_contact_binary()]:
+        if not b.hierarchy.is_contact_binary('primary'):
+            b.set_value('ecc', 0.2)
+        # the same phases are repeated in every cycle
+        b.add_dataset('lc', times=np.linspace(0, 2, 21), dataset='lc01')
+        b.set_value_all('irrad_method', 'wilson')
+        b.set_value_all('ntriangles', 500)
+        b.set_value_all('atm', 'blackbody')
+        b.set_value_all('ld_mode', 'manual')
+
+        phoebe.view_factors_cache_clear()
+        phoebe.view_factors_cache_set_maxsize(0)
+        b.run_compute(model='nocache')
+        assert len(universe._view_factors_cache) == 0
+
+        phoebe.view_factors_cache_set_maxsize(128)
+        b.run_compute(model='cache')
+        ncached = len(universe._view_factors_cache)
+        if verbose:
+            print("cached view-factor matrices: {} ({} bytes)".format(ncached, universe._view_factors_cache.nbytes))
+        assert 0 < ncached < 21
+
+        # nothing changed in the geometry, so everything is reused
+        b.set_value('distance', 2, unit='m')
+        b.run_compute(model='cache2')
+        assert len(universe._view_factors_cache) == ncached
+
+        fluxes = b.get_value(qualifier='fluxes', model='nocache')
+        assert np.allclose(b.get_value(qualifier='fluxes', model='cache'), fluxes, rtol=1e-12, atol=0)
+        assert np.allclose(b.get_value(qualifier='fluxes', model='cache2'), fluxes/4, rtol=1e-12, atol=0)
+
+    phoebe.view_factors_cache_clear()
+    assert len(universe._view_factors_cache) == 0
+
+    phoebe.reset_settings()
+
+    return b
+
+if __name__ == '__main__':
+    logger = phoebe.logger(clevel='INFO')
+    b = test_view_factors_cache(verbose=True)